@@ -0,0 +1,12 @@
+"""
+Entry script for converting files between NeXus, filewriter JSON and forwarder JSON without the GUI.
+Requires Python 3.6+
+"""
+import multiprocessing
+import sys
+
+from nexus_constructor.batch_converter import main
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
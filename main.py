@@ -2,35 +2,69 @@
 Entry script for the nexus constructor application.
 Requires Python 3.6+
 """
+import argparse
 import logging
+import multiprocessing
+import os
 import sys
-from PySide2.QtGui import QIcon
-from PySide2.QtWidgets import QApplication, QMainWindow
-from PySide2 import QtCore
 
-from nexus_constructor.component.component_type import (
-    make_dictionary_of_class_definitions,
-)
-from nexus_constructor.main_window import MainWindow
-from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
-from nexus_constructor.instrument import Instrument
-import os
-import argparse
+from nexus_constructor.startup_profiler import StartupProfiler
+
+
+def main(profiler: StartupProfiler, profile_output: str = None):
+    # Imported here so that the profiler, if enabled, can time them
+    with profiler.stage("Import Qt and the main window"):
+        from PySide2.QtCore import QTimer
+        from PySide2.QtGui import QIcon
+        from PySide2.QtWidgets import QApplication, QMainWindow
+        from PySide2 import QtCore
+
+        from nexus_constructor.component.component_type import (
+            make_dictionary_of_class_definitions,
+        )
+        from nexus_constructor.main_window import MainWindow
+        from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
+        from nexus_constructor.instrument import Instrument
+
+    with profiler.stage("Create the application"):
+        QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
+        app = QApplication(sys.argv)
+        app.setWindowIcon(QIcon(os.path.join("ui", "icon.png")))
+        window = QMainWindow()
+    with profiler.stage("Load the NeXus class definitions"):
+        nexus_wrapper = NexusWrapper()
+        # The definitions are next to this script, or next to the executable in a frozen build
+        if getattr(sys, "frozen", False):
+            application_dir = os.path.dirname(sys.executable)
+        else:
+            application_dir = os.path.dirname(os.path.abspath(__file__))
+        definitions_dir = os.path.join(application_dir, "definitions")
+        _, nx_component_classes = make_dictionary_of_class_definitions(definitions_dir)
+        instrument = Instrument(nexus_wrapper, nx_component_classes)
+    with profiler.stage("Set up the main window"):
+        ui = MainWindow(instrument, nx_component_classes)
+        ui.setupUi(window)
+    with profiler.stage("Show the main window"):
+        window.showMaximized()
+    # Runs once the event loop has drawn the window
+    QTimer.singleShot(0, lambda: profiler.finish(profile_output))
+    sys.exit(app.exec_())
+
 
 if __name__ == "__main__":
+    # Worker processes of a frozen build start by running this executable, which must hand them over to multiprocessing
+    multiprocessing.freeze_support()
     parser = argparse.ArgumentParser(description="Nexus Constructor")
-    if "help" in parser.parse_args():
-        exit(0)
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="FILE",
+        help="time each import and stage of startup, and write the times to FILE, or the log if no file is given",
+    )
+    arguments = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
-    QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
-    app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon(os.path.join("ui", "icon.png")))
-    window = QMainWindow()
-    nexus_wrapper = NexusWrapper()
-    definitions_dir = os.path.abspath(os.path.join(os.getcwd(), "definitions"))
-    _, nx_component_classes = make_dictionary_of_class_definitions(definitions_dir)
-    instrument = Instrument(nexus_wrapper, nx_component_classes)
-    ui = MainWindow(instrument, nx_component_classes)
-    ui.setupUi(window)
-    window.showMaximized()
-    sys.exit(app.exec_())
+    startup_profiler = StartupProfiler(enabled=arguments.profile_startup is not None)
+    startup_profiler.start()
+    main(startup_profiler, arguments.profile_startup)
@@ -1,6 +1,6 @@
 from collections import OrderedDict
 
-from PySide2.QtGui import QVector3D
+import numpy as np
 from PySide2.QtCore import QUrl, Signal, QObject
 from PySide2.QtWidgets import QListWidgetItem
 
@@ -28,9 +28,9 @@ from nexus_constructor.instrument import Instrument
 from nexus_constructor.ui_utils import file_dialog, validate_line_edit
 from nexus_constructor.component_tree_model import ComponentTreeModel
 from functools import partial
-from nexus_constructor.ui_utils import generate_unique_name
-from nexus_constructor.component.component import (
-    Component,
+from nexus_constructor.name_utils import generate_unique_name
+from nexus_constructor.component.component import Component
+from nexus_constructor.field_utils import (
     add_fields_to_component,
     get_fields_and_update_functions_for_component,
 )
@@ -76,11 +76,11 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
         self.ok_button.setEnabled(False)
 
         # Set default URL to nexus base classes in web view
-        #self.webEngineView.setUrl(
+        # self.webEngineView.setUrl(
         #    QUrl(
         #        "http://download.nexusformat.org/doc/html/classes/base_classes/index.html"
         #    )
-        #)
+        # )
 
         self.meshRadioButton.clicked.connect(self.show_mesh_fields)
         self.CylinderRadioButton.clicked.connect(self.show_cylinder_fields)
@@ -261,9 +261,10 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
                 self.CylinderRadioButton.setChecked(True)
                 self.cylinderHeightLineEdit.setValue(component_shape.height)
                 self.cylinderRadiusLineEdit.setValue(component_shape.radius)
-                self.cylinderXLineEdit.setValue(component_shape.axis_direction.x())
-                self.cylinderYLineEdit.setValue(component_shape.axis_direction.y())
-                self.cylinderZLineEdit.setValue(component_shape.axis_direction.z())
+                x, y, z = component_shape.axis_direction
+                self.cylinderXLineEdit.setValue(x)
+                self.cylinderYLineEdit.setValue(y)
+                self.cylinderZLineEdit.setValue(z)
                 self.unitsLineEdit.setText(component_shape.units)
 
     def create_new_ui_field(self, field):
@@ -302,11 +303,11 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
         )
 
     def on_nx_class_changed(self):
-        #self.webEngineView.setUrl(
+        # self.webEngineView.setUrl(
         #    QUrl(
         #        f"http://download.nexusformat.org/sphinx/classes/base_classes/{self.componentTypeComboBox.currentText()}.html"
         #    )
-        #)
+        # )
         self.possible_fields = self.nx_component_classes[
             self.componentTypeComboBox.currentText()
         ]
@@ -348,10 +349,12 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
         if self.CylinderRadioButton.isChecked():
 
             component.set_cylinder_shape(
-                QVector3D(
-                    self.cylinderXLineEdit.value(),
-                    self.cylinderYLineEdit.value(),
-                    self.cylinderZLineEdit.value(),
+                np.array(
+                    [
+                        self.cylinderXLineEdit.value(),
+                        self.cylinderYLineEdit.value(),
+                        self.cylinderZLineEdit.value(),
+                    ]
                 ),
                 self.cylinderHeightLineEdit.value(),
                 self.cylinderRadiusLineEdit.value(),
@@ -401,14 +404,15 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
             else None
         )
 
-        if self.component_to_edit:
-            shape, positions = self.edit_existing_component(
-                component_name, description, nx_class, pixel_data
-            )
-        else:
-            shape, positions = self.create_new_component(
-                component_name, description, nx_class, pixel_data
-            )
+        with self.instrument.nexus.batch_changes():
+            if self.component_to_edit:
+                shape, positions = self.edit_existing_component(
+                    component_name, description, nx_class, pixel_data
+                )
+            else:
+                shape, positions = self.create_new_component(
+                    component_name, description, nx_class, pixel_data
+                )
 
         self.instrument.nexus.component_added.emit(
             self.nameLineEdit.text(), shape, positions
@@ -465,9 +469,9 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
             self.parent().sceneWidget.delete_component(self.component_to_edit.name)
 
         # remove previous fields
-        for field_group in self.component_to_edit.group.values():
+        for field_group in list(self.component_to_edit.group.values()):
             if get_name_of_node(field_group) not in INVALID_FIELD_NAMES:
-                del self.instrument.nexus.nexus_file[field_group.name]
+                self.instrument.nexus.delete_node(field_group)
 
         self.component_to_edit.name = component_name
         self.component_to_edit.nx_class = nx_class
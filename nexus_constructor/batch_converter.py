@@ -0,0 +1,233 @@
+"""
+Converts files between NeXus, filewriter JSON and forwarder JSON without starting the GUI, for example to regenerate
+the filewriter commands for every instrument definition in one run.
+Only the NeXus and JSON modules are imported, not the Qt widgets or 3D view, and the files are converted in parallel
+in a pool of processes.
+"""
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+import attr
+
+from nexus_constructor.json.filewriter_json_reader import json_file_to_nexus
+from nexus_constructor.json.filewriter_json_writer import generate_json_from_nexus_file
+from nexus_constructor.json.forwarder_json_writer import generate_forwarder_command
+from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
+
+NEXUS = "nexus"
+FILEWRITER_JSON = "json"
+FORWARDER_JSON = "forwarder"
+
+# Appended to the name of each input file, without its extension, to name the output file
+OUTPUT_SUFFIXES = {
+    NEXUS: ".nxs",
+    FILEWRITER_JSON: ".json",
+    FORWARDER_JSON: "_forwarder.json",
+}
+
+NEXUS_EXTENSIONS = (".nxs", ".nx5", ".h5", ".hdf5", ".hdf")
+
+
+@attr.s(frozen=True)
+class ConversionOptions:
+    """
+    How to convert each file. These are sent to the worker processes, so must be picklable.
+    """
+
+    output_format = attr.ib(type=str)
+    output_dir = attr.ib(type=str)
+    compact = attr.ib(type=bool, default=False)
+    float_precision = attr.ib(type=Optional[int], default=None)
+    broker = attr.ib(type=str, default="")
+    provider_type = attr.ib(type=str, default="ca")
+
+
+@attr.s(frozen=True)
+class ConversionResult:
+    input_filename = attr.ib(type=str)
+    output_filename = attr.ib(type=Optional[str])
+    error = attr.ib(type=Optional[str], default=None)
+
+
+def is_nexus_file(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in NEXUS_EXTENSIONS
+
+
+def output_filename_for(input_filename: str, options: ConversionOptions) -> str:
+    name = os.path.splitext(os.path.basename(input_filename))[0]
+    return os.path.join(
+        options.output_dir, name + OUTPUT_SUFFIXES[options.output_format]
+    )
+
+
+def load_file(filename: str) -> NexusWrapper:
+    """
+    Load a NeXus or filewriter JSON file into a NexusWrapper, leaving large datasets in NeXus files on disk
+    :raises ValueError: if the file contains more than one entry, as there is nobody to choose between them
+    """
+    nexus_wrapper = NexusWrapper(filename)
+    if is_nexus_file(filename):
+        loaded = nexus_wrapper.open_file(filename, lazy=True)
+    else:
+        with open(filename, "rb") as json_file:
+            loaded = nexus_wrapper.load_nexus_file(json_file_to_nexus(json_file))
+    if not loaded:
+        raise ValueError(f"{filename} contains more than one NXentry group")
+    return nexus_wrapper
+
+
+def convert_file(input_filename: str, options: ConversionOptions) -> str:
+    """
+    Convert a single file, replacing the output file if it exists
+    :param input_filename: A NeXus file, or a filewriter JSON file, to convert
+    :param options: What to convert it to and where to write it
+    :return: The name of the output file
+    """
+    output_filename = output_filename_for(input_filename, options)
+    if os.path.abspath(output_filename) == os.path.abspath(input_filename):
+        raise ValueError(f"Converting {input_filename} would overwrite it")
+    nexus_wrapper = load_file(input_filename)
+
+    if options.output_format == NEXUS:
+        if os.path.exists(output_filename):
+            os.remove(output_filename)
+        nexus_wrapper.save_file(output_filename)
+    elif options.output_format == FILEWRITER_JSON:
+        nexus_wrapper.check_lazy_source()
+        with open(output_filename, "w") as file:
+            generate_json_from_nexus_file(
+                nexus_wrapper.nexus_file,
+                file,
+                nexus_file_name=os.path.splitext(os.path.basename(input_filename))[0]
+                + ".nxs",
+                broker=options.broker,
+                compact=options.compact,
+                float_precision=options.float_precision,
+            )
+    elif options.output_format == FORWARDER_JSON:
+        with open(output_filename, "w") as file:
+            generate_forwarder_command(
+                file,
+                nexus_wrapper.entry,
+                provider_type=options.provider_type,
+                default_broker=options.broker,
+                compact=options.compact,
+            )
+    else:
+        raise ValueError(f"Unknown output format {options.output_format}")
+    nexus_wrapper.nexus_file.close()
+    return output_filename
+
+
+def _convert_file_and_catch_errors(
+    input_filename: str, options: ConversionOptions
+) -> ConversionResult:
+    # A file which cannot be converted should not stop the others, so the error is passed back instead
+    try:
+        return ConversionResult(input_filename, convert_file(input_filename, options))
+    except Exception as e:
+        return ConversionResult(input_filename, None, f"{type(e).__name__}: {e}")
+
+
+def convert_files(
+    input_filenames: Sequence[str],
+    options: ConversionOptions,
+    processes: Optional[int] = None,
+) -> List[ConversionResult]:
+    """
+    Convert files in parallel, each in a separate process
+    :param input_filenames: NeXus or filewriter JSON files to convert
+    :param options: What to convert them to and where to write them
+    :param processes: Number of worker processes, defaults to the number of CPUs
+    :return: The result of converting each file, in the same order as the input files
+    """
+    os.makedirs(options.output_dir, exist_ok=True)
+    if processes == 1 or len(input_filenames) <= 1:
+        return [
+            _convert_file_and_catch_errors(filename, options)
+            for filename in input_filenames
+        ]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(
+            executor.map(
+                _convert_file_and_catch_errors,
+                input_filenames,
+                [options] * len(input_filenames),
+            )
+        )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Convert NeXus and filewriter JSON files without the GUI"
+    )
+    parser.add_argument(
+        "input_files", nargs="+", help="NeXus or filewriter JSON files to convert"
+    )
+    parser.add_argument(
+        "-t",
+        "--to",
+        dest="output_format",
+        choices=list(OUTPUT_SUFFIXES),
+        required=True,
+        help="format to convert to",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        default=".",
+        help="directory to write the converted files to",
+    )
+    parser.add_argument(
+        "-j",
+        "--processes",
+        type=int,
+        default=None,
+        help="number of files to convert in parallel, defaults to the number of CPUs",
+    )
+    parser.add_argument("--compact", action="store_true", help="write minified JSON")
+    parser.add_argument(
+        "--float-precision",
+        type=int,
+        default=None,
+        help="number of significant digits to write floats in JSON with",
+    )
+    parser.add_argument(
+        "--broker", default="", help="default broker for streams and the filewriter"
+    )
+    parser.add_argument(
+        "--provider-type",
+        choices=["ca", "pva"],
+        default="ca",
+        help="provider type of the PVs in forwarder commands",
+    )
+    return parser
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the converter from the command line
+    :return: Exit status, which is non-zero if any file failed to convert
+    """
+    logging.basicConfig(level=logging.INFO)
+    arguments = create_parser().parse_args(args)
+    options = ConversionOptions(
+        output_format=arguments.output_format,
+        output_dir=arguments.output_dir,
+        compact=arguments.compact,
+        float_precision=arguments.float_precision,
+        broker=arguments.broker,
+        provider_type=arguments.provider_type,
+    )
+    results = convert_files(arguments.input_files, options, arguments.processes)
+    for result in results:
+        if result.error is None:
+            logging.info(
+                f"Converted {result.input_filename} to {result.output_filename}"
+            )
+        else:
+            logging.error(f"Failed to convert {result.input_filename}: {result.error}")
+    return 1 if any(result.error is not None for result in results) else 0
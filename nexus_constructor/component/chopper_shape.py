@@ -9,8 +9,9 @@ from nexus_constructor.geometry.disk_chopper.disk_chopper_checker import (
 from nexus_constructor.geometry.disk_chopper.disk_chopper_geometry_creator import (
     DiskChopperGeometryCreator,
 )
-from typing import Optional, Union, List, Tuple
-from PySide2.QtGui import QVector3D
+from typing import Optional, Union, Tuple
+
+import numpy as np
 
 
 class ChopperShape(ComponentShape):
@@ -18,7 +19,7 @@ class ChopperShape(ComponentShape):
         self,
     ) -> Tuple[
         Optional[Union[OFFGeometry, CylindricalGeometry, NoShapeGeometry]],
-        Optional[List[QVector3D]],
+        Optional[np.ndarray],
     ]:
         # If there is a shape group then use that
         shape, _ = super().get_shape()
@@ -1,15 +1,12 @@
 import h5py
 from typing import Any, List, Optional, Union, Tuple
-from PySide2.QtGui import QVector3D, QMatrix4x4
-from PySide2.Qt3DCore import Qt3DCore
-from PySide2.QtWidgets import QListWidget
 
 from nexus_constructor.common_attrs import CommonAttrs
 from nexus_constructor.component.pixel_shape import PixelShape
 from nexus_constructor.component.transformations_list import TransformationsList
 from nexus_constructor.nexus import nexus_wrapper as nx
 from nexus_constructor.nexus.nexus_wrapper import get_nx_class
-from nexus_constructor.field_utils import get_fields_with_update_functions
+from nexus_constructor.name_utils import generate_unique_name
 from nexus_constructor.pixel_data import PixelMapping, PixelGrid, PixelData
 from nexus_constructor.pixel_data_to_nexus_utils import (
     get_x_offsets_from_pixel_grid,
@@ -21,11 +18,6 @@ from nexus_constructor.pixel_data_to_nexus_utils import (
 )
 from nexus_constructor.transformation_types import TransformationType
 from nexus_constructor.transformations import Transformation
-from nexus_constructor.ui_utils import (
-    qvector3d_to_numpy_array,
-    generate_unique_name,
-    show_warning_dialog,
-)
 from nexus_constructor.geometry.cylindrical_geometry import (
     CylindricalGeometry,
     calculate_vertices,
@@ -33,10 +25,10 @@ from nexus_constructor.geometry.cylindrical_geometry import (
 from nexus_constructor.geometry import (
     OFFGeometryNexus,
     OFFGeometry,
-    record_faces_in_file,
+    record_winding_order_in_file,
     record_vertices_in_file,
 )
-from nexus_constructor.geometry.utils import validate_nonzero_qvector
+from nexus_constructor.geometry.utils import normalise, validate_nonzero_vector
 from nexus_constructor.component.component_shape import (
     CYLINDRICAL_GEOMETRY_NEXUS_NAME,
     OFF_GEOMETRY_NEXUS_NAME,
@@ -55,18 +47,14 @@ class DependencyError(Exception):
     pass
 
 
-def _normalise(input_vector: QVector3D) -> Tuple[QVector3D, float]:
+def _normalise(input_vector: np.ndarray) -> Tuple[np.ndarray, float]:
     """
     Normalise to unit vector
 
     :param input_vector: Input vector
     :return: Unit vector, magnitude
     """
-    magnitude = input_vector.length()
-    if magnitude == 0:
-        return QVector3D(0.0, 0.0, 0.0), 0.0
-
-    return input_vector.normalized(), magnitude
+    return normalise(input_vector), float(np.linalg.norm(input_vector))
 
 
 def _generate_incremental_name(base_name, group: h5py.Group):
@@ -187,16 +175,14 @@ class Component:
                 )
 
     @property
-    def transform(self) -> Qt3DCore.QTransform:
+    def matrix(self) -> np.ndarray:
         """
-        Get a QTransform describing the position and orientation of the component
+        Get a 4x4 matrix describing the position and orientation of the component, acting on column vectors
         """
-        transform_matrix = QMatrix4x4()
+        transform_matrix = np.identity(4)
         for transform in self.transforms_full_chain:
-            transform_matrix *= transform.qmatrix
-        transformation = Qt3DCore.QTransform()
-        transformation.setMatrix(transform_matrix)
-        return transformation
+            transform_matrix = transform_matrix @ transform.matrix
+        return transform_matrix
 
     @property
     def transforms(self) -> TransformationsList:
@@ -211,7 +197,7 @@ class Component:
         return transforms
 
     def add_translation(
-        self, vector: QVector3D, name: str = None, depends_on: Transformation = None
+        self, vector: np.ndarray, name: str = None, depends_on: Transformation = None
     ) -> Transformation:
         """
         Note, currently assumes translation is in metres
@@ -219,31 +205,30 @@ class Component:
         :param name: name of the translation group (Optional)
         :param depends_on: existing transformation which the new one depends on (otherwise relative to origin)
         """
-        transforms_group = self.file.create_transformations_group_if_does_not_exist(
-            self.group
-        )
-        if name is None:
-            name = _generate_incremental_name(
-                TransformationType.TRANSLATION, transforms_group
+        with self.file.batch_changes():
+            transforms_group = self.file.create_transformations_group_if_does_not_exist(
+                self.group
+            )
+            if name is None:
+                name = _generate_incremental_name(
+                    TransformationType.TRANSLATION, transforms_group
+                )
+            unit_vector, magnitude = _normalise(vector)
+            field = self.file.set_field_value(transforms_group, name, magnitude, float)
+            self.file.set_attribute_value(field, CommonAttrs.UNITS, "m")
+            self.file.set_attribute_value(field, CommonAttrs.VECTOR, unit_vector)
+            self.file.set_attribute_value(
+                field, CommonAttrs.TRANSFORMATION_TYPE, TransformationType.TRANSLATION
             )
-        unit_vector, magnitude = _normalise(vector)
-        field = self.file.set_field_value(transforms_group, name, magnitude, float)
-        self.file.set_attribute_value(field, CommonAttrs.UNITS, "m")
-        self.file.set_attribute_value(
-            field, CommonAttrs.VECTOR, qvector3d_to_numpy_array(unit_vector)
-        )
-        self.file.set_attribute_value(
-            field, CommonAttrs.TRANSFORMATION_TYPE, TransformationType.TRANSLATION
-        )
 
-        translation_transform = Transformation(self.file, field)
-        translation_transform.ui_value = magnitude
-        translation_transform.depends_on = depends_on
-        return translation_transform
+            translation_transform = Transformation(self.file, field)
+            translation_transform.ui_value = magnitude
+            translation_transform.depends_on = depends_on
+            return translation_transform
 
     def add_rotation(
         self,
-        axis: QVector3D,
+        axis: np.ndarray,
         angle: float,
         name: str = None,
         depends_on: Transformation = None,
@@ -255,25 +240,26 @@ class Component:
         :param name: Name of the rotation group (Optional)
         :param depends_on: existing transformation which the new one depends on (otherwise relative to origin)
         """
-        transforms_group = self.file.create_transformations_group_if_does_not_exist(
-            self.group
-        )
-        if name is None:
-            name = _generate_incremental_name(
-                TransformationType.ROTATION, transforms_group
+        with self.file.batch_changes():
+            transforms_group = self.file.create_transformations_group_if_does_not_exist(
+                self.group
             )
-        field = self.file.set_field_value(transforms_group, name, angle, float)
-        self.file.set_attribute_value(field, CommonAttrs.UNITS, "degrees")
-        self.file.set_attribute_value(
-            field, CommonAttrs.VECTOR, qvector3d_to_numpy_array(axis)
-        )
-        self.file.set_attribute_value(
-            field, CommonAttrs.TRANSFORMATION_TYPE, TransformationType.ROTATION
-        )
-        rotation_transform = Transformation(self.file, field)
-        rotation_transform.depends_on = depends_on
-        rotation_transform.ui_value = angle
-        return rotation_transform
+            if name is None:
+                name = _generate_incremental_name(
+                    TransformationType.ROTATION, transforms_group
+                )
+            field = self.file.set_field_value(transforms_group, name, angle, float)
+            self.file.set_attribute_value(field, CommonAttrs.UNITS, "degrees")
+            self.file.set_attribute_value(
+                field, CommonAttrs.VECTOR, np.asarray(axis, dtype=float)
+            )
+            self.file.set_attribute_value(
+                field, CommonAttrs.TRANSFORMATION_TYPE, TransformationType.ROTATION
+            )
+            rotation_transform = Transformation(self.file, field)
+            rotation_transform.depends_on = depends_on
+            rotation_transform.ui_value = angle
+            return rotation_transform
 
     def _transform_is_in_this_component(self, transform: Transformation) -> bool:
         return transform._dataset.parent.parent.name == self.absolute_path
@@ -306,25 +292,29 @@ class Component:
 
     @depends_on.setter
     def depends_on(self, transformation: Transformation):
-        existing_depends_on = self.file.get_attribute_value(
-            self.group, CommonAttrs.DEPENDS_ON
-        )
-        if existing_depends_on is not None:
-            Transformation(
-                self.file, self.file[existing_depends_on]
-            ).deregister_dependent(self)
-
-        if transformation is None:
-            self.file.set_field_value(self.group, CommonAttrs.DEPENDS_ON, ".", str)
-        else:
-            self.file.set_field_value(
-                self.group, CommonAttrs.DEPENDS_ON, transformation.absolute_path, str
+        with self.file.batch_changes():
+            existing_depends_on = self.file.get_attribute_value(
+                self.group, CommonAttrs.DEPENDS_ON
             )
-            transformation.register_dependent(self)
+            if existing_depends_on is not None:
+                Transformation(
+                    self.file, self.file[existing_depends_on]
+                ).deregister_dependent(self)
+
+            if transformation is None:
+                self.file.set_field_value(self.group, CommonAttrs.DEPENDS_ON, ".", str)
+            else:
+                self.file.set_field_value(
+                    self.group,
+                    CommonAttrs.DEPENDS_ON,
+                    transformation.absolute_path,
+                    str,
+                )
+                transformation.register_dependent(self)
 
     def set_cylinder_shape(
         self,
-        axis_direction: QVector3D = QVector3D(0.0, 0.0, 1.0),
+        axis_direction: np.ndarray = (0.0, 0.0, 1.0),
         height: float = 1.0,
         radius: float = 1.0,
         units: Union[str, bytes] = "m",
@@ -334,25 +324,26 @@ class Component:
         Sets the shape of the component to be a cylinder
         Overrides any existing shape
         """
-        self.remove_shape()
-        validate_nonzero_qvector(axis_direction)
+        with self.file.batch_changes():
+            self.remove_shape()
+            validate_nonzero_vector(axis_direction)
 
-        shape_group = self.create_shape_nx_group(
-            CYLINDRICAL_GEOMETRY_NEXUS_NAME, type(pixel_data) is PixelGrid
-        )
+            shape_group = self.create_shape_nx_group(
+                CYLINDRICAL_GEOMETRY_NEXUS_NAME, type(pixel_data) is PixelGrid
+            )
 
-        pixel_mapping = None
-        if isinstance(pixel_data, PixelMapping):
-            pixel_mapping = pixel_data
+            pixel_mapping = None
+            if isinstance(pixel_data, PixelMapping):
+                pixel_mapping = pixel_data
 
-        vertices = calculate_vertices(axis_direction, height, radius)
-        vertices_field = self.file.set_field_value(
-            shape_group, CommonAttrs.VERTICES, vertices
-        )
-        # Specify 0th vertex is base centre, 1st is base edge, 2nd is top centre
-        self.file.set_field_value(shape_group, "cylinders", np.array([0, 1, 2]))
-        self.file.set_attribute_value(vertices_field, CommonAttrs.UNITS, units)
-        return CylindricalGeometry(self.file, shape_group, pixel_mapping)
+            vertices = calculate_vertices(axis_direction, height, radius)
+            vertices_field = self.file.set_field_value(
+                shape_group, CommonAttrs.VERTICES, vertices
+            )
+            # Specify 0th vertex is base centre, 1st is base edge, 2nd is top centre
+            self.file.set_field_value(shape_group, "cylinders", np.array([0, 1, 2]))
+            self.file.set_attribute_value(vertices_field, CommonAttrs.UNITS, units)
+            return CylindricalGeometry(self.file, shape_group, pixel_mapping)
 
     def set_off_shape(
         self,
@@ -365,19 +356,29 @@ class Component:
         Sets the shape of the component to be a mesh
         Overrides any existing shape
         """
-        self.remove_shape()
+        with self.file.batch_changes():
+            self.remove_shape()
 
-        shape_group = self.create_shape_nx_group(
-            OFF_GEOMETRY_NEXUS_NAME, isinstance(pixel_data, PixelGrid)
-        )
+            shape_group = self.create_shape_nx_group(
+                OFF_GEOMETRY_NEXUS_NAME, isinstance(pixel_data, PixelGrid)
+            )
 
-        pixel_mapping = None
-        if isinstance(pixel_data, PixelMapping):
-            pixel_mapping = pixel_data
+            pixel_mapping = None
+            if isinstance(pixel_data, PixelMapping):
+                pixel_mapping = pixel_data
 
-        record_faces_in_file(self.file, shape_group, loaded_geometry.faces)
-        record_vertices_in_file(self.file, shape_group, loaded_geometry.vertices)
-        return OFFGeometryNexus(self.file, shape_group, units, filename, pixel_mapping)
+            record_winding_order_in_file(
+                self.file,
+                shape_group,
+                loaded_geometry.winding_order_array,
+                loaded_geometry.winding_order_indices_array,
+            )
+            record_vertices_in_file(
+                self.file, shape_group, loaded_geometry.vertices_array
+            )
+            return OFFGeometryNexus(
+                self.file, shape_group, units, filename, pixel_mapping
+            )
 
     def create_shape_nx_group(
         self, nexus_name: str, shape_is_single_pixel: bool = False
@@ -405,16 +406,14 @@ class Component:
     @property
     def shape(
         self,
-    ) -> Tuple[
-        Optional[Union[OFFGeometry, CylindricalGeometry]], Optional[List[QVector3D]]
-    ]:
+    ) -> Tuple[Optional[Union[OFFGeometry, CylindricalGeometry]], Optional[np.ndarray]]:
         """
-        Get the shape of the component if there is one defined, and optionally a
-        list of transformations relative to the component's depends_on chain which
+        Get the shape of the component if there is one defined, and optionally an
+        (N,3) array of translations relative to the component's depends_on chain which
         describe where the shape should be repeated
         (used in subclass for components where the shape describes each pixel)
 
-        :return: Component shape, each transformation where the shape is repeated
+        :return: Component shape, each translation where the shape is repeated
         """
         return self._shape.get_shape()
 
@@ -434,18 +433,19 @@ class Component:
         Records the pixel grid data to the NeXus file.
         :param pixel_grid: The PixelGrid created from the input provided to the Add/Edit Component Window.
         """
-        self.set_field(
-            "x_pixel_offset", get_x_offsets_from_pixel_grid(pixel_grid), "float64"
-        )
-        self.set_field(
-            "y_pixel_offset", get_y_offsets_from_pixel_grid(pixel_grid), "float64"
-        )
-        self.set_field(
-            "z_pixel_offset", get_z_offsets_from_pixel_grid(pixel_grid), "float64"
-        )
-        self.set_field(
-            "detector_number", get_detector_ids_from_pixel_grid(pixel_grid), "int64"
-        )
+        with self.file.batch_changes():
+            self.set_field(
+                "x_pixel_offset", get_x_offsets_from_pixel_grid(pixel_grid), "float64"
+            )
+            self.set_field(
+                "y_pixel_offset", get_y_offsets_from_pixel_grid(pixel_grid), "float64"
+            )
+            self.set_field(
+                "z_pixel_offset", get_z_offsets_from_pixel_grid(pixel_grid), "float64"
+            )
+            self.set_field(
+                "detector_number", get_detector_ids_from_pixel_grid(pixel_grid), "int64"
+            )
 
     def record_pixel_mapping(self, pixel_mapping: PixelMapping):
         """
@@ -464,28 +464,3 @@ class Component:
         """
         for field in PIXEL_FIELDS:
             self.delete_field(field)
-
-
-def add_fields_to_component(component: Component, fields_widget: QListWidget):
-    """
-    Adds fields from a list widget to a component.
-    :param component: Component to add the field to.
-    :param fields_widget: The field list widget to extract field information such the name and value of each field.
-    """
-    for i in range(fields_widget.count()):
-        widget = fields_widget.itemWidget(fields_widget.item(i))
-        try:
-            component.set_field(
-                name=widget.name, value=widget.value, dtype=widget.dtype
-            )
-        except ValueError as error:
-            show_warning_dialog(
-                f"Warning: field {widget.name} not added",
-                title="Field invalid",
-                additional_info=str(error),
-                parent=fields_widget.parent().parent(),
-            )
-
-
-def get_fields_and_update_functions_for_component(component: Component):
-    return get_fields_with_update_functions(component.group)
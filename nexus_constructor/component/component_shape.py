@@ -1,6 +1,6 @@
 import h5py
-from typing import Tuple, Optional, Union, List
-from PySide2.QtGui import QVector3D
+import numpy as np
+from typing import Tuple, Optional, Union
 
 from nexus_constructor.nexus.nexus_wrapper import get_nx_class
 from nexus_constructor.nexus import nexus_wrapper as nx
@@ -37,15 +37,15 @@ class ComponentShape:
         self,
     ) -> Tuple[
         Optional[Union[OFFGeometry, CylindricalGeometry, NoShapeGeometry]],
-        Optional[List[QVector3D]],
+        Optional[np.ndarray],
     ]:
         """
-        Get the shape of the component if there is one defined, and optionally a
-        list of transformations relative to the component's depends_on chain which
+        Get the shape of the component if there is one defined, and optionally an
+        (N,3) array of translations relative to the component's depends_on chain which
         describe where the shape should be repeated
         (used in subclass for components where the shape describes each pixel)
 
-        :return: Component shape, each transformation where the shape is repeated
+        :return: Component shape, each translation where the shape is repeated
         """
         shape = get_shape_from_component(
             self.component_group, self.file, SHAPE_GROUP_NAME
@@ -1,6 +1,11 @@
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
 import os
-import xmltodict
+import sys
+import uuid
 
 PIXEL_COMPONENT_TYPES = {"NXdetector"}
 COMPONENT_TYPES = {
@@ -41,6 +46,13 @@ COMPONENT_TYPES = {
 CHOPPER_CLASS_NAME = "NXdisk_chopper"
 
 
+# Increase this when the layout of the cached index changes, so that old caches are not read
+CLASS_DEFINITIONS_INDEX_VERSION = 1
+
+# Fields of a base class, each described by a dict with its name, type and, if given, units
+FieldDefinitions = List[Dict[str, Optional[str]]]
+
+
 def __list_base_class_files(file_list):
     for file in file_list:
         if file.endswith(".nxdl.xml"):
@@ -48,43 +60,133 @@ def __list_base_class_files(file_list):
 
 
 def make_dictionary_of_class_definitions(
-    repo_directory="nexus_definitions", black_list: List[str] = None
+    repo_directory="nexus_definitions",
+    black_list: List[str] = None,
+    cache_dir: str = None,
 ):
-    base_class_dir = os.path.join(repo_directory, "base_classes")
-
+    """
+    Find the fields of every NeXus base class.
+    The base classes are read from a cached index, which is only rebuilt when the definitions change.
+    :param repo_directory: The NeXus definitions directory, containing base_classes
+    :param black_list: Names of base classes to leave out
+    :param cache_dir: Directory holding the index, by default the user's cache directory
+    :return: The field names of every base class, and of those which are components, keyed by class name
+    """
+    if black_list is None:
+        black_list = []
     component_definitions = {}
     all_class_definitions = {}
-    for base_class_file in __list_base_class_files(os.listdir(base_class_dir)):
-        with open(os.path.join(base_class_dir, base_class_file)) as def_file:
-            _create_base_class_dict(
-                def_file.read(),
-                black_list,
-                all_class_definitions,
-                component_definitions,
-            )
+    index = load_class_definitions_index(repo_directory, cache_dir)
+    for nx_class_name, fields in index.items():
+        if nx_class_name in black_list:
+            continue
+        class_fields = [field["name"] for field in fields]
+        all_class_definitions[nx_class_name] = class_fields
+        if nx_class_name in COMPONENT_TYPES:
+            component_definitions[nx_class_name] = class_fields
     return all_class_definitions, component_definitions
 
 
-def _create_base_class_dict(
-    xml_text, black_list, class_definitions, component_definitions
-):
-    if black_list is None:
-        black_list = []
+def default_cache_dir() -> str:
+    cache_home = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(cache_home, "nexus-constructor")
 
-    xml_definition = xmltodict.parse(xml_text)["definition"]
-    nx_class_name = xml_definition["@name"]
-    if nx_class_name in black_list:
-        return
-    class_fields = []
+
+def hash_definitions_directory(base_class_dir: str) -> str:
+    """
+    Hash the names, sizes and modification times of the base class files, which only needs the directory listing,
+    rather than the contents of the files
+    """
+    hasher = hashlib.sha1(
+        f"{CLASS_DEFINITIONS_INDEX_VERSION}:{os.path.abspath(base_class_dir)}".encode()
+    )
+    for entry in sorted(os.scandir(base_class_dir), key=lambda entry: entry.name):
+        if entry.name.endswith(".nxdl.xml"):
+            stat = entry.stat()
+            hasher.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return hasher.hexdigest()
+
+
+def load_class_definitions_index(
+    repo_directory: str, cache_dir: str = None
+) -> Dict[str, FieldDefinitions]:
+    """
+    Load the index of the NeXus base classes from the cache, or build and cache it if the definitions have changed
+    :param repo_directory: The NeXus definitions directory, containing base_classes
+    :param cache_dir: Directory holding the index, by default the user's cache directory
+    :return: The fields of each base class, keyed by class name
+    """
+    base_class_dir = os.path.join(repo_directory, "base_classes")
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    cache_file = os.path.join(
+        cache_dir, f"nxdl_index_{hash_definitions_directory(base_class_dir)}.json"
+    )
     try:
-        fields = xml_definition["field"]
-        try:
-            for field in fields:
-                class_fields.append(field["@name"])
-        except Exception:
-            class_fields.append(fields["@name"])
-    except KeyError:
+        with open(cache_file) as file:
+            return json.load(file)
+    except (OSError, ValueError):
         pass
-    class_definitions[nx_class_name] = class_fields
-    if nx_class_name in COMPONENT_TYPES:
-        component_definitions[nx_class_name] = class_fields
+
+    index = build_class_definitions_index(base_class_dir)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Written under a temporary name first so that another instance starting at the same time never reads half
+        temporary_file = f"{cache_file}.{uuid.uuid4()}"
+        with open(temporary_file, "w") as file:
+            json.dump(index, file)
+        os.replace(temporary_file, cache_file)
+    except OSError as e:
+        logging.warning(f"Unable to cache NeXus base class definitions: {e}")
+    return index
+
+
+def build_class_definitions_index(
+    base_class_dir: str, processes: int = None
+) -> Dict[str, FieldDefinitions]:
+    """
+    Parse every base class definition, spreading the files over a pool of processes
+    :param base_class_dir: Directory containing the .nxdl.xml files
+    :param processes: Number of worker processes, defaults to the number of CPUs. Always parsed in this process in a
+    frozen build, where starting worker processes would start more copies of the application.
+    :return: The fields of each base class, keyed by class name
+    """
+    paths = [
+        os.path.join(base_class_dir, base_class_file)
+        for base_class_file in __list_base_class_files(
+            sorted(os.listdir(base_class_dir))
+        )
+    ]
+    if processes == 1 or getattr(sys, "frozen", False):
+        return dict(map(_parse_base_class_file, paths))
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return dict(executor.map(_parse_base_class_file, paths, chunksize=8))
+
+
+def _parse_base_class_file(path: str) -> Tuple[str, FieldDefinitions]:
+    with open(path) as def_file:
+        return _parse_base_class(def_file.read())
+
+
+def _parse_base_class(xml_text: str) -> Tuple[str, FieldDefinitions]:
+    # Only needed when the index is rebuilt
+    import xmltodict
+
+    xml_definition = xmltodict.parse(xml_text)["definition"]
+    fields = xml_definition.get("field", [])
+    # xmltodict gives a single field as a dict rather than a list
+    if not isinstance(fields, list):
+        fields = [fields]
+    return (
+        xml_definition["@name"],
+        [
+            {
+                "name": field["@name"],
+                "type": field.get("@type", "NX_CHAR"),
+                "units": field.get("@units"),
+            }
+            for field in fields
+        ],
+    )
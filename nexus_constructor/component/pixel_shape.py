@@ -6,17 +6,16 @@ from nexus_constructor.component.component_shape import (
 from nexus_constructor.geometry.cylindrical_geometry import CylindricalGeometry
 from nexus_constructor.geometry import OFFGeometry, NoShapeGeometry
 from nexus_constructor.nexus import nexus_wrapper as nx
-from typing import Optional, Union, List, Tuple
-from PySide2.QtGui import QVector3D
+from typing import Optional, Union, Tuple
 import h5py
 import numpy as np
 
 
 def _create_transformation_vectors_for_pixel_offsets(
     detector_group: h5py.Group, wrapper: nx.NexusWrapper
-) -> List[QVector3D]:
+) -> np.ndarray:
     """
-    Construct a transformation (as a QVector3D) for each pixel offset
+    Construct a transformation, as a row of an (N,3) array, for each pixel offset
     """
     x_offsets = wrapper.get_field_value(detector_group, "x_pixel_offset")
     y_offsets = wrapper.get_field_value(detector_group, "y_pixel_offset")
@@ -28,12 +27,9 @@ def _create_transformation_vectors_for_pixel_offsets(
     if z_offsets is None:
         z_offsets = np.zeros_like(x_offsets)
     # offsets datasets can be 2D to match dimensionality of detector, so flatten to 1D
-    return [
-        QVector3D(x, y, z)
-        for x, y, z in zip(
-            x_offsets.flatten(), y_offsets.flatten(), z_offsets.flatten()
-        )
-    ]
+    return np.column_stack(
+        (x_offsets.flatten(), y_offsets.flatten(), z_offsets.flatten())
+    ).astype(float)
 
 
 class PixelShape(ComponentShape):
@@ -41,7 +37,7 @@ class PixelShape(ComponentShape):
         self,
     ) -> Tuple[
         Optional[Union[OFFGeometry, CylindricalGeometry, NoShapeGeometry]],
-        Optional[List[QVector3D]],
+        Optional[np.ndarray],
     ]:
         shape = get_shape_from_component(
             self.component_group, self.file, PIXEL_SHAPE_GROUP_NAME
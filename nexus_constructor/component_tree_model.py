@@ -1,5 +1,4 @@
 from PySide2.QtCore import QAbstractItemModel, QModelIndex, Qt, Signal
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QMessageBox
 from nexus_constructor.component.component import Component
 from nexus_constructor.component.transformations_list import TransformationsList
@@ -7,9 +6,10 @@ from nexus_constructor.component.link_transformation import LinkTransformation
 from nexus_constructor.transformation_types import TransformationType
 from nexus_constructor.transformations import Transformation
 from nexus_constructor.instrument import Instrument
-from nexus_constructor.ui_utils import generate_unique_name
+from nexus_constructor.name_utils import generate_unique_name
 import PySide2.QtGui
 import logging
+import numpy as np
 
 
 class ComponentInfo(object):
@@ -198,18 +198,20 @@ class ComponentTreeModel(QAbstractItemModel):
         self.beginInsertRows(target_index, target_pos, target_pos)
         transformation_list.insert(target_pos, new_transformation)
         self.endInsertRows()
-        parent_component.depends_on = transformation_list[0]
-        linked_component = None
-        if transformation_list.has_link:
-            linked_component = transformation_list.link.linked_component
-        for i in range(len(transformation_list) - 1):
-            transformation_list[i].depends_on = transformation_list[i + 1]
-        if transformation_list.has_link:
-            transformation_list.link.linked_component = linked_component
-            if linked_component is not None:
-                transformation_list[
-                    -1
-                ].depends_on = transformation_list.link.linked_component.transforms[0]
+        with parent_component.file.batch_changes():
+            parent_component.depends_on = transformation_list[0]
+            linked_component = None
+            if transformation_list.has_link:
+                linked_component = transformation_list.link.linked_component
+            for i in range(len(transformation_list) - 1):
+                transformation_list[i].depends_on = transformation_list[i + 1]
+            if transformation_list.has_link:
+                transformation_list.link.linked_component = linked_component
+                if linked_component is not None:
+                    linked_transforms = (
+                        transformation_list.link.linked_component.transforms
+                    )
+                    transformation_list[-1].depends_on = linked_transforms[0]
         self.instrument.nexus.transformation_changed.emit()
 
     @staticmethod
@@ -221,12 +223,12 @@ class ComponentTreeModel(QAbstractItemModel):
                 name=generate_unique_name(
                     TransformationType.TRANSLATION, transformation_list
                 ),
-                vector=QVector3D(1.0, 0, 0),
+                vector=np.array([1.0, 0, 0]),
             )
         elif transformation_type == TransformationType.ROTATION:
             new_transformation = parent_component.add_rotation(
                 name=generate_unique_name("Rotation", transformation_list),
-                axis=QVector3D(1.0, 0, 0),
+                axis=np.array([1.0, 0, 0]),
                 angle=0.0,
             )
         else:
@@ -0,0 +1,17 @@
+import h5py
+import numpy as np
+
+# The types a field can be given in the UI, and the numpy type each is stored as
+DATASET_TYPE = {
+    "Byte": np.byte,
+    "UByte": np.ubyte,
+    "Short": np.short,
+    "UShort": np.ushort,
+    "Integer": np.intc,
+    "UInteger": np.uintc,
+    "Long": np.int_,
+    "ULong": np.uint,
+    "Float": np.single,
+    "Double": np.double,
+    "String": h5py.special_dtype(vlen=str),
+}
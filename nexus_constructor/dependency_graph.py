@@ -0,0 +1,306 @@
+"""
+Keeps track of which components and transformations depend on each transformation through their depends_on links.
+
+This is needed so that transformations which something still depends on are not deleted, and so that depends_on
+links can be updated when a transformation is renamed. The graph is held in memory and built from a single pass over
+the file when it is loaded. It is written to the file as the dependee_of attribute of each transformation, which is not
+part of the NeXus standard, only when the file is saved.
+"""
+import logging
+import posixpath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import h5py
+import numpy as np
+
+from nexus_constructor.common_attrs import CommonAttrs
+from nexus_constructor.nexus.file_changes import (
+    ChangeType,
+    FileChange,
+    is_same_or_descendant,
+)
+from nexus_constructor.transformation_engine import resolve_depends_on
+
+
+def find_depends_on(root: h5py.Group) -> Dict[str, str]:
+    """
+    Find the depends_on field of every component and the depends_on attribute of every transformation in root,
+    including root itself.
+    Links which point to nodes missing from the file are skipped.
+    :param root: Group to search, usually the file or its entry
+    :return: The absolute path of each dependent mapped to the absolute path of the transformation it depends on
+    """
+    depends_on, _ = _find_nodes_and_depends_on(root)
+    return depends_on
+
+
+def _find_nodes_and_depends_on(
+    root: h5py.Group,
+) -> Tuple[Dict[str, str], Dict[str, h5py.HLObject]]:
+    """
+    Paths are worked out from the names given by visititems and looked up in the nodes already visited, rather than
+    opening nodes by path, which makes up most of the time taken otherwise
+    :return: The depends_on links in root, and every node in root keyed by absolute path
+    """
+    depends_on: Dict[str, str] = {}
+    nodes: Dict[str, h5py.HLObject] = {}
+
+    def visit(path, node):
+        nodes[path] = node
+        if isinstance(node, h5py.Group) and CommonAttrs.DEPENDS_ON in node:
+            value = node[CommonAttrs.DEPENDS_ON][()]
+            relative_to = path
+        elif isinstance(node, h5py.Dataset) and CommonAttrs.DEPENDS_ON in node.attrs:
+            value = node.attrs[CommonAttrs.DEPENDS_ON]
+            relative_to = posixpath.dirname(path)
+        else:
+            return
+        dependency = resolve_depends_on(value, relative_to)
+        if dependency is not None:
+            depends_on[path] = dependency
+
+    visit(root.name, root)
+    root.visititems(lambda name, node: visit(posixpath.join(root.name, name), node))
+
+    for path, dependency in list(depends_on.items()):
+        # Links can point outside root, so only those not found while visiting are looked up in the file
+        if dependency not in nodes and dependency not in root.file:
+            logging.warning(
+                f"{path} depends on a transformation which is not in the file"
+            )
+            del depends_on[path]
+    return depends_on, nodes
+
+
+def get_dependents(depends_on: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Reverse the depends_on links
+    :param depends_on: The absolute path of each dependent mapped to the path of the transformation it depends on
+    :return: The absolute path of each transformation mapped to the paths of everything which depends on it directly
+    """
+    dependents: Dict[str, List[str]] = {}
+    for dependent, dependency in depends_on.items():
+        dependents.setdefault(dependency, []).append(dependent)
+    return dependents
+
+
+def check_for_cycles(depends_on: Dict[str, str]):
+    """
+    Follows each chain once, so this takes time in proportion to the number of links however long the chains are.
+    :param depends_on: The absolute path of each dependent mapped to the path of the transformation it depends on
+    :raises ValueError: if following the depends_on links from any node leads back to that node
+    """
+    # Paths whose chain has already been followed to its end
+    checked: Set[str] = set()
+    for start in depends_on:
+        chain: Set[str] = set()
+        path = start
+        while path in depends_on and path not in checked:
+            if path in chain:
+                raise ValueError(f"depends_on chain of {start} contains a cycle")
+            chain.add(path)
+            path = depends_on[path]
+        checked.update(chain)
+
+
+def write_dependee_of_attributes(
+    nexus_file: h5py.File, dependents: Dict[str, Iterable[str]]
+):
+    """
+    Write the dependee_of attribute of every transformation which something depends on, replacing any dependee_of
+    attributes already in the file. Transformations which are not in the file are skipped.
+    :param nexus_file: The file to write to
+    :param dependents: The absolute path of each transformation mapped to the paths of its direct dependents
+    """
+    _, nodes = _find_nodes_and_depends_on(nexus_file)
+    for node in nodes.values():
+        if CommonAttrs.DEPENDEE_OF in node.attrs:
+            del node.attrs[CommonAttrs.DEPENDEE_OF]
+
+    for path, dependee_of in dependents.items():
+        if path in nodes and dependee_of:
+            nodes[path].attrs[CommonAttrs.DEPENDEE_OF] = np.array(
+                list(dependee_of), dtype=h5py.special_dtype(vlen=str)
+            )
+
+
+class DependencyGraph:
+    """
+    The components and transformations which depend directly on each transformation, keyed by absolute path.
+    Adding or removing a dependent takes constant time, and getting the dependents of a transformation takes time in
+    proportion to how many there are.
+    Paths are kept up to date with the changes NexusWrapper reports, so renamed and removed nodes are followed. Every
+    path in the graph is also indexed under its parent, so a removed or renamed group only touches the links of nodes
+    under it.
+    """
+
+    def __init__(self):
+        # Dicts with no values are used as sets which keep the order dependents were added in
+        self._dependents: Dict[str, Dict[str, None]] = {}
+        # The transformation each dependent depends on, a node has a single depends_on
+        self._depends_on: Dict[str, str] = {}
+        # The children of each path which are in the graph or have descendants in it, from the root "/" down
+        self._children: Dict[str, Set[str]] = {}
+
+    def add(self, path: str, dependent_path: str):
+        """
+        Register dependent_path as depending on path, replacing what it depended on before
+        """
+        previous_path = self._depends_on.get(dependent_path)
+        if previous_path is not None and previous_path != path:
+            self.remove(previous_path, dependent_path)
+        self._dependents.setdefault(path, {})[dependent_path] = None
+        self._depends_on[dependent_path] = path
+        self._index_path(path)
+        self._index_path(dependent_path)
+
+    def remove(self, path: str, dependent_path: str) -> bool:
+        """
+        :return: False if the dependent was not registered as depending on the path
+        """
+        dependents = self._dependents.get(path, {})
+        if dependent_path not in dependents:
+            return False
+        del dependents[dependent_path]
+        if not dependents:
+            del self._dependents[path]
+        del self._depends_on[dependent_path]
+        self._unindex_path(path)
+        self._unindex_path(dependent_path)
+        return True
+
+    def get_dependents(self, path: str) -> List[str]:
+        return list(self._dependents.get(path, ()))
+
+    def get_depends_on(self, dependent_path: str) -> Optional[str]:
+        """
+        :return: The path dependent_path depends on, or None if it is not registered as depending on anything
+        """
+        return self._depends_on.get(dependent_path)
+
+    def clear(self):
+        self._dependents = {}
+        self._depends_on = {}
+        self._children = {}
+
+    def add_links_in(self, root: h5py.Group):
+        """
+        Add every depends_on link found in root, including root itself, from one pass over it
+        """
+        depends_on = find_depends_on(root)
+        try:
+            check_for_cycles(depends_on)
+        except ValueError:
+            logging.warning(f"The depends_on chains in {root.name} contain a cycle")
+        for dependent_path, path in depends_on.items():
+            self.add(path, dependent_path)
+
+    def rebuild(self, nexus_file: h5py.File):
+        self.clear()
+        self.add_links_in(nexus_file)
+
+    def update(self, change: FileChange, nexus_file: h5py.File):
+        """
+        Keep the graph in step with a single change to the NeXus file
+        """
+        if change.change_type == ChangeType.RELOADED:
+            self.rebuild(nexus_file)
+        elif change.change_type == ChangeType.ADDED:
+            node = nexus_file.get(change.path)
+            # Groups can be added with their contents, for example when a component is duplicated
+            if isinstance(node, h5py.Group):
+                self.add_links_in(node)
+        elif change.change_type == ChangeType.REMOVED:
+            self._remove_paths_under(change.path)
+        elif change.change_type == ChangeType.RENAMED:
+            self._move_paths_under(change.path, change.new_path)
+
+    def _in_graph(self, path: str) -> bool:
+        return path in self._dependents or path in self._depends_on
+
+    def _index_path(self, path: str):
+        child = None
+        while True:
+            indexed = path in self._children
+            children = self._children.setdefault(path, set())
+            if child is not None:
+                children.add(child)
+            parent = posixpath.dirname(path)
+            if indexed or parent == path:
+                return
+            child, path = path, parent
+
+    def _unindex_path(self, path: str):
+        # Drop the path, and then any ancestors, once nothing in the graph is at or under it
+        while (
+            path in self._children
+            and not self._children[path]
+            and not self._in_graph(path)
+        ):
+            del self._children[path]
+            path, child = posixpath.dirname(path), path
+            if path == child:
+                return
+            self._children[path].discard(child)
+
+    def _paths_under(self, ancestor: str) -> List[str]:
+        """
+        :return: The paths in the graph which are ancestor or are below it
+        """
+        ancestor = ancestor.rstrip("/") or "/"
+        if ancestor not in self._children:
+            return []
+        paths = []
+        to_visit = [ancestor]
+        while to_visit:
+            path = to_visit.pop()
+            if self._in_graph(path):
+                paths.append(path)
+            to_visit.extend(self._children[path])
+        return paths
+
+    def _remove_paths_under(self, removed_path: str):
+        for path in self._paths_under(removed_path):
+            dependency = self._depends_on.get(path)
+            if dependency is not None:
+                self.remove(dependency, path)
+            for dependent_path in self.get_dependents(path):
+                self.remove(path, dependent_path)
+
+    def _move_paths_under(self, old_path: str, new_path: str):
+        suffix_start = len(old_path)
+
+        def moved(path: str) -> str:
+            if is_same_or_descendant(path, old_path):
+                return new_path + path[suffix_start:]
+            return path
+
+        moved_paths = self._paths_under(old_path)
+        # Every link to or from a moved path is in the dependents of one of these, which are replaced in place so that
+        # dependents stay in the order they were added
+        affected_paths = {path for path in moved_paths if path in self._dependents}
+        affected_paths.update(
+            self._depends_on[path] for path in moved_paths if path in self._depends_on
+        )
+
+        old_links = {path: self._dependents.pop(path) for path in affected_paths}
+        for path, dependents in old_links.items():
+            for dependent_path in dependents:
+                del self._depends_on[dependent_path]
+        for path, dependents in old_links.items():
+            self._dependents[moved(path)] = {
+                moved(dependent_path): None for dependent_path in dependents
+            }
+            for dependent_path in dependents:
+                self._depends_on[moved(dependent_path)] = moved(path)
+
+        for path in sorted(moved_paths, key=len, reverse=True):
+            self._unindex_path(path)
+        for path in moved_paths:
+            self._index_path(moved(path))
+
+    def write_dependee_of_attributes(self, nexus_file: h5py.File):
+        """
+        Write the graph to the file as the dependee_of attributes of the transformations, for example when saving
+        """
+        write_dependee_of_attributes(nexus_file, self._dependents)
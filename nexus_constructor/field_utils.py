@@ -3,11 +3,14 @@ from typing import List
 
 import h5py
 import numpy as np
+from PySide2.QtWidgets import QListWidget
 
 from nexus_constructor.common_attrs import CommonAttrs
+from nexus_constructor.component.component import Component
 from nexus_constructor.field_widget import FieldWidget
 from nexus_constructor.invalid_field_names import INVALID_FIELD_NAMES
 from nexus_constructor.nexus.nexus_wrapper import get_name_of_node
+from nexus_constructor.ui_utils import show_warning_dialog
 from nexus_constructor.validators import FieldType
 
 
@@ -95,3 +98,28 @@ def find_field_type(item):
         f"Object {get_name_of_node(item)} not handled as field - could be used for other parts of UI instead"
     )
     return item, None
+
+
+def add_fields_to_component(component: Component, fields_widget: QListWidget):
+    """
+    Adds fields from a list widget to a component.
+    :param component: Component to add the field to.
+    :param fields_widget: The field list widget to extract field information such the name and value of each field.
+    """
+    for i in range(fields_widget.count()):
+        widget = fields_widget.itemWidget(fields_widget.item(i))
+        try:
+            component.set_field(
+                name=widget.name, value=widget.value, dtype=widget.dtype
+            )
+        except ValueError as error:
+            show_warning_dialog(
+                f"Warning: field {widget.name} not added",
+                title="Field invalid",
+                additional_info=str(error),
+                parent=fields_widget.parent().parent(),
+            )
+
+
+def get_fields_and_update_functions_for_component(component: Component):
+    return get_fields_with_update_functions(component.group)
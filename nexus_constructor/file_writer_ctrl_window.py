@@ -2,7 +2,8 @@ from functools import partial
 from typing import Callable, Dict, Union, Tuple, Type
 
 from nexus_constructor.kafka.kafka_interface import KafkaInterface
-from nexus_constructor.ui_utils import validate_line_edit
+from nexus_constructor.nexus.lazy_file import SourceFileChangedError
+from nexus_constructor.ui_utils import validate_line_edit, show_warning_dialog
 from nexus_constructor.validators import BrokerAndTopicValidator
 from ui.led import Led
 from ui.filewriter_ctrl_frame import Ui_FilewriterCtrl
@@ -214,16 +215,21 @@ class FileWriterCtrl(Ui_FilewriterCtrl, QMainWindow):
                 use_swmr,
             ) = self.command_widget.get_arguments()
             in_memory_file = io.StringIO()
-            generate_json(
-                data=self.instrument,
-                file=in_memory_file,
-                nexus_file_name=nexus_file_name,
-                broker=broker,
-                start_time=start_time,
-                stop_time=stop_time,
-                service_id=service_id,
-                use_swmr=use_swmr,
-            )
+            try:
+                generate_json(
+                    data=self.instrument,
+                    file=in_memory_file,
+                    nexus_file_name=nexus_file_name,
+                    broker=broker,
+                    start_time=start_time,
+                    stop_time=stop_time,
+                    service_id=service_id,
+                    use_swmr=use_swmr,
+                    compact=True,
+                )
+            except SourceFileChangedError as e:
+                show_warning_dialog(str(e), "Unable to send command", parent=self)
+                return
             in_memory_file.seek(0)
             msg_to_send = in_memory_file.read()
             self.command_producer.send_command(msg_to_send)
@@ -4,6 +4,7 @@ from .off_geometry import (
     OFFGeometryNoNexus,
     OFFGeometryNexus,
     record_faces_in_file,
+    record_winding_order_in_file,
     record_vertices_in_file,
 )
 from .no_shape_geometry import NoShapeGeometry
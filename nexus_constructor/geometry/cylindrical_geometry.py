@@ -1,12 +1,9 @@
-from PySide2.QtGui import QVector3D, QMatrix4x4
-
 from nexus_constructor.common_attrs import CommonAttrs
 from nexus_constructor.pixel_data import PixelMapping
 from nexus_constructor.pixel_data_to_nexus_utils import (
     get_detector_number_from_pixel_mapping,
 )
 from nexus_constructor.unit_utils import calculate_unit_conversion_factor, METRES
-from math import sin, cos, pi, acos, degrees
 import h5py
 import numpy as np
 from nexus_constructor.nexus import nexus_wrapper as nx
@@ -15,17 +12,27 @@ from nexus_constructor.nexus.validation import (
     ValidateDataset,
     validate_group,
 )
-from nexus_constructor.ui_utils import (
-    numpy_array_to_qvector3d,
-    qvector3d_to_numpy_array,
+from nexus_constructor.geometry.utils import (
+    get_an_orthogonal_unit_vector,
+    get_orthogonal_unit_vectors,
+    normalise,
+)
+from nexus_constructor.geometry.off_geometry import (
+    OFFGeometry,
+    OFFGeometryNoNexus,
+    vertices_to_array,
 )
-from nexus_constructor.geometry.utils import get_an_orthogonal_unit_vector
-from nexus_constructor.geometry.off_geometry import OFFGeometry, OFFGeometryNoNexus
 from typing import Tuple, List
 
+# Number of points around the circumference of each cylinder in its mesh, fewer give a coarser but cheaper mesh
+CYLINDER_MESH_STEPS = 20
+
+# Base centre, base edge and top centre of a cylinder of radius and height 1, centred on the origin along the z axis
+UNIT_CYLINDER_POINTS = np.array([[0.0, 0.0, -0.5], [1.0, 0.0, -0.5], [0.0, 0.0, 0.5]])
+
 
 def calculate_vertices(
-    axis_direction: QVector3D, height: float, radius: float
+    axis_direction: np.ndarray, height: float, radius: float
 ) -> np.ndarray:
     """
     Given cylinder axis, height and radius, calculate the base centre, base edge and top centre vertices
@@ -34,19 +41,124 @@ def calculate_vertices(
     :param radius: radius of the cylinder
     :return: base centre, base edge and top centre vertices as a numpy array
     """
-    axis_direction = axis_direction.normalized()
+    axis_direction = normalise(axis_direction)
     top_centre = axis_direction * height / 2.0
     base_centre = axis_direction * height / -2.0
-    radial_direction = get_an_orthogonal_unit_vector(axis_direction).normalized()
+    radial_direction = get_an_orthogonal_unit_vector(axis_direction)
     base_edge = base_centre + (radius * radial_direction)
-    vertices = np.vstack(
+    return np.vstack((base_centre, base_edge, top_centre))
+
+
+def unit_cylinder_mesh_arrays(
+    steps: int = CYLINDER_MESH_STEPS,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build a mesh of the cylinder described by UNIT_CYLINDER_POINTS. It has a circle of steps vertices at each end,
+    starting at the base edge, joined by rectangular faces, and a face covering each end.
+    :param steps: Number of vertices around each end of the cylinder
+    :return: (2*steps,3) vertices, winding_order and winding_order_indices in the NXoff_geometry layout
+    """
+    angles = 2 * np.pi * np.arange(steps) / steps
+    circle = np.column_stack((np.cos(angles), -np.sin(angles)))
+    vertices = np.concatenate(
         (
-            qvector3d_to_numpy_array(base_centre),
-            qvector3d_to_numpy_array(base_edge),
-            qvector3d_to_numpy_array(top_centre),
+            np.column_stack((circle, np.full(steps, -0.5))),
+            np.column_stack((circle, np.full(steps, 0.5))),
         )
     )
-    return vertices
+
+    # The bottom circle is vertices 0 to steps-1 and the top circle steps to 2*steps-1
+    bottom = np.arange(steps)
+    next_bottom = (bottom + 1) % steps
+    rectangles = np.column_stack(
+        (bottom, bottom + steps, next_bottom + steps, next_bottom)
+    ).flatten()
+    # The second end is listed in reverse to preserve the winding order
+    ends = np.concatenate((bottom, np.arange(2 * steps - 1, steps - 1, -1)))
+    winding_order = np.concatenate((rectangles, ends))
+    winding_order_indices = np.concatenate(
+        (np.arange(steps) * 4, [4 * steps, 5 * steps])
+    )
+    return vertices, winding_order, winding_order_indices
+
+
+def unit_cylinder_off_geometry(steps: int = CYLINDER_MESH_STEPS) -> OFFGeometry:
+    """
+    :param steps: Number of vertices around each end of the cylinder
+    :return: Mesh of the unit cylinder, to be drawn with the transforms from CylindricalGeometry.instance_transforms
+    """
+    return OFFGeometryNoNexus.from_arrays(*unit_cylinder_mesh_arrays(steps))
+
+
+def cylinder_instance_transforms(
+    cylinder_points: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the transform of the unit cylinder, UNIT_CYLINDER_POINTS, onto each cylinder, so that a mesh of the unit
+    cylinder can be drawn once per cylinder instead of building a mesh of every cylinder.
+    A vertex v of the unit cylinder is at centres[i] + matrices[i] @ v in the ith cylinder.
+    :param cylinder_points: (N,3,3) array of the base centre, base edge and top centre of each cylinder
+    :return: (N,3) array of the centre of each cylinder and (N,3,3) array of the matrix which rotates and scales the
+    unit cylinder to match it
+    """
+    base_centres = cylinder_points[:, 0]
+    base_edges = cylinder_points[:, 1]
+    top_centres = cylinder_points[:, 2]
+
+    axes = top_centres - base_centres
+    heights = np.linalg.norm(axes, axis=1, keepdims=True)
+    # Cylinders with no height point along z, as in CylindricalGeometry.axis_direction
+    axis_directions = np.divide(
+        axes, heights, out=np.tile([0.0, 0.0, 1.0], (len(axes), 1)), where=heights > 0
+    )
+    radial = base_edges - base_centres
+    radii = np.linalg.norm(radial, axis=1, keepdims=True)
+    # The unit cylinder's base edge maps onto the base edge point, kept at right angles to the axis
+    radial -= np.sum(radial * axis_directions, axis=1, keepdims=True) * axis_directions
+    radial_lengths = np.linalg.norm(radial, axis=1, keepdims=True)
+    radial_directions = np.where(
+        radial_lengths > 1e-12 * np.maximum(radii, 1.0),
+        radial / np.where(radial_lengths > 0, radial_lengths, 1.0),
+        get_orthogonal_unit_vectors(axis_directions),
+    )
+    tangent_directions = np.cross(axis_directions, radial_directions)
+
+    # The columns are the directions of the unit cylinder's x, y and z axes in each cylinder
+    matrices = np.stack(
+        (radial_directions * radii, tangent_directions * radii, axes,), axis=2,
+    )
+    return (base_centres + top_centres) / 2, matrices
+
+
+def cylinder_mesh_arrays(
+    cylinder_points: np.ndarray, steps: int = CYLINDER_MESH_STEPS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build a mesh of many cylinders at once, by placing a copy of the unit cylinder mesh on each cylinder
+    :param cylinder_points: (N,3,3) array of the base centre, base edge and top centre of each cylinder
+    :param steps: Number of vertices around each end of each cylinder
+    :return: (N*2*steps,3) vertices, winding_order and winding_order_indices in the NXoff_geometry layout
+    """
+    (
+        unit_vertices,
+        cylinder_winding_order,
+        cylinder_face_starts,
+    ) = unit_cylinder_mesh_arrays(steps)
+    centres, matrices = cylinder_instance_transforms(cylinder_points)
+    vertices = (
+        centres[:, np.newaxis] + np.einsum("nij,vj->nvi", matrices, unit_vertices)
+    ).reshape(-1, 3)
+
+    cylinder_count = len(cylinder_points)
+    winding_order = (
+        cylinder_winding_order[np.newaxis, :]
+        + (np.arange(cylinder_count) * len(unit_vertices))[:, np.newaxis]
+    ).flatten()
+    winding_order_indices = (
+        cylinder_face_starts[np.newaxis, :]
+        + (np.arange(cylinder_count) * len(cylinder_winding_order))[:, np.newaxis]
+    ).flatten()
+    return vertices, winding_order, winding_order_indices
 
 
 class CylindricalGeometry:
@@ -54,7 +166,9 @@ class CylindricalGeometry:
     Describes the shape of a cylinder in 3D space. The cylinder's centre is the origin of the local coordinate system.
     This wrapper does not have setters, delete cylinder and create a new one if the cylinder needs to change.
 
-    Note, the NXcylindrical_geometry group can describe multiple cylinders, but here we are using it only for one.
+    Note, the NXcylindrical_geometry group can describe multiple cylinders, for example one per tube of a detector
+    bank. The mesh and instance transforms include all of them, heights, radii and axis_directions give the values of
+    each, and height, radius and axis_direction are those of the first.
     """
 
     geometry_str = "Cylinder"
@@ -109,105 +223,130 @@ class CylindricalGeometry:
     def height(self) -> float:
         base_centre, _, top_centre = self._get_cylinder_vertices()
         cylinder_axis = top_centre - base_centre
-        return cylinder_axis.length()
+        return np.linalg.norm(cylinder_axis)
 
-    def _get_cylinder_vertices(self) -> Tuple[QVector3D, QVector3D, QVector3D]:
+    def _get_cylinder_vertices(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Get the three points defining the cylinder
+        Get the three points defining the first cylinder
         We define "base" as the end of the cylinder in the -ve axis direction
         :return: base centre point, base edge point, top centre point
         """
-        # flatten cylinders in case there are multiple cylinders defined, we'll take the first three elements,
-        # so effectively any cylinder after the first one is ignored
-        cylinders = self.cylinders.flatten()
-        vertices = self.file.get_field_value(self.group, CommonAttrs.VERTICES)
-        return tuple(
-            numpy_array_to_qvector3d(vertices[cylinders[i], :]) for i in range(3)
-        )
+        return tuple(self.cylinder_points[0].astype(float))
 
     @property
     def cylinders(self) -> np.ndarray:
         return self.file.get_field_value(self.group, "cylinders")
 
+    @property
+    def cylinder_points(self) -> np.ndarray:
+        """
+        Reads the vertices and cylinders datasets once each
+        :return: (N,3,3) array of the base centre, base edge and top centre of every cylinder, in the file's units
+        """
+        cylinders = np.asarray(self.cylinders).reshape(-1, 3)
+        vertices = np.asarray(
+            self.file.get_field_value(self.group, CommonAttrs.VERTICES)
+        )
+        return vertices[cylinders]
+
+    @property
+    def cylinder_count(self) -> int:
+        return len(np.asarray(self.cylinders).reshape(-1, 3))
+
+    @property
+    def heights(self) -> np.ndarray:
+        """
+        :return: Height of every cylinder, in the file's units
+        """
+        points = self.cylinder_points
+        return np.linalg.norm(points[:, 2] - points[:, 0], axis=1)
+
+    @property
+    def radii(self) -> np.ndarray:
+        """
+        :return: Radius of every cylinder, in the file's units
+        """
+        points = self.cylinder_points
+        return np.linalg.norm(points[:, 1] - points[:, 0], axis=1)
+
+    @property
+    def axis_directions(self) -> np.ndarray:
+        """
+        :return: (N,3) array of the unit axis direction of every cylinder, (0,0,1) for those with no height
+        """
+        _, matrices = cylinder_instance_transforms(self.cylinder_points)
+        axes = matrices[:, :, 2]
+        lengths = np.linalg.norm(axes, axis=1, keepdims=True)
+        return np.divide(
+            axes,
+            lengths,
+            out=np.tile([0.0, 0.0, 1.0], (len(axes), 1)),
+            where=lengths > 0,
+        )
+
+    def cylinders_of_detector(self, detector_id: int) -> np.ndarray:
+        """
+        The detector_number dataset gives the detector each cylinder belongs to
+        :param detector_id: A value from detector_number
+        :return: Indices of the cylinders of the detector
+        """
+        detector_number = np.asarray(self.detector_number).reshape(-1)
+        return np.flatnonzero(detector_number == detector_id)
+
+    def instance_transforms(
+        self, positions: np.ndarray = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find where to draw the unit cylinder mesh, from unit_cylinder_off_geometry, to draw every cylinder, in metres
+        :param positions: (P,3) array, the cylinders are repeated at each of these positions, for example at each pixel
+        :return: (M,3) array of the offset and (M,3,3) array of the matrix of each copy of the unit cylinder, every
+        cylinder at the first position, followed by every cylinder at the second and so on
+        """
+        centres, matrices = cylinder_instance_transforms(self.cylinder_points)
+        unit_conversion_factor = calculate_unit_conversion_factor(self.units, METRES)
+        centres = centres * unit_conversion_factor
+        matrices = matrices * unit_conversion_factor
+        if positions is None:
+            return centres, matrices
+        offsets = vertices_to_array(positions)
+        return (
+            (offsets[:, np.newaxis] + centres[np.newaxis, :]).reshape(-1, 3),
+            np.tile(matrices, (len(offsets), 1, 1)),
+        )
+
     @property
     def radius(self) -> float:
         base_centre, base_edge, _ = self._get_cylinder_vertices()
         cylinder_radius = base_edge - base_centre
-        return cylinder_radius.length()
+        return np.linalg.norm(cylinder_radius)
 
     @property
-    def axis_direction(self) -> QVector3D:
+    def axis_direction(self) -> np.ndarray:
         """
         Finds the axis direction using the base centre and top centre if the height is non-zero, otherwise it just
         returns a default value of (0,0,1).
         :return: The axis direction vector.
         """
-        if self.height != 0:
-            base_centre, _, top_centre = self._get_cylinder_vertices()
-            cylinder_axis = top_centre - base_centre
-            return cylinder_axis.normalized()
+        base_centre, _, top_centre = self._get_cylinder_vertices()
+        cylinder_axis = top_centre - base_centre
+        if np.linalg.norm(cylinder_axis) != 0:
+            return normalise(cylinder_axis)
 
-        return QVector3D(0, 0, 1)
+        return np.array([0.0, 0.0, 1.0])
 
     @property
-    def off_geometry(self, steps: int = 20) -> OFFGeometry:
-        unit_conversion_factor = calculate_unit_conversion_factor(self.units, METRES)
-
-        # A list of vertices describing the circle at the bottom of the cylinder
-        bottom_circle = [
-            QVector3D(sin(2 * pi * i / steps), cos(2 * pi * i / steps), 0) * self.radius
-            for i in range(steps)
-        ]
-
-        # The top of the cylinder is the bottom shifted upwards
-        top_circle = [vector + QVector3D(0, 0, self.height) for vector in bottom_circle]
-
-        # The true cylinder are all vertices from the unit cylinder multiplied by the conversion factor
-        vertices = [
-            vector * unit_conversion_factor for vector in bottom_circle + top_circle
-        ]
-
-        # rotate each vertex to produce the desired cylinder mesh
-        rotate_matrix = self._rotation_matrix()
-        vertices = [vector * rotate_matrix for vector in vertices]
-
-        def vertex_above(vertex):
-            """
-            Returns the index of the vertex above this one in the cylinder.
-            """
-            return vertex + steps
-
-        def next_vertex(vertex):
-            """
-            Returns the next vertex around in the top or bottom circle of the cylinder.
-            """
-            return (vertex + 1) % steps
-
-        # Rectangular faces joining the top and bottom
-        rectangle_faces = [
-            [i, vertex_above(i), vertex_above(next_vertex(i)), next_vertex(i)]
-            for i in range(steps)
-        ]
-
-        # Step sided shapes describing the top and bottom
-        # The bottom uses steps of -1 to preserve winding order
-        top_bottom_faces = [
-            [i for i in range(steps)],
-            [i for i in range((2 * steps) - 1, steps - 1, -1)],
-        ]
-
-        return OFFGeometryNoNexus(
-            vertices=vertices, faces=rectangle_faces + top_bottom_faces
-        )
+    def off_geometry(self) -> OFFGeometry:
+        return self.to_off_geometry()
 
-    def _rotation_matrix(self) -> QMatrix4x4:
+    def to_off_geometry(self, steps: int = CYLINDER_MESH_STEPS) -> OFFGeometry:
         """
-        :return: A QMatrix4x4 describing the rotation from the Z axis to the cylinder's axis
+        Build a mesh of every cylinder in the group, in metres
+        :param steps: Number of vertices around each end of each cylinder, fewer give a coarser but cheaper mesh
         """
-        default_axis = QVector3D(0, 0, 1)
-        desired_axis = self.axis_direction.normalized()
-        rotate_axis = QVector3D.crossProduct(desired_axis, default_axis)
-        rotate_radians = acos(QVector3D.dotProduct(desired_axis, default_axis))
-        rotate_matrix = QMatrix4x4()
-        rotate_matrix.rotate(degrees(rotate_radians), rotate_axis)
-        return rotate_matrix
+        vertices, winding_order, winding_order_indices = cylinder_mesh_arrays(
+            self.cylinder_points, steps
+        )
+        unit_conversion_factor = calculate_unit_conversion_factor(self.units, METRES)
+        return OFFGeometryNoNexus.from_arrays(
+            vertices * unit_conversion_factor, winding_order, winding_order_indices
+        )
@@ -11,7 +11,7 @@ from nexus_constructor.unit_utils import (
     units_are_expected_type,
     units_have_magnitude_of_one,
 )
-from nexus_constructor.validators import DATASET_TYPE
+from nexus_constructor.dataset_types import DATASET_TYPE
 
 SLIT_EDGES_NAME = "slit_edges"
 SLITS_NAME = "slits"
@@ -1,15 +1,43 @@
 import logging
+import os
+import re
+from collections import OrderedDict
+from io import StringIO, TextIOBase
+from typing import Callable, Iterator, Tuple, Union, IO
+
+import numpy as np
 
 from nexus_constructor.geometry import OFFGeometry, OFFGeometryNoNexus
-from nexusutils.readwriteoff import parse_off_file
 from nexus_constructor.unit_utils import calculate_unit_conversion_factor, METRES
-from stl import mesh
-from PySide2.QtGui import QVector3D
-from io import StringIO
+
+# Number of bytes or characters to read from a mesh file at a time
+CHUNK_SIZE = 16 * 1024 * 1024
+
+STL_HEADER_SIZE = 80
+STL_COUNT_SIZE = 4
+# Layout of each triangle in a binary STL file
+STL_TRIANGLE_DTYPE = np.dtype(
+    [
+        ("normal", "<f4", (3,)),
+        ("corners", "<f4", (3, 3)),
+        ("attribute_byte_count", "<u2"),
+    ]
+)
+STL_VERTEX_PATTERN = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+
+MeshArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+MESH_FILE_EXTENSIONS = (".off", ".stl")
+# Meshes can be very large, so only keep a few
+MESH_FILE_CACHE_SIZE = 4
+
+
+def _extension(filename: str) -> str:
+    return os.path.splitext(filename)[1].lower()
 
 
 def load_geometry(
-    filename: str, units: str, geometry: OFFGeometry = OFFGeometryNoNexus()
+    filename: str, units: str, geometry: OFFGeometry = None
 ) -> OFFGeometry:
     """
     Loads geometry from a file into an OFFGeometry instance
@@ -22,100 +50,326 @@ def load_geometry(
     :return: An OFFGeometry instance containing that file's geometry, or an empty instance if filename's extension is
     unsupported.
     """
-
-    extension = filename[filename.rfind(".") :].lower()
-
-    try:
-        with open(filename) as file:
-            return load_geometry_from_file_object(file, extension, units, geometry)
-    except UnicodeDecodeError:
-        # Try again in case the file is in binary. At least one of these should work when a user selects a file because
-        # GeometryFileValidator inspects the file beforehand to check that it's valid.
-        with open(filename, "rb") as file:
-            return load_geometry_from_file_object(file, extension, units, geometry)
+    if _extension(filename) not in MESH_FILE_EXTENSIONS:
+        return load_geometry_from_file_object(
+            StringIO(), _extension(filename), units, geometry
+        )
+    return _set_geometry_arrays(
+        mesh_file_cache.get(filename),
+        calculate_unit_conversion_factor(units, METRES),
+        geometry,
+    )
 
 
 def load_geometry_from_file_object(
-    file: StringIO,
+    file: Union[StringIO, IO[bytes]],
     extension: str,
     units: str,
-    geometry: OFFGeometry = OFFGeometryNoNexus(),
+    geometry: OFFGeometry = None,
 ) -> OFFGeometry:
     """
     Loads geometry from a file object into an OFFGeometry instance
 
     Supported file types are OFF and STL.
 
-    :param file: The file object to load the geometry from.
+    :param file: The file object to load the geometry from, opened in text or binary mode.
     :param units: A unit of length in the form of a string. Used to determine the multiplication factor.
     :param geometry: The optional OFFGeometry to load the geometry data into. If not provided, a new instance will be
     returned.
     :return: An OFFGeometry instance containing that file's geometry, or an empty instance if filename's extension is
     unsupported.
     """
-
     mult_factor = calculate_unit_conversion_factor(units, METRES)
 
-    if extension == ".off":
-        _load_off_geometry(file, mult_factor, geometry)
-    elif extension == ".stl":
-        _load_stl_geometry(file, mult_factor, geometry)
+    if extension in MESH_FILE_EXTENSIONS:
+        mesh_arrays = parse_mesh_file_object(file, extension)
     else:
-        geometry.faces = []
-        geometry.vertices = []
+        mesh_arrays = (
+            np.empty((0, 3)),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+        )
         logging.error("geometry file extension not supported")
 
-    return geometry
+    return _set_geometry_arrays(mesh_arrays, mult_factor, geometry)
 
 
-def _load_off_geometry(
-    file: StringIO, mult_factor: float, geometry: OFFGeometry = OFFGeometryNoNexus()
+def _set_geometry_arrays(
+    mesh_arrays: MeshArrays, mult_factor: float, geometry: OFFGeometry = None
 ) -> OFFGeometry:
+    if geometry is None:
+        geometry = OFFGeometryNoNexus()
+    vertices, winding_order, winding_order_indices = mesh_arrays
+    geometry.set_arrays(vertices * mult_factor, winding_order, winding_order_indices)
+    return geometry
+
+
+def parse_mesh_file_object(
+    file: Union[StringIO, IO[bytes]], extension: str
+) -> MeshArrays:
+    """
+    Parse an OFF or STL file into arrays in the NXoff_geometry layout, in the units used in the file.
+    :param file: The file object to read, opened in text or binary mode
+    :param extension: The extension of the file, which gives its format
+    :return: (V,3) vertices, winding_order and winding_order_indices
+    :raises ValueError: if the file is not valid
     """
-    Loads geometry from an OFF file into an OFFGeometry instance.
+    if extension == ".off":
+        mesh_arrays = parse_off_arrays(file)
+        logging.info("OFF loaded")
+    elif extension == ".stl":
+        mesh_arrays = triangles_to_mesh_arrays(parse_stl_triangles(file))
+        logging.info("STL loaded")
+    else:
+        raise ValueError(f"Geometry file extension {extension} is not supported")
+    return mesh_arrays
 
-    :param file: The file containing an OFF geometry.
-    :param mult_factor: The multiplication factor for unit conversion.
-    :param geometry: The optional OFFGeometry to load the OFF data into. If not provided, a new instance will be
-    returned.
-    :return: An OFFGeometry instance containing that file's geometry.
+
+class MeshFileCache:
+    """
+    Keeps the most recently parsed mesh files, so a file which is validated, counted and then loaded while a
+    component is being added is only parsed once.
+    Entries are keyed by the file's path, modification time and size, so a file which is edited is parsed again.
     """
-    vertices, faces = parse_off_file(file)
 
-    geometry.vertices = [
-        QVector3D(x * mult_factor, y * mult_factor, z * mult_factor)
-        for x, y, z in (vertex for vertex in vertices)
-    ]
-    geometry.faces = [face.tolist()[1:] for face in faces]
-    logging.info("OFF loaded")
-    return geometry
+    def __init__(self, max_entries: int = MESH_FILE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int, int], MeshArrays]" = OrderedDict()
 
+    def get(self, filename: str, open_file: Callable = open) -> MeshArrays:
+        """
+        Get the parsed contents of the OFF or STL file, parsing it if it has not been seen or has changed.
+        The arrays are shared between callers so are read-only.
+        :param filename: Path of the file
+        :param open_file: Function to open the file with, taking the filename and mode
+        :raises ValueError: if the file is not valid
+        """
+        try:
+            status = os.stat(filename)
+        except OSError:
+            # Nothing to key the entry on, but open_file may still be able to provide the contents
+            return self._parse(filename, open_file)
+        key = (os.path.abspath(filename), status.st_mtime_ns, status.st_size)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
 
-def _load_stl_geometry(
-    file: StringIO, mult_factor: float, geometry: OFFGeometry = OFFGeometryNoNexus()
-) -> OFFGeometry:
+        mesh_arrays = self._parse(filename, open_file)
+        for array in mesh_arrays:
+            array.setflags(write=False)
+        self._entries[key] = mesh_arrays
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return mesh_arrays
+
+    def clear(self):
+        self._entries.clear()
+
+    @staticmethod
+    def _parse(filename: str, open_file: Callable) -> MeshArrays:
+        # Both parsers work on bytes, so that binary and ASCII files can be read the same way
+        with open_file(filename, "rb") as file:
+            return parse_mesh_file_object(file, _extension(filename))
+
+
+def _read_chunks(file: Union[StringIO, IO[bytes]]) -> Iterator[bytes]:
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk.encode("utf8") if isinstance(chunk, str) else chunk
+
+
+def _read_lines(file: Union[StringIO, IO[bytes]]) -> Iterator[bytes]:
     """
-    Loads geometry from an STL file into an OFFGeometry instance.
+    Read the file in chunks, yielding each line with any comment removed, and skipping empty lines
+    """
+    remainder = b""
+    for chunk in _read_chunks(file):
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            line = line.split(b"#", 1)[0].strip()
+            if line:
+                yield line
+    remainder = remainder.split(b"#", 1)[0].strip()
+    if remainder:
+        yield remainder
 
-    :param file: The file containing an STL geometry.
-    :param mult_factor: The multiplication factor for unit conversion.
-    :param geometry: The optional OFFGeometry to load the STL data into. If not provided, a new instance will be
-    returned.
-    :return: An OFFGeometry instance containing that file's geometry.
-    """
-    mesh_data = mesh.Mesh.from_file("", fh=file, calculate_normals=False)
-    # numpy-stl loads numbers as python decimals, not floats, which aren't valid in json
-    geometry.vertices = [
-        QVector3D(
-            float(corner[0]) * mult_factor,
-            float(corner[1]) * mult_factor,
-            float(corner[2]) * mult_factor,
+
+def _take_lines(lines: Iterator[bytes], count: int) -> list:
+    taken = [line for _, line in zip(range(count), lines)]
+    if len(taken) != count:
+        raise ValueError(f"Expected {count} lines in OFF file, found {len(taken)}")
+    return taken
+
+
+def parse_off_arrays(file: Union[StringIO, IO[bytes]]) -> MeshArrays:
+    """
+    Parse an OFF file into arrays in the NXoff_geometry layout.
+    Colours after the vertex or face values are ignored.
+    :param file: The file object to read, opened in text or binary mode
+    :return: (V,3) vertices, winding_order and winding_order_indices
+    :raises ValueError: if the file is not a valid OFF file
+    """
+    lines = _read_lines(file)
+    header = next(lines, b"").split()
+    if not header or header[0] != b"OFF":
+        raise ValueError("OFF file must start with OFF")
+    # The counts are allowed to follow OFF on the same line
+    counts = header[1:] or next(lines, b"").split()
+    if len(counts) < 2:
+        raise ValueError("OFF file is missing the vertex and face counts")
+    number_of_vertices, number_of_faces = int(counts[0]), int(counts[1])
+
+    vertex_lines = _take_lines(lines, number_of_vertices)
+    vertices = np.array(b" ".join(vertex_lines).split(), dtype=float)
+    if len(vertices) == 3 * number_of_vertices:
+        vertices = vertices.reshape(-1, 3)
+    else:
+        vertices = np.array(
+            [line.split()[:3] for line in vertex_lines], dtype=float
+        ).reshape(-1, 3)
+
+    face_lines = _take_lines(lines, number_of_faces)
+    values_per_line = np.fromiter(
+        (len(line.split()) for line in face_lines),
+        dtype=np.int64,
+        count=len(face_lines),
+    )
+    values = np.array(b" ".join(face_lines).split(), dtype=float)
+    line_starts = np.cumsum(values_per_line) - values_per_line
+    face_sizes = values[line_starts].astype(np.int64) if len(values) else line_starts
+    if np.any(face_sizes > values_per_line - 1):
+        raise ValueError("OFF file contains a face with missing vertex indices")
+
+    winding_order_indices = np.cumsum(face_sizes) - face_sizes
+    # Position in values of each vertex index, skipping the count at the start of each line
+    face_of_point = np.repeat(np.arange(len(face_sizes)), face_sizes)
+    point_in_face = np.arange(face_sizes.sum()) - winding_order_indices[face_of_point]
+    winding_order = values[line_starts[face_of_point] + 1 + point_in_face].astype(
+        np.int64
+    )
+    if len(winding_order) and (
+        winding_order.min() < 0 or winding_order.max() >= number_of_vertices
+    ):
+        raise ValueError("OFF file contains a face with an invalid vertex index")
+    return vertices, winding_order, winding_order_indices
+
+
+def _stl_triangle_count(first_chunk: bytes, file_size: int) -> int:
+    """
+    :return: The number of triangles if the file is a binary STL, otherwise -1
+    """
+    header_size = STL_HEADER_SIZE + STL_COUNT_SIZE
+    if len(first_chunk) < header_size:
+        return -1
+    count = int(
+        np.frombuffer(first_chunk, dtype="<u4", count=1, offset=STL_HEADER_SIZE)[0]
+    )
+    # Binary files can also start with "solid", so check the size matches the number of triangles
+    if file_size == header_size + count * STL_TRIANGLE_DTYPE.itemsize:
+        return count
+    return -1
+
+
+def _file_size(file: Union[StringIO, IO[bytes]]) -> int:
+    position = file.tell()
+    size = file.seek(0, 2)
+    file.seek(position)
+    return size
+
+
+def parse_stl_triangles(file: Union[StringIO, IO[bytes]]) -> np.ndarray:
+    """
+    Parse a binary or ASCII STL file.
+    :param file: The file object to read, opened in text or binary mode
+    :return: (T,3,3) array of the corners of each triangle
+    """
+    if not isinstance(file, TextIOBase):
+        file_size = _file_size(file)
+        first_chunk = file.read(STL_HEADER_SIZE + STL_COUNT_SIZE)
+        count = _stl_triangle_count(first_chunk, file_size)
+        if count != -1:
+            return _parse_binary_stl_triangles(file, count)
+        file.seek(0)
+    return _parse_ascii_stl_triangles(file)
+
+
+def _parse_binary_stl_triangles(file: IO[bytes], count: int) -> np.ndarray:
+    triangles = np.empty((count, 3, 3), dtype=np.float32)
+    chunk_triangles = max(CHUNK_SIZE // STL_TRIANGLE_DTYPE.itemsize, 1)
+    for start in range(0, count, chunk_triangles):
+        chunk_count = min(chunk_triangles, count - start)
+        end = start + chunk_count
+        data = file.read(chunk_count * STL_TRIANGLE_DTYPE.itemsize)
+        # View the bytes as triangle records without copying, then copy only the corners out
+        triangles[start:end] = np.frombuffer(
+            data, dtype=STL_TRIANGLE_DTYPE, count=chunk_count
+        )["corners"]
+    return triangles
+
+
+def _parse_ascii_stl_triangles(file: Union[StringIO, IO[bytes]]) -> np.ndarray:
+    coordinates = []
+    loop_count = 0
+    facet_count = 0
+    remainder = b""
+    started = False
+    for chunk in _read_chunks(file):
+        chunk = remainder + chunk
+        if not started:
+            if not chunk.lstrip().startswith(b"solid"):
+                raise ValueError("ASCII STL file must start with solid")
+            started = True
+        # Only search complete lines, a vertex could be split across the end of the chunk
+        end = chunk.rfind(b"\n") + 1
+        remainder = chunk[end:]
+        coordinates.extend(STL_VERTEX_PATTERN.findall(chunk, 0, end))
+        loop_count += chunk.count(b"endloop", 0, end)
+        facet_count += chunk.count(b"endfacet", 0, end)
+    coordinates.extend(STL_VERTEX_PATTERN.findall(remainder))
+    loop_count += remainder.count(b"endloop")
+    facet_count += remainder.count(b"endfacet")
+    if not started:
+        raise ValueError("STL file is empty")
+    if not len(coordinates) == 3 * loop_count == 3 * facet_count:
+        raise ValueError(
+            "STL file contains a facet which is not a loop of three vertices"
         )
-        for triangle in mesh_data.vectors
-        for corner in triangle
-    ]
-    geometry.faces = [
-        [i * 3, (i * 3) + 1, (i * 3) + 2] for i in range(len(mesh_data.vectors))
-    ]
-    logging.info("STL loaded")
-    return geometry
+    return np.array(coordinates, dtype=float).reshape(-1, 3, 3)
+
+
+def triangles_to_mesh_arrays(triangles: np.ndarray) -> MeshArrays:
+    """
+    Convert the corners of each triangle into arrays in the NXoff_geometry layout, with each distinct corner stored
+    once rather than once for each triangle using it.
+    :param triangles: (T,3,3) array of the corners of each triangle
+    :return: (V,3) vertices, winding_order and winding_order_indices
+    """
+    # Adding zero turns -0.0 into 0.0, so they are treated as the same vertex
+    corners = np.asarray(triangles).reshape(-1, 3) + 0.0
+    if len(corners) == 0:
+        return (
+            np.empty((0, 3)),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+        )
+    # Sort the corners so that identical ones are next to each other, lexsort is much faster than np.unique with axis
+    order = np.lexsort(corners.T[::-1])
+    sorted_corners = corners[order]
+    is_first_of_vertex = np.empty(len(corners), dtype=bool)
+    is_first_of_vertex[0] = True
+    np.any(
+        sorted_corners[1:] != sorted_corners[:-1], axis=1, out=is_first_of_vertex[1:]
+    )
+    winding_order = np.empty(len(corners), dtype=np.int64)
+    winding_order[order] = np.cumsum(is_first_of_vertex) - 1
+    return (
+        sorted_corners[is_first_of_vertex].astype(float),
+        winding_order,
+        np.arange(0, len(corners), 3, dtype=np.int64),
+    )
+
+
+mesh_file_cache = MeshFileCache()
@@ -1,19 +1,23 @@
 from nexus_constructor.geometry.off_geometry import OFFGeometry, OFFGeometryNoNexus
-from PySide2.QtGui import QVector3D
+import numpy as np
 
 __half_side_length = 0.05
 
 OFFCube = OFFGeometryNoNexus(
-    vertices=[
-        QVector3D(-__half_side_length, -__half_side_length, __half_side_length),
-        QVector3D(__half_side_length, -__half_side_length, __half_side_length),
-        QVector3D(-__half_side_length, __half_side_length, __half_side_length),
-        QVector3D(__half_side_length, __half_side_length, __half_side_length),
-        QVector3D(-__half_side_length, __half_side_length, -__half_side_length),
-        QVector3D(__half_side_length, __half_side_length, -__half_side_length),
-        QVector3D(-__half_side_length, -__half_side_length, -__half_side_length),
-        QVector3D(__half_side_length, -__half_side_length, -__half_side_length),
-    ],
+    vertices=__half_side_length
+    * np.array(
+        [
+            [-1, -1, 1],
+            [1, -1, 1],
+            [-1, 1, 1],
+            [1, 1, 1],
+            [-1, 1, -1],
+            [1, 1, -1],
+            [-1, -1, -1],
+            [1, -1, -1],
+        ],
+        dtype=float,
+    ),
     faces=[
         [0, 1, 3, 2],
         [2, 3, 5, 4],
@@ -1,5 +1,4 @@
 from typing import List, Tuple
-from PySide2.QtGui import QVector3D
 from abc import ABC, abstractmethod
 
 from nexus_constructor.common_attrs import CommonAttrs
@@ -15,32 +14,141 @@ from nexus_constructor.pixel_data import PixelMapping
 from nexus_constructor.pixel_data_to_nexus_utils import (
     get_detector_faces_from_pixel_mapping,
 )
-from nexus_constructor.ui_utils import (
-    numpy_array_to_qvector3d,
-    qvector3d_to_numpy_array,
-)
 import numpy as np
 
 
+def vertices_to_array(vertices) -> np.ndarray:
+    """
+    :param vertices: List of vectors, or anything array-like with 3 values per vertex
+    :return: (V,3) float array of the vertices
+    """
+    return np.asarray(vertices, dtype=float).reshape(-1, 3)
+
+
+def faces_to_winding_order(faces: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a list of faces into the flat arrays used by NXoff_geometry
+    :param faces: List of faces, each a list of vertex indices
+    :return: winding_order, the vertex indices of all faces one after another, and
+    winding_order_indices, the index in winding_order where each face starts
+    """
+    face_sizes = np.fromiter((len(face) for face in faces), dtype=np.int64)
+    winding_order_indices = np.zeros(len(face_sizes), dtype=np.int64)
+    np.cumsum(face_sizes[:-1], out=winding_order_indices[1:])
+    winding_order = np.fromiter(
+        (point for face in faces for point in face),
+        dtype=np.int64,
+        count=face_sizes.sum(),
+    )
+    return winding_order, winding_order_indices
+
+
+def triangulate_faces(winding_order: np.ndarray, face_starts: np.ndarray) -> np.ndarray:
+    """
+    Split each face into a fan of triangles which all share the first vertex of the face
+    :param winding_order: Vertex indices of all faces one after another
+    :param face_starts: Index in winding_order where each face starts
+    :return: (T,3) array of the vertex indices of each triangle
+    """
+    winding_order = np.asarray(winding_order, dtype=np.int64)
+    face_starts = np.asarray(face_starts, dtype=np.int64)
+    face_sizes = np.diff(np.append(face_starts, len(winding_order)))
+    triangles_per_face = np.maximum(face_sizes - 2, 0)
+    first_triangle_of_face = np.cumsum(triangles_per_face) - triangles_per_face
+
+    face_of_triangle = np.repeat(np.arange(len(face_starts)), triangles_per_face)
+    triangle_in_face = (
+        np.arange(triangles_per_face.sum()) - first_triangle_of_face[face_of_triangle]
+    )
+    start = face_starts[face_of_triangle]
+    return np.stack(
+        (
+            winding_order[start],
+            winding_order[start + triangle_in_face + 1],
+            winding_order[start + triangle_in_face + 2],
+        ),
+        axis=1,
+    )
+
+
+def winding_order_to_faces(
+    winding_order: np.ndarray, winding_order_indices: np.ndarray
+) -> List[List[int]]:
+    """
+    Convert the flat arrays used by NXoff_geometry into a list of the vertex indices for each face
+    """
+    if len(winding_order_indices) == 0:
+        return []
+    return [
+        face.tolist()
+        for face in np.split(
+            np.asarray(winding_order), np.asarray(winding_order_indices)[1:]
+        )
+    ]
+
+
 class OFFGeometry(ABC):
+    """
+    3D mesh description of the shape of an object, based on the OFF file format.
+    The mesh is held as arrays in the same layout as NXoff_geometry, the list properties are built from the arrays
+    when they are requested, so should be assigned to rather than modified in place.
+    """
+
     geometry_str = "OFF"
 
     @property
     @abstractmethod
+    def vertices_array(self) -> np.ndarray:
+        """
+        (V,3) array of the vertices
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def winding_order_array(self) -> np.ndarray:
+        """
+        Flattened 1D array of indices in vertices for each face
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def winding_order_indices_array(self) -> np.ndarray:
+        """
+        The start index for each face in winding_order_array
+        """
+        pass
+
+    @abstractmethod
+    def set_arrays(
+        self,
+        vertices: np.ndarray,
+        winding_order: np.ndarray,
+        winding_order_indices: np.ndarray,
+    ):
+        """
+        Replace the whole mesh with arrays in the NXoff_geometry layout
+        :param vertices: (V,3) array of vertices
+        :param winding_order: Vertex indices of all faces one after another
+        :param winding_order_indices: Index in winding_order where each face starts
+        """
+        pass
+
+    @property
     def winding_order(self) -> List[int]:
         """
         Flattened 1D list of indices in vertices for each face
         winding_order_indices gives the start index for each face in this list
         """
-        pass
+        return self.winding_order_array.tolist()
 
     @property
-    @abstractmethod
     def winding_order_indices(self) -> List[int]:
         """
         The start index for each face in winding_order
         """
-        pass
+        return self.winding_order_indices_array.tolist()
 
     @property
     @abstractmethod
@@ -49,12 +157,12 @@ class OFFGeometry(ABC):
 
     @property
     @abstractmethod
-    def vertices(self) -> List[QVector3D]:
+    def vertices(self) -> List[np.ndarray]:
         pass
 
     @vertices.setter
     @abstractmethod
-    def vertices(self, new_vertices: List[QVector3D]):
+    def vertices(self, new_vertices: List[np.ndarray]):
         pass
 
     @property
@@ -75,43 +183,83 @@ class OFFGeometryNoNexus(OFFGeometry):
     for objects which have no real shape data to be stored in the file.
     """
 
-    def __init__(self, vertices: List[QVector3D] = None, faces: List[List[int]] = None):
+    def __init__(
+        self, vertices: List[np.ndarray] = None, faces: List[List[int]] = None
+    ):
         """
-        :param vertices: list of Vector objects used as corners of polygons in the geometry
+        :param vertices: list of vectors used as corners of polygons in the geometry, or a (V,3) array
         :param faces: list of integer lists. Each sublist is a winding path around the corners of a polygon.
             Each sublist item is an index into the vertices list to identify a specific point in 3D space
         """
         super().__init__()
-        self._vertices = vertices
-        self._faces = faces
+        self.vertices = [] if vertices is None else vertices
+        self.faces = [] if faces is None else faces
+
+    @classmethod
+    def from_arrays(
+        cls,
+        vertices: np.ndarray,
+        winding_order: np.ndarray,
+        winding_order_indices: np.ndarray,
+    ) -> "OFFGeometryNoNexus":
+        """
+        Create a geometry directly from arrays in the NXoff_geometry layout, without building any lists
+        :param vertices: (V,3) array of vertices
+        :param winding_order: Vertex indices of all faces one after another
+        :param winding_order_indices: Index in winding_order where each face starts
+        """
+        geometry = cls()
+        geometry.set_arrays(vertices, winding_order, winding_order_indices)
+        return geometry
+
+    def set_arrays(
+        self,
+        vertices: np.ndarray,
+        winding_order: np.ndarray,
+        winding_order_indices: np.ndarray,
+    ):
+        self._vertices_array = vertices_to_array(vertices)
+        self._winding_order = np.asarray(winding_order, dtype=np.int64)
+        self._winding_order_indices = np.asarray(winding_order_indices, dtype=np.int64)
+        self._faces = None
 
     @property
-    def winding_order(self) -> List[int]:
-        return [point for face in self.faces for point in face]
+    def vertices_array(self) -> np.ndarray:
+        return self._vertices_array
 
     @property
-    def winding_order_indices(self) -> List[int]:
-        face_sizes = [len(face) for face in self.faces]
-        return [sum(face_sizes[0:i]) for i in range(len(face_sizes))]
+    def winding_order_array(self) -> np.ndarray:
+        return self._winding_order
+
+    @property
+    def winding_order_indices_array(self) -> np.ndarray:
+        return self._winding_order_indices
 
     @property
     def off_geometry(self) -> OFFGeometry:
         return self
 
     @property
-    def vertices(self) -> List[QVector3D]:
-        return self._vertices
+    def vertices(self) -> List[np.ndarray]:
+        return list(self._vertices_array)
 
     @vertices.setter
-    def vertices(self, new_vertices: List[QVector3D]):
-        self._vertices = new_vertices
+    def vertices(self, new_vertices: List[np.ndarray]):
+        self._vertices_array = vertices_to_array(new_vertices)
 
     @property
     def faces(self) -> List[List[int]]:
+        if self._faces is None:
+            self._faces = winding_order_to_faces(
+                self._winding_order, self._winding_order_indices
+            )
         return self._faces
 
     @faces.setter
     def faces(self, new_faces: List[List[int]]):
+        self._winding_order, self._winding_order_indices = faces_to_winding_order(
+            new_faces
+        )
         self._faces = new_faces
 
 
@@ -175,29 +323,43 @@ class OFFGeometryNexus(OFFGeometry):
         self.file.set_field_value(self.group, "detector_faces", detector_faces)
 
     @property
-    def winding_order(self) -> List[int]:
-        return [point for face in self.faces for point in face]
+    def vertices_array(self) -> np.ndarray:
+        return self.group[CommonAttrs.VERTICES][...].astype(float)
 
     @property
-    def winding_order_indices(self) -> List[int]:
-        face_sizes = [len(face) for face in self.faces]
-        return [sum(face_sizes[0:i]) for i in range(len(face_sizes))]
+    def winding_order_array(self) -> np.ndarray:
+        return self.group["winding_order"][...].astype(np.int64)
+
+    @property
+    def winding_order_indices_array(self) -> np.ndarray:
+        return self.group["faces"][...].astype(np.int64).reshape(-1)
+
+    def set_arrays(
+        self,
+        vertices: np.ndarray,
+        winding_order: np.ndarray,
+        winding_order_indices: np.ndarray,
+    ):
+        with self.file.batch_changes():
+            record_winding_order_in_file(
+                self.file, self.group, winding_order, winding_order_indices
+            )
+            record_vertices_in_file(self.file, self.group, vertices)
 
     @property
     def off_geometry(self) -> OFFGeometry:
-        return OFFGeometryNoNexus(self.vertices, self.faces)
+        return OFFGeometryNoNexus.from_arrays(
+            self.vertices_array,
+            self.winding_order_array,
+            self.winding_order_indices_array,
+        )
 
     @property
-    def vertices(self) -> List[QVector3D]:
-        vertices_from_file = self.group[CommonAttrs.VERTICES]
-        number_of_vertices = vertices_from_file.shape[0]
-        return [
-            numpy_array_to_qvector3d(vertices_from_file[vertex_number][:])
-            for vertex_number in range(number_of_vertices)
-        ]
+    def vertices(self) -> List[np.ndarray]:
+        return list(self.vertices_array)
 
     @vertices.setter
-    def vertices(self, new_vertices: List[QVector3D]):
+    def vertices(self, new_vertices: List[np.ndarray]):
         record_vertices_in_file(self.file, self.group, new_vertices)
 
     @property
@@ -207,17 +369,9 @@ class OFFGeometryNexus(OFFGeometry):
         into a list of the vertex indices for each face
         :return: List of vertex indices for each face
         """
-        winding_order_from_file = self.group["winding_order"][...]
-        # Gives starting index for each face in winding_order
-        face_starting_indices = self.group["faces"][...]
-        faces = [
-            winding_order_from_file[
-                face_start : face_starting_indices[index + 1]
-            ].tolist()
-            for index, face_start in enumerate(face_starting_indices[:-1])
-        ]
-        faces.append(winding_order_from_file[face_starting_indices[-1] :].tolist())
-        return faces
+        return winding_order_to_faces(
+            self.winding_order_array, self.winding_order_indices_array
+        )
 
     @faces.setter
     def faces(self, new_faces: List[List[int]]):
@@ -263,23 +417,42 @@ def record_faces_in_file(
     :param group: The shape group node
     :param new_faces: The new face data, list of list for each face with indices of vertices in face
     """
-    winding_order = [index for new_face in new_faces for index in new_face]
-    nexus_wrapper.set_field_value(group, "winding_order", winding_order)
-    faces_length = [0]
-    faces_length.extend([len(new_face) for new_face in new_faces[:-1]])
-    faces_start_indices = np.cumsum(faces_length)
-    nexus_wrapper.set_field_value(group, "faces", faces_start_indices)
+    record_winding_order_in_file(
+        nexus_wrapper, group, *faces_to_winding_order(new_faces)
+    )
+
+
+def record_winding_order_in_file(
+    nexus_wrapper: nx.NexusWrapper,
+    group: h5py.Group,
+    winding_order: np.ndarray,
+    winding_order_indices: np.ndarray,
+):
+    """
+    Record face data in file, already in the layout of the NXoff_geometry datasets
+    :param nexus_wrapper: Wrapper for the file the data will be stored in
+    :param group: The shape group node
+    :param winding_order: Vertex indices of all faces one after another
+    :param winding_order_indices: Index in winding_order where each face starts
+    """
+    nexus_wrapper.set_field_value(
+        group, "winding_order", np.asarray(winding_order, dtype=np.int64)
+    )
+    nexus_wrapper.set_field_value(
+        group, "faces", np.asarray(winding_order_indices, dtype=np.int64)
+    )
 
 
 def record_vertices_in_file(
-    nexus_wrapper: nx.NexusWrapper, group: h5py.Group, new_vertices: List[QVector3D]
+    nexus_wrapper: nx.NexusWrapper, group: h5py.Group, new_vertices: List[np.ndarray]
 ):
     """
     Record vertex data in file
     :param nexus_wrapper: Wrapper for the file the data will be stored in
     :param group: The shape group node
-    :param new_vertices: The new vertices data, list of cartesian coords for each vertex
+    :param new_vertices: The new vertices data, list of cartesian coords for each vertex, or a (V,3) array
     """
-    vertices = [qvector3d_to_numpy_array(vertex) for vertex in new_vertices]
-    vertices_node = nexus_wrapper.set_field_value(group, CommonAttrs.VERTICES, vertices)
+    vertices_node = nexus_wrapper.set_field_value(
+        group, CommonAttrs.VERTICES, vertices_to_array(new_vertices)
+    )
     nexus_wrapper.set_attribute_value(vertices_node, CommonAttrs.UNITS, "m")
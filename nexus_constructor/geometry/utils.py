@@ -1,18 +1,44 @@
-from PySide2.QtGui import QVector3D
 import numpy as np
 
 
-def validate_nonzero_qvector(value: QVector3D):
-    if value.x() == 0 and value.y() == 0 and value.z() == 0:
+def validate_nonzero_vector(value: np.ndarray):
+    if not np.any(value):
         raise ValueError("Vector is zero length")
 
 
-def get_an_orthogonal_unit_vector(input_vector: QVector3D) -> QVector3D:
+def normalise(input_vector: np.ndarray) -> np.ndarray:
+    """
+    :return: Unit vector in the direction of the input vector, or a zero vector if it is zero length
+    """
+    input_vector = np.asarray(input_vector, dtype=float)
+    length = np.linalg.norm(input_vector)
+    if length == 0:
+        return np.zeros(3)
+    return input_vector / length
+
+
+def get_an_orthogonal_unit_vector(input_vector: np.ndarray) -> np.ndarray:
     """
     Return a unit vector which is orthogonal to the input vector
     There are infinite valid solutions, just one is returned
     """
-    if np.abs(input_vector.z()) < np.abs(input_vector.x()):
-        vector = QVector3D(input_vector.y(), -input_vector.x(), 0.0)
-        return vector.normalized()
-    return QVector3D(0.0, -input_vector.z(), input_vector.y()).normalized()
+    x, y, z = np.asarray(input_vector, dtype=float)
+    if np.abs(z) < np.abs(x):
+        return normalise([y, -x, 0.0])
+    return normalise([0.0, -z, y])
+
+
+def get_orthogonal_unit_vectors(input_vectors: np.ndarray) -> np.ndarray:
+    """
+    Return a unit vector orthogonal to each row of an (N,3) array, chosen in the same way as
+    get_an_orthogonal_unit_vector. Zero length rows give zero vectors.
+    """
+    x, y, z = input_vectors[:, 0], input_vectors[:, 1], input_vectors[:, 2]
+    zeros = np.zeros_like(x)
+    vectors = np.where(
+        (np.abs(z) < np.abs(x))[:, np.newaxis],
+        np.column_stack((y, -x, zeros)),
+        np.column_stack((zeros, -z, y)),
+    )
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
@@ -1,13 +1,17 @@
-from typing import List
+from typing import Dict, List, Optional
 
 import h5py
 
-from nexus_constructor.common_attrs import CommonAttrs
 from nexus_constructor.nexus import nexus_wrapper as nx
 from nexus_constructor.component.component import Component
 from nexus_constructor.nexus.nexus_wrapper import get_nx_class
-from nexus_constructor.transformations import Transformation
+from nexus_constructor.transformation_cache import TransformationCache
 from nexus_constructor.component.component_factory import create_component
+from nexus_constructor.nexus.file_changes import (
+    ChangeType,
+    FileChange,
+    is_same_or_descendant,
+)
 
 COMPONENTS_IN_ENTRY = ["NXmonitor", "NXsample"]
 
@@ -28,30 +32,22 @@ class Instrument:
     def __init__(self, nexus_file: nx.NexusWrapper, nx_classes):
         self.nexus = nexus_file
         self.nx_component_classes = nx_classes
+        # NX_class of every component group in the entry, keyed by the absolute path of the group.
+        # Kept up to date from the changes NexusWrapper reports so that listing components does not traverse the file
+        self._component_index: Dict[str, str] = {}
         self._generate_transform_dependency_lists()
+        self._build_component_index()
+        self.nexus.node_changed.connect(self._update_component_index)
+        self.transformation_cache = TransformationCache(self.nexus)
 
     def _generate_transform_dependency_lists(self):
         """
         We keep track of what transformations a transformation is a dependency of
         so that we can avoid deleting transformations if anything else still depends on them.
         There is no attribute for this in the NeXus standard, so we cannot rely on it being in the file we have loaded.
-        This method allows us to generate the attributes.
+        This method builds the dependency graph from a single pass over the file.
         """
-
-        def refresh_depends_on(_, node):
-            """
-            Refresh the depends_on attribute of each transformation, which also results in registering dependents
-            """
-            if isinstance(node, h5py.Group):
-                if CommonAttrs.NX_CLASS in node.attrs.keys():
-                    if node.attrs[CommonAttrs.NX_CLASS] == "NXtransformations":
-                        for transformation_name in node:
-                            transform = Transformation(
-                                self.nexus, node[transformation_name]
-                            )
-                            transform.depends_on = transform.depends_on
-
-        self.nexus.nexus_file.visititems(refresh_depends_on)
+        self.nexus.dependency_graph.rebuild(self.nexus.nexus_file)
 
     def create_component(self, name: str, nx_class: str, description: str) -> Component:
         """
@@ -62,13 +58,14 @@ class Instrument:
         :return Wrapper for added component
         """
         name = _convert_name_with_spaces(name)
-        parent_group = self.nexus.instrument
-        if nx_class in COMPONENTS_IN_ENTRY:
-            parent_group = self.nexus.entry
-        component_group = self.nexus.create_nx_group(name, nx_class, parent_group)
-        component = create_component(self.nexus, component_group)
-        component.description = description
-        return component
+        with self.nexus.batch_changes():
+            parent_group = self.nexus.instrument
+            if nx_class in COMPONENTS_IN_ENTRY:
+                parent_group = self.nexus.entry
+            component_group = self.nexus.create_nx_group(name, nx_class, parent_group)
+            component = create_component(self.nexus, component_group)
+            component.description = description
+            return component
 
     def remove_component(self, component: Component):
         """
@@ -78,15 +75,95 @@ class Instrument:
         self.nexus.component_removed.emit(component.name)
         self.nexus.delete_node(component.group)
 
+    def _sorted_component_paths(self) -> List[str]:
+        # Sorting on the path segments gives the same order as visiting the entry with visititems
+        return sorted(self._component_index, key=lambda path: path.split("/"))
+
     def get_component_list(self) -> List[Component]:
-        component_list = []
+        return [
+            create_component(self.nexus, self.nexus.nexus_file[path])
+            for path in self._sorted_component_paths()
+        ]
 
-        def find_components(_, node):
+    def get_component(self, path: str) -> Optional[Component]:
+        """
+        :param path: Absolute path of the component group in the NeXus file
+        :return: The component at the given path, or None if there is no component there
+        """
+        if path not in self._component_index:
+            return None
+        return create_component(self.nexus, self.nexus.nexus_file[path])
+
+    def get_components_by_nx_class(self, nx_class: str) -> List[Component]:
+        return [
+            create_component(self.nexus, self.nexus.nexus_file[path])
+            for path in self._sorted_component_paths()
+            if self._component_index[path] == nx_class
+        ]
+
+    def _get_component_class(self, node) -> Optional[str]:
+        if isinstance(node, h5py.Group):
+            nx_class = get_nx_class(node)
+            if nx_class and nx_class in self.nx_component_classes:
+                return nx_class
+        return None
+
+    def _index_components_in_group(self, group: h5py.Group):
+        def index_component(_, node):
+            nx_class = self._get_component_class(node)
+            if nx_class:
+                self._component_index[node.name] = nx_class
+
+        if group.name != self.nexus.entry.name:
+            index_component(None, group)
+        group.visititems(index_component)
+
+    def _build_component_index(self):
+        self._component_index = {}
+        self._index_components_in_group(self.nexus.entry)
+
+    def _update_component_index(self, change: FileChange):
+        """
+        Keep the component index in step with a single change to the NeXus file.
+        """
+        entry_path = self.nexus.entry.name
+        if (
+            change.change_type == ChangeType.RELOADED
+            or entry_path is None
+            or is_same_or_descendant(entry_path, change.path)
+            or is_same_or_descendant(entry_path, change.new_path or change.path)
+        ):
+            # The entry itself has been replaced or moved
+            self._build_component_index()
+            return
+        if not is_same_or_descendant(change.path, entry_path):
+            return
+
+        if change.change_type == ChangeType.ADDED:
+            node = self.nexus.nexus_file.get(change.path)
             if isinstance(node, h5py.Group):
-                if CommonAttrs.NX_CLASS in node.attrs.keys():
-                    nx_class = get_nx_class(node)
-                    if nx_class and nx_class in self.nx_component_classes:
-                        component_list.append(create_component(self.nexus, node))
-
-        self.nexus.entry.visititems(find_components)
-        return component_list
+                self._index_components_in_group(node)
+        elif change.change_type == ChangeType.REMOVED:
+            self._remove_from_component_index(change.path)
+        elif change.change_type == ChangeType.RENAMED:
+            suffix_start = len(change.path)
+            moved = {
+                change.new_path + path[suffix_start:]: nx_class
+                for path, nx_class in self._component_index.items()
+                if is_same_or_descendant(path, change.path)
+            }
+            self._remove_from_component_index(change.path)
+            if is_same_or_descendant(change.new_path, entry_path):
+                self._component_index.update(moved)
+        elif change.change_type == ChangeType.ATTRS_CHANGED:
+            nx_class = self._get_component_class(self.nexus.nexus_file.get(change.path))
+            if nx_class:
+                self._component_index[change.path] = nx_class
+            else:
+                self._component_index.pop(change.path, None)
+
+    def _remove_from_component_index(self, path: str):
+        for indexed_path in [
+            p for p in self._component_index if is_same_or_descendant(p, path)
+        ]:
+            del self._component_index[indexed_path]
@@ -1,10 +1,12 @@
 import logging
-from typing import Tuple, List
+from typing import Tuple, List, TYPE_CHECKING
+
+import numpy as np
 
 from PySide2.Qt3DCore import Qt3DCore
 from PySide2.Qt3DExtras import Qt3DExtras
 from PySide2.Qt3DRender import Qt3DRender
-from PySide2.QtCore import QRectF
+from PySide2.QtCore import QRectF, QTimer
 from PySide2.QtGui import QVector3D, QColor
 from PySide2.QtWidgets import QWidget, QVBoxLayout
 
@@ -13,7 +15,29 @@ from nexus_constructor.instrument_view_axes import InstrumentViewAxes
 from nexus_constructor.instrument_zooming_3d_window import InstrumentZooming3DWindow
 from nexus_constructor.off_renderer import OffMesh
 from nexus_constructor.geometry import OFFGeometry
-from nexus_constructor.qentity_utils import create_qentity, create_material
+from nexus_constructor.level_of_detail import (
+    ComponentLevelsOfDetail,
+    LevelOfDetail,
+    boxes_outside_frustum,
+    frustum_planes,
+)
+from nexus_constructor.mesh_preparation import (
+    MeshPreparer,
+    PreparedMesh,
+    prepare_mesh,
+)
+from nexus_constructor.qentity_utils import (
+    create_qentity,
+    create_material,
+    create_instanced_material,
+)
+from nexus_constructor.ui_utils import (
+    numpy_array_to_qmatrix4x4,
+    qmatrix4x4_to_numpy_array,
+)
+
+if TYPE_CHECKING:
+    from nexus_constructor.component.component import Component  # noqa: F401
 
 
 class InstrumentView(QWidget):
@@ -28,6 +52,7 @@ class InstrumentView(QWidget):
         """
         Fixes Qt3D segfault - this needs to be called when the program closes otherwise Qt tries to draw objects as python is cleaning them up.
         """
+        self.mesh_preparer.shutdown()
         self.clear_all_components()
         del self.root_entity
         del self.view
@@ -86,6 +111,15 @@ class InstrumentView(QWidget):
         self.component_entities = {}
         self.transformations = {}
 
+        # The levels of detail of each component with a mesh, and whether an update of them has been scheduled
+        self.component_levels_of_detail = {}
+        self._level_of_detail_update_pending = False
+        self.view.camera_changed.connect(self.schedule_level_of_detail_update)
+
+        # Builds the meshes of components on worker threads while an instrument is loading
+        self.mesh_preparer = MeshPreparer(self)
+        self.mesh_preparer.mesh_prepared.connect(self.add_prepared_mesh)
+
         # Create layers in order to allow one camera to only see the gnomon and one camera to only see the
         # components and axis lines
         self.create_layers()
@@ -187,25 +221,86 @@ class InstrumentView(QWidget):
         return clear_buffers
 
     def add_component(
-        self, name: str, geometry: OFFGeometry, positions: List[QVector3D] = None
+        self, name: str, geometry: OFFGeometry, positions: np.ndarray = None
     ):
         """
         Add a component to the instrument view given a name and its geometry.
         :param name: The name of the component.
         :param geometry: The geometry information of the component that is used to create a mesh.
-        :param positions: Mesh is repeated at each of these positions
+        :param positions: Mesh is repeated at each of these positions, by drawing one instance of it at each
         """
-        if geometry is None:
+        self.mesh_preparer.discard(name)
+        self.add_prepared_mesh(prepare_mesh(name, geometry, positions))
+
+    def add_components_in_background(self, components: List["Component"]):
+        """
+        Build the meshes of components on worker threads, each component is added to the view when its mesh is ready
+        """
+        self.mesh_preparer.prepare(components)
+
+    def add_prepared_mesh(self, prepared_mesh: PreparedMesh):
+        """
+        Upload a mesh built by prepare_mesh and create the component's entity
+        """
+        if prepared_mesh is None:
             return
+        name = prepared_mesh.name
+
+        if prepared_mesh.instanced:
+            material = create_instanced_material(
+                QColor("black"), QColor("grey"), self.component_root_entity
+            )
+        else:
+            material = create_material(
+                QColor("black"), QColor("grey"), self.component_root_entity
+            )
 
-        mesh = OffMesh(geometry.off_geometry, self.component_root_entity, positions)
-        material = create_material(
-            QColor("black"), QColor("grey"), self.component_root_entity
+        def create_mesh(level: LevelOfDetail) -> OffMesh:
+            return OffMesh(None, self.component_root_entity, buffers=level.buffers)
+
+        mesh = create_mesh(prepared_mesh.levels[0])
+        entity = create_qentity([mesh, material], self.component_root_entity)
+        self.component_entities[name] = entity
+        self.component_levels_of_detail[name] = ComponentLevelsOfDetail(
+            entity,
+            prepared_mesh.levels,
+            mesh,
+            create_mesh,
+            prepared_mesh.box_min,
+            prepared_mesh.box_max,
         )
+        # The transformation may have been set while the mesh was being prepared
+        if name in self.transformations:
+            entity.addComponent(self.transformations[name])
+            self._update_component_transformation(name)
+        self.schedule_level_of_detail_update()
+
+    def schedule_level_of_detail_update(self):
+        """
+        Update the levels of detail and visibility of the components once control returns to the event loop, so that
+        many changes at once, such as the camera moving while every component is added, only cause one update
+        """
+        if not self._level_of_detail_update_pending:
+            self._level_of_detail_update_pending = True
+            QTimer.singleShot(0, self.update_levels_of_detail)
 
-        self.component_entities[name] = create_qentity(
-            [mesh, material], self.component_root_entity
+    def update_levels_of_detail(self):
+        """
+        Hide the components which are outside the camera's view, and draw the rest with a mesh detailed enough for
+        their distance from the camera
+        """
+        self._level_of_detail_update_pending = False
+        if not self.component_levels_of_detail:
+            return
+        components = list(self.component_levels_of_detail.values())
+        box_mins = np.array([component.world_box[0] for component in components])
+        box_maxs = np.array([component.world_box[1] for component in components])
+        hidden = boxes_outside_frustum(
+            frustum_planes(self.view.view_projection_matrix()), box_mins, box_maxs
         )
+        distances = self.view.distances_to_camera(box_mins, box_maxs)
+        for component, is_hidden, distance in zip(components, hidden, distances):
+            component.update(not is_hidden, distance)
 
     def get_entity(self, component_name: str) -> Qt3DCore.QEntity:
         """
@@ -231,18 +326,26 @@ class InstrumentView(QWidget):
         """
         resets the entities in qt3d so all components are cleared from the 3d view.
         """
+        self.mesh_preparer.discard_all()
         for component in self.component_entities.keys():
             self.component_entities[component].setParent(None)
         self.component_entities = dict()
+        self.component_levels_of_detail = dict()
 
     def delete_component(self, name: str):
         """
         Delete a component from the InstrumentView by removing the components and entity from the dictionaries.
         :param name: The name of the component.
         """
+        if self.mesh_preparer.is_pending(name):
+            self.mesh_preparer.discard(name)
+            self.transformations.pop(name, None)
+            return
         try:
             self.component_entities[name].setParent(None)
             self.component_entities.pop(name)
+            self.transformations.pop(name, None)
+            self.component_levels_of_detail.pop(name, None)
         except KeyError:
             logging.error(
                 f"Unable to delete component {name} because it doesn't exist."
@@ -256,16 +359,47 @@ class InstrumentView(QWidget):
         the resultant transformation for its entire depends_on chain of translations and rotations
         """
         self.transformations[component_name] = transformation
-        component = self.component_entities[component_name]
-        component.addComponent(transformation)
+        # Components whose mesh is still being prepared get the transformation when they are added
+        if component_name in self.component_entities:
+            self.component_entities[component_name].addComponent(transformation)
+            self._update_component_transformation(component_name)
+
+    def set_transformation_matrix(self, component_name: str, matrix: np.ndarray):
+        """
+        Set the resultant transformation matrix of a component, reusing its existing transformation if it has one
+        """
+        matrix = numpy_array_to_qmatrix4x4(matrix)
+        if component_name in self.transformations:
+            transformation = self.transformations[component_name]
+            if transformation.matrix() != matrix:
+                transformation.setMatrix(matrix)
+                self._update_component_transformation(component_name)
+        else:
+            transformation = Qt3DCore.QTransform()
+            transformation.setMatrix(matrix)
+            self.add_transformation(component_name, transformation)
 
     def clear_all_transformations(self):
         """
         Remove all transformations from all components
         """
         for component_name, transformation in self.transformations.items():
-            self.component_entities[component_name].removeComponent(transformation)
+            if component_name in self.component_entities:
+                self.component_entities[component_name].removeComponent(transformation)
         self.transformations = {}
+        for component in self.component_levels_of_detail.values():
+            component.set_transformation(None)
+        self.schedule_level_of_detail_update()
+
+    def _update_component_transformation(self, component_name: str):
+        """
+        Move the bounding box used to decide whether a component can be seen along with the component
+        """
+        if component_name in self.component_levels_of_detail:
+            self.component_levels_of_detail[component_name].set_transformation(
+                qmatrix4x4_to_numpy_array(self.transformations[component_name].matrix())
+            )
+            self.schedule_level_of_detail_update()
 
     @staticmethod
     def set_cube_mesh_dimensions(
@@ -1,15 +1,27 @@
+import numpy as np
 from PySide2 import QtGui
 from PySide2.Qt3DExtras import Qt3DExtras
-from PySide2.QtCore import Qt
+from PySide2.QtCore import Qt, Signal
+
+from nexus_constructor.level_of_detail import distances_to_boxes
+from nexus_constructor.ui_utils import qmatrix4x4_to_numpy_array
 
 
 class InstrumentZooming3DWindow(Qt3DExtras.Qt3DWindow):
+    # Emitted when the camera moves or its projection changes, so what it can see may have changed
+    camera_changed = Signal()
+
     def __init__(self, component_root_entity):
         """
         A custom 3D window that only zooms in on the instrument components when the escape key is pressed.
         """
         super().__init__()
         self.component_root_entity = component_root_entity
+        self.camera().viewMatrixChanged.connect(self._emit_camera_changed)
+        self.camera().projectionMatrixChanged.connect(self._emit_camera_changed)
+
+    def _emit_camera_changed(self, *_):
+        self.camera_changed.emit()
 
     def keyReleaseEvent(self, event: QtGui.QKeyEvent):
         """
@@ -22,3 +34,26 @@ class InstrumentZooming3DWindow(Qt3DExtras.Qt3DWindow):
             self.camera().viewEntity(self.component_root_entity)
             return
         super().keyReleaseEvent(event)
+
+    def camera_position(self) -> np.ndarray:
+        position = self.camera().position()
+        return np.array([position.x(), position.y(), position.z()])
+
+    def view_projection_matrix(self) -> np.ndarray:
+        """
+        :return: 4x4 matrix which maps world coordinates to the camera's clip coordinates
+        """
+        camera = self.camera()
+        return qmatrix4x4_to_numpy_array(
+            camera.projectionMatrix() * camera.viewMatrix()
+        )
+
+    def distances_to_camera(
+        self, box_mins: np.ndarray, box_maxs: np.ndarray
+    ) -> np.ndarray:
+        """
+        :param box_mins: (N,3) array of the lowest corner of each box
+        :param box_maxs: (N,3) array of the highest corner of each box
+        :return: Distance from the camera to the nearest point of each box
+        """
+        return distances_to_boxes(self.camera_position(), box_mins, box_maxs)
@@ -2,14 +2,20 @@ import json
 import h5py
 import numpy as np
 import uuid
-from typing import Union, List
+from typing import Union, List, Iterator, Tuple, Any, IO
 
 from nexus_constructor.common_attrs import CommonAttrs
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 """
 Read the JSON and construct an in-memory NeXus file from the nexus_structure field
 """
 NexusObject = Union[h5py.Group, h5py.Dataset]
+JsonEvent = Tuple[str, Any]
 
 
 _json_type_to_numpy = {
@@ -58,15 +64,23 @@ def _add_link(json_object: dict, current_group: h5py.Group):
     current_group[json_object["name"]] = h5py.SoftLink(json_object["target"])
 
 
+def _values_to_array(json_object: dict, numpy_type: np.dtype) -> np.ndarray:
+    """
+    Decode the values of a dataset into an array of the type and size declared in the JSON
+    """
+    values = np.array(json_object["values"], dtype=numpy_type)
+    size = json_object["dataset"].get("size")
+    if size is not None and values.ndim > 0 and values.size == np.prod(size):
+        values = values.reshape(size)
+    return values
+
+
 def _add_dataset(json_object: dict, current_group: h5py.Group):
     numpy_type = _json_type_to_numpy[json_object["dataset"][TYPE]]
-    values = json_object["values"]
-    if json_object["dataset"][TYPE] == "string" and isinstance(
-        json_object["values"], list
-    ):
-        values = [value.encode("utf8") for value in json_object["values"]]
     new_dataset = current_group.create_dataset(
-        json_object["name"], dtype=numpy_type, data=values
+        json_object["name"],
+        dtype=numpy_type,
+        data=_values_to_array(json_object, numpy_type),
     )
     _add_attributes(json_object, new_dataset)
 
@@ -103,3 +117,104 @@ def json_to_nexus(json_input: str) -> h5py.File:
     _add_to_nexus(nexus_structure["children"], nexus_file)
 
     return nexus_file
+
+
+def json_file_to_nexus(json_file: IO) -> h5py.File:
+    """
+    Convert a JSON file to in-memory NeXus file
+    If ijson is installed the file is parsed incrementally and each group and dataset is added to the NeXus file as it
+    is read, so only one dataset's values are held in memory at a time. Otherwise the whole file is read with json.
+    :param json_file: JSON file object, opened in binary mode for incremental parsing
+    :return: NeXus file
+    """
+    if ijson is None:
+        return json_to_nexus(json_file.read())
+
+    nexus_file = _create_in_memory_file(str(uuid.uuid4()))
+    try:
+        _stream_to_nexus(ijson.basic_parse(json_file, use_float=True), nexus_file)
+    except ijson.JSONError:
+        # ijson does not accept everything the json module does, such as NaN, so parse those files with json instead
+        nexus_file.close()
+        json_file.seek(0)
+        return json_to_nexus(json_file.read())
+    except Exception:
+        nexus_file.close()
+        raise
+    return nexus_file
+
+
+def _stream_to_nexus(events: Iterator[JsonEvent], nexus_file: h5py.File):
+    if next(events, (None, None))[0] != "start_map":
+        raise ValueError("Empty json file, nothing to load!")
+    found_nexus_structure = False
+    for _, key in _map_keys(events):
+        event, value = next(events)
+        if key == "nexus_structure" and event == "start_map":
+            found_nexus_structure = True
+            for _, structure_key in _map_keys(events):
+                event, value = next(events)
+                if structure_key == "children" and event == "start_array":
+                    _stream_children(events, nexus_file)
+                else:
+                    _read_value(events, event, value)
+        else:
+            _read_value(events, event, value)
+    if not found_nexus_structure:
+        raise KeyError("nexus_structure")
+
+
+def _map_keys(events: Iterator[JsonEvent]) -> Iterator[JsonEvent]:
+    """
+    Yield the map_key events of a map which has been started, up to the end of the map
+    """
+    for event, value in events:
+        if event == "end_map":
+            return
+        yield event, value
+
+
+def _stream_children(events: Iterator[JsonEvent], current_group: h5py.Group):
+    for event, _ in events:
+        if event == "end_array":
+            return
+        if event != "start_map":
+            raise ValueError("Children in the nexus_structure must be objects")
+        _stream_child(events, current_group)
+
+
+def _stream_child(events: Iterator[JsonEvent], current_group: h5py.Group):
+    child = {}
+    new_group = None
+    for _, key in _map_keys(events):
+        event, value = next(events)
+        if (
+            key == "children"
+            and event == "start_array"
+            and child.get(TYPE) == "group"
+            and "name" in child
+        ):
+            # The group's children are added to the file as they are read, rather than being read in first
+            new_group = current_group.create_group(child["name"])
+            _stream_children(events, new_group)
+        else:
+            child[key] = _read_value(events, event, value)
+    if new_group is None:
+        _add_to_nexus([child], current_group)
+    else:
+        _add_attributes(child, new_group)
+
+
+def _read_value(events: Iterator[JsonEvent], event: str, value: Any) -> Any:
+    """
+    Build the Python object for the value starting with the given event
+    """
+    if event == "start_map":
+        return {key: _read_value(events, *next(events)) for _, key in _map_keys(events)}
+    if event == "start_array":
+        items = []
+        for event, value in events:
+            if event == "end_array":
+                return items
+            items.append(_read_value(events, event, value))
+    return value
@@ -2,18 +2,24 @@ import h5py
 import numpy as np
 import uuid
 import logging
-from typing import Union, Dict, Any, List, Tuple
+from typing import Union, Dict, Any, List, Tuple, Iterator, TYPE_CHECKING
 
 from nexus_constructor.common_attrs import CommonAttrs
-from nexus_constructor.instrument import Instrument
-from nexus_constructor.json.helpers import object_to_json_file
+from nexus_constructor.json.json_stream_writer import (
+    ChunkedArray,
+    object_to_json_stream,
+)
 from nexus_constructor.nexus.nexus_wrapper import get_nx_class, get_name_of_node
 
+if TYPE_CHECKING:
+    # Only imported for type checking, as importing Instrument also imports the Qt widgets and 3D view
+    from nexus_constructor.instrument import Instrument  # noqa: F401
+
 NexusObject = Union[h5py.Group, h5py.Dataset, h5py.SoftLink]
 
 
 def generate_json(
-    data: Instrument,
+    data: "Instrument",
     file,
     nexus_file_name: str = "",
     broker: str = "",
@@ -22,20 +28,58 @@ def generate_json(
     service_id: str = None,
     abort_uninitialised: bool = False,
     use_swmr: bool = True,
+    compact: bool = False,
+    float_precision: int = None,
 ):
     """
-    Returns a formatted json string built from a given Instrument
+    Writes a formatted json string built from a given Instrument
     The json description can be used by the file writer (github.com/ess-dmsc/kafka-to-nexus) to create a NeXus file
+    The NeXus tree is written out as it is walked, so the whole description is never held in memory at once.
 
     :param data: The full description of the beamline and data
     :param file: the file object to output the JSON to.
     :param streams: dict of streams in nexus file.
     :param links: dict of links in nexus file with name and target as value fields.
     :param nexus_file_name: The NeXus file name in the write command for the filewriter.
+    :param compact: Whether to write minified JSON, for example to keep a command sent to the filewriter small.
+    :param float_precision: Number of significant digits to write floats with, or None to write them exactly.
+    :raises SourceFileChangedError: If the file was opened lazily and has since been moved, deleted or modified.
     """
+    data.nexus.check_lazy_source()
+    generate_json_from_nexus_file(
+        data.nexus.nexus_file,
+        file,
+        nexus_file_name=nexus_file_name,
+        broker=broker,
+        start_time=start_time,
+        stop_time=stop_time,
+        service_id=service_id,
+        abort_uninitialised=abort_uninitialised,
+        use_swmr=use_swmr,
+        compact=compact,
+        float_precision=float_precision,
+    )
 
-    converter = NexusToDictConverter()
-    tree = converter.convert(data.nexus.nexus_file)
+
+def generate_json_from_nexus_file(
+    nexus_file: h5py.File,
+    file,
+    nexus_file_name: str = "",
+    broker: str = "",
+    start_time: str = None,
+    stop_time: str = None,
+    service_id: str = None,
+    abort_uninitialised: bool = False,
+    use_swmr: bool = True,
+    compact: bool = False,
+    float_precision: int = None,
+):
+    """
+    Writes the filewriter command describing a NeXus file, without needing an Instrument or the GUI
+    See generate_json for the parameters.
+    """
+    converter = NexusToStreamConverter()
+    tree = converter.convert(nexus_file)
     write_command, _ = create_writer_commands(
         tree,
         nexus_file_name,
@@ -46,7 +90,7 @@ def generate_json(
         abort_on_uninitialised_stream=abort_uninitialised,
         use_hdf_swmr=use_swmr,
     )
-    object_to_json_file(write_command, file)
+    object_to_json_stream(write_command, file, compact, float_precision)
 
 
 def cast_to_int(data):
@@ -60,6 +104,16 @@ def cast_to_int(data):
         return int(data)
 
 
+JSON_TYPES = {
+    "float": np.float32,
+    "double": np.float64,
+    "int32": np.int32,
+    "int64": np.int64,
+    "uint32": np.uint32,
+    "uint64": np.uint64,
+}
+INTEGER_TYPES = [np.int32, np.int64, np.uint32, np.uint64]
+
 ATTR_NAME_BLACKLIST = [CommonAttrs.DEPENDEE_OF, CommonAttrs.UI_VALUE]
 NX_CLASS_BLACKLIST = ["NXgroup", CommonAttrs.NC_STREAM]
 
@@ -91,7 +145,7 @@ def get_data_and_type(root: h5py.Dataset):
     if type(data) is np.ndarray:
         size = data.shape
         data = data.tolist()
-    if dtype.char == "S" or dtype == h5py.special_dtype(vlen=str):
+    if _is_string_dtype(dtype):
         try:
             if isinstance(data, list):
                 data = [str_item.decode("utf-8") for str_item in data]
@@ -99,28 +153,26 @@ def get_data_and_type(root: h5py.Dataset):
                 data = data.decode("utf-8")
         except AttributeError:  # Already a str (decoded)
             pass
-        dtype = "string"
-    elif dtype == np.float32:
-        dtype = "float"
-    elif dtype == np.float64:
-        dtype = "double"
-    elif dtype == np.int32:
-        dtype = "int32"
-        data = cast_to_int(data)
-    elif dtype == np.int64:
-        dtype = "int64"
-        data = cast_to_int(data)
-    elif dtype == np.uint32:
-        dtype = "uint32"
+    elif dtype in INTEGER_TYPES:
         data = cast_to_int(data)
-    elif dtype == np.uint64:
-        dtype = "uint64"
-        data = cast_to_int(data)
-    else:
-        logging.error(
-            f"Unrecognised type {dtype}, don't know what to record as in JSON"
-        )
-    return data, dtype, size
+    return data, _get_json_type(dtype), size
+
+
+def _is_string_dtype(dtype: np.dtype) -> bool:
+    return dtype.char == "S" or dtype == h5py.special_dtype(vlen=str)
+
+
+def _get_json_type(dtype: np.dtype) -> Union[str, np.dtype]:
+    """
+    :return: The name of the type used in the filewriter JSON for the dataset type
+    """
+    if _is_string_dtype(dtype):
+        return "string"
+    for json_type, numpy_type in JSON_TYPES.items():
+        if dtype == numpy_type:
+            return json_type
+    logging.error(f"Unrecognised type {dtype}, don't know what to record as in JSON")
+    return dtype
 
 
 class NexusToDictConverter:
@@ -160,29 +212,32 @@ class NexusToDictConverter:
             self._handle_stream(root, root_dict)
             return root_dict
 
+        root_dict["children"] = self._group_children(root)
+        return root_dict
+
+    def _group_children(self, root: h5py.Group):
+        return list(self._iterate_group_children(root))
+
+    def _iterate_group_children(self, root: h5py.Group) -> Iterator[Dict]:
         for entry in root.values():
             # Check if there are SoftLinks in the group
             if isinstance(root.get(name=entry.name, getlink=True), h5py.SoftLink):
-                self._handle_link(entry, root, root_dict)
-            root_dict["children"].append(self._root_to_dict(entry))
-
-        return root_dict
+                yield self._handle_link(entry, root)
+            yield self._root_to_dict(entry)
 
     @staticmethod
-    def _handle_link(entry: NexusObject, root: h5py.Group, root_dict: Dict):
+    def _handle_link(entry: NexusObject, root: h5py.Group) -> Dict:
         """
         Create link specific fields in the JSON when a softlink is found.
         :param entry: The entry (dataset or group) that is to be linked
         :param root: the group containing the link object
-        :param root_dict: the output dictionary for the JSON writer
+        :return: the link's dictionary for the JSON writer
         """
-        root_dict["children"].append(
-            {
-                "type": "link",
-                "name": get_name_of_node(entry),
-                "target": root.get(name=entry.name, getlink=True).path,
-            }
-        )
+        return {
+            "type": "link",
+            "name": get_name_of_node(entry),
+            "target": root.get(name=entry.name, getlink=True).path,
+        }
 
     @staticmethod
     def _handle_stream(root: h5py.Group, root_dict: Dict):
@@ -200,14 +255,13 @@ class NexusToDictConverter:
                 item_dict[name] = item[...][()]
         root_dict["children"].append({"type": "stream", "stream": item_dict})
 
-    @staticmethod
-    def _handle_dataset(root: Union[h5py.Dataset, h5py.SoftLink]):
+    def _handle_dataset(self, root: Union[h5py.Dataset, h5py.SoftLink]):
         """
         Generate JSON dict for a h5py dataset.
         :param root: h5py dataset to generate dict from.
         :return: generated dictionary of dataset values and attrs.
         """
-        data, dataset_type, size = get_data_and_type(root)
+        data, dataset_type, size = self._get_data_and_type(root)
 
         root_dict = {
             "type": "dataset",
@@ -220,6 +274,27 @@ class NexusToDictConverter:
 
         return root_dict
 
+    @staticmethod
+    def _get_data_and_type(root: h5py.Dataset):
+        return get_data_and_type(root)
+
+
+class NexusToStreamConverter(NexusToDictConverter):
+    """
+    Converts a NeXus file to the same structure as NexusToDictConverter, except that the children of groups are
+    generators and numeric datasets are read in chunks, so nothing is read from the file until it is written out.
+    The result can only be written with a JsonStreamWriter, and only once.
+    """
+
+    def _group_children(self, root: h5py.Group):
+        return self._iterate_group_children(root)
+
+    @staticmethod
+    def _get_data_and_type(root: h5py.Dataset):
+        if root.shape == () or _is_string_dtype(root.dtype):
+            return get_data_and_type(root)
+        return ChunkedArray(root), _get_json_type(root.dtype), root.shape
+
 
 def create_writer_commands(
     nexus_structure,
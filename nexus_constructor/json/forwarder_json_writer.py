@@ -3,13 +3,18 @@ from typing import List, TextIO
 import h5py
 
 from nexus_constructor.common_attrs import CommonAttrs
-from nexus_constructor.json.helpers import object_to_json_file
-from nexus_constructor.nexus.nexus_wrapper import get_nx_class
+from nexus_constructor.json.json_stream_writer import object_to_json_stream
+from nexus_constructor.nexus.nexus_wrapper import decode_bytes_string, get_nx_class
 from nexus_constructor.writer_modules import WriterModules
 
 FORWARDER_SCHEMAS = [WriterModules.F142.value, WriterModules.TDCTIME.value]
 
 
+def _get_string_field(group: h5py.Group, name: str) -> str:
+    # h5py 3 reads variable-length strings as bytes
+    return decode_bytes_string(group[name][()])
+
+
 def find_forwarder_streams(root, provider_type: str, default_broker: str) -> List:
     """
     Find all streams and return them in the expected format for JSON serialisiation.
@@ -24,10 +29,10 @@ def find_forwarder_streams(root, provider_type: str, default_broker: str) -> Lis
         if (
             isinstance(node, h5py.Group)
             and get_nx_class(node) == CommonAttrs.NC_STREAM
-            and node["writer_module"][()] in FORWARDER_SCHEMAS
+            and _get_string_field(node, "writer_module") in FORWARDER_SCHEMAS
         ):
-            writer_module = node["writer_module"][()]
-            pv_name = node["source"][()]
+            writer_module = _get_string_field(node, "writer_module")
+            pv_name = _get_string_field(node, "source")
             if pv_name not in pv_names.keys():
                 stream_list.append(
                     {
@@ -52,7 +57,7 @@ def find_forwarder_streams(root, provider_type: str, default_broker: str) -> Lis
         return {"schema": writer_module, "topic": get_topic(node)}
 
     def get_topic(node):
-        uri = node["topic"][()]
+        uri = _get_string_field(node, "topic")
         uri_split = uri.split("/")
         if len(uri_split) == 1:
             # Broker is not already included in the topic string, so add the default broker
@@ -65,13 +70,18 @@ def find_forwarder_streams(root, provider_type: str, default_broker: str) -> Lis
 
 
 def generate_forwarder_command(
-    output_file: TextIO, root: h5py.Group, provider_type: str, default_broker: str
+    output_file: TextIO,
+    root: h5py.Group,
+    provider_type: str,
+    default_broker: str,
+    compact: bool = False,
 ):
     """
     Generate a forwarder command containing a list of PVs and which topics to route them to.
     :param output_file: file object to write the JSON output to.
     :param streams: dictionary of stream objects.
     :param provider_type: whether to use channel access or pv access protocol
+    :param compact: whether to write minified JSON rather than indenting it for reading
     """
     tree_dict = {"streams": find_forwarder_streams(root, provider_type, default_broker)}
-    object_to_json_file(tree_dict, output_file)
+    object_to_json_stream(tree_dict, output_file, compact)
@@ -0,0 +1,205 @@
+"""
+Writes JSON to a file object as the values are walked, rather than building the whole document in memory first.
+Lists can be given as generators, and array values as objects which read their data a chunk at a time, so that
+only a small part of a large document needs to exist at once.
+"""
+import json
+from collections.abc import Iterator
+from typing import Optional, TextIO, Tuple, Union
+
+import h5py
+import numpy as np
+
+from nexus_constructor.json.helpers import handle_non_std_types
+
+# Number of array elements to format and write at a time
+ARRAY_CHUNK_SIZE = 65536
+
+# Separators between items and between keys and values, with no whitespace, for the smallest output
+COMPACT_SEPARATORS = (",", ":")
+
+
+class ChunkedArray:
+    """
+    An array value which is read and written a chunk of rows at a time, for example an h5py dataset
+    which is only read from the file as it is written out.
+    """
+
+    def __init__(
+        self, array: Union[np.ndarray, h5py.Dataset], chunk_size: int = ARRAY_CHUNK_SIZE
+    ):
+        self.array = array
+        row_size = int(np.prod(array.shape[1:], dtype=np.int64))
+        self.rows_per_chunk = max(chunk_size // max(row_size, 1), 1)
+
+    def __len__(self):
+        return self.array.shape[0]
+
+    def chunks(self) -> Iterator:
+        for start in range(0, len(self), self.rows_per_chunk):
+            end = start + self.rows_per_chunk
+            yield np.asarray(self.array[start:end])
+
+
+def _float_format(precision: Optional[int]) -> str:
+    return "%r" if precision is None else f"%.{precision}g"
+
+
+def _float_to_json(value: float, precision: Optional[int] = None) -> str:
+    # Matches the json module, which writes nan and infinity as NaN and Infinity
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return _float_format(precision) % value
+
+
+def format_numbers(values: np.ndarray, precision: Optional[int] = None) -> list:
+    """
+    Format the numbers in a 1D array as JSON values, with NumPy formatting the whole array at once
+    :param values: A 1D numeric or boolean array
+    :param precision: Number of significant digits to write floats with, or None to write them exactly
+    :return: A list of strings, one per value
+    """
+    if values.dtype == np.bool_:
+        return np.where(values, "true", "false").tolist()
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype(str).tolist()
+    values = values.astype(np.float64, copy=False)
+    if precision is None:
+        # NumPy writes the shortest string which reads back as the same value, as repr and the json module do
+        formatted = values.astype(str)
+    else:
+        formatted = np.char.mod(f"%.{precision}g", values)
+    finite = np.isfinite(values)
+    if not finite.all():
+        # Matches the json module, which writes nan and infinity as NaN and Infinity
+        formatted = formatted.astype(object)
+        formatted[np.isnan(values)] = "NaN"
+        formatted[values == np.inf] = "Infinity"
+        formatted[values == -np.inf] = "-Infinity"
+    return formatted.tolist()
+
+
+class JsonStreamWriter:
+    """
+    Writes a value as JSON in the same layout as json.dump with the given indent and separators.
+    Dicts, lists, tuples, generators, numpy arrays, ChunkedArray objects and scalars of any numpy type can be written.
+    Floats are written exactly unless a precision, in significant digits, is given.
+    """
+
+    def __init__(
+        self,
+        file: TextIO,
+        indent: Optional[int] = 2,
+        separators: Optional[Tuple[str, str]] = None,
+        precision: Optional[int] = None,
+    ):
+        self.file = file
+        self.indent = indent
+        if separators is None:
+            separators = ("," if indent is not None else ", ", ": ")
+        self.item_separator, self.key_separator = separators
+        self.precision = precision
+
+    def write(self, value):
+        self._write_value(value, 0)
+
+    def _newline(self, level: int) -> str:
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * level)
+
+    def _write_value(self, value, level: int):
+        if isinstance(value, dict):
+            self._write_dict(value, level)
+        elif isinstance(value, ChunkedArray):
+            self._write_chunks(value.chunks(), level)
+        elif isinstance(value, np.ndarray):
+            if value.ndim == 0:
+                self._write_value(value[()], level)
+            else:
+                self._write_chunks(ChunkedArray(value).chunks(), level)
+        elif isinstance(value, (list, tuple, Iterator)):
+            self._write_items(value, level)
+        else:
+            self.file.write(self._scalar_to_json(value))
+
+    def _scalar_to_json(self, value) -> str:
+        if value is None:
+            return "null"
+        if isinstance(value, (bool, np.bool_)):
+            return "true" if value else "false"
+        if isinstance(value, (int, np.integer)):
+            return str(int(value))
+        if isinstance(value, (float, np.floating)):
+            return _float_to_json(float(value), self.precision)
+        if isinstance(value, str):
+            return json.dumps(value)
+        if isinstance(value, bytes):
+            return json.dumps(value.decode("utf8"))
+        return json.dumps(value, default=handle_non_std_types)
+
+    def _write_dict(self, value: dict, level: int):
+        if not value:
+            self.file.write("{}")
+            return
+        self.file.write("{")
+        separator = ""
+        for key, item in value.items():
+            self.file.write(
+                f"{separator}{self._newline(level + 1)}{json.dumps(str(key))}{self.key_separator}"
+            )
+            self._write_value(item, level + 1)
+            separator = self.item_separator
+        self.file.write(f"{self._newline(level)}}}")
+
+    def _write_items(self, items, level: int):
+        # Items can be a generator, so whether there are any is only known after starting
+        separator = "["
+        for item in items:
+            self.file.write(f"{separator}{self._newline(level + 1)}")
+            self._write_value(item, level + 1)
+            separator = self.item_separator
+        if separator == "[":
+            self.file.write("[]")
+        else:
+            self.file.write(f"{self._newline(level)}]")
+
+    def _write_chunks(self, chunks: Iterator, level: int):
+        separator = "["
+        for chunk in chunks:
+            if chunk.ndim > 1 or chunk.dtype.kind not in "biuf":
+                # Rows of multidimensional arrays are nested lists, and other types are written one at a time
+                for row in chunk:
+                    self.file.write(f"{separator}{self._newline(level + 1)}")
+                    self._write_value(row, level + 1)
+                    separator = self.item_separator
+            elif len(chunk):
+                item_separator = self.item_separator + self._newline(level + 1)
+                numbers = item_separator.join(format_numbers(chunk, self.precision))
+                self.file.write(f"{separator}{self._newline(level + 1)}{numbers}")
+                separator = self.item_separator
+        if separator == "[":
+            self.file.write("[]")
+        else:
+            self.file.write(f"{self._newline(level)}]")
+
+
+def object_to_json_stream(
+    value, file: TextIO, compact: bool = False, precision: Optional[int] = None
+):
+    """
+    Write the value to the file as JSON, without building the whole document in memory
+    :param value: The value to write, see JsonStreamWriter for the types which can be written
+    :param file: File object to write to
+    :param compact: Whether to write minified JSON on one line, rather than indenting it for reading
+    :param precision: Number of significant digits to write floats with, or None to write them exactly
+    """
+    if compact:
+        writer = JsonStreamWriter(file, None, COMPACT_SEPARATORS, precision)
+    else:
+        writer = JsonStreamWriter(file, precision=precision)
+    writer.write(value)
@@ -0,0 +1,324 @@
+"""
+Simplified meshes for drawing distant components more cheaply, and tests of which components the camera can see.
+Components far from the camera are drawn with a mesh simplified by vertex clustering, which merges the vertices in
+each cell of a grid over the mesh, and components outside the view frustum are not drawn at all.
+"""
+from typing import Callable, Dict, List, Tuple
+
+import attr
+import numpy as np
+
+from nexus_constructor.geometry.off_geometry import (
+    OFFGeometry,
+    OFFGeometryNoNexus,
+    triangulate_faces,
+)
+
+# Meshes with fewer vertices than this are cheap enough to always draw in full
+LEVEL_OF_DETAIL_MINIMUM_VERTICES = 5000
+
+# The number of grid cells along the longest side of the mesh for each simplified level, and how far away the
+# camera must be to use it, in multiples of the size of the component. Each pair keeps the error of the simplified
+# mesh to a few pixels in a typical view.
+SIMPLIFIED_LEVELS = ((128, 4.0), (32, 16.0), (8, 64.0))
+
+# A simplified level is only kept if it has at most this fraction of the vertices of the previous level
+MINIMUM_VERTEX_REDUCTION = 0.5
+
+
+@attr.s
+class LevelOfDetail:
+    """
+    A mesh of a component, used when the camera is at least minimum_distance times the size of the component away.
+    buffers holds the mesh packed ready to upload, if it has been prepared in advance.
+    """
+
+    geometry = attr.ib(type=OFFGeometry)
+    minimum_distance = attr.ib(type=float)
+    buffers = attr.ib(default=None)
+
+
+def simplify_by_vertex_clustering(
+    vertices: np.ndarray,
+    winding_order: np.ndarray,
+    winding_order_indices: np.ndarray,
+    cells: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simplify a mesh by replacing the vertices in each cell of a grid with a single vertex at their mean position.
+    Triangles with two corners in the same cell collapse and are removed.
+    :param vertices: (V,3) array of vertices
+    :param winding_order: Vertex indices of all faces one after another
+    :param winding_order_indices: Index in winding_order where each face starts
+    :param cells: Number of cells along the longest side of the mesh's bounding box
+    :return: vertices, winding_order and winding_order_indices of the simplified mesh, whose faces are all triangles
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    triangles = triangulate_faces(winding_order, winding_order_indices)
+    if len(triangles) == 0:
+        return vertices, np.asarray(winding_order), np.asarray(winding_order_indices)
+
+    lower = vertices.min(axis=0)
+    cell_size = (vertices.max(axis=0) - lower).max() / cells
+    if cell_size == 0:
+        cell_size = 1.0
+    cell_coordinates = np.minimum(
+        np.floor((vertices - lower) / cell_size).astype(np.int64), cells - 1
+    )
+    _, first_vertices, cluster_of_vertex, cluster_sizes = np.unique(
+        cell_coordinates,
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+        return_counts=True,
+    )
+    # Number the clusters in the order of their first vertex, so that the vertices keep their order
+    cluster_order = np.argsort(first_vertices)
+    cluster_numbers = np.empty_like(cluster_order)
+    cluster_numbers[cluster_order] = np.arange(len(cluster_order))
+    cluster_of_vertex = cluster_numbers[cluster_of_vertex.reshape(-1)]
+    cluster_sizes = cluster_sizes[cluster_order]
+    cluster_vertices = (
+        np.column_stack(
+            [
+                np.bincount(cluster_of_vertex, weights=vertices[:, axis])
+                for axis in range(3)
+            ]
+        )
+        / cluster_sizes[:, np.newaxis]
+    )
+
+    triangles = cluster_of_vertex[triangles]
+    triangles = triangles[
+        (triangles[:, 0] != triangles[:, 1])
+        & (triangles[:, 1] != triangles[:, 2])
+        & (triangles[:, 2] != triangles[:, 0])
+    ]
+    # Several triangles can collapse onto the same three clusters, keep the first of them
+    _, first_triangles = np.unique(
+        np.sort(triangles, axis=1), axis=0, return_index=True
+    )
+    triangles = triangles[np.sort(first_triangles)]
+
+    # Drop the clusters which are no longer part of any triangle
+    used_clusters, triangles = np.unique(triangles, return_inverse=True)
+    return (
+        cluster_vertices[used_clusters],
+        triangles.reshape(-1),
+        np.arange(0, triangles.size, 3),
+    )
+
+
+def create_levels_of_detail(geometry: OFFGeometry) -> List[LevelOfDetail]:
+    """
+    Precompute the simplified meshes of a geometry
+    :param geometry: The full resolution mesh
+    :return: The levels of detail, starting with the full resolution mesh and getting coarser. Only the full resolution
+    mesh is returned if the geometry is small or simplifying it does not remove many vertices.
+    """
+    levels = [LevelOfDetail(geometry, 0.0)]
+    vertices = geometry.vertices_array
+    if len(vertices) < LEVEL_OF_DETAIL_MINIMUM_VERTICES:
+        return levels
+    winding_order = geometry.winding_order_array
+    winding_order_indices = geometry.winding_order_indices_array
+    for cells, minimum_distance in SIMPLIFIED_LEVELS:
+        simplified_arrays = simplify_by_vertex_clustering(
+            vertices, winding_order, winding_order_indices, cells
+        )
+        previous_vertex_count = len(levels[-1].geometry.vertices_array)
+        if len(simplified_arrays[0]) > MINIMUM_VERTEX_REDUCTION * previous_vertex_count:
+            continue
+        levels.append(
+            LevelOfDetail(
+                OFFGeometryNoNexus.from_arrays(*simplified_arrays), minimum_distance
+            )
+        )
+    return levels
+
+
+def choose_level_of_detail(
+    levels: List[LevelOfDetail], distance: float, size: float
+) -> int:
+    """
+    :param levels: Levels of detail of a component, from create_levels_of_detail
+    :param distance: Distance from the camera to the component
+    :param size: Size of the component, such as the diagonal of its bounding box
+    :return: Index of the coarsest level which can be used at this distance
+    """
+    chosen_level = 0
+    for index, level in enumerate(levels):
+        if distance >= level.minimum_distance * size:
+            chosen_level = index
+    return chosen_level
+
+
+def bounding_box(vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :return: Lowest and highest corners of the box around the vertices
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    if len(vertices) == 0:
+        return np.zeros(3), np.zeros(3)
+    return vertices.min(axis=0), vertices.max(axis=0)
+
+
+def instanced_bounding_box(
+    box_min: np.ndarray,
+    box_max: np.ndarray,
+    offsets: np.ndarray,
+    matrices: np.ndarray = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the box around every instance of a mesh, as drawn by an instanced OffMesh
+    :param box_min: Lowest corner of the box around the mesh
+    :param box_max: Highest corner of the box around the mesh
+    :param offsets: (N,3) array of the offset of each instance
+    :param matrices: (N,3,3) array of the matrix which rotates and scales each instance, or None if they do not
+    :return: Lowest and highest corners of the box around all of the instances
+    """
+    offsets = np.asarray(offsets, dtype=float).reshape(-1, 3)
+    if len(offsets) == 0:
+        return box_min, box_max
+    centre = (box_min + box_max) / 2
+    half_size = (box_max - box_min) / 2
+    if matrices is None:
+        centres = offsets + centre
+        half_sizes = np.tile(half_size, (len(offsets), 1))
+    else:
+        centres = offsets + matrices @ centre
+        half_sizes = np.abs(matrices) @ half_size
+    return (centres - half_sizes).min(axis=0), (centres + half_sizes).max(axis=0)
+
+
+def transform_boxes(
+    box_mins: np.ndarray, box_maxs: np.ndarray, matrices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the axis aligned boxes around boxes which have been rotated and moved
+    :param box_mins: (N,3) array of the lowest corner of each box
+    :param box_maxs: (N,3) array of the highest corner of each box
+    :param matrices: (N,4,4) array of the transformation matrix of each box
+    :return: Lowest and highest corners of each transformed box
+    """
+    centres = (box_mins + box_maxs) / 2
+    half_sizes = (box_maxs - box_mins) / 2
+    linear = matrices[:, :3, :3]
+    centres = np.einsum("nij,nj->ni", linear, centres) + matrices[:, :3, 3]
+    half_sizes = np.einsum("nij,nj->ni", np.abs(linear), half_sizes)
+    return centres - half_sizes, centres + half_sizes
+
+
+def frustum_planes(view_projection_matrix: np.ndarray) -> np.ndarray:
+    """
+    Find the planes bounding what the camera can see. A point p is inside a plane (a,b,c,d) if a*x + b*y + c*z + d is
+    not negative.
+    :param view_projection_matrix: 4x4 matrix which maps world coordinates to the camera's clip coordinates
+    :return: (6,4) array of the left, right, bottom, top, near and far planes
+    """
+    m = np.asarray(view_projection_matrix, dtype=float)
+    return np.array(
+        [m[3] + m[0], m[3] - m[0], m[3] + m[1], m[3] - m[1], m[3] + m[2], m[3] - m[2],]
+    )
+
+
+def boxes_outside_frustum(
+    planes: np.ndarray, box_mins: np.ndarray, box_maxs: np.ndarray
+) -> np.ndarray:
+    """
+    Find which boxes are entirely outside the view frustum. Boxes near the corners of the frustum can be outside it
+    without being found, which only means that they are drawn unnecessarily.
+    :param planes: (6,4) array of planes from frustum_planes
+    :param box_mins: (N,3) array of the lowest corner of each box
+    :param box_maxs: (N,3) array of the highest corner of each box
+    :return: Boolean array which is True for each box that cannot be seen
+    """
+    normals = planes[:, :3]
+    # The corner of each box furthest along the normal of each plane, if it is outside then the whole box is
+    furthest_corners = np.where(
+        normals[np.newaxis, :, :] >= 0,
+        box_maxs[:, np.newaxis, :],
+        box_mins[:, np.newaxis, :],
+    )
+    distances = np.einsum("npi,pi->np", furthest_corners, normals) + planes[:, 3]
+    return (distances < 0).any(axis=1)
+
+
+def distances_to_boxes(
+    point: np.ndarray, box_mins: np.ndarray, box_maxs: np.ndarray
+) -> np.ndarray:
+    """
+    :return: Distance from the point to the nearest point of each box, zero for boxes containing the point
+    """
+    nearest_points = np.clip(point, box_mins, box_maxs)
+    return np.linalg.norm(nearest_points - point, axis=1)
+
+
+class ComponentLevelsOfDetail:
+    """
+    Switches the mesh of a component's entity between its levels of detail, and hides the entity when it cannot be
+    seen. The mesh of each level is created the first time the level is used.
+    """
+
+    def __init__(
+        self,
+        entity,
+        levels: List[LevelOfDetail],
+        mesh,
+        create_mesh: Callable[[LevelOfDetail], object],
+        box_min: np.ndarray,
+        box_max: np.ndarray,
+    ):
+        """
+        :param entity: The component's entity, holding the mesh of the first level
+        :param levels: The levels of detail of the component, from create_levels_of_detail
+        :param mesh: The mesh of the first level
+        :param create_mesh: Creates the mesh of another level
+        :param box_min: Lowest corner of the box around the component, in its own coordinates
+        :param box_max: Highest corner of the box around the component, in its own coordinates
+        """
+        self.entity = entity
+        self.levels = levels
+        self.create_mesh = create_mesh
+        self.meshes: Dict[int, object] = {0: mesh}
+        self.current_level = 0
+        self.visible = True
+        self.local_box = (box_min, box_max)
+        self.world_box = self.local_box
+
+    def set_transformation(self, matrix: np.ndarray):
+        """
+        :param matrix: 4x4 matrix of the component's transformation, None to remove it
+        """
+        if matrix is None:
+            self.world_box = self.local_box
+            return
+        box_mins, box_maxs = transform_boxes(
+            self.local_box[0][np.newaxis],
+            self.local_box[1][np.newaxis],
+            np.asarray(matrix)[np.newaxis],
+        )
+        self.world_box = (box_mins[0], box_maxs[0])
+
+    @property
+    def size(self) -> float:
+        return float(np.linalg.norm(self.world_box[1] - self.world_box[0]))
+
+    def set_visible(self, visible: bool):
+        if visible != self.visible:
+            self.visible = visible
+            self.entity.setEnabled(visible)
+
+    def set_level(self, index: int):
+        if index == self.current_level:
+            return
+        if index not in self.meshes:
+            self.meshes[index] = self.create_mesh(self.levels[index])
+        self.entity.removeComponent(self.meshes[self.current_level])
+        self.entity.addComponent(self.meshes[index])
+        self.current_level = index
+
+    def update(self, visible: bool, distance: float):
+        self.set_visible(visible)
+        if visible:
+            self.set_level(choose_level_of_detail(self.levels, distance, self.size))
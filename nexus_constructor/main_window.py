@@ -1,4 +1,6 @@
-from typing import Dict
+import logging
+from typing import Dict, List, Optional
+
 from PySide2.QtWidgets import (
     QMainWindow,
     QApplication,
@@ -7,8 +9,8 @@ from PySide2.QtWidgets import (
     QAction,
 )
 from PySide2.QtWidgets import QDialog, QLabel, QGridLayout, QComboBox, QPushButton
-import silx.gui.hdf5
 import h5py
+import numpy as np
 import nexus_constructor.json.forwarder_json_writer
 from nexus_constructor.add_component_window import AddComponentDialog
 from nexus_constructor.filewriter_command_widget import FilewriterCommandWidget
@@ -17,7 +19,10 @@ from nexus_constructor.ui_utils import file_dialog, show_warning_dialog
 from ui.main_window import Ui_MainWindow
 from nexus_constructor.component.component import Component
 from nexus_constructor.json import filewriter_json_writer
-from nexus_constructor.json.filewriter_json_reader import json_to_nexus
+from nexus_constructor.json.filewriter_json_reader import json_file_to_nexus
+from nexus_constructor.nexus.file_changes import FileChange
+from nexus_constructor.nexus.lazy_file import SourceFileChangedError
+from nexus_constructor.qt_signal_bridge import QtNexusSignals
 
 NEXUS_FILE_TYPES = {"NeXus Files": ["nxs", "nex", "nx5"]}
 JSON_FILE_TYPES = {"JSON Files": ["json", "JSON"]}
@@ -28,12 +33,16 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         super().__init__()
         self.instrument = instrument
         self.nx_classes = nx_classes
+        self.nexus_signals = QtNexusSignals(self.instrument.nexus, self)
 
     def setupUi(self, main_window):
         super().setupUi(main_window)
 
         self.export_to_nexus_file_action.triggered.connect(self.save_to_nexus_file)
         self.open_nexus_file_action.triggered.connect(self.open_nexus_file)
+        self.open_nexus_file_lazily_action.triggered.connect(
+            self.open_nexus_file_lazily
+        )
         self.open_json_file_action.triggered.connect(self.open_json_file)
         self.export_to_filewriter_JSON_action.triggered.connect(
             self.save_to_filewriter_json
@@ -45,31 +54,19 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         # Clear the 3d view when closed
         QApplication.instance().aboutToQuit.connect(self.sceneWidget.delete)
 
-        self.widget = silx.gui.hdf5.Hdf5TreeView()
-        self.widget.setAcceptDrops(True)
-        self.widget.setDragEnabled(True)
-        self.treemodel = self.widget.findHdf5TreeModel()
-        self.treemodel.setDatasetDragEnabled(True)
-        self.treemodel.setFileDropEnabled(True)
-        self.treemodel.setFileMoveEnabled(True)
-        self.treemodel.insertH5pyObject(self.instrument.nexus.nexus_file)
-        self.instrument.nexus.file_changed.connect(
-            self.update_nexus_file_structure_view
-        )
-        self.silx_tab_layout.addWidget(self.widget)
-        self.instrument.nexus.show_entries_dialog.connect(self.show_entries_dialog)
+        # silx is slow to import, so the NeXus file layout view is only created when its tab is first shown
+        self.widget = None
+        self.tab_widget.currentChanged.connect(self._set_up_nexus_file_structure_view)
+        self.nexus_signals.file_changed.connect(self.update_nexus_file_structure_view)
+        self.nexus_signals.show_entries_dialog.connect(self.show_entries_dialog)
 
-        self.instrument.nexus.component_added.connect(self.sceneWidget.add_component)
-        self.instrument.nexus.component_removed.connect(
-            self.sceneWidget.delete_component
-        )
+        self.nexus_signals.component_added.connect(self.sceneWidget.add_component)
+        self.nexus_signals.component_removed.connect(self.sceneWidget.delete_component)
         self.component_tree_view_tab.set_up_model(self.instrument)
-        self.instrument.nexus.transformation_changed.connect(
+        self.nexus_signals.transformation_changed.connect(
             self._update_transformations_3d_view
         )
 
-        self.widget.setVisible(True)
-
         self._set_up_file_writer_control_window(main_window)
         self.file_writer_control_window = None
 
@@ -136,17 +133,51 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         self.entries_dialog.layout().addWidget(ok_button)
         self.entries_dialog.show()
 
-    def update_nexus_file_structure_view(self, nexus_file):
-        self.treemodel.clear()
-        self.treemodel.insertH5pyObject(nexus_file)
+    def _set_up_nexus_file_structure_view(self, tab_index: int):
+        if self.widget is not None or tab_index != self.tab_widget.indexOf(
+            self.silx_tab
+        ):
+            return
+        import silx.gui.hdf5
+
+        self.widget = silx.gui.hdf5.Hdf5TreeView()
+        self.widget.setAcceptDrops(True)
+        self.widget.setDragEnabled(True)
+        self.treemodel = self.widget.findHdf5TreeModel()
+        self.treemodel.setDatasetDragEnabled(True)
+        self.treemodel.setFileDropEnabled(True)
+        self.treemodel.setFileMoveEnabled(True)
+        self.treemodel.insertH5pyObject(self.instrument.nexus.nexus_file)
+        self.silx_tab_layout.addWidget(self.widget)
+        self.widget.setVisible(True)
+
+    def update_nexus_file_structure_view(
+        self, nexus_file, changes: Optional[List[FileChange]] = None
+    ):
+        if self.widget is None:
+            # The view shows the file as it is when it is created
+            return
+        from nexus_constructor.nexus_tree_updater import update_nexus_tree
+
+        update_nexus_tree(self.widget, nexus_file, changes)
 
     def save_to_nexus_file(self):
         filename = file_dialog(True, "Save Nexus File", NEXUS_FILE_TYPES)
-        self.instrument.nexus.save_file(filename)
+        try:
+            self.instrument.nexus.save_file(filename)
+        except SourceFileChangedError as e:
+            show_warning_dialog(str(e), "Unable to save NeXus file", parent=self)
 
     def save_to_filewriter_json(self):
         filename = file_dialog(True, "Save Filewriter JSON File", JSON_FILE_TYPES)
         if filename:
+            try:
+                self.instrument.nexus.check_lazy_source()
+            except SourceFileChangedError as e:
+                show_warning_dialog(
+                    str(e), "Unable to save filewriter JSON", parent=self
+                )
+                return
             dialog = QDialog()
             dialog.setModal(True)
             dialog.setLayout(QGridLayout())
@@ -204,20 +235,28 @@ class MainWindow(Ui_MainWindow, QMainWindow):
                     )
 
     def open_nexus_file(self):
+        self._open_nexus_file(lazy=False)
+
+    def open_nexus_file_lazily(self):
+        """
+        Open a NeXus file leaving large datasets in the source file until they are read.
+        The source file must stay in place and unchanged while it is open.
+        """
+        self._open_nexus_file(lazy=True)
+
+    def _open_nexus_file(self, lazy: bool):
         filename = file_dialog(False, "Open Nexus File", NEXUS_FILE_TYPES)
         existing_file = self.instrument.nexus.nexus_file
-        if self.instrument.nexus.open_file(filename):
+        if self.instrument.nexus.open_file(filename, lazy=lazy):
             self._update_views()
             existing_file.close()
 
     def open_json_file(self):
         filename = file_dialog(False, "Open File Writer JSON File", JSON_FILE_TYPES)
         if filename:
-            with open(filename, "r") as json_file:
-                json_data = json_file.read()
-
+            with open(filename, "rb") as json_file:
                 try:
-                    nexus_file = json_to_nexus(json_data)
+                    nexus_file = json_file_to_nexus(json_file)
                 except Exception as exception:
                     show_warning_dialog(
                         "Provided file not recognised as valid JSON",
@@ -232,11 +271,20 @@ class MainWindow(Ui_MainWindow, QMainWindow):
                     self._update_views()
                     existing_file.close()
 
+    def _component_matrix(self, component: Component) -> np.ndarray:
+        try:
+            return self.instrument.transformation_cache.component_matrix(component)
+        except ValueError as error:
+            logging.warning(f"Showing {component.name} untransformed: {error}")
+            return np.identity(4)
+
     def _update_transformations_3d_view(self):
-        self.sceneWidget.clear_all_transformations()
+        # Matrices of chains which have not changed come straight from the cache
         for component in self.instrument.get_component_list():
             if component.name != "sample":
-                self.sceneWidget.add_transformation(component.name, component.transform)
+                self.sceneWidget.set_transformation_matrix(
+                    component.name, self._component_matrix(component)
+                )
 
     def _update_views(self):
         self.sceneWidget.clear_all_transformations()
@@ -245,10 +293,19 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         self._update_3d_view_with_component_shapes()
 
     def _update_3d_view_with_component_shapes(self):
-        for component in self.instrument.get_component_list():
-            shape, positions = component.shape
-            self.sceneWidget.add_component(component.name, shape, positions)
-            self.sceneWidget.add_transformation(component.name, component.transform)
+        # Resolve every depends_on chain in one batch rather than walking each component's chain separately
+        try:
+            self.instrument.transformation_cache.resolve_all()
+        except ValueError as error:
+            # Chains without a cycle are still resolved one at a time below
+            logging.warning(f"Unable to resolve every transformation at once: {error}")
+        components = self.instrument.get_component_list()
+        for component in components:
+            self.sceneWidget.set_transformation_matrix(
+                component.name, self._component_matrix(component)
+            )
+        # The shapes are read and meshed on worker threads, each component appears in the view when it is ready
+        self.sceneWidget.add_components_in_background(components)
 
     def show_add_component_window(self, component: Component = None):
         self.add_component_window = QDialog()
@@ -0,0 +1,139 @@
+"""
+Reads the shapes of components and builds their meshes on a pool of worker threads, so that the window stays
+responsive while an instrument loads. Only uploading the finished buffers to Qt3D happens on the GUI thread.
+Threads are used rather than processes because the NeXus file is held in memory by this process. Most of the time
+is spent in NumPy and h5py, which release the GIL for large arrays, so the meshes are built in parallel.
+"""
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import attr
+import numpy as np
+from PySide2.QtCore import QObject, Qt, Signal
+
+from nexus_constructor.geometry import CylindricalGeometry, OFFGeometry
+from nexus_constructor.geometry.cylindrical_geometry import unit_cylinder_off_geometry
+from nexus_constructor.geometry.off_geometry import vertices_to_array
+from nexus_constructor.level_of_detail import (
+    LevelOfDetail,
+    bounding_box,
+    create_levels_of_detail,
+    instanced_bounding_box,
+)
+from nexus_constructor.off_renderer import create_mesh_buffers
+
+if TYPE_CHECKING:
+    from nexus_constructor.component.component import Component  # noqa: F401
+
+
+@attr.s
+class PreparedMesh:
+    """
+    The mesh of a component, with the buffers of each level of detail ready to upload
+    """
+
+    name = attr.ib(type=str)
+    levels = attr.ib(type=List[LevelOfDetail])
+    instanced = attr.ib(type=bool)
+    box_min = attr.ib(type=np.ndarray)
+    box_max = attr.ib(type=np.ndarray)
+
+
+def prepare_mesh(
+    name: str, geometry: OFFGeometry, positions: np.ndarray = None
+) -> Optional[PreparedMesh]:
+    """
+    Build the mesh of a component, without using Qt3D
+    :param name: The name of the component.
+    :param geometry: The geometry of the component, None if it has no shape.
+    :param positions: Mesh is repeated at each of these positions, by drawing one instance of it at each
+    :return: The prepared mesh, or None if there is no geometry
+    """
+    if geometry is None:
+        return None
+
+    matrices = None
+    if isinstance(geometry, CylindricalGeometry) and (
+        positions is not None or geometry.cylinder_count > 1
+    ):
+        # One mesh of a cylinder drawn once per cylinder, so a bank of many tubes is a single draw call
+        offsets, matrices = geometry.instance_transforms(positions)
+        mesh_geometry = unit_cylinder_off_geometry()
+    else:
+        offsets = None if positions is None else vertices_to_array(positions)
+        mesh_geometry = geometry.off_geometry
+    instanced = offsets is not None
+
+    levels = create_levels_of_detail(mesh_geometry)
+    for level in levels:
+        level.buffers = create_mesh_buffers(
+            level.geometry, offsets, instanced, matrices
+        )
+
+    box_min, box_max = bounding_box(mesh_geometry.vertices_array)
+    if instanced:
+        box_min, box_max = instanced_bounding_box(box_min, box_max, offsets, matrices)
+    return PreparedMesh(name, levels, instanced, box_min, box_max)
+
+
+def prepare_component_mesh(component: "Component") -> Optional[PreparedMesh]:
+    shape, positions = component.shape
+    return prepare_mesh(component.name, shape, positions)
+
+
+class MeshPreparer(QObject):
+    """
+    Prepares the meshes of components on worker threads and emits mesh_prepared on the GUI thread as each is
+    finished, so that components appear as soon as their mesh is ready.
+    """
+
+    mesh_prepared = Signal("QVariant")
+    # Carries finished work from the worker threads to the thread of the preparer
+    _finished = Signal(str, "QVariant")
+
+    def __init__(self, parent: QObject = None, max_workers: int = None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers)
+        # The work in progress for each component, a mesh is only emitted if it is still the latest for its component
+        self._pending: Dict[str, Future] = {}
+        self._finished.connect(self._emit_mesh_prepared, Qt.QueuedConnection)
+
+    def prepare(self, components: List["Component"]):
+        for component in components:
+            self.discard(component.name)
+            future = self._executor.submit(prepare_component_mesh, component)
+            self._pending[component.name] = future
+            future.add_done_callback(partial(self._finished.emit, component.name))
+
+    def is_pending(self, name: str) -> bool:
+        return name in self._pending
+
+    def discard(self, name: str):
+        """
+        Stop preparing the mesh of a component, for example because it has been deleted
+        """
+        future = self._pending.pop(name, None)
+        if future is not None:
+            future.cancel()
+
+    def discard_all(self):
+        for name in list(self._pending):
+            self.discard(name)
+
+    def shutdown(self):
+        self.discard_all()
+        self._executor.shutdown(wait=False)
+
+    def _emit_mesh_prepared(self, name: str, future: Future):
+        if self._pending.get(name) is not future:
+            return
+        del self._pending[name]
+        try:
+            prepared_mesh = future.result()
+        except Exception as error:
+            logging.error(f"Unable to build the mesh of component {name}: {error}")
+            return
+        if prepared_mesh is not None:
+            self.mesh_prepared.emit(prepared_mesh)
@@ -0,0 +1,70 @@
+from enum import Enum
+from typing import List, Optional
+
+import attr
+
+
+class ChangeType(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    RENAMED = "renamed"
+    ATTRS_CHANGED = "attrs_changed"
+    VALUE_CHANGED = "value_changed"
+    RELOADED = "reloaded"
+
+
+@attr.s(frozen=True)
+class FileChange:
+    """
+    Describes a single change made to the in-memory NeXus file.
+    path is the absolute path of the affected node, for renames new_path is the path the node was moved to.
+    RELOADED means the whole file was replaced, so anything derived from it should be rebuilt.
+    """
+
+    change_type = attr.ib(type=ChangeType)
+    path = attr.ib(type=str)
+    new_path = attr.ib(type=Optional[str], default=None)
+
+
+def is_same_or_descendant(path: str, ancestor: str) -> bool:
+    """
+    :return: True if path is ancestor or is somewhere below ancestor in the file tree
+    """
+    return path == ancestor or path.startswith(ancestor.rstrip("/") + "/")
+
+
+def parent_path(path: str) -> str:
+    parent = path.rstrip("/").rsplit("/", 1)[0]
+    return parent if parent else "/"
+
+
+def coalesce_changes(changes: List[FileChange]) -> List[FileChange]:
+    """
+    Merge the changes recorded during a batch, dropping duplicates and changes to nodes which were
+    added earlier in the same batch, as describing the addition already covers them.
+    """
+    if any(change.change_type == ChangeType.RELOADED for change in changes):
+        return [FileChange(ChangeType.RELOADED, "/")]
+
+    coalesced = []
+    added_paths = []
+    for change in changes:
+        if change in coalesced:
+            continue
+        if change.change_type in (
+            ChangeType.ADDED,
+            ChangeType.ATTRS_CHANGED,
+            ChangeType.VALUE_CHANGED,
+        ) and any(is_same_or_descendant(change.path, added) for added in added_paths):
+            continue
+        if change.change_type == ChangeType.ADDED:
+            added_paths.append(change.path)
+        elif change.change_type in (ChangeType.REMOVED, ChangeType.RENAMED):
+            # Anything added below this node has now moved or gone, so stop treating it as covered
+            added_paths = [
+                added
+                for added in added_paths
+                if not is_same_or_descendant(added, change.path)
+            ]
+        coalesced.append(change)
+    return coalesced
@@ -0,0 +1,169 @@
+"""
+Open a NeXus file without reading all of its data into memory.
+Groups, attributes, links and small datasets are copied into an in-memory file, while large datasets, such as event
+data or detector pixel maps, become virtual datasets which map onto the file on disk and are only read when accessed.
+HDF5 reads the fill value, zero, from a virtual dataset whose source file is missing, so the identity of the source
+file is recorded when it is opened and checked before its data is used.
+"""
+import os
+import uuid
+from typing import List, Tuple
+
+import attr
+import h5py
+
+# Datasets larger than this are left on disk when a file is opened lazily
+LAZY_DATASET_THRESHOLD_BYTES = 1024 * 1024
+
+# Number of bytes of a lazy dataset to copy at a time when it is materialised
+MATERIALISE_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+class SourceFileChangedError(OSError):
+    """
+    The file which lazy datasets are read from has been moved, deleted or modified since it was opened
+    """
+
+
+@attr.s(frozen=True)
+class SourceFileIdentity:
+    """
+    Identifies the version of a file on disk, to tell whether it is still the file that was opened
+    """
+
+    path = attr.ib(type=str)
+    size = attr.ib(type=int)
+    modified_ns = attr.ib(type=int)
+    inode = attr.ib(type=int)
+
+    @classmethod
+    def of_file(cls, filename: str) -> "SourceFileIdentity":
+        path = os.path.abspath(filename)
+        status = os.stat(path)
+        return cls(path, status.st_size, status.st_mtime_ns, status.st_ino)
+
+    def check(self):
+        """
+        :raises SourceFileChangedError: If the file no longer exists or is no longer the same file.
+        """
+        try:
+            current = SourceFileIdentity.of_file(self.path)
+        except OSError as e:
+            raise SourceFileChangedError(
+                f"{self.path} was opened without reading its large datasets into memory and can no longer be read: "
+                f"{e.strerror}"
+            ) from e
+        if current != self:
+            raise SourceFileChangedError(
+                f"{self.path} was opened without reading its large datasets into memory and has since been replaced "
+                f"or modified, reopen it to use its current data"
+            )
+
+
+def open_file_skeleton(
+    filename: str, threshold: int = LAZY_DATASET_THRESHOLD_BYTES
+) -> Tuple[h5py.File, SourceFileIdentity]:
+    """
+    Create an in-memory copy of the structure of a file, leaving its large datasets on disk.
+    :param filename: Path of the NeXus file to open.
+    :param threshold: Size in bytes above which a dataset is read from disk on demand.
+    :return: The in-memory file, and the identity of the file on disk which must be checked before reading from it.
+    """
+    source = SourceFileIdentity.of_file(filename)
+    nexus_file = h5py.File(
+        str(uuid.uuid4()), mode="x", driver="core", backing_store=False
+    )
+    with h5py.File(source.path, mode="r") as source_file:
+        _copy_attributes(source_file, nexus_file)
+        _copy_group_skeleton(source_file, nexus_file, threshold)
+    # In case the file was written to while it was being read
+    source.check()
+    return nexus_file, source
+
+
+def _copy_attributes(source: h5py.HLObject, destination: h5py.HLObject):
+    for name in source.attrs:
+        # Keep the exact HDF5 type, for example fixed length rather than variable length strings
+        destination.attrs.create(
+            name, source.attrs[name], dtype=source.attrs.get_id(name).dtype
+        )
+
+
+def _copy_group_skeleton(
+    source_group: h5py.Group, destination_group: h5py.Group, threshold: int
+):
+    for name in source_group:
+        link = source_group.get(name, getlink=True)
+        if isinstance(link, (h5py.SoftLink, h5py.ExternalLink)):
+            destination_group[name] = link
+            continue
+        node = source_group[name]
+        if isinstance(node, h5py.Group):
+            new_group = destination_group.create_group(name)
+            _copy_attributes(node, new_group)
+            _copy_group_skeleton(node, new_group, threshold)
+        elif node.shape and node.nbytes > threshold:
+            _create_lazy_dataset(node, destination_group, name)
+        else:
+            destination_group.copy(source=node, dest=destination_group, name=name)
+
+
+def _create_lazy_dataset(
+    dataset: h5py.Dataset, destination_group: h5py.Group, name: str
+):
+    layout = h5py.VirtualLayout(
+        shape=dataset.shape, dtype=dataset.dtype, maxshape=dataset.maxshape
+    )
+    layout[...] = h5py.VirtualSource(dataset)
+    new_dataset = destination_group.create_virtual_dataset(name, layout)
+    _copy_attributes(dataset, new_dataset)
+
+
+def is_lazy_dataset(dataset: h5py.Dataset, source_filename: str) -> bool:
+    """
+    Whether the dataset's data is read on demand from the given file, rather than being held in memory
+    """
+    return dataset.is_virtual and any(
+        source.file_name == os.path.abspath(source_filename)
+        for source in dataset.virtual_sources()
+    )
+
+
+def materialise_lazy_datasets(group: h5py.Group, source: SourceFileIdentity):
+    """
+    Replace datasets under the group which are read on demand from the source file with datasets holding the data,
+    for example before saving, so that the saved file does not depend on the file it was opened from.
+    :param group: The group to search, usually the root of the file being saved.
+    :param source: Identity of the file which was opened lazily.
+    :raises SourceFileChangedError: If the source file has changed since it was opened, before or during copying.
+    """
+    source.check()
+    lazy_datasets: List[h5py.Dataset] = []
+
+    def find_lazy_datasets(_, node):
+        if isinstance(node, h5py.Dataset) and is_lazy_dataset(node, source.path):
+            lazy_datasets.append(node)
+
+    group.visititems(find_lazy_datasets)
+    for dataset in lazy_datasets:
+        _materialise_dataset(dataset)
+    source.check()
+
+
+def _materialise_dataset(dataset: h5py.Dataset):
+    parent = dataset.parent
+    name = dataset.name.split("/")[-1]
+    temporary_name = f"{name}_{uuid.uuid4()}"
+    parent.move(name, temporary_name)
+    lazy_dataset = parent[temporary_name]
+
+    new_dataset = parent.create_dataset(
+        name, shape=lazy_dataset.shape, dtype=lazy_dataset.dtype
+    )
+    row_bytes = max(lazy_dataset.nbytes // max(lazy_dataset.shape[0], 1), 1)
+    rows_per_chunk = max(MATERIALISE_CHUNK_BYTES // row_bytes, 1)
+    for start in range(0, lazy_dataset.shape[0], rows_per_chunk):
+        rows = slice(start, start + rows_per_chunk)
+        new_dataset[rows] = lazy_dataset[rows]
+    _copy_attributes(lazy_dataset, new_dataset)
+    del parent[temporary_name]
@@ -1,11 +1,26 @@
 import logging
+import os
 import uuid
+from contextlib import contextmanager
+
 import h5py
-from PySide2.QtCore import Signal, QObject
 from typing import Any, TypeVar, Optional
 import numpy as np
 
 from nexus_constructor.common_attrs import CommonAttrs
+from nexus_constructor.dependency_graph import DependencyGraph
+from nexus_constructor.nexus.file_changes import (
+    ChangeType,
+    FileChange,
+    coalesce_changes,
+)
+from nexus_constructor.nexus.lazy_file import (
+    SourceFileChangedError,
+    SourceFileIdentity,
+    open_file_skeleton,
+    materialise_lazy_datasets,
+)
+from nexus_constructor.nexus.signals import Signal
 
 h5Node = TypeVar("h5Node", h5py.Group, h5py.Dataset)
 
@@ -53,19 +68,28 @@ def create_temporary_in_memory_file() -> h5py.File:
     return set_up_in_memory_nexus_file(str(uuid.uuid4()))
 
 
-class NexusWrapper(QObject):
+class NexusWrapper:
     """
     Contains the NeXus file and functions to add and edit components in the NeXus file structure.
-    All changes to the NeXus file should happen via this class. Emits Qt signal whenever anything in the file changes.
+    All changes to the NeXus file should happen via this class. Emits a signal whenever anything in the file changes.
+    The signals do not use Qt, see qt_signal_bridge for connecting them to widgets.
     """
 
-    # Signal that indicates the nexus file has been changed in some way
-    file_changed = Signal("QVariant")
-    file_opened = Signal("QVariant")
-    component_added = Signal(str, "QVariant", "QVariant")
-    component_removed = Signal(str)
+    # Signal that indicates the nexus file has been changed in some way,
+    # carries the file and a list of FileChange describing what changed
+    file_changed = Signal()
+    # Signal emitted immediately with the FileChange for every edit, even inside batch_changes,
+    # for keeping indexes of the file contents up to date
+    node_changed = Signal()
+    # Carries the file
+    file_opened = Signal()
+    # Carries the component name, its geometry and its pixel positions
+    component_added = Signal()
+    # Carries the component name
+    component_removed = Signal()
     transformation_changed = Signal()
-    show_entries_dialog = Signal("QVariant", "QVariant")
+    # Carries the entry groups keyed by name, and the file
+    show_entries_dialog = Signal()
 
     def __init__(
         self,
@@ -73,55 +97,115 @@ class NexusWrapper(QObject):
         entry_name: str = "entry",
         instrument_name: str = "instrument",
     ):
-        super().__init__()
-        self.nexus_file = set_up_in_memory_nexus_file(filename)
-        self.entry = self.create_nx_group(entry_name, "NXentry", self.nexus_file)
-        self.instrument = self.create_nx_group(
-            instrument_name, "NXinstrument", self.entry
-        )
-        self.create_nx_group("sample", "NXsample", self.entry)
+        # Depth of nested batch_changes blocks and the changes recorded inside them
+        self._batch_depth = 0
+        self._pending_changes = []
+        # The file on disk which large datasets are read from, if the file was opened lazily
+        self.lazy_source: Optional[SourceFileIdentity] = None
+        # What depends on each transformation, kept in step with every change to the file
+        self.dependency_graph = DependencyGraph()
 
-        self._emit_file()
+        self.nexus_file = set_up_in_memory_nexus_file(filename)
+        with self.batch_changes():
+            self.entry = self.create_nx_group(entry_name, "NXentry", self.nexus_file)
+            self.instrument = self.create_nx_group(
+                instrument_name, "NXinstrument", self.entry
+            )
+            self.create_nx_group("sample", "NXsample", self.entry)
 
-    def _emit_file(self):
+    def _emit_file(self, change: FileChange):
         """
-        Calls the file_changed signal with the updated file object when the structure is changed.
+        Calls the file_changed signal with the updated file object and a description of the change.
+        If called inside a batch_changes block the signal is deferred until the outermost block exits.
+        :param change: Describes which node changed and how.
         :return: None
         """
-        self.file_changed.emit(self.nexus_file)
+        self.dependency_graph.update(change, self.nexus_file)
+        self.node_changed.emit(change)
+        self._pending_changes.append(change)
+        if self._batch_depth > 0:
+            return
+        changes = coalesce_changes(self._pending_changes)
+        self._pending_changes = []
+        self.file_changed.emit(self.nexus_file, changes)
+
+    @contextmanager
+    def batch_changes(self):
+        """
+        Context manager which coalesces all file_changed emissions made inside it into a single emission when the
+        outermost block exits, carrying the merged list of changes. Blocks can be nested. Use this around operations
+        which make several edits to the file, so that listeners such as the NeXus tree view only update once.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_changes:
+                changes = coalesce_changes(self._pending_changes)
+                self._pending_changes = []
+                self.file_changed.emit(self.nexus_file, changes)
 
     def save_file(self, filename: str):
         """
         Saves the in-memory NeXus file to a physical file if the filename is valid.
         :param filename: Absolute file path to the file to save.
+        :raises SourceFileChangedError: If the file was opened lazily and has since been moved, deleted or modified,
+        in which case nothing is saved.
         :return: None
         """
         if filename:
             logging.debug(filename)
-            file = h5py.File(append_nxs_extension(filename), mode="x")
+            self.check_lazy_source()
+            filename = append_nxs_extension(filename)
+            file = h5py.File(filename, mode="x")
             try:
                 file.copy(
                     source=self.nexus_file["/entry/"],
                     dest="/entry/",
                     without_attrs=False,
                 )
+                if self.lazy_source is not None:
+                    materialise_lazy_datasets(file, self.lazy_source)
+                self.dependency_graph.write_dependee_of_attributes(file)
                 logging.info("Saved to NeXus file")
             except ValueError as e:
                 logging.error(f"File writing failed: {e}")
+            except SourceFileChangedError:
+                # Rather than leave a file with zeros in place of the data that could not be read
+                file.close()
+                os.remove(filename)
+                raise
+
+    def check_lazy_source(self):
+        """
+        Check that the data of large datasets can still be read, if the file was opened lazily.
+        :raises SourceFileChangedError: If the file they are read from has been moved, deleted or modified.
+        """
+        if self.lazy_source is not None:
+            self.lazy_source.check()
 
-    def open_file(self, filename: str):
+    def open_file(self, filename: str, lazy: bool = False):
         """
         Opens a physical file into memory and sets the model to use it.
         :param filename: Absolute file path to the file to open.
+        :param lazy: If True only the structure and small datasets are read into memory, large datasets are read from
+        the file on disk when they are accessed. The file on disk is never modified.
         :return:
         """
         if filename:
+            if lazy:
+                nexus_file, source = open_file_skeleton(filename)
+                return self.load_nexus_file(nexus_file, lazy_source=source)
             nexus_file = h5py.File(
                 filename, mode="r+", backing_store=False, driver="core"
             )
             return self.load_nexus_file(nexus_file)
 
-    def load_nexus_file(self, nexus_file: h5py.File):
+    def load_nexus_file(
+        self, nexus_file: h5py.File, lazy_source: Optional[SourceFileIdentity] = None
+    ):
+        self.lazy_source = lazy_source
         entries = self.find_entries_in_file(nexus_file)
         self.file_opened.emit(nexus_file)
         return entries
@@ -160,17 +244,19 @@ class NexusWrapper(QObject):
         self.entry = entry
         self.instrument = self.get_instrument_group_from_entry(self.entry)
         self.nexus_file = nexus_file
-        self._generate_dependee_of_attributes()
         logging.info("NeXus file loaded")
-        self._emit_file()
+        self._emit_file(FileChange(ChangeType.RELOADED, "/"))
 
     def rename_node(self, node: h5Node, new_name: str):
-        self.nexus_file.move(node.name, f"{node.parent.name}/{new_name}")
-        self._emit_file()
+        old_path = node.name
+        new_path = f"{node.parent.name}/{new_name}"
+        self.nexus_file.move(old_path, new_path)
+        self._emit_file(FileChange(ChangeType.RENAMED, old_path, new_path))
 
     def delete_node(self, node: h5Node):
-        del self.nexus_file[node.name]
-        self._emit_file()
+        path = node.name
+        del self.nexus_file[path]
+        self._emit_file(FileChange(ChangeType.REMOVED, path))
 
     def create_nx_group(
         self, name: str, nx_class: str, parent: h5py.Group
@@ -184,42 +270,9 @@ class NexusWrapper(QObject):
         """
         group = parent.create_group(name)
         group.attrs[CommonAttrs.NX_CLASS] = nx_class
-        self._emit_file()
+        self._emit_file(FileChange(ChangeType.ADDED, group.name))
         return group
 
-    def _generate_dependee_of_attributes(self):
-        """
-        Fill in the dependee_of attribute for transformations that are linked to.
-        """
-        component_depends_on = {}
-
-        def find_depends_on_for_components(_, node):
-            if isinstance(node, h5py.Group):
-                if CommonAttrs.DEPENDS_ON in node.keys():
-                    component_depends_on[node.name] = node[CommonAttrs.DEPENDS_ON][()]
-
-        self.nexus_file["/"].visititems(find_depends_on_for_components)
-
-        transforms_dependee_of = {}
-        for group_name, depends_on_transform in component_depends_on.items():
-            try:
-                depends_on_transform = depends_on_transform.decode(
-                    "UTF-8"
-                )  # transform name is byte-string, so decode
-            except AttributeError:
-                pass  # transform name is already a string
-            if f"{group_name}/{depends_on_transform}" in self.nexus_file:
-                # depends_on is relative, change to an absolute path
-                depends_on_transform = f"{group_name}/{depends_on_transform}"
-            if depends_on_transform not in transforms_dependee_of.keys():
-                transforms_dependee_of[depends_on_transform] = []
-            transforms_dependee_of[depends_on_transform].append(group_name)
-
-        for transform, dependee_of in transforms_dependee_of.items():
-            self.nexus_file[transform].attrs[CommonAttrs.DEPENDEE_OF] = np.array(
-                dependee_of, dtype=h5py.special_dtype(vlen=str)
-            )
-
     def duplicate_nx_group(
         self, group_to_duplicate: h5py.Group, new_group_name: str
     ) -> h5py.Group:
@@ -229,17 +282,38 @@ class NexusWrapper(QObject):
             source=group_to_duplicate,
             name=new_group_name,
         )
-        self._emit_file()
-        return group_to_duplicate.parent[new_group_name]
+        new_group = group_to_duplicate.parent[new_group_name]
+        self._emit_file(FileChange(ChangeType.ADDED, new_group.name))
+        return new_group
+
+    def copy_node(
+        self, source: h5Node, parent: h5py.Group, name: str, expand_soft: bool = False
+    ) -> h5Node:
+        """
+        Copy a node, which may be in another file, into this file
+        :param source: The group or dataset to copy
+        :param parent: Group to copy the node into
+        :param name: Name of the copy
+        :param expand_soft: If True then copy the objects soft links point to rather than the links
+        :return: The copy
+        """
+        parent.copy(source=source, dest=parent, name=name, expand_soft=expand_soft)
+        new_node = parent[name]
+        self._emit_file(FileChange(ChangeType.ADDED, new_node.name))
+        return new_node
 
     def set_nx_class(self, group: h5py.Group, nx_class: str):
         group.attrs[CommonAttrs.NX_CLASS] = nx_class
-        self._emit_file()
+        self._emit_file(FileChange(ChangeType.ATTRS_CHANGED, group.name))
 
-    @staticmethod
-    def get_field_value(group: h5py.Group, name: str) -> Optional[Any]:
+    def get_field_value(self, group: h5py.Group, name: str) -> Optional[Any]:
+        """
+        :raises SourceFileChangedError: If the field is read from a lazily opened file which has since changed.
+        """
         if name not in group:
             return None
+        if getattr(group[name], "is_virtual", False):
+            self.check_lazy_source()
         value = group[name][...]
         if value.dtype.type is np.string_:
             value = str(value, "utf8")
@@ -270,12 +344,14 @@ class NexusWrapper(QObject):
 
         if isinstance(value, h5py.SoftLink):
             group[name] = value
+            self._emit_file(FileChange(ChangeType.ADDED, f"{group.name}/{name}"))
             return group[name]
 
         if isinstance(value, h5py.Group):
             if name in group:
                 del group[name]
             value.copy(dest=group, source=value)
+            self._emit_file(FileChange(ChangeType.ADDED, group[name].name))
             return group[name]
 
         if dtype is str:
@@ -285,8 +361,12 @@ class NexusWrapper(QObject):
         if dtype == np.object:
             dtype = h5py.special_dtype(vlen=str)
         ds = None
+        change_type = ChangeType.VALUE_CHANGED if name in group else ChangeType.ADDED
         if name in group:
-            if dtype is None or group[name].dtype == dtype:
+            if group[name].is_virtual:
+                # Virtual datasets read from other files, so they are replaced rather than written through
+                ds = self._recreate_dataset(group, name, value, dtype)
+            elif dtype is None or group[name].dtype == dtype:
                 try:
                     group[name][...] = value
                 except TypeError:
@@ -302,13 +382,14 @@ class NexusWrapper(QObject):
         except AttributeError:
             pass
 
-        self._emit_file()
+        self._emit_file(FileChange(change_type, group[name].name))
         return group[name]
 
     def delete_field_value(self, group: h5py.Group, name: str):
         try:
+            path = group[name].name
             del group[name]
-            self._emit_file()
+            self._emit_file(FileChange(ChangeType.REMOVED, path))
         except KeyError:
             pass
 
@@ -331,16 +412,16 @@ class NexusWrapper(QObject):
                 )
                 for index, item in enumerate(value):
                     node.attrs[name][index] = item.encode("utf-8")
-                self._emit_file()
+                self._emit_file(FileChange(ChangeType.ATTRS_CHANGED, node.name))
                 return
 
         node.attrs[name] = value
-        self._emit_file()
+        self._emit_file(FileChange(ChangeType.ATTRS_CHANGED, node.name))
 
     def delete_attribute(self, node: h5Node, name: str):
         if name in node.attrs.keys():
             del node.attrs[name]
-        self._emit_file()
+        self._emit_file(FileChange(ChangeType.ATTRS_CHANGED, node.name))
 
     def create_transformations_group_if_does_not_exist(self, parent_group: h5Node):
         for child in parent_group:
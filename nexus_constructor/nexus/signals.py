@@ -0,0 +1,69 @@
+"""
+Signals for the model which call the connected functions directly, without Qt, so that the model can be imported
+cheaply and used where Qt is not available, for example in worker processes.
+They are declared and used in the same way as Qt signals, with connect, disconnect and emit methods, so code using the
+model does not need to know which kind it has. See qt_signal_bridge for re-emitting them as Qt signals.
+"""
+import weakref
+from typing import Callable, List, Optional
+
+
+def _reference(slot: Callable) -> Callable[[], Optional[Callable]]:
+    # Methods are held weakly, as Qt does for the slots of QObjects, so that connecting an object's method to a signal
+    # does not keep the object alive, or create a reference cycle when the object holds the emitter
+    if hasattr(slot, "__self__") and hasattr(slot, "__func__"):
+        return weakref.WeakMethod(slot)
+    return lambda: slot
+
+
+class BoundSignal:
+    """
+    The signal of a single object, holding the functions connected to it
+    """
+
+    def __init__(self):
+        self._slots: List[Callable[[], Optional[Callable]]] = []
+
+    def connect(self, slot: Callable):
+        self._slots.append(_reference(slot))
+
+    def disconnect(self, slot: Optional[Callable] = None):
+        """
+        Disconnect a function, or every function if none is given
+        :raises RuntimeError: if the function is not connected, as a Qt signal does
+        """
+        if slot is None:
+            self._slots = []
+            return
+        for reference in self._slots:
+            if reference() == slot:
+                self._slots.remove(reference)
+                return
+        raise RuntimeError(f"Failed to disconnect signal from {slot}")
+
+    def emit(self, *args):
+        # Copied so that slots can connect or disconnect while the signal is being emitted
+        for reference in list(self._slots):
+            slot = reference()
+            if slot is None:
+                self._slots.remove(reference)
+            else:
+                slot(*args)
+
+
+class Signal:
+    """
+    Declared as a class attribute, like a Qt Signal. Each instance of the class gets its own BoundSignal the first
+    time the signal is accessed through it.
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        signal = BoundSignal()
+        # Stored on the instance, which takes precedence over this descriptor from then on
+        instance.__dict__[self.name] = signal
+        return signal
@@ -0,0 +1,246 @@
+import logging
+from functools import lru_cache
+from typing import List, Optional, Set
+
+import h5py
+import silx.io.utils
+from PySide2.QtCore import QAbstractProxyModel, QModelIndex
+from silx.gui.hdf5 import Hdf5TreeModel, Hdf5TreeView
+from silx.gui.hdf5.Hdf5Item import Hdf5Item
+from silx.gui.hdf5.Hdf5Node import Hdf5Node
+
+from nexus_constructor.nexus.file_changes import (
+    ChangeType,
+    FileChange,
+    parent_path,
+)
+
+
+def update_nexus_tree(
+    view: Hdf5TreeView, nexus_file: h5py.File, changes: Optional[List[FileChange]]
+):
+    """
+    Update the silx tree view to reflect the given changes to the NeXus file, only touching the rows which changed
+    so that the rest of the tree keeps its expansion and selection state.
+    Falls back to rebuilding the whole tree if the changes can't be applied incrementally.
+    :param view: The tree view displaying the file.
+    :param nexus_file: The file which changed.
+    :param changes: Descriptions of what changed, a RELOADED change or None means rebuild everything.
+    """
+    model = view.findHdf5TreeModel()
+    row = model.h5pyObjectRow(nexus_file)
+    if (
+        row == -1
+        or not changes
+        or not can_update_incrementally()
+        or any(change.change_type == ChangeType.RELOADED for change in changes)
+    ):
+        _rebuild_tree(model, nexus_file)
+        return
+
+    file_index = model.index(row, 0, QModelIndex())
+    try:
+        _apply_changes(view, model, file_index, nexus_file, changes)
+    except Exception:
+        logging.exception("Failed to update the NeXus tree view, rebuilding it")
+        _rebuild_tree(model, nexus_file)
+
+
+def _rebuild_tree(model: Hdf5TreeModel, nexus_file: h5py.File):
+    model.clear()
+    model.insertH5pyObject(nexus_file)
+
+
+def _apply_changes(
+    view: Hdf5TreeView,
+    model: Hdf5TreeModel,
+    file_index: QModelIndex,
+    nexus_file: h5py.File,
+    changes: List[FileChange],
+):
+    # Groups whose list of children may have changed, and nodes which exist in both but need their item replacing
+    resync_paths = []
+    replace_paths = []
+    for change in changes:
+        if change.change_type in (ChangeType.ADDED, ChangeType.REMOVED):
+            _append_unique(resync_paths, parent_path(change.path))
+            if change.change_type == ChangeType.ADDED:
+                _append_unique(replace_paths, change.path)
+        elif change.change_type == ChangeType.RENAMED:
+            _append_unique(resync_paths, parent_path(change.path))
+            _append_unique(resync_paths, parent_path(change.new_path))
+        else:
+            _append_unique(replace_paths, change.path)
+
+    expanded_paths = set()
+    for path in replace_paths:
+        index = _find_loaded_index(model, file_index, path)
+        if index is not None:
+            _collect_expanded_paths(view, model, index, path, expanded_paths)
+
+    for path in resync_paths:
+        index = _find_loaded_index(model, file_index, path)
+        if index is not None:
+            _resync_children(model, index, nexus_file, path)
+
+    for path in replace_paths:
+        if path == "/":
+            continue
+        index = _find_loaded_index(model, file_index, path)
+        if index is not None:
+            _replace_item(model, index)
+
+    for path in sorted(expanded_paths, key=lambda p: p.count("/")):
+        index = _find_loaded_index(model, file_index, path, populate=True)
+        if index is not None:
+            view.setExpanded(_map_to_view(view, index), True)
+
+
+def _append_unique(paths: List[str], path: str):
+    if path not in paths:
+        paths.append(path)
+
+
+# silx populates the children of an item the first time they are requested, there is no public accessor for whether
+# this has happened yet so its private list of children is read instead
+_CHILDREN_ATTRIBUTE = "_Hdf5Node__child"
+
+
+@lru_cache(maxsize=None)
+def can_update_incrementally() -> bool:
+    """
+    Whether this version of silx lets the tree be updated incrementally, if not the tree is rebuilt after every change
+    """
+    if hasattr(Hdf5Node(), _CHILDREN_ATTRIBUTE):
+        return True
+    logging.warning(
+        f"Hdf5Node in silx has no {_CHILDREN_ATTRIBUTE} attribute, the NeXus tree view will be rebuilt after every "
+        f"change rather than updated"
+    )
+    return False
+
+
+def _children_loaded(node: Hdf5Node) -> bool:
+    return getattr(node, _CHILDREN_ATTRIBUTE) is not None
+
+
+def _child_row(node, name: str) -> int:
+    for row in range(node.childCount()):
+        if node.child(row).basename == name:
+            return row
+    return -1
+
+
+def _find_loaded_index(
+    model: Hdf5TreeModel, file_index: QModelIndex, path: str, populate: bool = False
+) -> Optional[QModelIndex]:
+    """
+    Find the model index of the item at the given path in the file, without causing silx to load any children which
+    have not been displayed yet unless populate is True.
+    :return: The index, or None if the item is not currently in the model.
+    """
+    index = file_index
+    for name in path.strip("/").split("/"):
+        if not name:
+            continue
+        node = model.nodeFromIndex(index)
+        if not populate and not _children_loaded(node):
+            return None
+        row = _child_row(node, name)
+        if row == -1:
+            return None
+        index = model.index(row, 0, index)
+    return index
+
+
+def _create_item(parent_node, group: h5py.Group, name: str) -> Hdf5Item:
+    class_ = group.get(name, getclass=True)
+    link = group.get(name, getclass=True, getlink=True)
+    return Hdf5Item(
+        text=name,
+        obj=None,
+        parent=parent_node,
+        key=name,
+        h5Class=silx.io.utils.get_h5_class(class_=class_)
+        if class_ is not None
+        else None,
+        linkClass=silx.io.utils.get_h5_class(class_=link),
+    )
+
+
+def _resync_children(
+    model: Hdf5TreeModel, index: QModelIndex, nexus_file: h5py.File, path: str
+):
+    """
+    Remove the rows of children which are no longer in the group and insert rows for new children,
+    leaving rows for children which are still there untouched.
+    """
+    node = model.nodeFromIndex(index)
+    if not _children_loaded(node):
+        return
+    group = nexus_file[path]
+    names = list(group.keys())
+
+    row = 0
+    while row < node.childCount():
+        if node.child(row).basename not in names:
+            model.beginRemoveRows(index, row, row)
+            node.removeChildAtIndex(row)
+            model.endRemoveRows()
+        else:
+            row += 1
+
+    for position, name in enumerate(names):
+        if _child_row(node, name) == -1:
+            position = min(position, node.childCount())
+            model.beginInsertRows(index, position, position)
+            node.insertChild(position, _create_item(node, group, name))
+            model.endInsertRows()
+
+
+def _replace_item(model: Hdf5TreeModel, index: QModelIndex):
+    """
+    Replace the item at index with a fresh one, as silx caches the h5py object and its description in the item.
+    """
+    row = index.row()
+    parent_index = model.parent(index)
+    parent_node = model.nodeFromIndex(parent_index)
+    group = parent_node.obj
+    name = parent_node.child(row).basename
+    model.beginRemoveRows(parent_index, row, row)
+    parent_node.removeChildAtIndex(row)
+    model.endRemoveRows()
+    model.beginInsertRows(parent_index, row, row)
+    parent_node.insertChild(row, _create_item(parent_node, group, name))
+    model.endInsertRows()
+
+
+def _map_to_view(view: Hdf5TreeView, index: QModelIndex) -> QModelIndex:
+    proxies = []
+    model = view.model()
+    while isinstance(model, QAbstractProxyModel):
+        proxies.append(model)
+        model = model.sourceModel()
+    for proxy in reversed(proxies):
+        index = proxy.mapFromSource(index)
+    return index
+
+
+def _collect_expanded_paths(
+    view: Hdf5TreeView,
+    model: Hdf5TreeModel,
+    index: QModelIndex,
+    path: str,
+    expanded_paths: Set[str],
+):
+    if not view.isExpanded(_map_to_view(view, index)):
+        return
+    expanded_paths.add(path)
+    node = model.nodeFromIndex(index)
+    if not _children_loaded(node):
+        return
+    for row in range(node.childCount()):
+        child_path = f"{path.rstrip('/')}/{node.child(row).basename}"
+        _collect_expanded_paths(
+            view, model, model.index(row, 0, index), child_path, expanded_paths
+        )
@@ -8,102 +8,149 @@ https://github.com/geehalel/npindi/blob/57c092200dd9cb259ac1c730a1258a378a1a6342
 import logging
 from typing import List, Tuple
 
+import attr
+
 from nexus_constructor.geometry import OFFGeometry
+from nexus_constructor.geometry.off_geometry import (
+    triangulate_faces,
+    vertices_to_array,
+)
+from nexus_constructor.qentity_utils import (
+    INSTANCE_MATRIX_ATTRIBUTE_NAMES,
+    INSTANCE_OFFSET_ATTRIBUTE_NAME,
+)
 from PySide2.Qt3DRender import Qt3DRender
 from PySide2.Qt3DCore import Qt3DCore
-from PySide2.QtGui import QVector3D
-import struct
-import itertools
+import numpy as np
 
 
-def flatten(list_to_flatten):
+def convert_to_bytes(vectors):
     """
-    Flattens a list of lists into a single list
-    :param list_to_flatten: The list of lists
-    :return: A single list containing all values
+    Converts a list or array of vectors into the byte format required by Qt
+    :param vectors: The vectors to convert
+    :return: The byte representation
     """
-    return itertools.chain.from_iterable(list_to_flatten)
+    return np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
 
 
-def convert_to_bytes(vectors):
+def create_vertex_and_normal_arrays(
+    vertices: np.ndarray, triangles: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Converts a list of vectors into the byte format required by Qt
-    :param vectors: The list of vectors to convert
-    :return: The byte representation
+    Create the per-vertex position and normal arrays for rendering triangles, Qt requires each vertex of each
+    triangle to have its own normal.
+    :param vertices: (V,3) array of vertices
+    :param triangles: (T,3) array of vertex indices
+    :return: (T*3,3) float32 arrays of the positions and normals
     """
-    return struct.pack(f"{len(vectors)}f", *vectors)
+    corners = np.asarray(vertices, dtype=np.float32)[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    # Degenerate triangles get a zero normal, as with QVector3D.normal
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    normals[lengths[:, 0] == 0] = 0
+    return (
+        corners.reshape(-1, 3),
+        np.repeat(normals, 3, axis=0).astype(np.float32, copy=False),
+    )
 
 
-def convert_faces_into_triangles(faces):
+@attr.s
+class AttributeData:
     """
-    Converts the faces into a list of triangles
-    :param faces: List of faces containing the triangles
-    :return: A list of the triangles that make a face
+    The values of a vertex attribute, packed as 3 floats per vertex, or per instance if divisor is not zero
     """
-    triangles = []
-    for face in faces:
-        triangles_in_face = len(face) - 2
-        triangles.extend(
-            [[face[0], face[i + 1], face[i + 2]] for i in range(triangles_in_face)]
-        )
-    return triangles
 
+    name = attr.ib(type=str)
+    data = attr.ib(type=bytes)
+    count = attr.ib(type=int)
+    divisor = attr.ib(type=int, default=0)
 
-def create_vertex_buffer(vertices, faces):
+
+@attr.s
+class MeshBuffers:
     """
-    For each point in each triangle in each face, add its points to the vertices list.
-    To do this we:
-    Separate faces into triangles (with them starting at the 0th point)
-    Get the vertices that are in the triangles
-    Adding them into a flat list of points
-    :param vertices: The vertices in the mesh
-    :param faces: The faces in the mesh
-    :return: A list of the points in the faces
+    Everything needed to upload a mesh to Qt3D. Creating it is the slow part of building a mesh, and does not use Qt,
+    so it can be done away from the GUI thread.
     """
-    triangles = convert_faces_into_triangles(faces)
-
-    flattened_triangles = flatten(triangles)
 
-    return flatten(
-        vertices[point_index].toTuple() for point_index in flattened_triangles
-    )
+    attributes = attr.ib(type=List[AttributeData])
+    vertex_count = attr.ib(type=int)
+    instance_count = attr.ib(type=int)
 
 
-def create_normal_buffer(vertices, faces):
+def create_mesh_buffers(
+    model: OFFGeometry,
+    positions: np.ndarray = None,
+    instanced: bool = False,
+    instance_matrices: np.ndarray = None,
+) -> MeshBuffers:
     """
-    Creates normal vectors for each vertex on the mesh.
-    Qt requires each vertex to have it's own normal.
-    :param vertices: The vertices for the mesh
-    :param faces: The faces in the mesh
-    :return: A list of the normal points for the faces
+    Triangulate a mesh, find its normals and pack them into buffers
+    :param model: The geometry to render
+    :param positions: (N,3) array of positions to copy the mesh into. If None specified a single mesh is
+    produced at the origin.
+    :param instanced: If True the mesh is only stored once and the positions are stored in a per-instance
+    attribute, to be drawn by an instanced renderer with a material which applies the offsets.
+    :param instance_matrices: (N,3,3) array of the matrix applied to the mesh before it is moved to each position,
+    only used if instanced. If None the mesh is not rotated or scaled.
     """
-    triangles = convert_faces_into_triangles(faces)
-    normal_buffer_values = []
-    for triangle in triangles:
-        # Get the vertices of each triangle
-        points = [vertices[p] for p in triangle]
-        # Convert our vector objects into Qt Vectors
-        # Calculate the normal, leveraging Qt
-        normal = QVector3D.normal(*points)
-        # Need to have a normal for each vector
-        normal_buffer_values.extend(normal.toTuple() * 3)
-    return normal_buffer_values
-
-
-def repeat_shape_over_positions(
-    model: OFFGeometry, positions: List[QVector3D]
-) -> Tuple[List[List[int]], List[QVector3D]]:
-    faces = []
-    vertices = []
-    for i, position in enumerate(positions):
-        vertices.extend([vertex + position for vertex in model.vertices])
-        faces.extend(
-            [
-                [vertex + i * len(model.vertices) for vertex in face]
-                for face in model.faces
-            ]
+    if positions is None:
+        positions = np.zeros((1, 3))
+
+    vertices = model.vertices_array
+    triangles = triangulate_faces(
+        model.winding_order_array, model.winding_order_indices_array
+    )
+    vertex_positions, vertex_normals = create_vertex_and_normal_arrays(
+        vertices, triangles
+    )
+    offsets = vertices_to_array(positions)
+    attributes = []
+    if instanced:
+        attributes.append(
+            AttributeData(
+                INSTANCE_OFFSET_ATTRIBUTE_NAME,
+                convert_to_bytes(offsets),
+                len(offsets),
+                divisor=1,
+            )
+        )
+        if instance_matrices is None:
+            instance_matrices = np.tile(np.identity(3), (len(offsets), 1, 1))
+        for column, name in enumerate(INSTANCE_MATRIX_ATTRIBUTE_NAMES):
+            attributes.append(
+                AttributeData(
+                    name,
+                    convert_to_bytes(instance_matrices[:, :, column]),
+                    len(offsets),
+                    divisor=1,
+                )
+            )
+        instance_count = len(offsets)
+    else:
+        # Copy the triangles to each position, the normals are the same for every copy
+        vertex_positions = (
+            vertex_positions[np.newaxis, :, :] + offsets[:, np.newaxis, :]
+        ).reshape(-1, 3)
+        vertex_normals = np.tile(vertex_normals, (len(offsets), 1))
+        instance_count = 1
+
+    attributes.append(
+        AttributeData(
+            Qt3DRender.QAttribute.defaultPositionAttributeName(),
+            convert_to_bytes(vertex_positions),
+            len(vertex_positions),
         )
-    return faces, vertices
+    )
+    attributes.append(
+        AttributeData(
+            Qt3DRender.QAttribute.defaultNormalAttributeName(),
+            convert_to_bytes(vertex_normals),
+            len(vertex_normals),
+        )
+    )
+    return MeshBuffers(attributes, len(vertex_positions), instance_count)
 
 
 class QtOFFGeometry(Qt3DRender.QGeometry):
@@ -115,44 +162,48 @@ class QtOFFGeometry(Qt3DRender.QGeometry):
     q_attribute = Qt3DRender.QAttribute
 
     def __init__(
-        self, model: OFFGeometry, positions: List[QVector3D] = None, parent=None
+        self,
+        model: OFFGeometry,
+        positions: np.ndarray = None,
+        parent=None,
+        instanced: bool = False,
+        instance_matrices: np.ndarray = None,
+        buffers: MeshBuffers = None,
     ):
         """
         Creates the geometry for the OFF to be displayed in Qt3D.
         :param model: The geometry to render
-        :param positions: The posit
-        :param parent: A list of positions to copy the mesh into. If None specified a single mesh is
+        :param positions: (N,3) array of positions to copy the mesh into. If None specified a single mesh is
         produced at the origin.
+        :param parent: The parent of the geometry
+        :param instanced: If True the mesh is only stored once and the positions are stored in a per-instance
+        attribute, to be drawn by an instanced renderer with a material which applies the offsets.
+        :param instance_matrices: (N,3,3) array of the matrix applied to the mesh before it is moved to each position,
+        only used if instanced. If None the mesh is not rotated or scaled.
+        :param buffers: Buffers already made by create_mesh_buffers, the other arguments are ignored if given
         """
         super().__init__(parent)
 
-        if positions is None:
-            positions = [QVector3D(0, 0, 0)]
-
-        faces, vertices = repeat_shape_over_positions(model, positions)
-
-        vertex_buffer_values = list(create_vertex_buffer(vertices, faces))
-        normal_buffer_values = create_normal_buffer(vertices, faces)
-
-        positionAttribute = self.create_attribute(
-            vertex_buffer_values, self.q_attribute.defaultPositionAttributeName()
-        )
-        normalAttribute = self.create_attribute(
-            normal_buffer_values, self.q_attribute.defaultNormalAttributeName()
-        )
-
-        self.addAttribute(positionAttribute)
-        self.addAttribute(normalAttribute)
-        self.vertex_count = len(vertex_buffer_values) // 3
+        if buffers is None:
+            buffers = create_mesh_buffers(
+                model, positions, instanced, instance_matrices
+            )
+        for attribute_data in buffers.attributes:
+            self.addAttribute(self.create_attribute(attribute_data))
+        self.vertex_count = buffers.vertex_count
+        self.instance_count = buffers.instance_count
 
         logging.info("Qt mesh built")
 
-    def create_attribute(self, buffer_values, name):
+    def create_attribute(self, attribute_data: AttributeData):
+        """
+        Create a vertex attribute backed by a buffer holding its values
+        """
         SIZE_OF_FLOAT_IN_STRUCT = 4
         POINTS_IN_VECTOR = 3
 
         buffer = Qt3DRender.QBuffer(self)
-        buffer.setData(convert_to_bytes(buffer_values))
+        buffer.setData(attribute_data.data)
 
         attribute = self.q_attribute(self)
         attribute.setAttributeType(self.q_attribute.VertexAttribute)
@@ -160,8 +211,9 @@ class QtOFFGeometry(Qt3DRender.QGeometry):
         attribute.setDataSize(POINTS_IN_VECTOR)
         attribute.setByteOffset(0)
         attribute.setByteStride(POINTS_IN_VECTOR * SIZE_OF_FLOAT_IN_STRUCT)
-        attribute.setCount(len(buffer_values))
-        attribute.setName(name)
+        attribute.setCount(attribute_data.count)
+        attribute.setDivisor(attribute_data.divisor)
+        attribute.setName(attribute_data.name)
         return attribute
 
 
@@ -174,19 +226,30 @@ class OffMesh(Qt3DRender.QGeometryRenderer):
         self,
         geometry: OFFGeometry,
         parent: Qt3DCore.QEntity,
-        positions: List[QVector3D] = None,
+        positions: np.ndarray = None,
+        instanced: bool = False,
+        instance_matrices: np.ndarray = None,
+        buffers: MeshBuffers = None,
     ):
         """
         Creates a geometry renderer for OFF geometry.
         :param geometry: The geometry to render
         :param parent: The parent entity to attach the mesh to.
-        :param positions: A list of positions to copy the mesh into. If None specified a single mesh is
+        :param positions: (N,3) array of positions to copy the mesh into. If None specified a single mesh is
         produced at the origin.
+        :param instanced: If True the mesh is uploaded once and drawn once per position, which needs a material
+        from create_instanced_material. Otherwise the mesh is copied to each position.
+        :param instance_matrices: (N,3,3) array of the matrix which rotates and scales the mesh at each position,
+        only used if instanced
+        :param buffers: Buffers already made by create_mesh_buffers, for example on another thread. The geometry,
+        positions and instancing arguments are ignored if given.
         """
         super().__init__(parent)
 
-        self.setInstanceCount(1)
-        qt_geometry = QtOFFGeometry(geometry, positions, self)
+        qt_geometry = QtOFFGeometry(
+            geometry, positions, self, instanced, instance_matrices, buffers
+        )
+        self.setInstanceCount(qt_geometry.instance_count)
         self.setVertexCount(qt_geometry.vertex_count)
         self.setFirstVertex(0)
         self.setPrimitiveType(Qt3DRender.QGeometryRenderer.Triangles)
@@ -6,7 +6,7 @@ import numpy as np
 
 from nexus_constructor.component.component import Component
 from nexus_constructor.geometry import OFFGeometryNexus
-from nexus_constructor.geometry.geometry_loader import load_geometry
+from nexus_constructor.geometry.geometry_loader import mesh_file_cache
 from nexus_constructor.pixel_data import (
     PixelGrid,
     PixelMapping,
@@ -416,12 +416,12 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
     @staticmethod
     def get_number_of_faces_from_mesh_file(filename: str) -> int:
         """
-        Creates a temporary geometry and uses this is order to determine the number of faces in the file.
+        Determines the number of faces in the file, sharing the parsed file with the validator and the final load.
         :param filename: The filename for the mesh.
         :return: The number of faces in the mesh.
         """
-        temp_geometry = load_geometry(filename, "m")
-        return len(temp_geometry.faces)
+        _, _, winding_order_indices = mesh_file_cache.get(filename)
+        return len(winding_order_indices)
 
     def hide_pixel_options_stack(self):
         """
@@ -5,6 +5,110 @@ from PySide2.Qt3DExtras import Qt3DExtras
 from PySide2.Qt3DRender import Qt3DRender
 from PySide2.QtGui import QColor
 
+# Name of the per-instance attribute holding the offset of each copy of an instanced mesh
+INSTANCE_OFFSET_ATTRIBUTE_NAME = "instanceOffset"
+# Names of the per-instance attributes holding the columns of the matrix which rotates and scales each copy
+INSTANCE_MATRIX_ATTRIBUTE_NAMES = (
+    "instanceMatrixX",
+    "instanceMatrixY",
+    "instanceMatrixZ",
+)
+
+# Shaders for rendering a mesh once per instance, each copy transformed by its matrix then moved by its offset, lit
+# by a light at the camera. The normals are transformed by the same matrix, which is only correct for matrices which
+# scale equally in every direction at right angles to the normals, as for the unit cylinder.
+INSTANCED_VERTEX_SHADER_GL3 = b"""
+#version 150 core
+
+in vec3 vertexPosition;
+in vec3 vertexNormal;
+in vec3 instanceOffset;
+in vec3 instanceMatrixX;
+in vec3 instanceMatrixY;
+in vec3 instanceMatrixZ;
+
+out vec3 worldPosition;
+out vec3 worldNormal;
+
+uniform mat4 modelMatrix;
+uniform mat3 modelNormalMatrix;
+uniform mat4 modelViewProjection;
+
+void main()
+{
+    mat3 instanceMatrix = mat3(instanceMatrixX, instanceMatrixY, instanceMatrixZ);
+    vec4 position = vec4(instanceMatrix * vertexPosition + instanceOffset, 1.0);
+    worldNormal = normalize(modelNormalMatrix * (instanceMatrix * vertexNormal));
+    worldPosition = vec3(modelMatrix * position);
+    gl_Position = modelViewProjection * position;
+}
+"""
+
+INSTANCED_FRAGMENT_SHADER_GL3 = b"""
+#version 150 core
+
+in vec3 worldPosition;
+in vec3 worldNormal;
+
+out vec4 fragColor;
+
+uniform vec4 ka;
+uniform vec4 kd;
+uniform vec3 eyePosition;
+
+void main()
+{
+    vec3 toEye = normalize(eyePosition - worldPosition);
+    float diffuse = abs(dot(normalize(worldNormal), toEye));
+    fragColor = vec4(ka.rgb + kd.rgb * diffuse, 1.0);
+}
+"""
+
+INSTANCED_VERTEX_SHADER_GL2 = b"""
+attribute vec3 vertexPosition;
+attribute vec3 vertexNormal;
+attribute vec3 instanceOffset;
+attribute vec3 instanceMatrixX;
+attribute vec3 instanceMatrixY;
+attribute vec3 instanceMatrixZ;
+
+varying vec3 worldPosition;
+varying vec3 worldNormal;
+
+uniform mat4 modelMatrix;
+uniform mat3 modelNormalMatrix;
+uniform mat4 modelViewProjection;
+
+void main()
+{
+    mat3 instanceMatrix = mat3(instanceMatrixX, instanceMatrixY, instanceMatrixZ);
+    vec4 position = vec4(instanceMatrix * vertexPosition + instanceOffset, 1.0);
+    worldNormal = normalize(modelNormalMatrix * (instanceMatrix * vertexNormal));
+    worldPosition = vec3(modelMatrix * position);
+    gl_Position = modelViewProjection * position;
+}
+"""
+
+INSTANCED_FRAGMENT_SHADER_GL2 = b"""
+#ifdef GL_ES
+precision highp float;
+#endif
+
+varying vec3 worldPosition;
+varying vec3 worldNormal;
+
+uniform vec4 ka;
+uniform vec4 kd;
+uniform vec3 eyePosition;
+
+void main()
+{
+    vec3 toEye = normalize(eyePosition - worldPosition);
+    float diffuse = abs(dot(normalize(worldNormal), toEye));
+    gl_FragColor = vec4(ka.rgb + kd.rgb * diffuse, 1.0);
+}
+"""
+
 
 def create_material(
     ambient: QColor,
@@ -39,6 +143,75 @@ def create_material(
     return material
 
 
+def _create_instanced_technique(
+    effect: Qt3DRender.QEffect,
+    profile: Qt3DRender.QGraphicsApiFilter.OpenGLProfile,
+    major_version: int,
+    minor_version: int,
+    vertex_shader: bytes,
+    fragment_shader: bytes,
+) -> Qt3DRender.QTechnique:
+    technique = Qt3DRender.QTechnique(effect)
+    api_filter = technique.graphicsApiFilter()
+    api_filter.setApi(Qt3DRender.QGraphicsApiFilter.OpenGL)
+    api_filter.setProfile(profile)
+    api_filter.setMajorVersion(major_version)
+    api_filter.setMinorVersion(minor_version)
+
+    # The default forward renderer only draws techniques with this filter key
+    filter_key = Qt3DRender.QFilterKey(technique)
+    filter_key.setName("renderingStyle")
+    filter_key.setValue("forward")
+    technique.addFilterKey(filter_key)
+
+    shader_program = Qt3DRender.QShaderProgram(technique)
+    shader_program.setVertexShaderCode(vertex_shader)
+    shader_program.setFragmentShaderCode(fragment_shader)
+    render_pass = Qt3DRender.QRenderPass(technique)
+    render_pass.setShaderProgram(shader_program)
+    technique.addRenderPass(render_pass)
+    return technique
+
+
+def create_instanced_material(
+    ambient: QColor, diffuse: QColor, parent: Qt3DCore.QEntity
+) -> Qt3DRender.QMaterial:
+    """
+    Creates a material for meshes which are drawn once per instance, each copy transformed by the instance's values
+    of the INSTANCE_MATRIX_ATTRIBUTE_NAMES attributes and moved by its value of the INSTANCE_OFFSET_ATTRIBUTE_NAME
+    attribute. The built-in materials ignore per-instance attributes.
+    :param ambient: The desired ambient colour of the material.
+    :param diffuse: The desired diffuse colour of the material.
+    :return A material that is now able to be added to an entity.
+    """
+    material = Qt3DRender.QMaterial(parent)
+    effect = Qt3DRender.QEffect(material)
+    effect.addTechnique(
+        _create_instanced_technique(
+            effect,
+            Qt3DRender.QGraphicsApiFilter.CoreProfile,
+            3,
+            2,
+            INSTANCED_VERTEX_SHADER_GL3,
+            INSTANCED_FRAGMENT_SHADER_GL3,
+        )
+    )
+    effect.addTechnique(
+        _create_instanced_technique(
+            effect,
+            Qt3DRender.QGraphicsApiFilter.NoProfile,
+            2,
+            0,
+            INSTANCED_VERTEX_SHADER_GL2,
+            INSTANCED_FRAGMENT_SHADER_GL2,
+        )
+    )
+    material.setEffect(effect)
+    material.addParameter(Qt3DRender.QParameter("ka", ambient, material))
+    material.addParameter(Qt3DRender.QParameter("kd", diffuse, material))
+    return material
+
+
 def create_qentity(
     components: List[Qt3DCore.QComponent], parent=None
 ) -> Qt3DCore.QEntity:
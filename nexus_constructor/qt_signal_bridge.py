@@ -0,0 +1,34 @@
+from PySide2.QtCore import QObject, Signal
+
+from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
+
+NEXUS_WRAPPER_SIGNALS = [
+    "file_changed",
+    "node_changed",
+    "file_opened",
+    "component_added",
+    "component_removed",
+    "transformation_changed",
+    "show_entries_dialog",
+]
+
+
+class QtNexusSignals(QObject):
+    """
+    Re-emits the signals of a NexusWrapper as Qt signals, so that widgets and the 3D view can be connected to them
+    with the usual Qt behaviour, such as slots being disconnected when their widget is deleted.
+    The signals have the same names and arguments as those of NexusWrapper, which should still be used to emit them.
+    """
+
+    file_changed = Signal("QVariant", "QVariant")
+    node_changed = Signal("QVariant")
+    file_opened = Signal("QVariant")
+    component_added = Signal(str, "QVariant", "QVariant")
+    component_removed = Signal(str)
+    transformation_changed = Signal()
+    show_entries_dialog = Signal("QVariant", "QVariant")
+
+    def __init__(self, nexus_wrapper: NexusWrapper, parent: QObject = None):
+        super().__init__(parent)
+        for name in NEXUS_WRAPPER_SIGNALS:
+            getattr(nexus_wrapper, name).connect(getattr(self, name).emit)
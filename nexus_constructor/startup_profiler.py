@@ -0,0 +1,179 @@
+"""
+Records how long each module takes to import and each stage of starting the application takes, to find what delays
+the main window appearing. Enabled by running main.py with --profile-startup.
+"""
+import importlib.abc
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import attr
+
+# Number of modules to list in the report, the slowest first
+REPORTED_MODULES = 40
+
+
+@attr.s
+class ModuleImportTime:
+    """
+    self_time excludes the time spent importing other modules from the module, cumulative_time includes it
+    """
+
+    name = attr.ib(type=str)
+    self_time = attr.ib(type=float)
+    cumulative_time = attr.ib(type=float)
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """
+    Times executing a module, leaving the module's own loader in its __loader__ and __spec__ as some packages use it
+    to find their resources
+    """
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        module.__loader__ = self.loader
+        module.__spec__.loader = self.loader
+        with self.profiler.importing(module.__name__):
+            self.loader.exec_module(module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Finds each module with the other finders and wraps its loader to time it
+    """
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+        self._finding = False
+
+    def find_spec(self, fullname, path, target=None):
+        # Other finders can import modules while finding one, which must not come back here
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._finding = False
+        if spec is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self.profiler)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Times module imports and named stages of startup. Does nothing unless enabled, so it can be left in place.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.modules: List[ModuleImportTime] = []
+        self.stages: List[Tuple[str, float]] = []
+        self._import_timer = _ImportTimer(self)
+        # Time spent importing other modules from each module currently being imported
+        self._nested_import_times: List[float] = []
+        self._start_time: Optional[float] = None
+
+    def start(self):
+        if not self.enabled:
+            return
+        self._start_time = time.perf_counter()
+        sys.meta_path.insert(0, self._import_timer)
+
+    def stop(self) -> float:
+        """
+        Stop timing imports
+        :return: Seconds since the profiler was started
+        """
+        if self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+        if self._start_time is None:
+            return 0.0
+        return time.perf_counter() - self._start_time
+
+    @contextmanager
+    def importing(self, name: str):
+        self._nested_import_times.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative_time = time.perf_counter() - start
+            self_time = cumulative_time - self._nested_import_times.pop()
+            if self._nested_import_times:
+                self._nested_import_times[-1] += cumulative_time
+            self.modules.append(ModuleImportTime(name, self_time, cumulative_time))
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a stage of startup, such as creating the main window
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.stages.append((name, time.perf_counter() - start))
+
+    def import_times_by_package(self) -> Dict[str, float]:
+        """
+        :return: Total time spent executing the modules of each top level package, in seconds
+        """
+        times: Dict[str, float] = {}
+        for module in self.modules:
+            package = module.name.split(".")[0]
+            times[package] = times.get(package, 0.0) + module.self_time
+        return times
+
+    def report(self, total_time: float = None) -> str:
+        lines = []
+        if total_time is not None:
+            lines.append(f"Startup took {total_time * 1000:.0f} ms")
+        lines.append("Stages:")
+        lines += [
+            f"  {seconds * 1000:8.1f} ms  {name}" for name, seconds in self.stages
+        ]
+        lines.append("Imports by package:")
+        lines += [
+            f"  {seconds * 1000:8.1f} ms  {package}"
+            for package, seconds in sorted(
+                self.import_times_by_package().items(), key=lambda item: -item[1]
+            )
+        ]
+        lines.append("Slowest modules (self, cumulative):")
+        lines += [
+            f"  {module.self_time * 1000:8.1f} ms  {module.cumulative_time * 1000:8.1f} ms  {module.name}"
+            for module in sorted(self.modules, key=lambda module: -module.self_time)[
+                :REPORTED_MODULES
+            ]
+        ]
+        return "\n".join(lines)
+
+    def finish(self, output_filename: Optional[str] = None):
+        """
+        Stop the profiler and write the report to a file, or the log if no file is given
+        """
+        if not self.enabled:
+            return
+        report = self.report(self.stop())
+        if output_filename:
+            with open(output_filename, "w") as file:
+                file.write(report + "\n")
+        else:
+            logging.info(report)
@@ -0,0 +1,149 @@
+from typing import Dict, List, Set, Optional
+
+import numpy as np
+
+from nexus_constructor.nexus import nexus_wrapper as nx
+from nexus_constructor.nexus.file_changes import (
+    ChangeType,
+    FileChange,
+    is_same_or_descendant,
+)
+from nexus_constructor.transformation_engine import (
+    NO_PARENT,
+    local_matrices,
+    read_depends_on,
+    read_is_rotation,
+    read_magnitude,
+    read_vector,
+    resolve_transformations,
+)
+
+
+class TransformationCache:
+    """
+    Caches the composed matrix of the depends_on chain starting at each transformation, and the resulting matrix of
+    each component, keyed by absolute path in the NeXus file.
+    When the file reports a change to a transformation or component, only that entry and the entries which were
+    composed from it are invalidated, so unchanged chains are not re-read from the file.
+    """
+
+    def __init__(self, nexus_wrapper: nx.NexusWrapper):
+        self.nexus = nexus_wrapper
+        self._matrices: Dict[str, np.ndarray] = {}
+        # Path of a cached entry mapped to the paths of the cached entries whose matrix was composed from it
+        self._dependents: Dict[str, Set[str]] = {}
+        self.nexus.node_changed.connect(self._on_node_changed)
+
+    def component_matrix(self, component: "Component") -> np.ndarray:  # noqa: F821
+        """
+        Get the matrix describing the position and orientation of the component, equivalent to component.matrix
+        :param component: The component to get the matrix for
+        :return: The composed matrix of the component's full depends_on chain
+        :raises ValueError: if the chain contains a cycle
+        """
+        component_path = component.absolute_path
+        if component_path not in self._matrices:
+            transform_path = read_depends_on(component.group)
+            if transform_path is None:
+                self._matrices[component_path] = np.identity(4)
+            else:
+                self._resolve_chain(transform_path)
+                self._matrices[component_path] = self._matrices[transform_path]
+                self._add_dependent(transform_path, component_path)
+        return self._matrices[component_path].copy()
+
+    def transformation_matrix(self, path: str) -> np.ndarray:
+        """
+        Get the composed matrix of the depends_on chain which starts at the transformation with the given path
+        :param path: Absolute path of the transformation dataset
+        :raises ValueError: if the chain contains a cycle
+        """
+        self._resolve_chain(path)
+        return self._matrices[path].copy()
+
+    def resolve_all(self):
+        """
+        Resolve and cache every transformation in the entry in one batch, for example after loading a file
+        :raises ValueError: if any depends_on chain contains a cycle, nothing is cached
+        """
+        resolved = resolve_transformations(self.nexus.entry)
+        for i, path in enumerate(resolved.paths):
+            self._matrices[path] = resolved.matrices[i]
+            parent = resolved.parents[i]
+            if parent != NO_PARENT:
+                self._add_dependent(resolved.paths[parent], path)
+
+    def invalidate(self, path: str):
+        """
+        Remove the cached matrix for the given path and for everything composed from it
+        """
+        paths_to_remove = [path]
+        while paths_to_remove:
+            current_path = paths_to_remove.pop()
+            self._matrices.pop(current_path, None)
+            paths_to_remove.extend(self._dependents.pop(current_path, ()))
+
+    def clear(self):
+        self._matrices = {}
+        self._dependents = {}
+
+    def _resolve_chain(self, path: str):
+        """
+        :raises ValueError: if the chain contains a cycle, nothing is cached for it
+        """
+        # Walk along the chain until reaching its end or a link which is already cached
+        chain: List[str] = []
+        visited: Set[str] = set()
+        current_path: Optional[str] = path
+        while current_path is not None and current_path not in self._matrices:
+            if current_path in visited:
+                raise ValueError(
+                    f"depends_on chain starting at {path} contains a cycle through {current_path}"
+                )
+            visited.add(current_path)
+            chain.append(current_path)
+            current_path = read_depends_on(self.nexus.nexus_file[current_path])
+        if not chain:
+            return
+
+        nodes = [self.nexus.nexus_file[link_path] for link_path in chain]
+        local = local_matrices(
+            [read_is_rotation(node) for node in nodes],
+            [read_vector(node) for node in nodes],
+            [read_magnitude(node) for node in nodes],
+        )
+
+        matrix = (
+            np.identity(4) if current_path is None else self._matrices[current_path]
+        )
+        # Compose from the end of the chain back towards the start, caching the matrix at each link
+        for link_path, link_matrix in zip(reversed(chain), local[::-1]):
+            matrix = link_matrix @ matrix
+            self._matrices[link_path] = matrix
+            if current_path is not None:
+                self._add_dependent(current_path, link_path)
+            current_path = link_path
+
+    def _add_dependent(self, path: str, dependent_path: str):
+        self._dependents.setdefault(path, set()).add(dependent_path)
+
+    def _on_node_changed(self, change: FileChange):
+        if change.change_type == ChangeType.RELOADED:
+            self.clear()
+            return
+        changed_paths = [change.path]
+        if change.new_path is not None:
+            changed_paths.append(change.new_path)
+        # A cached entry is stale if it, something inside it (such as a component's depends_on field),
+        # or one of its parent groups has changed
+        stale_paths = [
+            cached_path
+            for cached_path in self._matrices
+            if any(
+                is_same_or_descendant(cached_path, changed_path)
+                or is_same_or_descendant(changed_path, cached_path)
+                for changed_path in changed_paths
+            )
+        ]
+        for stale_path in stale_paths:
+            self.invalidate(stale_path)
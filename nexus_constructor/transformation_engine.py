@@ -0,0 +1,302 @@
+"""
+Resolves transformation depends_on chains with NumPy, without needing Qt.
+
+Matrices follow the same conventions as Transformation.matrix and Component.matrix: column vectors, angles in
+degrees, and the matrix of a chain is the product of its links in order, so the resolved matrix of a transformation
+is its local matrix multiplied by the resolved matrix of the transformation it depends on.
+"""
+import posixpath
+from typing import Dict, List, Optional
+
+import attr
+import h5py
+import numpy as np
+
+from nexus_constructor.common_attrs import CommonAttrs
+from nexus_constructor.transformation_types import TransformationType
+
+NO_PARENT = -1
+
+
+def _decode(value) -> str:
+    if isinstance(value, np.ndarray):
+        value = value.flatten()[0]
+    if isinstance(value, bytes):
+        return value.decode("utf8")
+    return str(value)
+
+
+def translation_matrices(vectors: np.ndarray, magnitudes: np.ndarray) -> np.ndarray:
+    """
+    :param vectors: (N,3) translation directions, these are normalised so only their direction is used
+    :param magnitudes: (N,) distance to translate along each direction
+    :return: (N,4,4) translation matrices
+    """
+    vectors = np.asarray(vectors, dtype=float).reshape(-1, 3)
+    lengths = np.linalg.norm(vectors, axis=1)
+    scale = np.divide(
+        magnitudes, lengths, out=np.zeros_like(lengths), where=lengths > 0
+    )
+    matrices = np.tile(np.identity(4), (len(vectors), 1, 1))
+    matrices[:, :3, 3] = vectors * scale[:, np.newaxis]
+    return matrices
+
+
+def rotation_matrices(axes: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    """
+    :param axes: (N,3) rotation axes, these are normalised, a zero length axis gives no rotation
+    :param angles: (N,) rotation angles in degrees, positive angles rotate anticlockwise looking down the axis
+    :return: (N,4,4) rotation matrices
+    """
+    axes = np.asarray(axes, dtype=float).reshape(-1, 3)
+    lengths = np.linalg.norm(axes, axis=1)
+    unit_axes = np.divide(
+        axes,
+        lengths[:, np.newaxis],
+        out=np.zeros_like(axes),
+        where=lengths[:, np.newaxis] > 0,
+    )
+    radians = np.radians(angles)
+    cos = np.cos(radians)
+    sin = np.sin(radians)
+    x, y, z = unit_axes[:, 0], unit_axes[:, 1], unit_axes[:, 2]
+    one_minus_cos = 1 - cos
+
+    matrices = np.tile(np.identity(4), (len(axes), 1, 1))
+    matrices[:, 0, 0] = cos + x * x * one_minus_cos
+    matrices[:, 0, 1] = x * y * one_minus_cos - z * sin
+    matrices[:, 0, 2] = x * z * one_minus_cos + y * sin
+    matrices[:, 1, 0] = y * x * one_minus_cos + z * sin
+    matrices[:, 1, 1] = cos + y * y * one_minus_cos
+    matrices[:, 1, 2] = y * z * one_minus_cos - x * sin
+    matrices[:, 2, 0] = z * x * one_minus_cos - y * sin
+    matrices[:, 2, 1] = z * y * one_minus_cos + x * sin
+    matrices[:, 2, 2] = cos + z * z * one_minus_cos
+
+    # A zero length axis means no rotation, as for QQuaternion.fromAxisAndAngle
+    matrices[lengths == 0] = np.identity(4)
+    return matrices
+
+
+def local_matrices(
+    is_rotation: np.ndarray, vectors: np.ndarray, magnitudes: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the matrix of each transformation on its own.
+    :param is_rotation: (N,) True for rotations, False for translations
+    :param vectors: (N,3) rotation axis or translation direction of each transformation
+    :param magnitudes: (N,) angle in degrees or distance of each transformation
+    :return: (N,4,4) matrices
+    """
+    is_rotation = np.asarray(is_rotation, dtype=bool)
+    vectors = np.asarray(vectors, dtype=float).reshape(-1, 3)
+    magnitudes = np.asarray(magnitudes, dtype=float)
+    matrices = np.empty((len(is_rotation), 4, 4))
+    matrices[is_rotation] = rotation_matrices(
+        vectors[is_rotation], magnitudes[is_rotation]
+    )
+    matrices[~is_rotation] = translation_matrices(
+        vectors[~is_rotation], magnitudes[~is_rotation]
+    )
+    return matrices
+
+
+def chain_depths(parents: np.ndarray) -> np.ndarray:
+    """
+    :param parents: (N,) index of the transformation each one depends on, or NO_PARENT
+    :return: (N,) number of links between each transformation and the end of its chain
+    :raises ValueError: if the depends_on chains contain a cycle
+    """
+    parents = np.asarray(parents, dtype=int)
+    depths = np.zeros(len(parents), dtype=int)
+    ancestors = parents.copy()
+    for _ in range(len(parents) + 1):
+        has_ancestor = ancestors != NO_PARENT
+        if not has_ancestor.any():
+            return depths
+        depths[has_ancestor] += 1
+        ancestors[has_ancestor] = parents[ancestors[has_ancestor]]
+    raise ValueError("depends_on chains contain a cycle")
+
+
+def resolve_chains(local: np.ndarray, parents: np.ndarray) -> np.ndarray:
+    """
+    Compose every depends_on chain at once, one batched matrix multiplication per level of depth.
+    :param local: (N,4,4) matrix of each transformation on its own
+    :param parents: (N,) index of the transformation each one depends on, or NO_PARENT
+    :return: (N,4,4) resolved matrix of the chain starting at each transformation
+    """
+    parents = np.asarray(parents, dtype=int)
+    depths = chain_depths(parents)
+    resolved = np.array(local, dtype=float)
+    for depth in range(1, depths.max(initial=0) + 1):
+        at_depth = np.flatnonzero(depths == depth)
+        resolved[at_depth] = np.matmul(local[at_depth], resolved[parents[at_depth]])
+    return resolved
+
+
+def read_magnitude(dataset: h5py.Dataset) -> float:
+    """
+    Read the magnitude used to display a transformation, without modifying the file.
+    Matches Transformation.ui_value: the value if it is numeric, the first value of an array,
+    otherwise the placeholder value stored for the UI, otherwise zero.
+    """
+    if isinstance(dataset, h5py.Dataset):
+        value = dataset[()]
+        try:
+            return float(value if np.isscalar(value) else value[0])
+        except (ValueError, TypeError, IndexError):
+            pass
+    if CommonAttrs.UI_VALUE in dataset.attrs:
+        return float(np.asarray(dataset.attrs[CommonAttrs.UI_VALUE]).flatten()[0])
+    return 0.0
+
+
+def read_is_rotation(node: h5py.HLObject) -> bool:
+    """
+    :return: Whether the transformation is a rotation, links with no transformation_type are treated as translations
+    """
+    transformation_type = node.attrs.get(CommonAttrs.TRANSFORMATION_TYPE)
+    if transformation_type is None:
+        return False
+    return (
+        _decode(transformation_type).strip().capitalize() == TransformationType.ROTATION
+    )
+
+
+def read_vector(node: h5py.HLObject) -> np.ndarray:
+    """
+    :return: The vector of the transformation, zero if it has none so that the link does not move anything
+    """
+    vector = node.attrs.get(CommonAttrs.VECTOR)
+    if vector is None:
+        return np.zeros(3)
+    return np.asarray(vector, dtype=float).reshape(3)
+
+
+def read_depends_on(node: h5py.HLObject) -> Optional[str]:
+    """
+    Read the depends_on field of a component group or the depends_on attribute of a transformation.
+    Relative paths are relative to the component group, or to the group containing the transformation.
+    :return: The absolute path of the transformation which the node depends on, or None at the end of a chain
+    """
+    if isinstance(node, h5py.Group):
+        if CommonAttrs.DEPENDS_ON not in node:
+            return None
+        depends_on = node[CommonAttrs.DEPENDS_ON][()]
+        relative_to = node
+    else:
+        depends_on = node.attrs.get(CommonAttrs.DEPENDS_ON)
+        relative_to = node.parent
+    if depends_on is None:
+        return None
+    depends_on = _decode(depends_on)
+    if depends_on in (".", "/"):
+        return None
+    return relative_to[depends_on].name
+
+
+def resolve_depends_on(depends_on, relative_to: str) -> Optional[str]:
+    """
+    Work out the absolute path in a depends_on value, without checking that anything is at that path.
+    :param depends_on: The depends_on field or attribute value
+    :param relative_to: Absolute path which relative paths are relative to
+    :return: The absolute path, or None at the end of a chain
+    """
+    depends_on = _decode(depends_on)
+    if depends_on in (".", "/"):
+        return None
+    return posixpath.normpath(posixpath.join(relative_to, depends_on))
+
+
+def _is_transformation(node) -> bool:
+    return (
+        isinstance(node, (h5py.Dataset, h5py.Group))
+        and CommonAttrs.TRANSFORMATION_TYPE in node.attrs
+        and CommonAttrs.VECTOR in node.attrs
+    )
+
+
+@attr.s
+class ResolvedTransformations:
+    """
+    The resolved matrices of every transformation found under a group, in the order they were found.
+    """
+
+    paths = attr.ib(type=List[str])
+    local = attr.ib(type=np.ndarray)
+    parents = attr.ib(type=np.ndarray)
+    matrices = attr.ib(type=np.ndarray)
+    index = attr.ib(type=Dict[str, int], init=False)
+
+    def __attrs_post_init__(self):
+        self.index = {path: i for i, path in enumerate(self.paths)}
+
+    def matrix(self, path: Optional[str]) -> np.ndarray:
+        """
+        :param path: Absolute path of a transformation, or None for the end of a chain
+        :return: The (4,4) resolved matrix of the chain starting at that transformation
+        """
+        if path is None:
+            return np.identity(4)
+        return self.matrices[self.index[path]]
+
+
+def resolve_transformations(root: h5py.Group) -> ResolvedTransformations:
+    """
+    Find every transformation under root and resolve all of their depends_on chains in one batch.
+    Transformations outside root which are depended on are included too.
+    :param root: Group to search, usually the file or its entry
+    """
+    paths = []
+
+    def find_transformations(_, node):
+        if _is_transformation(node):
+            paths.append(node.name)
+
+    root.visititems(find_transformations)
+
+    index = {path: i for i, path in enumerate(paths)}
+    parent_paths = []
+    nodes = [root.file[path] for path in paths]
+    i = 0
+    # Links may point outside root, so keep appending them until every chain ends
+    while i < len(nodes):
+        parent_path = read_depends_on(nodes[i])
+        if parent_path is not None and parent_path not in index:
+            index[parent_path] = len(paths)
+            paths.append(parent_path)
+            nodes.append(root.file[parent_path])
+        parent_paths.append(parent_path)
+        i += 1
+
+    parents = np.array(
+        [NO_PARENT if path is None else index[path] for path in parent_paths],
+        dtype=int,
+    )
+    is_rotation = np.array([read_is_rotation(node) for node in nodes], dtype=bool)
+    vectors = np.array([read_vector(node) for node in nodes]).reshape(-1, 3)
+    magnitudes = np.array([read_magnitude(node) for node in nodes], dtype=float)
+
+    local = local_matrices(is_rotation, vectors, magnitudes)
+    return ResolvedTransformations(
+        paths=paths,
+        local=local,
+        parents=parents,
+        matrices=resolve_chains(local, parents),
+    )
+
+
+def resolve_component_matrices(
+    root: h5py.Group, component_paths: List[str]
+) -> Dict[str, np.ndarray]:
+    """
+    :param root: Group containing the components and their transformations
+    :param component_paths: Absolute paths of the component groups
+    :return: The (4,4) matrix giving the position and orientation of each component, keyed by component path
+    """
+    resolved = resolve_transformations(root)
+    return {
+        path: resolved.matrix(read_depends_on(root.file[path]))
+        for path in component_paths
+    }
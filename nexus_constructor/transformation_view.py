@@ -3,7 +3,6 @@ from nexus_constructor.transformation_types import TransformationType
 from ui.transformation import Ui_Transformation
 from ui.link import Ui_Link
 from PySide2.QtWidgets import QGroupBox, QFrame, QWidget
-from PySide2.QtGui import QVector3D
 from nexus_constructor.transformations import Transformation
 from nexus_constructor.instrument import Instrument
 from nexus_constructor.component_tree_model import LinkTransformation
@@ -25,9 +24,10 @@ class EditTransformation(QGroupBox):
 
     def _fill_in_existing_fields(self, current_vector):
         self.transformation_frame.name_line_edit.setText(self.transformation.name)
-        self.transformation_frame.x_spinbox.setValue(current_vector.x())
-        self.transformation_frame.y_spinbox.setValue(current_vector.y())
-        self.transformation_frame.z_spinbox.setValue(current_vector.z())
+        x, y, z = current_vector
+        self.transformation_frame.x_spinbox.setValue(x)
+        self.transformation_frame.y_spinbox.setValue(y)
+        self.transformation_frame.z_spinbox.setValue(z)
         item, update_function = find_field_type(self.transformation.dataset)
         update_function(item, self.transformation_frame.magnitude_widget)
         self.transformation_frame.magnitude_widget.units = self.transformation.units
@@ -52,9 +52,9 @@ class EditTransformation(QGroupBox):
         self.transformation.dataset = self.transformation_frame.magnitude_widget.value
         if self.transformation_frame.name_line_edit.text() != self.transformation.name:
             self.transformation.name = self.transformation_frame.name_line_edit.text()
-        self.transformation.vector = QVector3D(
-            *[spinbox.value() for spinbox in self.transformation_frame.spinboxes[:-1]]
-        )
+        self.transformation.vector = [
+            spinbox.value() for spinbox in self.transformation_frame.spinboxes[:-1]
+        ]
         self.transformation.units = self.transformation_frame.magnitude_widget.units
         self.instrument.nexus.transformation_changed.emit()
 
@@ -1,8 +1,6 @@
 import logging
 
 import numpy as np
-from PySide2.QtGui import QVector3D, QMatrix4x4
-from PySide2.Qt3DCore import Qt3DCore
 import h5py
 
 from nexus_constructor.common_attrs import CommonAttrs
@@ -10,6 +8,10 @@ from nexus_constructor.nexus import nexus_wrapper as nx
 from typing import TypeVar, Union, List
 
 from nexus_constructor.nexus.nexus_wrapper import h5Node
+from nexus_constructor.transformation_engine import (
+    rotation_matrices,
+    translation_matrices,
+)
 from nexus_constructor.transformation_types import TransformationType
 
 TransformationOrComponent = TypeVar(
@@ -49,21 +51,18 @@ class Transformation:
             dependent.depends_on = self
 
     @property
-    def qmatrix(self) -> QMatrix4x4:
+    def matrix(self) -> np.ndarray:
         """
-        Get a Qt3DCore.QTransform describing the transformation
+        Get a 4x4 matrix describing the transformation, acting on column vectors
         """
-        transform = Qt3DCore.QTransform()
         if self.type == TransformationType.ROTATION:
-            quaternion = transform.fromAxisAndAngle(self.vector, self.ui_value)
-            transform.setRotation(quaternion)
+            return rotation_matrices(self.vector, [self.ui_value])[0]
         elif self.type == TransformationType.TRANSLATION:
-            transform.setTranslation(self.vector.normalized() * self.ui_value)
+            return translation_matrices(self.vector, [self.ui_value])[0]
         else:
             raise (
                 RuntimeError('Unknown transformation of type "{}".'.format(self.type))
             )
-        return transform.matrix()
 
     @property
     def absolute_path(self):
@@ -101,20 +100,18 @@ class Transformation:
         self.file.set_attribute_value(self._dataset, CommonAttrs.UNITS, new_units)
 
     @property
-    def vector(self):
+    def vector(self) -> np.ndarray:
         """
-        Returns rotation axis or translation direction as a QVector3D
+        Returns rotation axis or translation direction as a numpy array of 3 values
         """
         vector_as_np_array = self.file.get_attribute_value(
             self._dataset, CommonAttrs.VECTOR
         )
-        return QVector3D(
-            vector_as_np_array[0], vector_as_np_array[1], vector_as_np_array[2]
-        )
+        return np.asarray(vector_as_np_array, dtype=float).reshape(3)
 
     @vector.setter
-    def vector(self, new_vector: QVector3D):
-        vector_as_np_array = np.array([new_vector.x(), new_vector.y(), new_vector.z()])
+    def vector(self, new_vector: np.ndarray):
+        vector_as_np_array = np.asarray(new_vector, dtype=float).reshape(3)
         self.file.set_attribute_value(
             self._dataset, CommonAttrs.VECTOR, vector_as_np_array
         )
@@ -132,24 +129,37 @@ class Transformation:
         old_attrs = {}
         for k, v in self._dataset.attrs.items():
             old_attrs[k] = v
-        dataset_name = self._dataset.name
-
-        del self.file.nexus_file[dataset_name]
-        if isinstance(new_data, h5py.Dataset):
-            self.file.nexus_file[dataset_name] = new_data[()]
-        else:
-            if isinstance(new_data, h5py.SoftLink):
-                self.file.nexus_file[dataset_name] = h5py.SoftLink(new_data.path)
+        parent_group = self._dataset.parent
+        dataset_name = nx.get_name_of_node(self._dataset)
+        # Deleting the dataset drops its links from the dependency graph, so they are restored once it is re-created
+        graph = self.file.dependency_graph
+        dependents = graph.get_dependents(self.absolute_path)
+        depends_on_path = graph.get_depends_on(self.absolute_path)
+
+        with self.file.batch_changes():
+            self.file.delete_node(self._dataset)
+            if isinstance(new_data, h5py.Dataset):
+                self._dataset = self.file.set_field_value(
+                    parent_group, dataset_name, new_data[()]
+                )
+            elif isinstance(new_data, h5py.SoftLink):
+                self._dataset = self.file.set_field_value(
+                    parent_group, dataset_name, h5py.SoftLink(new_data.path)
+                )
             else:
-                self.file.nexus_file.copy(
-                    source=new_data, dest=dataset_name, expand_soft=True
+                self._dataset = self.file.copy_node(
+                    new_data, parent_group, dataset_name, expand_soft=True
                 )
-        self._dataset = self.file.nexus_file[dataset_name]
-        for k, v in old_attrs.items():
-            self._dataset.attrs[k] = v
+            for k, v in old_attrs.items():
+                self.file.set_attribute_value(self._dataset, k, v)
 
-        if CommonAttrs.UI_VALUE not in self._dataset.attrs:
-            self._dataset.attrs[CommonAttrs.UI_VALUE] = 0
+            if CommonAttrs.UI_VALUE not in self._dataset.attrs:
+                self.file.set_attribute_value(self._dataset, CommonAttrs.UI_VALUE, 0)
+
+            for dependent_path in dependents:
+                graph.add(self.absolute_path, dependent_path)
+            if depends_on_path is not None:
+                graph.add(depends_on_path, self.absolute_path)
 
     @property
     def ui_value(self) -> float:
@@ -205,79 +215,49 @@ class Transformation:
         Note, until Python 4.0 (or 3.7 with from __future__ import annotations) have
         to use string for depends_on type here, because the current class is not defined yet
         """
-        existing_depends_on = self.file.get_attribute_value(
-            self._dataset, CommonAttrs.DEPENDS_ON
-        )
+        with self.file.batch_changes():
+            existing_depends_on = self.file.get_attribute_value(
+                self._dataset, CommonAttrs.DEPENDS_ON
+            )
 
-        if (
-            existing_depends_on is not None
-            and existing_depends_on in self.file.nexus_file
-        ):
-            Transformation(
-                self.file, self.file.nexus_file[existing_depends_on]
-            ).deregister_dependent(self)
+            if (
+                existing_depends_on is not None
+                and existing_depends_on in self.file.nexus_file
+            ):
+                Transformation(
+                    self.file, self.file.nexus_file[existing_depends_on]
+                ).deregister_dependent(self)
 
-        if depends_on is None:
-            self.file.set_attribute_value(self._dataset, CommonAttrs.DEPENDS_ON, ".")
-        else:
-            self.file.set_attribute_value(
-                self._dataset, CommonAttrs.DEPENDS_ON, depends_on.absolute_path
-            )
-            depends_on.register_dependent(self)
+            if depends_on is None:
+                self.file.set_attribute_value(
+                    self._dataset, CommonAttrs.DEPENDS_ON, "."
+                )
+            else:
+                self.file.set_attribute_value(
+                    self._dataset, CommonAttrs.DEPENDS_ON, depends_on.absolute_path
+                )
+                depends_on.register_dependent(self)
 
     def register_dependent(self, dependent: TransformationOrComponent):
         """
-        Register dependent transform or component in the dependee_of list of this transform
-        Note, "dependee_of" attribute is not part of the NeXus format
+        Register dependent transform or component in the dependency graph as depending on this transform
+        Note, this is written to the "dependee_of" attribute when saving, which is not part of the NeXus format
         :param dependent: transform or component that depends on this one
         """
-
-        if CommonAttrs.DEPENDEE_OF not in self._dataset.attrs.keys():
-            self.file.set_attribute_value(
-                self._dataset, CommonAttrs.DEPENDEE_OF, dependent.absolute_path
-            )
-        else:
-            dependee_of_list = self.file.get_attribute_value(
-                self._dataset, CommonAttrs.DEPENDEE_OF
-            )
-            if not isinstance(dependee_of_list, np.ndarray):
-                dependee_of_list = np.array([dependee_of_list])
-            dependee_of_list = dependee_of_list.astype("U")
-            if dependent.absolute_path not in dependee_of_list:
-                dependee_of_list = np.append(
-                    dependee_of_list, np.array([dependent.absolute_path])
-                )
-                self.file.set_attribute_value(
-                    self._dataset, CommonAttrs.DEPENDEE_OF, dependee_of_list
-                )
+        self.file.dependency_graph.add(self.absolute_path, dependent.absolute_path)
 
     def deregister_dependent(self, former_dependent: TransformationOrComponent):
         """
-        Remove former dependent from the dependee_of list of this transform
-        Note, "dependee_of" attribute is not part of the NeXus format
+        Remove former dependent from the dependents of this transform in the dependency graph
         :param former_dependent: transform or component that used to depend on this one
         """
-        if CommonAttrs.DEPENDEE_OF in self._dataset.attrs.keys():
-            dependee_of_list = self.file.get_attribute_value(
-                self._dataset, CommonAttrs.DEPENDEE_OF
+        if not self.file.dependency_graph.remove(
+            self.absolute_path, former_dependent.absolute_path
+        ):
+            logging.warning(
+                f"Unable to de-register dependent {former_dependent.absolute_path} from {self.absolute_path} "
+                "due to it not being registered."
             )
-            if (
-                not isinstance(dependee_of_list, np.ndarray)
-                and dependee_of_list == former_dependent.absolute_path
-            ):
-                # Must be a single string rather than a list, so simply delete it
-                self.file.delete_attribute(self._dataset, CommonAttrs.DEPENDEE_OF)
-            elif isinstance(dependee_of_list, np.ndarray):
-                dependee_of_list = dependee_of_list[
-                    dependee_of_list != former_dependent.absolute_path
-                ]
-                self.file.set_attribute_value(
-                    self._dataset, CommonAttrs.DEPENDEE_OF, dependee_of_list
-                )
-            else:
-                logging.warning(
-                    f"Unable to de-register dependent {former_dependent.absolute_path} from {self.absolute_path} due to it not being registered."
-                )
 
     def get_dependents(self) -> List[Union["Component", "Transformation"]]:
         """
@@ -287,32 +267,27 @@ class Transformation:
 
         return_dependents = []
 
-        if CommonAttrs.DEPENDEE_OF in self._dataset.attrs.keys():
-            dependents = self.file.get_attribute_value(
-                self._dataset, CommonAttrs.DEPENDEE_OF
-            )
-            if not isinstance(dependents, np.ndarray):
-                dependents = [dependents]
-            for path in dependents:
-                node = self.file.nexus_file[path]
-                if isinstance(node, h5py.Group):
-                    return_dependents.append(comp.Component(self.file, node))
-                elif isinstance(node, h5py.Dataset):
-                    return_dependents.append(Transformation(self.file, node))
-                else:
-                    raise RuntimeError("Unknown type of node.")
+        for path in self.file.dependency_graph.get_dependents(self.absolute_path):
+            node = self.file.nexus_file[path]
+            if isinstance(node, h5py.Group):
+                return_dependents.append(comp.Component(self.file, node))
+            elif isinstance(node, h5py.Dataset):
+                return_dependents.append(Transformation(self.file, node))
+            else:
+                raise RuntimeError("Unknown type of node.")
         return return_dependents
 
     def remove_from_dependee_chain(self):
-        all_dependees = self.get_dependents()
-        new_depends_on = self.depends_on
-        if self.depends_on.absolute_path == "/":
-            new_depends_on = None
-        else:
+        with self.file.batch_changes():
+            all_dependees = self.get_dependents()
+            new_depends_on = self.depends_on
+            if self.depends_on.absolute_path == "/":
+                new_depends_on = None
+            else:
+                for dependee in all_dependees:
+                    if isinstance(dependee, Transformation):
+                        new_depends_on.register_dependent(dependee)
             for dependee in all_dependees:
-                if isinstance(dependee, Transformation):
-                    new_depends_on.register_dependent(dependee)
-        for dependee in all_dependees:
-            dependee.depends_on = new_depends_on
-            self.deregister_dependent(dependee)
-        self.depends_on = None
+                dependee.depends_on = new_depends_on
+                self.deregister_dependent(dependee)
+            self.depends_on = None
@@ -1,11 +1,50 @@
 import logging
-
-import pint
+import tokenize
+from functools import lru_cache
 
 RADIANS = "radians"
 METRES = "metres"
 
-ureg = pint.UnitRegistry()
+# Number of unit strings, and pairs of units, to remember the parsed form and conversion factor of
+UNIT_CACHE_SIZE = 1024
+
+_unit_registry = None
+
+
+def get_unit_registry():
+    """
+    pint is slow to import and its registry slow to build, so both are put off until units are first checked, and
+    the one registry is shared by everything which handles units
+    :return: The pint UnitRegistry
+    """
+    global _unit_registry
+    if _unit_registry is None:
+        import pint
+
+        _unit_registry = pint.UnitRegistry()
+    return _unit_registry
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def _parse_units(input: str):
+    """
+    Parse a units string, remembering the result as the same strings are checked on every keystroke and every load
+    :return: The parsed pint quantity, or None if the units are not recognised
+    """
+    import pint
+
+    # Older versions of pint parse units with their own copy of tokenize
+    token_error = getattr(pint.compat, "tokenize", tokenize).TokenError
+    try:
+        return get_unit_registry()(input)
+    except (pint.errors.UndefinedUnitError, AttributeError, token_error):
+        return None
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def _conversion_factor(original_units: str, desired_units: str) -> float:
+    # Failed conversions raise, so are not remembered
+    return get_unit_registry()(original_units).to(desired_units).magnitude
 
 
 def units_are_recognised_by_pint(input: str, emit_logging_msg: bool = True) -> bool:
@@ -17,13 +56,7 @@ def units_are_recognised_by_pint(input: str, emit_logging_msg: bool = True) -> b
         `units_are_recognised_by_pint` returns false.
     :return: True if the unit is contained in the pint registry, False otherwise.
     """
-    try:
-        ureg(input)
-    except (
-        pint.errors.UndefinedUnitError,
-        AttributeError,
-        pint.compat.tokenize.TokenError,
-    ):
+    if _parse_units(input) is None:
         if emit_logging_msg:
             logging.info(f"Unit input {input} is not recognised.")
         return False
@@ -39,8 +72,10 @@ def units_are_expected_type(
     :param input: The units string.
     :return: True if the conversion was successful, False otherwise.
     """
+    import pint
+
     try:
-        ureg(input).to(expected_unit_type)
+        _conversion_factor(input, expected_unit_type)
     except (pint.errors.DimensionalityError, ValueError, AttributeError):
         if emit_logging_msg:
             logging.info(
@@ -58,7 +93,8 @@ def units_have_magnitude_of_one(input: str, emit_logging_msg=True) -> bool:
     :param input: The units string.
     :return: True if the unit has a magnitude of one, False otherwise.
     """
-    if ureg(input).magnitude != 1:
+    quantity = _parse_units(input)
+    if quantity is None or quantity.magnitude != 1:
         if emit_logging_msg:
             logging.info(
                 f"Unit input {input} has wrong magnitude. The input should have a magnitude of one."
@@ -70,8 +106,9 @@ def units_have_magnitude_of_one(input: str, emit_logging_msg=True) -> bool:
 def calculate_unit_conversion_factor(original_units: str, desired_units: str) -> float:
     """
     Determines the factor for multiplying values in the original units so that they are now in the desired units.
+    Factors are remembered, so loading many geometries in the same units only works the factor out once.
     :param original_units: The original units.
     :param desired_units: The units that the original units are to be converted to.
     :return: A float value for converting from the original units and the desired units.
     """
-    return ureg(original_units).to(desired_units).magnitude
+    return _conversion_factor(original_units, desired_units)
@@ -3,16 +3,15 @@ import re
 import h5py
 from PySide2.QtCore import Signal, QObject
 from PySide2.QtGui import QValidator, QIntValidator
-import pint
 import os
 from typing import List
 import numpy as np
 from enum import Enum
 
 from PySide2.QtWidgets import QComboBox, QWidget, QRadioButton
-from nexusutils.readwriteoff import parse_off_file
-from stl import mesh
 
+from nexus_constructor.dataset_types import DATASET_TYPE
+from nexus_constructor.geometry.geometry_loader import mesh_file_cache
 from nexus_constructor.unit_utils import (
     units_are_recognised_by_pint,
     units_are_expected_type,
@@ -47,10 +46,6 @@ class UnitValidator(QValidator):
     Validator to ensure the the text entered is a valid unit of length.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.ureg = pint.UnitRegistry()
-
     def validate(self, input: str, pos: int):
 
         if not (
@@ -121,27 +116,21 @@ class GeometryFileValidator(QValidator):
         for suffixes in self.file_types.values():
             for suff in suffixes:
                 if input.endswith(f".{suff}"):
-                    if suff in GEOMETRY_FILE_TYPES["OFF Files"]:
-                        return self._validate_off_file(input)
-                    if suff in GEOMETRY_FILE_TYPES["STL Files"]:
-                        return self._validate_stl_file(input)
+                    if (
+                        suff in GEOMETRY_FILE_TYPES["OFF Files"]
+                        or suff in GEOMETRY_FILE_TYPES["STL Files"]
+                    ):
+                        return self._validate_mesh_file(input)
         return self._emit_and_return(False)
 
-    def _validate_stl_file(self, input: str) -> QValidator.State:
+    def _validate_mesh_file(self, input: str) -> QValidator.State:
         try:
-            try:
-                mesh.Mesh.from_file(
-                    "", fh=self.open_file(input), calculate_normals=False
-                )
-            except UnicodeDecodeError:
-                # File is in binary format - load it again
-                mesh.Mesh.from_file(
-                    "", fh=self.open_file(input, mode="rb"), calculate_normals=False
-                )
-            return self._emit_and_return(True)
-        except (TypeError, AssertionError, RuntimeError, ValueError):
+            # The parsed mesh is kept so that loading the file once it is accepted doesn't parse it again
+            mesh_file_cache.get(input, self.open_file)
+        except (ValueError, TypeError, IndexError, OverflowError):
             # File is invalid
             return self._emit_and_return(False)
+        return self._emit_and_return(True)
 
     def _emit_and_return(self, is_valid: bool) -> QValidator.State:
         self.is_valid.emit(is_valid)
@@ -150,16 +139,6 @@ class GeometryFileValidator(QValidator):
         else:
             return QValidator.Intermediate
 
-    def _validate_off_file(self, input: str) -> QValidator.State:
-        try:
-            if parse_off_file(self.open_file(input)) is None:
-                # An invalid file can cause the function to return None
-                return self._emit_and_return(False)
-        except (ValueError, TypeError, StopIteration, IndexError):
-            # File is invalid
-            return self._emit_and_return(False)
-        return self._emit_and_return(True)
-
     @staticmethod
     def is_file(input: str) -> bool:
         return os.path.isfile(input)
@@ -290,21 +269,6 @@ class FieldType(Enum):
     nx_class = "NX class/group"
 
 
-DATASET_TYPE = {
-    "Byte": np.byte,
-    "UByte": np.ubyte,
-    "Short": np.short,
-    "UShort": np.ushort,
-    "Integer": np.intc,
-    "UInteger": np.uintc,
-    "Long": np.int_,
-    "ULong": np.uint,
-    "Float": np.single,
-    "Double": np.double,
-    "String": h5py.special_dtype(vlen=str),
-}
-
-
 class FieldValueValidator(QValidator):
     """
     Validates the field value line edit to check that the entered string is castable to the selected numpy type.
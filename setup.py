@@ -10,10 +10,16 @@ from pathlib import Path
 from cx_Freeze import setup, Executable
 import os
 
-# Dependencies are automatically detected, but it struggles with some parts of numpy.
+# Dependencies are automatically detected, but it struggles with some parts of numpy,
+# and with the ijson backends, which are imported by name at runtime.
 build_exe_options = {
     "optimize": 1,
-    "packages": ["numpy.core._methods", "numpy.lib.format", "pkg_resources._vendor"],
+    "packages": [
+        "numpy.core._methods",
+        "numpy.lib.format",
+        "pkg_resources._vendor",
+        "ijson.backends",
+    ],
     "excludes": [
         "pytest",
         "pytest-cov",
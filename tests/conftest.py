@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest.mock import Mock
 
 import pytest
@@ -8,7 +10,35 @@ from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
 from nexus_constructor.pixel_options import PixelOptions
 from nexus_constructor.validators import PixelValidator
 from tests.chopper_test_helpers import chopper_details  # noqa: F401
-from tests.test_utils import NX_CLASS_DEFINITIONS
+
+_CACHE_HOME_VARIABLE = "XDG_CACHE_HOME"
+
+
+def pytest_configure(config):
+    """
+    Points the cache at a temporary directory for the whole session. Test modules load the NeXus class definitions
+    when they are imported, which is before any fixture runs, so this must happen before they are collected.
+    """
+    config.cache_home = tempfile.TemporaryDirectory()
+    config.previous_cache_home = os.environ.get(_CACHE_HOME_VARIABLE)
+    os.environ[_CACHE_HOME_VARIABLE] = config.cache_home.name
+
+
+def pytest_unconfigure(config):
+    if config.previous_cache_home is None:
+        os.environ.pop(_CACHE_HOME_VARIABLE, None)
+    else:
+        os.environ[_CACHE_HOME_VARIABLE] = config.previous_cache_home
+    config.cache_home.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """
+    Points the cache at a temporary directory, so that tests never read or write the user's own cache
+    """
+    monkeypatch.setenv(_CACHE_HOME_VARIABLE, str(tmp_path / "cache"))
+    return tmp_path / "cache"
 
 
 @pytest.fixture(scope="function")
@@ -25,6 +55,9 @@ def nexus_wrapper() -> NexusWrapper:
 
 @pytest.fixture(scope="function")
 def instrument(nexus_wrapper) -> Instrument:
+    # Imported here rather than at the top, so that the class definitions are loaded after pytest_configure
+    from tests.test_utils import NX_CLASS_DEFINITIONS
+
     return Instrument(nexus_wrapper, NX_CLASS_DEFINITIONS)
 
 
@@ -0,0 +1,119 @@
+import json
+import subprocess
+import sys
+
+import h5py
+
+from nexus_constructor.batch_converter import (
+    ConversionOptions,
+    FILEWRITER_JSON,
+    FORWARDER_JSON,
+    NEXUS,
+    convert_files,
+    main,
+)
+from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
+
+
+def _save_nexus_file(filename: str, field_value: float):
+    nexus_wrapper = NexusWrapper(filename)
+    component = nexus_wrapper.create_nx_group(
+        "component", "NXsample", nexus_wrapper.entry
+    )
+    nexus_wrapper.set_field_value(component, "value", field_value)
+    stream = nexus_wrapper.create_nx_group("stream", "NCstream", component)
+    for name, value in [
+        ("writer_module", "f142"),
+        ("source", "PV:VALUE"),
+        ("topic", "motion"),
+    ]:
+        nexus_wrapper.set_field_value(stream, name, value)
+    nexus_wrapper.save_file(filename)
+    nexus_wrapper.nexus_file.close()
+
+
+def test_GIVEN_nexus_files_WHEN_converting_to_filewriter_json_in_parallel_THEN_each_file_is_converted(
+    tmpdir,
+):
+    input_filenames = [str(tmpdir.join(f"instrument_{i}.nxs")) for i in range(3)]
+    for i, filename in enumerate(input_filenames):
+        _save_nexus_file(filename, float(i))
+    output_dir = str(tmpdir.join("output"))
+
+    results = convert_files(
+        input_filenames, ConversionOptions(FILEWRITER_JSON, output_dir), processes=2
+    )
+
+    assert [result.error for result in results] == [None] * 3
+    for i, result in enumerate(results):
+        with open(result.output_filename) as file:
+            command = json.load(file)
+        assert command["file_attributes"]["file_name"] == f"instrument_{i}.nxs"
+        entry = command["nexus_structure"]["children"][0]
+        assert entry["name"] == "entry"
+
+
+def test_GIVEN_filewriter_json_WHEN_converting_to_nexus_THEN_saved_file_contains_values(
+    tmpdir,
+):
+    nexus_filename = str(tmpdir.join("instrument.nxs"))
+    _save_nexus_file(nexus_filename, 1.5)
+    json_dir = str(tmpdir.join("json"))
+    (json_result,) = convert_files(
+        [nexus_filename], ConversionOptions(FILEWRITER_JSON, json_dir)
+    )
+
+    (nexus_result,) = convert_files(
+        [json_result.output_filename],
+        ConversionOptions(NEXUS, str(tmpdir.join("nexus"))),
+    )
+
+    assert nexus_result.error is None
+    with h5py.File(nexus_result.output_filename, mode="r") as nexus_file:
+        assert nexus_file["entry/component/value"][()] == 1.5
+
+
+def test_GIVEN_nexus_file_with_stream_WHEN_converting_to_forwarder_json_THEN_stream_is_in_command(
+    tmpdir,
+):
+    nexus_filename = str(tmpdir.join("instrument.nxs"))
+    _save_nexus_file(nexus_filename, 1.5)
+
+    (result,) = convert_files(
+        [nexus_filename],
+        ConversionOptions(FORWARDER_JSON, str(tmpdir), broker="localhost:9092"),
+    )
+
+    with open(result.output_filename) as file:
+        streams = json.load(file)["streams"]
+    assert streams[0]["channel"] == "PV:VALUE"
+    assert streams[0]["converter"]["topic"] == "localhost:9092/motion"
+
+
+def test_GIVEN_unreadable_file_WHEN_running_converter_THEN_other_files_are_converted_and_exit_status_is_non_zero(
+    tmpdir,
+):
+    nexus_filename = str(tmpdir.join("instrument.nxs"))
+    _save_nexus_file(nexus_filename, 1.5)
+    missing_filename = str(tmpdir.join("missing.nxs"))
+    output_dir = tmpdir.join("output")
+
+    status = main(
+        [missing_filename, nexus_filename, "--to", "json", "-o", str(output_dir)]
+    )
+
+    assert status != 0
+    assert output_dir.join("instrument.json").check()
+
+
+def test_GIVEN_converter_module_WHEN_importing_THEN_qt_is_not_imported():
+    script = (
+        "import sys, nexus_constructor.batch_converter;"
+        "print(sorted(m for m in sys.modules if m.startswith('PySide2')))"
+    )
+
+    output = subprocess.run(
+        [sys.executable, "-c", script], stdout=subprocess.PIPE, check=True
+    ).stdout
+
+    assert output.decode().strip() == "[]"
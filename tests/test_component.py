@@ -8,7 +8,6 @@ from nexus_constructor.component.component import (
     OFF_GEOMETRY_NEXUS_NAME,
 )
 from cmath import isclose
-from PySide2.QtGui import QVector3D
 import pytest
 from pytest import approx
 import numpy as np
@@ -135,7 +134,7 @@ def test_GIVEN_component_with_a_transform_added_WHEN_get_transforms_for_componen
 ):
     component = add_component_to_file(nexus_wrapper, "some_field", 42, "component_name")
 
-    transform = component.add_translation(QVector3D(1.0, 0.0, 0.0))
+    transform = component.add_translation(np.array([1.0, 0.0, 0.0]))
     component.depends_on = transform
 
     assert (
@@ -148,7 +147,7 @@ def test_GIVEN_component_with_a_transform_added_WHEN_transform_is_deleted_THEN_t
 ):
     component = add_component_to_file(nexus_wrapper, "some_field", 42, "component_name")
 
-    transform = component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    transform = component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
 
     component.remove_transformation(transform)
 
@@ -162,7 +161,7 @@ def test_GIVEN_a_component_with_a_transform_dependency_WHEN_get_depends_on_THEN_
 ):
     component = add_component_to_file(nexus_wrapper, "some_field", 42, "component_name")
 
-    input_transform = component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    input_transform = component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component.depends_on = input_transform
 
     returned_transform = component.depends_on
@@ -180,7 +179,7 @@ def test_deleting_a_transformation_from_a_different_component_is_not_allowed(
         nexus_wrapper, "some_field", 42, "other_component_name"
     )
 
-    transform = first_component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    transform = first_component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
 
     with pytest.raises(PermissionError):
         assert second_component.remove_transformation(
@@ -192,7 +191,7 @@ def test_deleting_a_transformation_which_the_component_directly_depends_on_is_no
     nexus_wrapper,
 ):
     component = add_component_to_file(nexus_wrapper, "some_field", 42, "component_name")
-    transform = component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    transform = component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component.depends_on = transform
 
     with pytest.raises(DependencyError):
@@ -205,9 +204,9 @@ def test_deleting_a_transformation_which_the_component_indirectly_depends_on_is_
     nexus_wrapper,
 ):
     component = add_component_to_file(nexus_wrapper, "some_field", 42, "component_name")
-    first_transform = component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    first_transform = component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     second_transform = component.add_translation(
-        QVector3D(1.0, 0.0, 0.0), depends_on=first_transform
+        np.array([1.0, 0.0, 0.0]), depends_on=first_transform
     )
     component.depends_on = second_transform
 
@@ -227,9 +226,9 @@ def test_transforms_contains_only_local_transforms_not_full_depends_on_chain(
         nexus_wrapper, "some_field", 42, "other_component_name"
     )
 
-    first_transform = first_component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    first_transform = first_component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     second_transform = second_component.add_rotation(
-        QVector3D(1.0, 0.0, 0.0), 90.0, depends_on=first_transform
+        np.array([1.0, 0.0, 0.0]), 90.0, depends_on=first_transform
     )
 
     second_component.depends_on = second_transform
@@ -247,12 +246,12 @@ def test_transforms_contains_only_local_transforms_alt(nexus_wrapper):
         nexus_wrapper, "some_field", 42, "other_component_name"
     )
 
-    transform1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    transform1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     transform2 = component1.add_rotation(
-        QVector3D(1.0, 0.0, 0.0), 90.0, depends_on=transform1
+        np.array([1.0, 0.0, 0.0]), 90.0, depends_on=transform1
     )
     transform3 = component2.add_rotation(
-        QVector3D(1.0, 0.0, 0.0), 90.0, depends_on=transform2
+        np.array([1.0, 0.0, 0.0]), 90.0, depends_on=transform2
     )
     component1.depends_on = transform2
     component2.depends_on = transform3
@@ -273,8 +272,8 @@ def test_transforms_has_link(nexus_wrapper):
         nexus_wrapper, "some_field", 42, "other_component_name"
     )
 
-    transform1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
-    transform2 = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    transform1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
+    transform2 = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     transform1.depends_on = transform2
 
     component1.depends_on = transform1
@@ -292,8 +291,8 @@ def test_transforms_link_is_correct(nexus_wrapper):
         nexus_wrapper, "some_field", 42, "other_component_name"
     )
 
-    transform1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
-    transform2 = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    transform1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
+    transform2 = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     transform1.depends_on = transform2
 
     component1.depends_on = transform1
@@ -311,8 +310,8 @@ def test_transforms_has_no_link(nexus_wrapper):
         nexus_wrapper, "some_field", 42, "other_component_name"
     )
 
-    transform1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
-    transform2 = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    transform1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
+    transform2 = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
 
     component1.depends_on = transform1
     component2.depends_on = transform2
@@ -331,9 +330,9 @@ def test_removing_transformation_which_has_a_dependent_transform_in_another_comp
         nexus_wrapper, "some_field", 42, "other_component_name"
     )
 
-    first_transform = first_component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    first_transform = first_component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     second_transform = second_component.add_rotation(
-        QVector3D(1.0, 0.0, 0.0), 90.0, depends_on=first_transform
+        np.array([1.0, 0.0, 0.0]), 90.0, depends_on=first_transform
     )
 
     second_component.depends_on = second_transform
@@ -354,9 +353,9 @@ def test_removing_transformation_which_no_longer_has_a_dependent_transform_in_an
         nexus_wrapper, "some_field", 42, "other_component_name"
     )
 
-    first_transform = first_component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    first_transform = first_component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     second_transform = second_component.add_rotation(
-        QVector3D(1.0, 0.0, 0.0), 90.0, depends_on=first_transform
+        np.array([1.0, 0.0, 0.0]), 90.0, depends_on=first_transform
     )
 
     second_component.depends_on = second_transform
@@ -377,11 +376,11 @@ def test_removing_transformation_which_still_has_one_dependent_transform_is_not_
 ):
     component = add_component_to_file(nexus_wrapper, "some_field", 42, "component_name")
 
-    first_transform = component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    first_transform = component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     # second_transform
-    component.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0, depends_on=first_transform)
+    component.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0, depends_on=first_transform)
     third_transform = component.add_rotation(
-        QVector3D(1.0, 0.0, 0.0), 90.0, depends_on=first_transform
+        np.array([1.0, 0.0, 0.0]), 90.0, depends_on=first_transform
     )
 
     # Make third transform no longer depend on the first one
@@ -401,7 +400,7 @@ def test_can_add_cylinder_shape_to_and_component_and_get_the_same_shape_back(
     axis_x = 1.0
     axis_y = 0.0
     axis_z = 0.0
-    axis = QVector3D(axis_x, axis_y, axis_z)
+    axis = np.array([axis_x, axis_y, axis_z])
     height = 42.0
     radius = 37.0
     component.set_cylinder_shape(axis, height, radius)
@@ -410,9 +409,7 @@ def test_can_add_cylinder_shape_to_and_component_and_get_the_same_shape_back(
     assert isinstance(cylinder, CylindricalGeometry)
     assert cylinder.height == approx(height)
     assert cylinder.radius == approx(radius)
-    assert cylinder.axis_direction.x() == approx(axis_x)
-    assert cylinder.axis_direction.y() == approx(axis_y)
-    assert cylinder.axis_direction.z() == approx(axis_z)
+    assert cylinder.axis_direction == approx([axis_x, axis_y, axis_z])
 
 
 def test_can_add_mesh_shape_to_and_component_and_get_the_same_shape_back(nexus_wrapper):
@@ -423,9 +420,9 @@ def test_can_add_mesh_shape_to_and_component_and_get_the_same_shape_back(nexus_w
     vertex_2_y = -0.5
     vertex_2_z = 0
     vertices = [
-        QVector3D(-0.5, -0.5, 0),
-        QVector3D(0, 0.5, 0),
-        QVector3D(vertex_2_x, vertex_2_y, vertex_2_z),
+        np.array([-0.5, -0.5, 0]),
+        np.array([0, 0.5, 0]),
+        np.array([vertex_2_x, vertex_2_y, vertex_2_z]),
     ]
     triangle = [0, 1, 2]
     faces = [triangle]
@@ -435,17 +432,15 @@ def test_can_add_mesh_shape_to_and_component_and_get_the_same_shape_back(nexus_w
     output_mesh, _ = component.shape
     assert isinstance(output_mesh, OFFGeometryNexus)
     assert output_mesh.faces[0] == triangle
-    assert output_mesh.vertices[2].x() == approx(vertex_2_x)
-    assert output_mesh.vertices[2].y() == approx(vertex_2_y)
-    assert output_mesh.vertices[2].z() == approx(vertex_2_z)
+    assert output_mesh.vertices[2] == approx([vertex_2_x, vertex_2_y, vertex_2_z])
 
 
 def test_can_get_cad_file_units_from_model_when_already_in_model(nexus_wrapper):
     component = add_component_to_file(nexus_wrapper, "some_field", 42, "component_name")
     vertices = [
-        QVector3D(-0.5, -0.5, 0),
-        QVector3D(0, 0.5, 0),
-        QVector3D(0.5, -0.05, 0),
+        np.array([-0.5, -0.5, 0]),
+        np.array([0, 0.5, 0]),
+        np.array([0.5, -0.05, 0]),
     ]
     triangle = [0, 1, 2]
     faces = [triangle]
@@ -477,9 +472,9 @@ def test_no_cad_path_returns_none_when_getting_cad_path_from_off_geometry(
     vertex_2_y = -0.5
     vertex_2_z = 0
     vertices = [
-        QVector3D(-0.5, -0.5, 0),
-        QVector3D(0, 0.5, 0),
-        QVector3D(vertex_2_x, vertex_2_y, vertex_2_z),
+        np.array([-0.5, -0.5, 0]),
+        np.array([0, 0.5, 0]),
+        np.array([vertex_2_x, vertex_2_y, vertex_2_z]),
     ]
     triangle = [0, 1, 2]
     faces = [triangle]
@@ -497,9 +492,9 @@ def test_getting_cad_path_from_file(nexus_wrapper):
     vertex_2_y = -0.5
     vertex_2_z = 0
     vertices = [
-        QVector3D(-0.5, -0.5, 0),
-        QVector3D(0, 0.5, 0),
-        QVector3D(vertex_2_x, vertex_2_y, vertex_2_z),
+        np.array([-0.5, -0.5, 0]),
+        np.array([0, 0.5, 0]),
+        np.array([vertex_2_x, vertex_2_y, vertex_2_z]),
     ]
     triangle = [0, 1, 2]
     faces = [triangle]
@@ -519,9 +514,9 @@ def test_setting_cad_path_through_shape_persists_in_file(nexus_wrapper):
     vertex_2_y = -0.5
     vertex_2_z = 0
     vertices = [
-        QVector3D(-0.5, -0.5, 0),
-        QVector3D(0, 0.5, 0),
-        QVector3D(vertex_2_x, vertex_2_y, vertex_2_z),
+        np.array([-0.5, -0.5, 0]),
+        np.array([0, 0.5, 0]),
+        np.array([vertex_2_x, vertex_2_y, vertex_2_z]),
     ]
     triangle = [0, 1, 2]
     faces = [triangle]
@@ -543,7 +538,11 @@ def test_can_override_existing_shape(nexus_wrapper):
         cylinder, CylindricalGeometry
     ), "Expect shape to initially be a cylinder"
 
-    vertices = [QVector3D(-0.5, -0.5, 0), QVector3D(0, 0.5, 0), QVector3D(0.5, -0.5, 0)]
+    vertices = [
+        np.array([-0.5, -0.5, 0]),
+        np.array([0, 0.5, 0]),
+        np.array([0.5, -0.5, 0]),
+    ]
     faces = [[0, 1, 2]]
     input_mesh = OFFGeometryNoNexus(vertices, faces)
     component.set_off_shape(input_mesh)
@@ -741,74 +740,38 @@ def test_GIVEN_component_with_no_shape_information_WHEN_shape_is_requested_THEN_
 def test_GIVEN_component_with_no_depends_on_field_WHEN_get_transformation_THEN_returns_identity_matrix(
     component,
 ):
-    assert component.transform.matrix().isIdentity()
+    assert np.array_equal(component.matrix, np.identity(4))
 
 
 def test_GIVEN_component_with_single_translation_WHEN_get_transformation_THEN_returns_the_translation(
     component,
 ):
-    translation_vector = QVector3D(0.42, -0.17, 3.0)
+    translation_vector = np.array([0.42, -0.17, 3.0])
     translation = component.add_translation(translation_vector, "test_translation")
     component.depends_on = translation
 
-    expected_matrix = np.array(
-        (
-            1,
-            0,
-            0,
-            0,
-            0,
-            1,
-            0,
-            0,
-            0,
-            0,
-            1,
-            0,
-            translation_vector.x(),
-            translation_vector.y(),
-            translation_vector.z(),
-            1,
-        )
-    )
-    assert np.allclose(expected_matrix, np.array(component.transform.matrix().data()))
+    expected_matrix = np.identity(4)
+    expected_matrix[:3, 3] = translation_vector
+    assert np.allclose(expected_matrix, component.matrix)
 
 
 def test_GIVEN_component_with_two_translations_WHEN_get_transformation_THEN_returns_composite_translation(
     component,
 ):
-    first_translation_vector = QVector3D(0.42, -0.17, 3.0)
+    first_translation_vector = np.array([0.42, -0.17, 3.0])
     first_translation = component.add_translation(
         first_translation_vector, "first_test_translation"
     )
-    second_translation_vector = QVector3D(0.42, -0.17, 3.0)
+    second_translation_vector = np.array([0.42, -0.17, 3.0])
     second_translation = component.add_translation(
         second_translation_vector, "second_test_translation", first_translation
     )
     component.depends_on = second_translation
     # component depends on second_translation which depends on first_translation
 
-    expected_matrix = np.array(
-        (
-            1,
-            0,
-            0,
-            0,
-            0,
-            1,
-            0,
-            0,
-            0,
-            0,
-            1,
-            0,
-            first_translation_vector.x() + second_translation_vector.x(),
-            first_translation_vector.y() + second_translation_vector.y(),
-            first_translation_vector.z() + second_translation_vector.z(),
-            1,
-        )
-    )
-    assert np.allclose(expected_matrix, np.array(component.transform.matrix().data()))
+    expected_matrix = np.identity(4)
+    expected_matrix[:3, 3] = first_translation_vector + second_translation_vector
+    assert np.allclose(expected_matrix, component.matrix)
 
 
 def test_GIVEN_component_with_pixel_mapping_WHEN_removing_pixel_data_THEN_pixel_mapping_is_cleared(
@@ -843,9 +806,9 @@ def test_GIVEN_cylinder_with_height_of_zero_WHEN_getting_axis_direction_THEN_def
     axis_x = 1.0
     axis_y = 0.0
     axis_z = 0.0
-    axis = QVector3D(axis_x, axis_y, axis_z)
+    axis = np.array([axis_x, axis_y, axis_z])
     height = 0
     radius = 37.0
 
     component.set_cylinder_shape(axis, height, radius)
-    assert component.shape[0].axis_direction == QVector3D(0, 0, 1)
+    assert np.array_equal(component.shape[0].axis_direction, [0, 0, 1])
@@ -1,5 +1,6 @@
 from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
-from nexus_constructor.component.component import Component, add_fields_to_component
+from nexus_constructor.component.component import Component
+from nexus_constructor.field_utils import add_fields_to_component
 import numpy as np
 
 
@@ -11,7 +11,7 @@ from PySide2.QtCore import QModelIndex, Qt
 from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
 from typing import Any
 from uuid import uuid1
-from PySide2.QtGui import QVector3D
+import numpy as np
 
 from tests.test_utils import NX_CLASS_DEFINITIONS
 
@@ -113,7 +113,7 @@ def test_transformation_list_has_0_rows():
 
 def test_transformation_list_has_1_rows():
     component = get_component()
-    translation = component.add_translation(QVector3D(1.0, 0.0, 0.0))
+    translation = component.add_translation(np.array([1.0, 0.0, 0.0]))
     component.depends_on = translation
     data_under_test = FakeInstrument([component])
     component.stored_transforms = component.transforms
@@ -126,7 +126,7 @@ def test_transformation_list_has_1_rows():
 
 def test_transformation_has_0_rows():
     component = get_component()
-    translation = component.add_translation(QVector3D(1.0, 0.0, 0.0))
+    translation = component.add_translation(np.array([1.0, 0.0, 0.0]))
     component.depends_on = translation
     data_under_test = FakeInstrument([component])
     component.stored_transforms = component.transforms
@@ -139,7 +139,7 @@ def test_transformation_has_0_rows():
 
 def test_transformation_link_has_0_rows():
     component = get_component()
-    translation = component.add_translation(QVector3D(1.0, 0.0, 0.0))
+    translation = component.add_translation(np.array([1.0, 0.0, 0.0]))
     component.depends_on = translation
     data_under_test = FakeInstrument([component])
     component.stored_transforms = component.transforms
@@ -220,7 +220,7 @@ def test_get_component_info_parent():
 
 def test_get_transformation_parent():
     component = get_component()
-    translation = component.add_translation(QVector3D(1.0, 0.0, 0.0))
+    translation = component.add_translation(np.array([1.0, 0.0, 0.0]))
     component.depends_on = translation
     data_under_test = FakeInstrument([component])
     component.stored_transforms = component.transforms
@@ -550,7 +550,7 @@ def test_GIVEN_component_with_cylindrical_shape_information_WHEN_duplicating_com
         first_component_name, first_component_nx_class, description
     )
 
-    axis_direction = QVector3D(1, 0, 0)
+    axis_direction = np.array([1, 0, 0])
     height = 2
     radius = 3
     units = "cm"
@@ -566,7 +566,7 @@ def test_GIVEN_component_with_cylindrical_shape_information_WHEN_duplicating_com
     second_component_index = tree_model.index(2, 0, QModelIndex())
     second_component = second_component_index.internalPointer()
     second_shape, _ = second_component.shape
-    assert second_shape.axis_direction == axis_direction
+    assert np.array_equal(second_shape.axis_direction, axis_direction)
     assert second_shape.height == height
     assert second_shape.units == units
 
@@ -583,14 +583,14 @@ def test_GIVEN_component_with_off_shape_information_WHEN_duplicating_component_T
     )
 
     vertices = [
-        QVector3D(-0.5, -0.5, 0.5),
-        QVector3D(0.5, -0.5, 0.5),
-        QVector3D(-0.5, 0.5, 0.5),
-        QVector3D(0.5, 0.5, 0.5),
-        QVector3D(-0.5, 0.5, -0.5),
-        QVector3D(0.5, 0.5, -0.5),
-        QVector3D(-0.5, -0.5, -0.5),
-        QVector3D(0.5, -0.5, -0.5),
+        np.array([-0.5, -0.5, 0.5]),
+        np.array([0.5, -0.5, 0.5]),
+        np.array([-0.5, 0.5, 0.5]),
+        np.array([0.5, 0.5, 0.5]),
+        np.array([-0.5, 0.5, -0.5]),
+        np.array([0.5, 0.5, -0.5]),
+        np.array([-0.5, -0.5, -0.5]),
+        np.array([0.5, -0.5, -0.5]),
     ]
 
     faces = [
@@ -614,5 +614,5 @@ def test_GIVEN_component_with_off_shape_information_WHEN_duplicating_component_T
     second_component = second_component_index.internalPointer()
     second_shape, _ = second_component.shape
 
-    assert second_shape.vertices == vertices
+    assert np.array_equal(second_shape.vertices, vertices)
     assert second_shape.faces == faces
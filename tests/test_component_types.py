@@ -1,9 +1,29 @@
+import os
+
 import pytest
+from mock import patch
+
+from nexus_constructor.component import component_type
 from nexus_constructor.component.component_type import (
     __list_base_class_files,
-    _create_base_class_dict,
+    _parse_base_class,
+    build_class_definitions_index,
+    make_dictionary_of_class_definitions,
 )
 
+CRYSTAL_XML = """<definition name="NXcrystal" type="group" extends="NXobject">
+    <field name="usage" type="NX_CHAR"/>
+    <field name="wavelength" type="NX_FLOAT" units="NX_WAVELENGTH"/>
+</definition>
+"""
+
+
+def _create_definitions(tmpdir, xml_by_class_name):
+    base_class_dir = tmpdir.mkdir("definitions").mkdir("base_classes")
+    for class_name, xml in xml_by_class_name.items():
+        base_class_dir.join(f"{class_name}.nxdl.xml").write(xml)
+    return str(tmpdir.join("definitions"))
+
 
 def test_GIVEN_list_of_files_all_ending_with_nxdl_WHEN_list_base_class_files_THEN_yields_correct_files():
     list_of_files = ["something.nxdl.xml", "somethingelse.nxdl.xml", "test.nxdl.xml"]
@@ -35,7 +55,7 @@ def test_GIVEN_list_of_files_some_ending_with_nxdl_WHEN_listing_base_class_files
         next(gen)
 
 
-def test_GIVEN_valid_base_class_containing_name_WHEN_creating_base_class_dict_THEN_dict_contains_base_class_with_name():
+def test_GIVEN_valid_base_class_containing_name_WHEN_parsing_base_class_THEN_name_is_the_base_class_name():
     class_name = "NXtest"
     xml = f"""
     <definition
@@ -44,14 +64,12 @@ def test_GIVEN_valid_base_class_containing_name_WHEN_creating_base_class_dict_TH
     </definition>
     """
 
-    base_classes = dict()
-    component_base_classes = dict()
-    _create_base_class_dict(xml, None, base_classes, component_base_classes)
+    name, _ = _parse_base_class(xml)
 
-    assert class_name in base_classes.keys()
+    assert name == class_name
 
 
-def test_GIVEN_a_valid_base_class_containing_name_key_and_name_field_WHEN_creating_base_class_dict_THEN_dict_contains_base_class_with_name_as_key_and_name_field():
+def test_GIVEN_base_class_containing_name_key_and_name_field_WHEN_parsing_base_class_THEN_fields_contain_name_field():
     class_name = "NXtest"
 
     xml = f"""<definition
@@ -63,14 +81,12 @@ def test_GIVEN_a_valid_base_class_containing_name_key_and_name_field_WHEN_creati
     </definition>
     """
 
-    base_classes = dict()
-    component_base_classes = dict()
-    _create_base_class_dict(xml, None, base_classes, component_base_classes)
-    assert class_name in base_classes.keys()
-    assert "name" in base_classes[class_name]
+    name, fields = _parse_base_class(xml)
+    assert name == class_name
+    assert "name" in [field["name"] for field in fields]
 
 
-def test_GIVEN_a_valid_base_class_with_no_fields_WHEN_creating_base_class_dict_THEN_dict_contains_empty_list_for_value():
+def test_GIVEN_a_valid_base_class_with_no_fields_WHEN_parsing_base_class_THEN_fields_are_empty():
     class_name = "NXtest"
     xml = f"""
         <definition
@@ -79,14 +95,14 @@ def test_GIVEN_a_valid_base_class_with_no_fields_WHEN_creating_base_class_dict_T
         </definition>
         """
 
-    base_classes = dict()
-    component_base_classes = dict()
-    _create_base_class_dict(xml, None, base_classes, component_base_classes)
+    _, fields = _parse_base_class(xml)
 
-    assert not base_classes[class_name]
+    assert not fields
 
 
-def test_GIVEN_a_valid_base_class_that_is_in_blacklist_WHEN_creating_base_class_dict_THEN_dict_stays_empty():
+def test_GIVEN_a_valid_base_class_that_is_in_blacklist_WHEN_making_class_definitions_THEN_definitions_stay_empty(
+    tmpdir,
+):
     class_name = "NXtest"
     xml = f"""
             <definition
@@ -94,8 +110,89 @@ def test_GIVEN_a_valid_base_class_that_is_in_blacklist_WHEN_creating_base_class_
             type="group" extends="NXobject">
             </definition>
             """
-    base_classes = dict()
-    component_base_classes = dict()
-    _create_base_class_dict(xml, [class_name], base_classes, component_base_classes)
+    definitions_dir = _create_definitions(tmpdir, {class_name: xml})
+
+    base_classes, component_base_classes = make_dictionary_of_class_definitions(
+        definitions_dir, black_list=[class_name], cache_dir=str(tmpdir.join("cache"))
+    )
 
     assert not base_classes
+    assert not component_base_classes
+
+
+def test_GIVEN_fields_with_types_and_units_WHEN_parsing_base_class_THEN_fields_have_name_type_and_units():
+    name, fields = _parse_base_class(CRYSTAL_XML)
+
+    assert name == "NXcrystal"
+    assert fields == [
+        {"name": "usage", "type": "NX_CHAR", "units": None},
+        {"name": "wavelength", "type": "NX_FLOAT", "units": "NX_WAVELENGTH"},
+    ]
+
+
+def test_GIVEN_field_without_type_WHEN_parsing_base_class_THEN_field_type_is_nx_char():
+    _, fields = _parse_base_class(
+        '<definition name="NXtest"><field name="name"/></definition>'
+    )
+
+    assert fields == [{"name": "name", "type": "NX_CHAR", "units": None}]
+
+
+def test_GIVEN_definitions_directory_WHEN_building_index_in_parallel_THEN_index_matches_building_in_one_process():
+    base_class_dir = os.path.join(os.getcwd(), "definitions", "base_classes")
+
+    assert build_class_definitions_index(
+        base_class_dir, processes=2
+    ) == build_class_definitions_index(base_class_dir, processes=1)
+
+
+def test_GIVEN_frozen_application_WHEN_building_index_THEN_definitions_are_parsed_without_worker_processes(
+    tmpdir,
+):
+    definitions_dir = _create_definitions(tmpdir, {"NXcrystal": CRYSTAL_XML})
+
+    with patch.object(component_type.sys, "frozen", True, create=True), patch.object(
+        component_type, "ProcessPoolExecutor"
+    ) as executor:
+        index = build_class_definitions_index(
+            os.path.join(definitions_dir, "base_classes"), processes=2
+        )
+
+    executor.assert_not_called()
+    assert list(index) == ["NXcrystal"]
+
+
+def test_GIVEN_cached_index_WHEN_making_class_definitions_THEN_definitions_are_not_parsed_again(
+    tmpdir,
+):
+    definitions_dir = _create_definitions(tmpdir, {"NXcrystal": CRYSTAL_XML})
+    cache_dir = str(tmpdir.join("cache"))
+    first_definitions = make_dictionary_of_class_definitions(
+        definitions_dir, cache_dir=cache_dir
+    )
+
+    with patch.object(component_type, "build_class_definitions_index") as build:
+        second_definitions = make_dictionary_of_class_definitions(
+            definitions_dir, cache_dir=cache_dir
+        )
+
+    build.assert_not_called()
+    assert first_definitions == second_definitions
+    assert second_definitions[1] == {"NXcrystal": ["usage", "wavelength"]}
+
+
+def test_GIVEN_definition_added_after_caching_WHEN_making_class_definitions_THEN_index_is_rebuilt(
+    tmpdir,
+):
+    definitions_dir = _create_definitions(tmpdir, {"NXcrystal": CRYSTAL_XML})
+    cache_dir = str(tmpdir.join("cache"))
+    make_dictionary_of_class_definitions(definitions_dir, cache_dir=cache_dir)
+    tmpdir.join("definitions", "base_classes", "NXslit.nxdl.xml").write(
+        '<definition name="NXslit"><field name="x_gap"/></definition>'
+    )
+
+    all_definitions, _ = make_dictionary_of_class_definitions(
+        definitions_dir, cache_dir=cache_dir
+    )
+
+    assert all_definitions["NXslit"] == ["x_gap"]
@@ -1,16 +1,19 @@
 from mock import patch
+import numpy as np
 from numpy import array_equal, array
 from pytest import approx, raises
 import pytest
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.pixel_data import PixelMapping
 from .helpers import add_component_to_file
 from nexus_constructor.geometry.cylindrical_geometry import (
     calculate_vertices,
     CylindricalGeometry,
+    CYLINDER_MESH_STEPS,
+    cylinder_instance_transforms,
+    cylinder_mesh_arrays,
+    unit_cylinder_mesh_arrays,
 )
-from nexus_constructor.ui_utils import numpy_array_to_qvector3d
 
 
 @pytest.fixture
@@ -26,7 +29,7 @@ def test_cylinder_has_property_values_it_was_created_with(nexus_wrapper):
     radius = 4
     units = "cubits"
     cylinder = component.set_cylinder_shape(
-        axis_direction=QVector3D(1, 0, 0), height=height, radius=radius, units=units
+        axis_direction=np.array([1, 0, 0]), height=height, radius=radius, units=units
     )
 
     assert cylinder.radius == approx(radius)
@@ -39,7 +42,7 @@ def test_cylinder_units_returns_str_if_bytes_in_file(nexus_wrapper):
     component = add_component_to_file(nexus_wrapper)
     units_bytes = b"cubits"
     cylinder = component.set_cylinder_shape(
-        axis_direction=QVector3D(1, 0, 0), height=3, radius=4, units=units_bytes
+        axis_direction=np.array([1, 0, 0]), height=3, radius=4, units=units_bytes
     )
     units_str = units_bytes.decode("utf-8")
 
@@ -52,7 +55,7 @@ def test_axis_direction_must_be_non_zero(nexus_wrapper):
     radius = 4
     with raises(ValueError):
         component.set_cylinder_shape(
-            axis_direction=QVector3D(0, 0, 0), height=height, radius=radius, units="m"
+            axis_direction=np.array([0, 0, 0]), height=height, radius=radius, units="m"
         )
 
 
@@ -114,45 +117,45 @@ def test_get_expected_height_and_radius_when_cylinder_vertices_are_out_of_order_
 @pytest.mark.parametrize(
     "axis_direction,height,radius",
     [
-        (QVector3D(1, 0, 0), 1.0, 1.0),
-        (QVector3D(2, 3, 8), 0.5, 1.7),
-        (QVector3D(0, -1, 0), 42.0, 4.2),
+        (np.array([1, 0, 0]), 1.0, 1.0),
+        (np.array([2, 3, 8]), 0.5, 1.7),
+        (np.array([0, -1, 0]), 42.0, 4.2),
     ],
 )
 def test_calculate_vertices_gives_cylinder_centre_at_origin(
     axis_direction, height, radius
 ):
     vertices = calculate_vertices(axis_direction, height, radius)
-    base_centre = numpy_array_to_qvector3d(vertices[:][0])
-    top_centre = numpy_array_to_qvector3d(vertices[:][2])
+    base_centre = vertices[:][0]
+    top_centre = vertices[:][2]
     cylinder_centre = top_centre + base_centre
 
-    assert cylinder_centre.x() == approx(0), "Expect cylinder centre to be at 0, 0, 0"
-    assert cylinder_centre.y() == approx(0), "Expect cylinder centre to be at 0, 0, 0"
-    assert cylinder_centre.z() == approx(0), "Expect cylinder centre to be at 0, 0, 0"
+    assert cylinder_centre == approx(
+        [0, 0, 0]
+    ), "Expect cylinder centre to be at 0, 0, 0"
 
 
 @pytest.mark.parametrize(
     "axis_direction,height,radius",
     [
-        (QVector3D(1, 0, 0), 1.0, 1.0),
-        (QVector3D(2, 3, 8), 0.5, 1.7),
-        (QVector3D(0, -1, 0), 42.0, 4.2),
+        (np.array([1, 0, 0]), 1.0, 1.0),
+        (np.array([2, 3, 8]), 0.5, 1.7),
+        (np.array([0, -1, 0]), 42.0, 4.2),
     ],
 )
 def test_calculate_vertices_gives_vertices_consistent_with_specified_height_and_radius(
     axis_direction, height, radius
 ):
     vertices = calculate_vertices(axis_direction, height, radius)
-    base_centre = numpy_array_to_qvector3d(vertices[0][:])
-    base_edge = numpy_array_to_qvector3d(vertices[1][:])
-    top_centre = numpy_array_to_qvector3d(vertices[2][:])
+    base_centre = vertices[0][:]
+    base_edge = vertices[1][:]
+    top_centre = vertices[2][:]
 
     output_axis = top_centre - base_centre
     output_radius = base_edge - base_centre
 
-    assert output_axis.length() == approx(height)
-    assert output_radius.length() == approx(radius)
+    assert np.linalg.norm(output_axis) == approx(height)
+    assert np.linalg.norm(output_radius) == approx(radius)
 
 
 def test_GIVEN_pixel_ids_WHEN_initialising_cylindrical_geometry_THEN_ids_in_geometry_match_ids_in_mapping(
@@ -174,3 +177,160 @@ def test_GIVEN_pixel_ids_WHEN_initialising_cylindrical_geometry_THEN_ids_in_geom
     actual_dataset = cylindrical_geometry.detector_number
 
     assert array_equal(array(expected_dataset), actual_dataset)
+
+
+def _create_cylinders_group(nexus_wrapper, vertices, cylinders):
+    cylinders_group = nexus_wrapper.create_nx_group(
+        "cylinders", "NXcylindrical_geometry", nexus_wrapper.nexus_file
+    )
+    vertices_dataset = nexus_wrapper.set_field_value(
+        cylinders_group, "vertices", np.array(vertices, dtype=float)
+    )
+    nexus_wrapper.set_attribute_value(vertices_dataset, "units", "cm")
+    nexus_wrapper.set_field_value(cylinders_group, "cylinders", np.array(cylinders))
+    return CylindricalGeometry(nexus_wrapper, cylinders_group)
+
+
+def test_GIVEN_multiple_cylinders_WHEN_creating_mesh_THEN_mesh_contains_every_cylinder_in_metres(
+    nexus_wrapper,
+):
+    steps = 8
+    # Two cylinders along z with radius 1cm and height 2cm, the second displaced by 10cm along x
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 0, 2], [10, 0, 0], [10, 1, 0], [10, 0, 2]]
+    cylinder = _create_cylinders_group(nexus_wrapper, vertices, [[0, 1, 2], [3, 4, 5]])
+
+    mesh = cylinder.to_off_geometry(steps)
+
+    mesh_vertices = mesh.vertices_array.reshape(2, 2 * steps, 3)
+    for cylinder_vertices, centre_x in zip(mesh_vertices, [0.0, 0.1]):
+        radial = cylinder_vertices[:, :2] - [centre_x, 0.0]
+        assert np.linalg.norm(radial, axis=1) == approx(np.full(2 * steps, 0.01))
+        assert cylinder_vertices[:steps, 2] == approx(np.zeros(steps))
+        assert cylinder_vertices[steps:, 2] == approx(np.full(steps, 0.02))
+    faces_per_cylinder = steps + 2
+    assert len(mesh.winding_order_indices_array) == 2 * faces_per_cylinder
+    # The faces of the second cylinder follow those of the first, starting with its sides
+    second_cylinder_faces = mesh.faces[faces_per_cylinder:]
+    assert second_cylinder_faces[0] == [
+        2 * steps,
+        3 * steps,
+        3 * steps + 1,
+        2 * steps + 1,
+    ]
+    assert second_cylinder_faces[steps] == [2 * steps + i for i in range(steps)]
+
+
+def test_GIVEN_steps_WHEN_creating_mesh_THEN_each_end_has_steps_vertices(
+    nexus_wrapper,
+):
+    cylinder = component_with_cylinder(nexus_wrapper)
+
+    assert len(cylinder.to_off_geometry(5).vertices_array) == 10
+    assert len(cylinder.off_geometry.vertices_array) == 2 * CYLINDER_MESH_STEPS
+
+
+def test_GIVEN_cylinder_WHEN_creating_mesh_THEN_mesh_is_centred_on_cylinder_vertices(
+    nexus_wrapper,
+):
+    cylinder = component_with_cylinder(nexus_wrapper)
+
+    mesh_centre = np.mean(cylinder.off_geometry.vertices_array, axis=0)
+
+    assert mesh_centre == approx(np.zeros(3), abs=1e-9)
+
+
+def test_GIVEN_cylinder_WHEN_creating_mesh_THEN_vertices_and_cylinders_are_read_once(
+    nexus_wrapper,
+):
+    cylinder = component_with_cylinder(nexus_wrapper)
+
+    with patch.object(
+        nexus_wrapper, "get_field_value", wraps=nexus_wrapper.get_field_value
+    ) as get_field_value:
+        cylinder.to_off_geometry()
+
+    assert get_field_value.call_count == 2
+
+
+def test_GIVEN_cylinder_with_no_height_WHEN_creating_mesh_THEN_mesh_is_flat_circle_in_xy_plane(
+    nexus_wrapper,
+):
+    cylinder = _create_cylinders_group(
+        nexus_wrapper, [[0, 0, 0], [0, 2, 0], [0, 0, 0]], [[0, 1, 2]]
+    )
+
+    mesh_vertices = cylinder.to_off_geometry(4).vertices_array
+
+    assert np.isfinite(mesh_vertices).all()
+    assert mesh_vertices[:, 2] == approx(np.zeros(8))
+    assert np.linalg.norm(mesh_vertices, axis=1) == approx(np.full(8, 0.02))
+
+
+def component_with_cylinder(nexus_wrapper):
+    component = add_component_to_file(nexus_wrapper)
+    return component.set_cylinder_shape(
+        axis_direction=np.array([2, 3, 8]), height=3, radius=4, units="m"
+    )
+
+
+def test_GIVEN_multiple_cylinders_WHEN_getting_dimensions_THEN_each_cylinder_has_its_own_height_radius_and_axis(
+    nexus_wrapper,
+):
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 0, 2], [10, 0, 0], [10, 0, 3], [13, 0, 0]]
+    cylinder = _create_cylinders_group(nexus_wrapper, vertices, [[0, 1, 2], [3, 4, 5]])
+
+    assert cylinder.cylinder_count == 2
+    assert cylinder.heights == approx([2, 3])
+    assert cylinder.radii == approx([1, 3])
+    assert cylinder.axis_directions == approx(np.array([[0, 0, 1], [1, 0, 0]]))
+
+
+def test_GIVEN_detector_number_WHEN_finding_cylinders_of_detector_THEN_every_cylinder_of_detector_is_found(
+    nexus_wrapper,
+):
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 0, 2]]
+    cylinder = _create_cylinders_group(nexus_wrapper, vertices, [[0, 1, 2]] * 4)
+    cylinder.detector_number = [7, 8, 7, 9]
+
+    assert cylinder.cylinders_of_detector(7).tolist() == [0, 2]
+    assert cylinder.cylinders_of_detector(5).tolist() == []
+
+
+def test_GIVEN_cylinders_WHEN_transforming_unit_cylinder_mesh_THEN_result_matches_mesh_of_cylinders():
+    cylinder_points = np.array(
+        [
+            [[0, 0, 0], [1, 0, 0], [0, 0, 2]],
+            [[10, 0, 0], [10, 0.5, 0.5], [13, 0, 0]],
+            [[1, 2, 3], [1, 2, 3.5], [2, 3, 3]],
+        ],
+        dtype=float,
+    )
+    steps = 6
+    unit_vertices, _, _ = unit_cylinder_mesh_arrays(steps)
+
+    centres, matrices = cylinder_instance_transforms(cylinder_points)
+
+    transformed = centres[:, np.newaxis] + np.einsum(
+        "nij,vj->nvi", matrices, unit_vertices
+    )
+    mesh_vertices, _, _ = cylinder_mesh_arrays(cylinder_points, steps)
+    assert transformed.reshape(-1, 3) == approx(mesh_vertices)
+    # Each matrix only rotates and scales the unit cylinder, without reflecting it and reversing its faces
+    assert (np.linalg.det(matrices) > 0).all()
+
+
+def test_GIVEN_cylinders_and_positions_WHEN_getting_instance_transforms_THEN_each_cylinder_is_at_each_position(
+    nexus_wrapper,
+):
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 0, 2], [10, 0, 0], [11, 0, 0], [10, 0, 2]]
+    cylinder = _create_cylinders_group(nexus_wrapper, vertices, [[0, 1, 2], [3, 4, 5]])
+    positions = np.array([[0, 0, 0], [0, 1, 0], [0, 2, 0]])
+
+    offsets, matrices = cylinder.instance_transforms(positions)
+
+    assert offsets == approx(
+        np.array([[x, y, 0.01] for y in [0.0, 1.0, 2.0] for x in [0.0, 0.1]])
+    )
+    assert len(matrices) == 6
+    assert matrices[:, :, 2] == approx(np.tile([0, 0, 0.02], (6, 1)))
+    assert np.linalg.norm(matrices[:, :, 0], axis=1) == approx(np.full(6, 0.01))
@@ -0,0 +1,217 @@
+import h5py
+import pytest
+
+from nexus_constructor.common_attrs import CommonAttrs
+from nexus_constructor.dependency_graph import (
+    DependencyGraph,
+    check_for_cycles,
+    find_depends_on,
+    get_dependents,
+)
+from nexus_constructor.nexus.file_changes import ChangeType, FileChange
+from tests.helpers import InMemoryFile
+
+
+def _create_component(file: h5py.File, name: str) -> h5py.Group:
+    component = file.create_group(f"entry/instrument/{name}")
+    component.attrs[CommonAttrs.NX_CLASS] = "NXdetector"
+    transformations = component.create_group("transformations")
+    transformations.attrs[CommonAttrs.NX_CLASS] = "NXtransformations"
+    return component
+
+
+def _add_transformation(component: h5py.Group, name: str, depends_on: str):
+    transformation = component["transformations"].create_dataset(name, data=1.0)
+    transformation.attrs[CommonAttrs.TRANSFORMATION_TYPE] = "translation"
+    transformation.attrs[CommonAttrs.VECTOR] = [0.0, 0.0, 1.0]
+    transformation.attrs[CommonAttrs.DEPENDS_ON] = depends_on
+    return transformation
+
+
+def test_GIVEN_components_and_transformations_WHEN_finding_depends_on_THEN_relative_paths_are_made_absolute():
+    with InMemoryFile("test_find_depends_on") as file:
+        component = _create_component(file, "detector")
+        first = _add_transformation(component, "first", ".")
+        second = _add_transformation(component, "second", "first")
+        component.create_dataset(CommonAttrs.DEPENDS_ON, data="transformations/second")
+
+        assert find_depends_on(file) == {
+            component.name: second.name,
+            second.name: first.name,
+        }
+
+
+def test_GIVEN_depends_on_WHEN_getting_dependents_THEN_each_dependency_lists_its_direct_dependents():
+    depends_on = {"/a": "/c", "/b": "/c", "/c": "/d"}
+
+    assert get_dependents(depends_on) == {"/c": ["/a", "/b"], "/d": ["/c"]}
+
+
+def test_GIVEN_cyclic_depends_on_WHEN_checking_for_cycles_THEN_raises_value_error():
+    with pytest.raises(ValueError):
+        check_for_cycles({"/a": "/b", "/b": "/c", "/c": "/a"})
+
+
+def test_GIVEN_depends_on_chains_WHEN_checking_for_cycles_THEN_no_error_is_raised():
+    check_for_cycles({"/a": "/b", "/b": "/c", "/d": "/c"})
+
+
+def _create_file_with_two_components(file: h5py.File):
+    first_component = _create_component(file, "first_detector")
+    second_component = _create_component(file, "second_detector")
+    first = _add_transformation(first_component, "first", ".")
+    second = _add_transformation(second_component, "second", first.name)
+    first_component.create_dataset(CommonAttrs.DEPENDS_ON, data=first.name)
+    second_component.create_dataset(CommonAttrs.DEPENDS_ON, data=second.name)
+    return first_component, second_component, first, second
+
+
+def test_GIVEN_file_WHEN_rebuilding_graph_THEN_each_transformation_has_its_direct_dependents():
+    with InMemoryFile("test_rebuild_graph") as file:
+        (
+            first_component,
+            second_component,
+            first,
+            second,
+        ) = _create_file_with_two_components(file)
+        graph = DependencyGraph()
+
+        graph.rebuild(file)
+
+        assert graph.get_dependents(first.name) == [first_component.name, second.name]
+        assert graph.get_dependents(second.name) == [second_component.name]
+        assert graph.get_dependents(first_component.name) == []
+
+
+def test_GIVEN_dependent_WHEN_removing_it_twice_THEN_second_removal_returns_false():
+    graph = DependencyGraph()
+    graph.add("/transformation", "/component")
+
+    assert graph.remove("/transformation", "/component")
+    assert not graph.remove("/transformation", "/component")
+    assert graph.get_dependents("/transformation") == []
+
+
+def test_GIVEN_graph_WHEN_component_is_renamed_THEN_paths_under_it_are_moved():
+    graph = DependencyGraph()
+    graph.add("/entry/a/transformations/t", "/entry/a")
+    graph.add("/entry/a/transformations/t", "/entry/b")
+
+    graph.update(FileChange(ChangeType.RENAMED, "/entry/a", "/entry/c"), None)
+
+    assert graph.get_dependents("/entry/c/transformations/t") == [
+        "/entry/c",
+        "/entry/b",
+    ]
+    assert graph.get_dependents("/entry/a/transformations/t") == []
+
+
+def test_GIVEN_graph_WHEN_component_is_removed_THEN_its_links_are_removed():
+    graph = DependencyGraph()
+    graph.add("/entry/a/transformations/t", "/entry/a")
+    graph.add("/entry/b/transformations/t", "/entry/c")
+    graph.add("/entry/b/transformations/t", "/entry/a/transformations/t")
+
+    graph.update(FileChange(ChangeType.REMOVED, "/entry/a"), None)
+
+    assert graph.get_dependents("/entry/a/transformations/t") == []
+    assert graph.get_dependents("/entry/b/transformations/t") == ["/entry/c"]
+
+
+def test_GIVEN_graph_WHEN_writing_dependee_of_attributes_THEN_dependents_are_listed_and_stale_attributes_removed():
+    with InMemoryFile("test_write_dependee_of") as file:
+        (
+            first_component,
+            second_component,
+            first,
+            second,
+        ) = _create_file_with_two_components(file)
+        unused = _add_transformation(second_component, "unused", ".")
+        unused.attrs[CommonAttrs.DEPENDEE_OF] = "/entry/instrument/deleted"
+        graph = DependencyGraph()
+        graph.rebuild(file)
+
+        graph.write_dependee_of_attributes(file)
+
+        assert list(first.attrs[CommonAttrs.DEPENDEE_OF]) == [
+            first_component.name,
+            second.name,
+        ]
+        assert list(second.attrs[CommonAttrs.DEPENDEE_OF]) == [second_component.name]
+        assert CommonAttrs.DEPENDEE_OF not in unused.attrs
+
+
+def test_GIVEN_depends_on_missing_transformation_WHEN_finding_depends_on_THEN_link_is_skipped():
+    with InMemoryFile("test_find_depends_on_missing") as file:
+        component = _create_component(file, "detector")
+        component.create_dataset(CommonAttrs.DEPENDS_ON, data="/entry/missing")
+
+        assert find_depends_on(file) == {}
+
+
+def test_GIVEN_dependent_WHEN_adding_it_to_another_transformation_THEN_it_is_only_a_dependent_of_the_new_one():
+    graph = DependencyGraph()
+    graph.add("/entry/a/transformations/t", "/entry/b")
+
+    graph.add("/entry/c/transformations/t", "/entry/b")
+
+    assert graph.get_dependents("/entry/a/transformations/t") == []
+    assert graph.get_dependents("/entry/c/transformations/t") == ["/entry/b"]
+    assert graph.get_depends_on("/entry/b") == "/entry/c/transformations/t"
+
+
+def test_GIVEN_dependent_WHEN_removing_it_THEN_it_no_longer_depends_on_anything():
+    graph = DependencyGraph()
+    graph.add("/entry/a/transformations/t", "/entry/b")
+
+    graph.remove("/entry/a/transformations/t", "/entry/b")
+
+    assert graph.get_depends_on("/entry/b") is None
+
+
+def test_GIVEN_graph_WHEN_transformation_with_dependents_elsewhere_is_removed_THEN_dependents_can_be_added_elsewhere():
+    graph = DependencyGraph()
+    graph.add("/entry/a/transformations/t", "/entry/b")
+    graph.add("/entry/a/transformations/t", "/entry/c/transformations/t")
+
+    graph.update(FileChange(ChangeType.REMOVED, "/entry/a/transformations"), None)
+    graph.add("/entry/d/transformations/t", "/entry/b")
+
+    assert graph.get_dependents("/entry/a/transformations/t") == []
+    assert graph.get_dependents("/entry/d/transformations/t") == ["/entry/b"]
+    assert not graph.remove("/entry/a/transformations/t", "/entry/b")
+
+
+def test_GIVEN_graph_WHEN_group_with_similar_name_is_removed_THEN_other_links_are_kept():
+    graph = DependencyGraph()
+    graph.add("/entry/a/transformations/t", "/entry/a")
+    graph.add("/entry/ab/transformations/t", "/entry/ab")
+
+    graph.update(FileChange(ChangeType.REMOVED, "/entry/a"), None)
+
+    assert graph.get_dependents("/entry/ab/transformations/t") == ["/entry/ab"]
+
+
+def test_GIVEN_graph_WHEN_transformation_is_renamed_THEN_dependents_elsewhere_follow_it_and_keep_their_order():
+    graph = DependencyGraph()
+    graph.add("/entry/a/transformations/t", "/entry/b")
+    graph.add("/entry/a/transformations/t", "/entry/a")
+    graph.add("/entry/c/transformations/t", "/entry/a/transformations/t")
+
+    graph.update(
+        FileChange(
+            ChangeType.RENAMED,
+            "/entry/a/transformations/t",
+            "/entry/a/transformations/u",
+        ),
+        None,
+    )
+
+    assert graph.get_dependents("/entry/a/transformations/u") == [
+        "/entry/b",
+        "/entry/a",
+    ]
+    assert graph.get_dependents("/entry/c/transformations/t") == [
+        "/entry/a/transformations/u"
+    ]
+    assert graph.remove("/entry/c/transformations/t", "/entry/a/transformations/u")
@@ -1,8 +1,13 @@
 from nexus_constructor.geometry import OFFGeometryNoNexus
-from nexus_constructor.geometry.geometry_loader import load_geometry_from_file_object
-from nexus_constructor.off_renderer import repeat_shape_over_positions
-from PySide2.QtGui import QVector3D
-from io import StringIO
+from nexus_constructor.geometry.geometry_loader import (
+    load_geometry_from_file_object,
+    MeshFileCache,
+    STL_TRIANGLE_DTYPE,
+)
+from mock import patch
+from io import StringIO, BytesIO
+import numpy as np
+from pytest import approx
 
 
 def test_GIVEN_off_file_containing_geometry_WHEN_loading_geometry_to_file_THEN_vertices_and_faces_loaded_are_the_same_as_the_file():
@@ -32,16 +37,19 @@ def test_GIVEN_off_file_containing_geometry_WHEN_loading_geometry_to_file_THEN_v
 
     load_geometry_from_file_object(StringIO(off_file), ".off", model.units, model)
 
-    assert model.vertices == [
-        QVector3D(-0.5, -0.5, 0.5),
-        QVector3D(0.5, -0.5, 0.5),
-        QVector3D(-0.5, 0.5, 0.5),
-        QVector3D(0.5, 0.5, 0.5),
-        QVector3D(-0.5, 0.5, -0.5),
-        QVector3D(0.5, 0.5, -0.5),
-        QVector3D(-0.5, -0.5, -0.5),
-        QVector3D(0.5, -0.5, -0.5),
-    ]
+    assert np.array_equal(
+        model.vertices,
+        [
+            np.array([-0.5, -0.5, 0.5]),
+            np.array([0.5, -0.5, 0.5]),
+            np.array([-0.5, 0.5, 0.5]),
+            np.array([0.5, 0.5, 0.5]),
+            np.array([-0.5, 0.5, -0.5]),
+            np.array([0.5, 0.5, -0.5]),
+            np.array([-0.5, -0.5, -0.5]),
+            np.array([0.5, -0.5, -0.5]),
+        ],
+    )
     assert model.faces == [
         [0, 1, 3, 2],
         [2, 3, 5, 4],
@@ -81,14 +89,14 @@ def test_GIVEN_off_file_containing_geometry_WHEN_loading_geometry_to_file_THEN_v
 
 def test_GIVEN_stl_file_with_cube_geometry_WHEN_loading_geometry_THEN_all_faces_are_present():
     length = 30
-    left_lower_rear = QVector3D(0, 0, 0)
-    right_lower_rear = QVector3D(length, 0, 0)
-    left_upper_rear = QVector3D(0, length, 0)
-    right_upper_rear = QVector3D(length, length, 0)
-    left_lower_front = QVector3D(0, 0, length)
-    right_lower_front = QVector3D(length, 0, length)
-    left_upper_front = QVector3D(0, length, length)
-    right_upper_front = QVector3D(length, length, length)
+    left_lower_rear = (0, 0, 0)
+    right_lower_rear = (length, 0, 0)
+    left_upper_rear = (0, length, 0)
+    right_upper_rear = (length, length, 0)
+    left_lower_front = (0, 0, length)
+    right_lower_front = (length, 0, length)
+    left_upper_front = (0, length, length)
+    right_upper_front = (length, length, length)
     # faces on a cube with a right hand winding order
     faces = [
         [
@@ -202,6 +210,7 @@ def test_GIVEN_stl_file_with_cube_geometry_WHEN_loading_geometry_THEN_all_faces_
         endsolid vcg"""
 
     geometry = load_geometry_from_file_object(StringIO(cube), ".stl", "m")
+    vertices = [tuple(vertex) for vertex in geometry.vertices]
 
     # 2 triangles per face, 6 faces in the cube
     assert len(geometry.faces) == 6 * 2
@@ -217,7 +226,7 @@ def test_GIVEN_stl_file_with_cube_geometry_WHEN_loading_geometry_THEN_all_faces_
         left_upper_front,
         right_upper_front,
     ]:
-        assert vertex in geometry.vertices
+        assert vertex in vertices
     # each face must be in the loaded geometry
     for face in faces:
         face_found = False
@@ -231,9 +240,9 @@ def test_GIVEN_stl_file_with_cube_geometry_WHEN_loading_geometry_THEN_all_faces_
             for triangle in triangle_split:
                 # check the triangle against each rotation of each triangle in the geometry
                 for candidate_triangle_indices in geometry.faces:
-                    a = geometry.vertices[candidate_triangle_indices[0]]
-                    b = geometry.vertices[candidate_triangle_indices[1]]
-                    c = geometry.vertices[candidate_triangle_indices[2]]
+                    a = vertices[candidate_triangle_indices[0]]
+                    b = vertices[candidate_triangle_indices[1]]
+                    c = vertices[candidate_triangle_indices[2]]
                     if (
                         triangle == [a, b, c]
                         or triangle == [b, c, a]
@@ -251,112 +260,91 @@ def test_GIVEN_unrecognised_file_extension_WHEN_loading_geometry_THEN_returns_em
     assert len(geometry.faces) == 0
 
 
-def get_dummy_OFF():
-    # A square with a triangle on the side
-    original_vertices = [
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 0),
-        QVector3D(1, 1, 0),
-        QVector3D(1, 0, 0),
-        QVector3D(1.5, 0.5, 0),
-    ]
-    original_faces = [[0, 1, 2, 3], [2, 3, 4]]
-
-    return OFFGeometryNoNexus(vertices=original_vertices, faces=original_faces)
-
-
-def test_WHEN_generate_off_mesh_with_no_repeat_THEN_off_unchanged():
-    off_geometry = get_dummy_OFF()
-
-    positions = [QVector3D(0, 0, 0)]
-
-    faces, vertices = repeat_shape_over_positions(off_geometry, positions)
-
-    assert faces == off_geometry.faces
-    assert vertices == off_geometry.vertices
-
-
-def test_WHEN_generate_off_mesh_with_three_copies_THEN_original_shape_remains():
-    off_geometry = get_dummy_OFF()
-
-    positions = [QVector3D(0, 0, 0), QVector3D(0, 0, 1), QVector3D(1, 0, 0)]
-
-    faces, vertices = repeat_shape_over_positions(off_geometry, positions)
-
-    assert faces[: len(off_geometry.faces)] == off_geometry.faces
-    assert vertices[: len(off_geometry.vertices)] == off_geometry.vertices
-
-
-def _test_position_with_single_translation_helper(translation):
-    off_geometry = get_dummy_OFF()
-
-    positions = [QVector3D(0, 0, 0), translation]
-
-    faces, vertices = repeat_shape_over_positions(off_geometry, positions)
-
-    second_shape_faces = faces[len(off_geometry.faces) :]
-    second_shape_vertices = vertices[len(off_geometry.vertices) :]
-
-    # Faces will just be the same but every vertex added to be len(vertices)
-    shifted_faces = []
-    for face in second_shape_faces:
-        shifted_face = []
-        for vertex in face:
-            shifted_face.append(vertex - len(off_geometry.vertices))
-        shifted_faces.append(shifted_face)
-
-    assert shifted_faces == off_geometry.faces
-
-    return off_geometry.vertices, second_shape_vertices
-
-
-def test_WHEN_generate_off_mesh_with_single_x_position_THEN_second_shape_just_translation_of_first():
-    (
-        original_vertices,
-        second_shape_vertices,
-    ) = _test_position_with_single_translation_helper(QVector3D(1, 0, 0))
-
-    # Vertices will be the same by shifted by 1
-    for vertex in second_shape_vertices:
-        vertex.setX(vertex.x() - 1)
-
-    assert second_shape_vertices == original_vertices
-
-
-def test_WHEN_generate_off_mesh_with_single_y_position_THEN_second_shape_just_translation_of_first():
-    (
-        original_vertices,
-        second_shape_vertices,
-    ) = _test_position_with_single_translation_helper(QVector3D(0, 1, 0))
-
-    # Vertices will be the same by shifted by 1
-    for vertex in second_shape_vertices:
-        vertex.setY(vertex.y() - 1)
-
-    assert second_shape_vertices == original_vertices
-
-
-def test_WHEN_generate_off_mesh_with_single_negative_z_position_THEN_second_shape_just_translation_of_first():
-    (
-        original_vertices,
-        second_shape_vertices,
-    ) = _test_position_with_single_translation_helper(QVector3D(0, 0, -1))
-
-    # Vertices will be the same by shifted by 1
-    for vertex in second_shape_vertices:
-        vertex.setZ(vertex.z() + 1)
+def test_GIVEN_binary_stl_file_WHEN_loading_geometry_THEN_shared_corners_are_stored_once():
+    triangles = np.zeros(2, dtype=STL_TRIANGLE_DTYPE)
+    triangles["corners"][0] = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+    triangles["corners"][1] = [[1, 0, 0], [1, 1, 0], [0, 1, 0]]
+    stl_file = BytesIO(
+        b"solid but actually binary".ljust(80)
+        + np.uint32(len(triangles)).tobytes()
+        + triangles.tobytes()
+    )
 
-    assert second_shape_vertices == original_vertices
+    geometry = load_geometry_from_file_object(stl_file, ".stl", "m")
 
+    assert len(geometry.vertices) == 4
+    assert geometry.winding_order_indices == [0, 3]
+    assert np.array_equal(
+        geometry.vertices_array[geometry.winding_order_array].reshape(-1, 3, 3),
+        triangles["corners"],
+    )
 
-def test_WHEN_generate_off_mesh_with_single_diagonal_position_THEN_second_shape_just_translation_of_first():
-    (
-        original_vertices,
-        second_shape_vertices,
-    ) = _test_position_with_single_translation_helper(QVector3D(0, 1, -1))
 
-    for vertex in second_shape_vertices:
-        vertex.setZ(vertex.z() + 1)
-        vertex.setY(vertex.y() - 1)
+def test_GIVEN_off_file_with_counts_on_header_line_and_face_colours_WHEN_loading_geometry_THEN_colours_are_ignored():
+    off_file = (
+        "OFF 4 2 0\n"
+        "0 0 0\n"
+        "1 0 0 # comment\n"
+        "0 1 0\n"
+        "1 1 0\n"
+        "3 0 1 2 255 0 0\n"
+        "4 0 1 3 2\n"
+    )
 
-    assert second_shape_vertices == original_vertices
+    geometry = load_geometry_from_file_object(StringIO(off_file), ".off", "cm")
+
+    assert geometry.faces == [[0, 1, 2], [0, 1, 3, 2]]
+    assert geometry.vertices[3] == approx([0.01, 0.01, 0])
+
+
+def test_GIVEN_unchanged_mesh_file_WHEN_getting_it_from_cache_twice_THEN_file_is_only_parsed_once(
+    tmpdir,
+):
+    off_file = tmpdir.join("triangle.off")
+    off_file.write("OFF\n3 1 0\n0 0 0\n1 0 0\n0 1 0\n3 0 1 2\n")
+    cache = MeshFileCache()
+
+    first = cache.get(str(off_file))
+    with patch(
+        "nexus_constructor.geometry.geometry_loader.parse_mesh_file_object"
+    ) as mock_parse:
+        second = cache.get(str(off_file))
+        mock_parse.assert_not_called()
+
+    assert second is first
+
+
+def test_GIVEN_mesh_file_is_changed_WHEN_getting_it_from_cache_THEN_file_is_parsed_again(
+    tmpdir,
+):
+    off_file = tmpdir.join("triangle.off")
+    off_file.write("OFF\n3 1 0\n0 0 0\n1 0 0\n0 1 0\n3 0 1 2\n")
+    cache = MeshFileCache()
+    cache.get(str(off_file))
+
+    off_file.write("OFF\n4 2 0\n0 0 0\n1 0 0\n0 1 0\n1 1 0\n3 0 1 2\n3 1 3 2\n")
+
+    _, _, winding_order_indices = cache.get(str(off_file))
+    assert len(winding_order_indices) == 2
+
+
+def test_GIVEN_more_files_than_cache_size_WHEN_getting_them_from_cache_THEN_least_recently_used_file_is_evicted(
+    tmpdir,
+):
+    cache = MeshFileCache(max_entries=2)
+    filenames = []
+    for name in ["first", "second", "third"]:
+        off_file = tmpdir.join(f"{name}.off")
+        off_file.write("OFF\n3 1 0\n0 0 0\n1 0 0\n0 1 0\n3 0 1 2\n")
+        filenames.append(str(off_file))
+    first = cache.get(filenames[0])
+    cache.get(filenames[1])
+    cache.get(filenames[0])
+    cache.get(filenames[2])
+
+    with patch(
+        "nexus_constructor.geometry.geometry_loader.parse_mesh_file_object"
+    ) as mock_parse:
+        assert cache.get(filenames[0]) is first
+        cache.get(filenames[1])
+        mock_parse.assert_called_once()
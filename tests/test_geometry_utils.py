@@ -1,50 +1,73 @@
+import numpy as np
+
 from nexus_constructor.geometry.utils import (
     get_an_orthogonal_unit_vector,
-    validate_nonzero_qvector,
+    get_orthogonal_unit_vectors,
+    normalise,
+    validate_nonzero_vector,
 )
-from PySide2.QtGui import QVector3D
 from pytest import raises, fail, approx
 import pytest
 
 
-def test_zero_qvector_raises_error_when_validated():
-    test_vector = QVector3D(0, 0, 0)
+def test_zero_vector_raises_error_when_validated():
+    test_vector = np.array([0, 0, 0])
     with raises(ValueError):
-        validate_nonzero_qvector(test_vector)
+        validate_nonzero_vector(test_vector)
 
 
 @pytest.mark.parametrize(
     "nonzero_input_vector",
-    [(QVector3D(1, 0, 0),), (QVector3D(2, 3, 8),), (QVector3D(0, -1, 0),)],
+    [(np.array([1, 0, 0]),), (np.array([2, 3, 8]),), (np.array([0, -1, 0]),)],
 )
-def test_non_zero_qvector_does_not_raise_error_when_validated(nonzero_input_vector):
+def test_non_zero_vector_does_not_raise_error_when_validated(nonzero_input_vector):
     try:
-        validate_nonzero_qvector(nonzero_input_vector[0])
+        validate_nonzero_vector(nonzero_input_vector[0])
     except ValueError:
         fail("Expected non-zero vector to pass validation")
 
 
 @pytest.mark.parametrize(
     "test_vector",
-    [(QVector3D(1, 0, 0),), (QVector3D(2, 3, -8),), (QVector3D(0, -1, 0),)],
+    [(np.array([1, 0, 0]),), (np.array([2, 3, -8]),), (np.array([0, -1, 0]),)],
 )
 def test_get_an_orthogonal_unit_vector_gives_a_unit_vector(test_vector):
     result_vector = get_an_orthogonal_unit_vector(test_vector[0])
-    assert result_vector.length() == approx(1)
+    assert np.linalg.norm(result_vector) == approx(1)
 
 
 @pytest.mark.parametrize(
     "test_vector",
     [
-        (QVector3D(1, 0, 0),),
-        (QVector3D(0, 1, 0),),
-        (QVector3D(0, 0, 1),),
-        (QVector3D(2, 3, -8),),
-        (QVector3D(0, -1, 0),),
-        (QVector3D(0.1, -1, 0),),
+        (np.array([1, 0, 0]),),
+        (np.array([0, 1, 0]),),
+        (np.array([0, 0, 1]),),
+        (np.array([2, 3, -8]),),
+        (np.array([0, -1, 0]),),
+        (np.array([0.1, -1, 0]),),
     ],
 )
 def test_get_an_orthogonal_unit_vector_gives_an_orthogonal_vector(test_vector):
     result_vector = get_an_orthogonal_unit_vector(test_vector[0])
     # Test orthogonal (dot product is zero)
-    assert QVector3D.dotProduct(test_vector[0], result_vector) == approx(0)
+    assert np.dot(test_vector[0], result_vector) == approx(0)
+
+
+def test_GIVEN_array_of_vectors_WHEN_getting_orthogonal_unit_vectors_THEN_each_matches_single_vector_result():
+    vectors = np.array(
+        [[1.0, 0.0, 0.0], [0.0, 0.0, 3.0], [2.0, 3.0, 8.0], [-4, 1, 0.5]]
+    )
+
+    results = get_orthogonal_unit_vectors(vectors)
+
+    for vector, result in zip(vectors, results):
+        expected = get_an_orthogonal_unit_vector(vector)
+        assert result == approx(expected)
+
+
+def test_GIVEN_vector_WHEN_normalising_THEN_unit_vector_in_same_direction_is_returned():
+    assert normalise([0.0, 3.0, 4.0]) == approx([0.0, 0.6, 0.8])
+
+
+def test_GIVEN_zero_vector_WHEN_normalising_THEN_zero_vector_is_returned():
+    assert normalise([0.0, 0.0, 0.0]) == approx([0.0, 0.0, 0.0])
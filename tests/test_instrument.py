@@ -127,7 +127,7 @@ def test_dependent_is_created_by_instrument_if_depends_on_is_relative(
     Instrument(nexus_wrapper, NX_CLASS_DEFINITIONS)
 
     transform_1_loaded = Transformation(nexus_wrapper, transform_1)
-    assert transform_1_loaded.dataset.attrs["NCdependee_of"][0] == "/entry/monitor1"
+    assert transform_1_loaded.get_dependents()[0].absolute_path == "/entry/monitor1"
 
 
 def test_dependee_of_contains_both_components_when_generating_dependee_of_chain_with_mixture_of_absolute_and_relative_paths(
@@ -157,6 +157,60 @@ def test_dependee_of_contains_both_components_when_generating_dependee_of_chain_
     Instrument(nexus_wrapper, NX_CLASS_DEFINITIONS)
     transform_1_loaded = Transformation(nexus_wrapper, transform_1)
 
-    # Check both relative and absolute are in dependee_of list
-    assert component_a.name in transform_1_loaded.dataset.attrs["NCdependee_of"]
-    assert component_b.name in transform_1_loaded.dataset.attrs["NCdependee_of"]
+    # Check both relative and absolute are in dependents
+    dependents = [
+        dependent.absolute_path for dependent in transform_1_loaded.get_dependents()
+    ]
+    assert component_a.name in dependents
+    assert component_b.name in dependents
+
+
+def test_GIVEN_renamed_component_WHEN_getting_components_list_THEN_list_contains_component_with_new_name():
+    wrapper = NexusWrapper("test_component_index_rename")
+    instrument = Instrument(wrapper, NX_CLASS_DEFINITIONS)
+    component = instrument.create_component("old_name", "NXcrystal", "")
+
+    component.name = "new_name"
+
+    names = [component.name for component in instrument.get_component_list()]
+    assert "new_name" in names
+    assert "old_name" not in names
+    assert instrument.get_component("/entry/instrument/new_name") == component
+    assert instrument.get_component("/entry/instrument/old_name") is None
+
+
+def test_GIVEN_duplicated_component_WHEN_getting_components_by_nx_class_THEN_both_components_are_returned():
+    wrapper = NexusWrapper("test_component_index_duplicate")
+    instrument = Instrument(wrapper, NX_CLASS_DEFINITIONS)
+    component = instrument.create_component("crystal", "NXcrystal", "")
+
+    component.duplicate(instrument.get_component_list())
+
+    assert len(instrument.get_components_by_nx_class("NXcrystal")) == 2
+
+
+def test_GIVEN_component_nx_class_changed_to_non_component_class_WHEN_getting_components_THEN_group_is_not_listed():
+    wrapper = NexusWrapper("test_component_index_nx_class")
+    instrument = Instrument(wrapper, NX_CLASS_DEFINITIONS)
+    component = instrument.create_component("crystal", "NXcrystal", "")
+
+    component.nx_class = "NXtransformations"
+
+    assert component not in instrument.get_component_list()
+
+
+def test_GIVEN_loaded_file_WHEN_getting_components_list_THEN_list_contains_components_from_loaded_file(
+    file,  # noqa: F811
+):
+    entry_group = file.create_group("entry")
+    entry_group.attrs["NX_class"] = "NXentry"
+    monitor_group = entry_group.create_group("monitor1")
+    monitor_group.attrs["NX_class"] = "NXmonitor"
+
+    nexus_wrapper = NexusWrapper("test_component_index_load")
+    instrument = Instrument(nexus_wrapper, NX_CLASS_DEFINITIONS)
+    nexus_wrapper.load_file(entry_group, file)
+
+    assert [component.name for component in instrument.get_component_list()] == [
+        "monitor1"
+    ]
@@ -1,3 +1,4 @@
+import numpy as np
 from mock import Mock
 
 from nexus_constructor.instrument_view import InstrumentView
@@ -47,3 +48,34 @@ def test_GIVEN_entity_and_camera_WHEN_zooming_to_component_THEN_camera_zooms_to_
 
     InstrumentView.zoom_to_component(mock_entity, mock_camera)
     mock_camera.viewEntity.assert_called_once()
+
+
+def test_GIVEN_components_WHEN_updating_levels_of_detail_THEN_each_component_gets_its_visibility_and_distance():
+    view = Mock()
+    near_component, hidden_component = Mock(), Mock()
+    near_component.world_box = (np.array([-1, -1, -6.0]), np.array([1, 1, -4.0]))
+    hidden_component.world_box = (np.array([50, 50, -6.0]), np.array([51, 51, -4.0]))
+    view.component_levels_of_detail = {
+        "near": near_component,
+        "hidden": hidden_component,
+    }
+    # Looking down -z from the origin, seeing x and y between -10 and 10
+    view.view.view_projection_matrix.return_value = np.diag([0.1, 0.1, -0.01, 1])
+    view.view.distances_to_camera.return_value = np.array([4.0, 70.0])
+
+    InstrumentView.update_levels_of_detail(view)
+
+    near_component.update.assert_called_once_with(True, 4.0)
+    hidden_component.update.assert_called_once_with(False, 70.0)
+
+
+def test_GIVEN_component_not_in_view_yet_WHEN_adding_transformation_THEN_transformation_is_kept_until_it_is_added():
+    view = Mock()
+    view.component_entities = {}
+    view.transformations = {}
+    transformation = Mock()
+
+    InstrumentView.add_transformation(view, "component", transformation)
+
+    assert view.transformations["component"] is transformation
+    view._update_component_transformation.assert_not_called()
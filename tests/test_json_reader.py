@@ -1,7 +1,15 @@
+import io
+import json
+
 import pytest
 import h5py
 import numpy as np
-from nexus_constructor.json.filewriter_json_reader import json_to_nexus
+from mock import patch
+
+from nexus_constructor.json.filewriter_json_reader import (
+    json_to_nexus,
+    json_file_to_nexus,
+)
 
 
 def is_nexus_class(group: h5py.Group, class_name: str):
@@ -204,3 +212,69 @@ def test_GIVEN_json_containing_link_WHEN_json_to_nexus_called_THEN_link_created_
     nexus_file = json_to_nexus(test_json)
 
     assert isinstance(nexus_file.get(link_name, getlink=True), h5py.SoftLink)
+
+
+def _json_with_nested_dataset(values, dataset_type, size):
+    return json.dumps(
+        {
+            "cmd": "FileWriter_new",
+            "nexus_structure": {
+                "children": [
+                    {
+                        "type": "group",
+                        "name": "entry",
+                        "children": [
+                            {
+                                "type": "dataset",
+                                "name": "data",
+                                "dataset": {"type": dataset_type, "size": size},
+                                "values": values,
+                            }
+                        ],
+                        "attributes": [{"name": "NX_class", "values": "NXentry"}],
+                    }
+                ]
+            },
+        }
+    )
+
+
+def test_GIVEN_flat_values_and_size_WHEN_json_to_nexus_called_THEN_dataset_has_declared_type_and_shape():
+    nexus_file = json_to_nexus(
+        _json_with_nested_dataset(list(range(6)), "uint32", [2, 3])
+    )
+
+    assert nexus_file["entry/data"].dtype == np.uint32
+    assert nexus_file["entry/data"].shape == (2, 3)
+    assert nexus_file["entry/data"][1, 2] == 5
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_GIVEN_json_file_WHEN_json_file_to_nexus_called_THEN_file_is_the_same_as_from_json_to_nexus(
+    use_ijson,
+):
+    test_json = _json_with_nested_dataset([[1.5, 2.5], [3.5, 4.5]], "double", [2, 2])
+
+    if use_ijson:
+        pytest.importorskip("ijson")
+        nexus_file = json_file_to_nexus(io.BytesIO(test_json.encode()))
+    else:
+        with patch("nexus_constructor.json.filewriter_json_reader.ijson", None):
+            nexus_file = json_file_to_nexus(io.BytesIO(test_json.encode()))
+
+    assert is_nexus_class(nexus_file["entry"], "NXentry")
+    assert nexus_file["entry/data"].dtype == np.float64
+    assert np.array_equal(nexus_file["entry/data"][...], [[1.5, 2.5], [3.5, 4.5]])
+
+
+def test_GIVEN_json_file_containing_nan_WHEN_json_file_to_nexus_called_THEN_nan_is_loaded():
+    test_json = _json_with_nested_dataset([1.0, float("nan")], "double", [2])
+
+    nexus_file = json_file_to_nexus(io.BytesIO(test_json.encode()))
+
+    assert np.isnan(nexus_file["entry/data"][1])
+
+
+def test_GIVEN_json_file_without_nexus_structure_WHEN_json_file_to_nexus_called_THEN_error_is_raised():
+    with pytest.raises(KeyError):
+        json_file_to_nexus(io.BytesIO(b'{"cmd": "FileWriter_new"}'))
@@ -0,0 +1,118 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from nexus_constructor.json.json_stream_writer import (
+    COMPACT_SEPARATORS,
+    ChunkedArray,
+    JsonStreamWriter,
+    format_numbers,
+    object_to_json_stream,
+)
+from tests.helpers import file  # noqa: F401
+
+
+def _stream_to_string(value, indent=2, separators=None):
+    output = io.StringIO()
+    JsonStreamWriter(output, indent, separators).write(value)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize(
+    "indent,separators", [(2, None), (None, None), (None, COMPACT_SEPARATORS)]
+)
+def test_GIVEN_nested_values_WHEN_streaming_json_THEN_output_is_the_same_as_json_dumps(
+    indent, separators,
+):
+    value = {
+        "children": [
+            {"name": "a", "values": [1, 2.5, True, None, "text"], "empty": []},
+            {"name": "b", "attributes": {}},
+        ],
+        "name": 'quote " and unicode Å',
+    }
+
+    assert _stream_to_string(value, indent, separators) == json.dumps(
+        value, indent=indent, separators=separators
+    )
+
+
+def test_GIVEN_generator_WHEN_streaming_json_THEN_it_is_written_as_a_list():
+    assert json.loads(_stream_to_string({"children": (i for i in range(3))})) == {
+        "children": [0, 1, 2]
+    }
+
+
+@pytest.mark.parametrize("dtype", [np.int32, np.uint64, np.float32, np.float64])
+def test_GIVEN_numpy_array_WHEN_streaming_json_THEN_output_is_the_same_as_json_dumps_of_list(
+    dtype,
+):
+    array = np.arange(12, dtype=dtype).reshape(4, 3) / 3
+    array = array.astype(dtype)
+
+    assert _stream_to_string(array) == json.dumps(array.tolist(), indent=2)
+
+
+def test_GIVEN_array_larger_than_chunk_size_WHEN_streaming_json_THEN_all_values_are_written():
+    array = np.linspace(0.0, 1.0, 1001)
+
+    output = _stream_to_string(ChunkedArray(array, chunk_size=100))
+
+    assert json.loads(output) == array.tolist()
+
+
+def test_GIVEN_non_finite_floats_WHEN_formatting_numbers_THEN_they_are_written_as_json_module_does():
+    values = np.array([np.nan, np.inf, -np.inf, 1.5])
+
+    assert format_numbers(values) == ["NaN", "Infinity", "-Infinity", "1.5"]
+
+
+def test_GIVEN_dataset_WHEN_creating_chunked_array_THEN_dataset_is_read_in_chunks_of_rows(
+    file,  # noqa: F811
+):
+    dataset = file.create_dataset("ds", data=np.ones((10, 4)))
+
+    chunks = list(ChunkedArray(dataset, chunk_size=8).chunks())
+
+    assert [chunk.shape for chunk in chunks] == [(2, 4)] * 5
+
+
+def test_GIVEN_precision_WHEN_formatting_numbers_THEN_floats_are_written_with_that_many_significant_digits():
+    values = np.array([1 / 3, 123456.789, 1.5e-9, np.nan])
+
+    assert format_numbers(values, precision=4) == [
+        "0.3333",
+        "1.235e+05",
+        "1.5e-09",
+        "NaN",
+    ]
+
+
+def test_GIVEN_compact_WHEN_writing_object_to_json_stream_THEN_output_has_no_whitespace():
+    output = io.StringIO()
+
+    object_to_json_stream(
+        {"values": np.array([[0.5, 1.0], [1.5, 2.0]]), "name": "a"},
+        output,
+        compact=True,
+    )
+
+    assert output.getvalue() == '{"values":[[0.5,1.0],[1.5,2.0]],"name":"a"}'
+
+
+def test_GIVEN_floats_of_every_magnitude_WHEN_formatting_numbers_exactly_THEN_output_matches_json_module():
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal(1000) * 10.0 ** rng.integers(-300, 300, 1000)
+    values = np.concatenate((values, [0.0, -0.0, 100.0, 1e16, 5e-324]))
+
+    assert format_numbers(values) == [json.dumps(value) for value in values.tolist()]
+    assert format_numbers(values.astype(np.float32)) == [
+        json.dumps(value) for value in values.astype(np.float32).tolist()
+    ]
+
+
+def test_GIVEN_integers_and_booleans_WHEN_formatting_numbers_THEN_output_matches_json_module():
+    assert format_numbers(np.array([-3, 0, 2 ** 40])) == ["-3", "0", "1099511627776"]
+    assert format_numbers(np.array([True, False])) == ["true", "false"]
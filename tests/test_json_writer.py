@@ -9,6 +9,7 @@ from nexus_constructor.instrument import Instrument
 from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
 from nexus_constructor.json.filewriter_json_writer import (
     NexusToDictConverter,
+    NexusToStreamConverter,
     create_writer_commands,
     generate_json,
     _add_attributes,
@@ -16,6 +17,10 @@ from nexus_constructor.json.filewriter_json_writer import (
     get_data_and_type,
 )
 from nexus_constructor.json.helpers import object_to_json_file
+from nexus_constructor.json.json_stream_writer import (
+    ChunkedArray,
+    object_to_json_stream,
+)
 from nexus_constructor.json.forwarder_json_writer import generate_forwarder_command
 from tests.helpers import file  # noqa: F401
 from tests.test_utils import NX_CLASS_DEFINITIONS
@@ -435,6 +440,52 @@ def test_GIVEN_instrument_containing_component_WHEN_generating_json_THEN_file_is
     assert component["children"][0]["dataset"]["type"] == "string"
 
 
+def test_GIVEN_nexus_file_WHEN_streaming_json_THEN_output_is_the_same_as_converting_to_dict(
+    file,
+):
+    entry = file.create_group("entry")
+    entry.attrs["NX_class"] = "NXentry"
+    entry.create_dataset("array", data=np.arange(20, dtype=np.int32).reshape(5, 4))
+    entry.create_dataset("scalar", data=1.5)
+    entry.create_dataset("text", data="some text")
+    entry.create_dataset("empty", data=np.array([], dtype=np.float64))
+    entry["linked_array"] = h5py.SoftLink("/entry/array")
+
+    expected = NexusToDictConverter().convert(file)
+    output = io.StringIO()
+    object_to_json_stream(NexusToStreamConverter().convert(file), output)
+
+    assert json.loads(output.getvalue()) == json.loads(json.dumps(expected))
+
+
+def test_GIVEN_array_dataset_WHEN_handling_dataset_for_streaming_THEN_values_are_not_read_until_written(
+    file,
+):
+    dataset = file.create_dataset("ds", data=np.arange(6, dtype=np.float64))
+
+    root_dict = NexusToStreamConverter()._handle_dataset(dataset)
+
+    assert isinstance(root_dict["values"], ChunkedArray)
+    assert root_dict["dataset"] == {"type": "double", "size": (6,)}
+
+
+def test_GIVEN_compact_WHEN_generating_json_THEN_output_is_smaller_and_contains_the_same_command():
+    wrapper = NexusWrapper("test_compact.nxs")
+    data = Instrument(wrapper, NX_CLASS_DEFINITIONS)
+    component = data.create_component("pinhole", "NXpinhole", "")
+    component.set_field("values", value=np.linspace(0.0, 1.0, 50), dtype=np.float64)
+    pretty_file = io.StringIO()
+    compact_file = io.StringIO()
+
+    generate_json(data, pretty_file)
+    generate_json(data, compact_file, compact=True)
+
+    assert len(compact_file.getvalue()) < len(pretty_file.getvalue()) / 2
+    pretty_command = json.loads(pretty_file.getvalue())
+    compact_command = json.loads(compact_file.getvalue())
+    assert compact_command["nexus_structure"] == pretty_command["nexus_structure"]
+
+
 def test_GIVEN_float64_WHEN_getting_data_and_type_THEN_returns_correct_dtype(file):
     dataset_name = "ds"
     dataset_type = np.float64
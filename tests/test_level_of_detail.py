@@ -0,0 +1,200 @@
+from mock import Mock
+import numpy as np
+from pytest import approx
+
+from nexus_constructor.geometry import OFFGeometryNoNexus
+from nexus_constructor.geometry.cylindrical_geometry import cylinder_mesh_arrays
+from nexus_constructor.level_of_detail import (
+    ComponentLevelsOfDetail,
+    LEVEL_OF_DETAIL_MINIMUM_VERTICES,
+    LevelOfDetail,
+    boxes_outside_frustum,
+    choose_level_of_detail,
+    create_levels_of_detail,
+    distances_to_boxes,
+    frustum_planes,
+    instanced_bounding_box,
+    simplify_by_vertex_clustering,
+    transform_boxes,
+)
+
+
+def _grid_of_cylinders(count: int) -> OFFGeometryNoNexus:
+    x, y = np.meshgrid(np.arange(count), np.arange(count))
+    base_centres = np.column_stack((x.ravel(), y.ravel(), np.zeros(count * count)))
+    cylinder_points = np.stack(
+        (base_centres, base_centres + [0.1, 0, 0], base_centres + [0, 0, 2]), axis=1
+    )
+    return OFFGeometryNoNexus.from_arrays(*cylinder_mesh_arrays(cylinder_points))
+
+
+def _orthographic_view_projection(half_size: float) -> np.ndarray:
+    # Looking down -z from the origin, seeing x and y between -half_size and half_size and z between -1 and -100
+    near, far = 1.0, 100.0
+    return np.array(
+        [
+            [1 / half_size, 0, 0, 0],
+            [0, 1 / half_size, 0, 0],
+            [0, 0, -2 / (far - near), -(far + near) / (far - near)],
+            [0, 0, 0, 1],
+        ]
+    )
+
+
+def test_GIVEN_mesh_WHEN_simplifying_with_one_cell_per_vertex_THEN_mesh_is_unchanged():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=float)
+
+    (
+        simplified_vertices,
+        winding_order,
+        winding_order_indices,
+    ) = simplify_by_vertex_clustering(
+        vertices, np.array([0, 1, 2, 3]), np.array([0]), cells=4
+    )
+
+    assert simplified_vertices.tolist() == vertices.tolist()
+    assert winding_order.tolist() == [0, 1, 2, 0, 2, 3]
+    assert winding_order_indices.tolist() == [0, 3]
+
+
+def test_GIVEN_vertices_in_the_same_cell_WHEN_simplifying_THEN_they_are_merged_and_collapsed_triangles_are_removed():
+    vertices = np.array([[0, 0, 0], [0.1, 0, 0], [10, 0, 0], [10, 10, 0]], dtype=float)
+    winding_order = np.array([0, 1, 3, 0, 2, 3, 1, 2, 3])
+
+    simplified_vertices, winding_order, _ = simplify_by_vertex_clustering(
+        vertices, winding_order, np.array([0, 3, 6]), cells=2
+    )
+
+    assert simplified_vertices.tolist() == approx(
+        np.array([[0.05, 0, 0], [10, 0, 0], [10, 10, 0]])
+    )
+    # Two of the triangles become the same triangle, and only one of them is kept
+    assert winding_order.tolist() == [0, 1, 2]
+
+
+def test_GIVEN_large_mesh_WHEN_creating_levels_of_detail_THEN_each_level_has_fewer_vertices_and_is_used_further_away():
+    geometry = _grid_of_cylinders(20)
+    assert len(geometry.vertices_array) >= LEVEL_OF_DETAIL_MINIMUM_VERTICES
+
+    levels = create_levels_of_detail(geometry)
+
+    assert levels[0].geometry is geometry
+    assert len(levels) > 1
+    for coarser, finer in zip(levels[1:], levels):
+        assert len(coarser.geometry.vertices_array) < len(finer.geometry.vertices_array)
+        assert coarser.minimum_distance > finer.minimum_distance
+
+
+def test_GIVEN_small_mesh_WHEN_creating_levels_of_detail_THEN_only_full_mesh_is_used():
+    geometry = _grid_of_cylinders(2)
+
+    levels = create_levels_of_detail(geometry)
+
+    assert len(levels) == 1
+    assert levels[0].geometry is geometry
+
+
+def test_GIVEN_levels_WHEN_choosing_level_THEN_coarsest_level_allowed_at_distance_is_chosen():
+    levels = [
+        LevelOfDetail(None, 0.0),
+        LevelOfDetail(None, 4.0),
+        LevelOfDetail(None, 16.0),
+    ]
+
+    assert choose_level_of_detail(levels, distance=1, size=2) == 0
+    assert choose_level_of_detail(levels, distance=10, size=2) == 1
+    assert choose_level_of_detail(levels, distance=100, size=2) == 2
+
+
+def test_GIVEN_boxes_WHEN_testing_against_frustum_THEN_only_boxes_entirely_outside_are_found():
+    planes = frustum_planes(_orthographic_view_projection(half_size=10))
+    box_mins = np.array(
+        [[-1, -1, -6], [20, 0, -6], [9, 9, -6], [0, 0, 5], [-50, -50, -50]], dtype=float
+    )
+    box_maxs = box_mins + [2, 2, 2]
+    box_maxs[-1] = [50, 50, 50]
+
+    outside = boxes_outside_frustum(planes, box_mins, box_maxs)
+
+    assert outside.tolist() == [False, True, False, True, False]
+
+
+def test_GIVEN_instances_WHEN_finding_bounding_box_THEN_box_contains_every_instance():
+    offsets = np.array([[0, 0, 0], [10, 0, 0]], dtype=float)
+    matrices = np.array([np.identity(3), np.diag([1.0, 1.0, 4.0])])
+
+    box_min, box_max = instanced_bounding_box(
+        np.array([-1.0, -1.0, -1.0]), np.array([1.0, 1.0, 1.0]), offsets, matrices
+    )
+
+    assert box_min.tolist() == [-1, -1, -4]
+    assert box_max.tolist() == [11, 1, 4]
+
+
+def test_GIVEN_rotated_and_moved_box_WHEN_transforming_boxes_THEN_result_contains_box():
+    # Rotate 90 degrees about z then move 5 along x
+    matrix = np.array(
+        [[0, -1, 0, 5], [1, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]], dtype=float
+    )
+
+    box_mins, box_maxs = transform_boxes(
+        np.array([[0.0, 0.0, 0.0]]), np.array([[2.0, 1.0, 1.0]]), matrix[np.newaxis]
+    )
+
+    assert box_mins.tolist() == [[4, 0, 0]]
+    assert box_maxs.tolist() == [[5, 2, 1]]
+
+
+def test_GIVEN_point_WHEN_finding_distances_to_boxes_THEN_distance_is_to_nearest_point_of_each_box():
+    box_mins = np.array([[3, -1, -1], [-1, -1, -1]], dtype=float)
+    box_maxs = np.array([[5, 1, 1], [1, 1, 1]], dtype=float)
+
+    distances = distances_to_boxes(np.zeros(3), box_mins, box_maxs)
+
+    assert distances.tolist() == [3, 0]
+
+
+def test_GIVEN_component_far_away_WHEN_updating_THEN_mesh_of_coarser_level_is_created_once_and_replaces_mesh():
+    entity = Mock()
+    first_mesh, coarse_mesh = Mock(), Mock()
+    create_mesh = Mock(return_value=coarse_mesh)
+    levels = [LevelOfDetail(None, 0.0), LevelOfDetail(Mock(), 4.0)]
+    component = ComponentLevelsOfDetail(
+        entity, levels, first_mesh, create_mesh, np.zeros(3), np.ones(3)
+    )
+
+    component.update(True, distance=100)
+    component.update(True, distance=1)
+    component.update(True, distance=100)
+
+    create_mesh.assert_called_once_with(levels[1])
+    assert component.current_level == 1
+    entity.removeComponent.assert_any_call(first_mesh)
+    entity.addComponent.assert_called_with(coarse_mesh)
+
+
+def test_GIVEN_component_outside_view_WHEN_updating_THEN_entity_is_disabled_once():
+    entity = Mock()
+    component = ComponentLevelsOfDetail(
+        entity, [LevelOfDetail(None, 0.0)], Mock(), Mock(), np.zeros(3), np.ones(3)
+    )
+
+    component.update(False, distance=1)
+    component.update(False, distance=1)
+
+    entity.setEnabled.assert_called_once_with(False)
+
+
+def test_GIVEN_transformation_WHEN_setting_transformation_THEN_world_box_moves_and_none_restores_it():
+    component = ComponentLevelsOfDetail(
+        Mock(), [LevelOfDetail(None, 0.0)], Mock(), Mock(), np.zeros(3), np.ones(3)
+    )
+    matrix = np.identity(4)
+    matrix[:3, 3] = [10, 0, 0]
+
+    component.set_transformation(matrix)
+    moved_box = component.world_box
+    component.set_transformation(None)
+
+    assert moved_box[0].tolist() == [10, 0, 0]
+    assert component.world_box[0].tolist() == [0, 0, 0]
@@ -1,5 +1,5 @@
 from tests.helpers import add_component_to_file
-from PySide2.QtGui import QVector3D
+import numpy as np
 from nexus_constructor.component.component import Component
 
 
@@ -23,7 +23,7 @@ def test_linked_component_is_none_3(nexus_wrapper):
 def test_linked_component_via_transform_1(nexus_wrapper):
     component1 = add_component_to_file(nexus_wrapper, "field", 42, "component1")
     component2 = add_component_to_file(nexus_wrapper, "field", 42, "component2")
-    rot = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component2.depends_on = rot
     component1.depends_on = rot
 
@@ -33,10 +33,10 @@ def test_linked_component_via_transform_1(nexus_wrapper):
 
 def test_linked_component_via_transform_2(nexus_wrapper):
     component1 = add_component_to_file(nexus_wrapper, "field", 42, "component1")
-    rot1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component1.depends_on = rot1
     component2 = add_component_to_file(nexus_wrapper, "field", 42, "component2")
-    rot2 = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot2 = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component2.depends_on = rot2
     rot1.depends_on = rot2
 
@@ -47,7 +47,7 @@ def test_linked_component_via_transform_2(nexus_wrapper):
 def test_linked_component_via_component_1(nexus_wrapper):
     component1 = add_component_to_file(nexus_wrapper, "field", 42, "component1")
     component2 = add_component_to_file(nexus_wrapper, "field", 42, "component2")
-    rot = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component2.depends_on = rot
     component1.transforms.link.linked_component = component2
 
@@ -57,10 +57,10 @@ def test_linked_component_via_component_1(nexus_wrapper):
 
 def test_linked_component_via_component_2(nexus_wrapper):
     component1 = add_component_to_file(nexus_wrapper, "field", 42, "component1")
-    rot1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component1.depends_on = rot1
     component2 = add_component_to_file(nexus_wrapper, "field", 42, "component2")
-    rot2 = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot2 = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component2.depends_on = rot2
     component1.transforms.link.linked_component = component2
 
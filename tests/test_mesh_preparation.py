@@ -0,0 +1,137 @@
+import threading
+
+from mock import Mock
+import numpy as np
+from pytest import approx
+
+from nexus_constructor.geometry.cylindrical_geometry import CYLINDER_MESH_STEPS
+from nexus_constructor.geometry.no_shape_geometry import OFFCube
+from nexus_constructor.mesh_preparation import MeshPreparer, prepare_mesh
+from .helpers import add_component_to_file
+
+
+def _component_with_cylinders(nexus_wrapper, name: str = "test_component"):
+    component = add_component_to_file(nexus_wrapper, component_name=name)
+    cylinder = component.set_cylinder_shape(
+        axis_direction=np.array([0, 0, 1]), height=2, radius=0.5, units="m"
+    )
+    vertices = [
+        [0, 0, -1],
+        [0.5, 0, -1],
+        [0, 0, 1],
+        [5, 0, -1],
+        [5.5, 0, -1],
+        [5, 0, 1],
+    ]
+    del cylinder.group["vertices"]
+    del cylinder.group["cylinders"]
+    vertices_dataset = nexus_wrapper.set_field_value(
+        cylinder.group, "vertices", np.array(vertices, dtype=float)
+    )
+    nexus_wrapper.set_attribute_value(vertices_dataset, "units", "m")
+    nexus_wrapper.set_field_value(
+        cylinder.group, "cylinders", np.array([[0, 1, 2], [3, 4, 5]])
+    )
+    return component
+
+
+def test_GIVEN_no_geometry_WHEN_preparing_mesh_THEN_nothing_is_prepared():
+    assert prepare_mesh("component", None) is None
+
+
+def test_GIVEN_geometry_and_positions_WHEN_preparing_mesh_THEN_mesh_is_instanced_at_each_position():
+    positions = [np.array([0, 0, 0]), np.array([0, 0, 1])]
+
+    prepared_mesh = prepare_mesh("component", OFFCube, positions)
+
+    assert prepared_mesh.name == "component"
+    assert prepared_mesh.instanced
+    assert prepared_mesh.levels[0].buffers.instance_count == 2
+    assert prepared_mesh.box_min == approx(np.array([-0.05, -0.05, -0.05]))
+    assert prepared_mesh.box_max == approx(np.array([0.05, 0.05, 1.05]))
+
+
+def test_GIVEN_geometry_without_positions_WHEN_preparing_mesh_THEN_mesh_is_not_instanced():
+    prepared_mesh = prepare_mesh("component", OFFCube)
+
+    assert not prepared_mesh.instanced
+    assert prepared_mesh.levels[0].buffers.instance_count == 1
+
+
+def test_GIVEN_multiple_cylinders_WHEN_preparing_mesh_THEN_unit_cylinder_is_drawn_once_per_cylinder(
+    nexus_wrapper,
+):
+    shape, positions = _component_with_cylinders(nexus_wrapper).shape
+
+    prepared_mesh = prepare_mesh("component", shape, positions)
+
+    buffers = prepared_mesh.levels[0].buffers
+    assert prepared_mesh.instanced
+    assert buffers.instance_count == 2
+    # The sides and ends of one cylinder, triangulated
+    assert buffers.vertex_count == 3 * (
+        2 * CYLINDER_MESH_STEPS + 2 * (CYLINDER_MESH_STEPS - 2)
+    )
+    assert prepared_mesh.box_min == approx(np.array([-0.5, -0.5, -1]))
+    assert prepared_mesh.box_max == approx(np.array([5.5, 0.5, 1]))
+
+
+def test_GIVEN_components_WHEN_preparing_meshes_in_background_THEN_each_mesh_is_emitted_once_ready(
+    qtbot, nexus_wrapper
+):
+    components = [
+        _component_with_cylinders(nexus_wrapper, name) for name in ["first", "second"]
+    ]
+    preparer = MeshPreparer()
+    prepared_meshes = []
+    preparer.mesh_prepared.connect(prepared_meshes.append)
+
+    preparer.prepare(components)
+
+    qtbot.waitUntil(lambda: len(prepared_meshes) == 2)
+    assert sorted(mesh.name for mesh in prepared_meshes) == ["first", "second"]
+    assert not preparer.is_pending("first")
+    preparer.shutdown()
+
+
+def test_GIVEN_mesh_being_prepared_WHEN_discarding_it_THEN_mesh_is_not_emitted(qtbot):
+    started, release = threading.Event(), threading.Event()
+
+    def get_shape():
+        started.set()
+        release.wait(5)
+        return OFFCube, None
+
+    component = Mock()
+    component.name = "component"
+    type(component).shape = property(lambda _: get_shape())
+    preparer = MeshPreparer()
+    emitted = Mock()
+    preparer.mesh_prepared.connect(emitted)
+
+    preparer.prepare([component])
+    started.wait(5)
+    preparer.discard("component")
+    release.set()
+    qtbot.wait(100)
+
+    emitted.assert_not_called()
+    preparer.shutdown()
+
+
+def test_GIVEN_shape_which_cannot_be_read_WHEN_preparing_mesh_THEN_error_is_logged_and_nothing_is_emitted(
+    qtbot, caplog
+):
+    component = Mock()
+    component.name = "broken"
+    type(component).shape = property(lambda _: 1 / 0)
+    preparer = MeshPreparer()
+    emitted = Mock()
+    preparer.mesh_prepared.connect(emitted)
+
+    preparer.prepare([component])
+
+    qtbot.waitUntil(lambda: not preparer.is_pending("broken"))
+    emitted.assert_not_called()
+    assert "broken" in caplog.text
+    preparer.shutdown()
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+MODEL_MODULES = [
+    "nexus_constructor.component.component",
+    "nexus_constructor.transformations",
+    "nexus_constructor.geometry.off_geometry",
+    "nexus_constructor.geometry.cylindrical_geometry",
+    "nexus_constructor.transformation_cache",
+    "nexus_constructor.instrument",
+]
+
+IMPORT_WITHOUT_QT = textwrap.dedent(
+    """
+    import importlib
+    import sys
+
+
+    class BlockPySide2:
+        def find_spec(self, name, path=None, target=None):
+            if name == "PySide2" or name.startswith("PySide2."):
+                raise ImportError(f"PySide2 is blocked, {name} was imported")
+
+
+    sys.meta_path.insert(0, BlockPySide2())
+    importlib.import_module(sys.argv[1])
+    """
+)
+
+
+@pytest.mark.parametrize("module", MODEL_MODULES)
+def test_GIVEN_pyside2_is_unavailable_WHEN_importing_model_module_THEN_import_succeeds(
+    module,
+):
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_WITHOUT_QT, module],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0, result.stderr
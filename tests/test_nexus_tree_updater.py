@@ -0,0 +1,156 @@
+from mock import patch
+from PySide2.QtWidgets import QTreeView
+from silx.gui.hdf5 import Hdf5TreeModel
+
+from nexus_constructor import nexus_tree_updater
+from nexus_constructor.nexus.file_changes import ChangeType, FileChange
+from nexus_constructor.nexus_tree_updater import (
+    can_update_incrementally,
+    update_nexus_tree,
+)
+
+
+class TreeView(QTreeView):
+    """
+    Displays the model directly, with the method of silx's Hdf5TreeView which the updater uses to find it
+    """
+
+    def findHdf5TreeModel(self) -> Hdf5TreeModel:
+        return self.model()
+
+
+def _create_view(qtbot, nexus_wrapper) -> TreeView:
+    model = Hdf5TreeModel()
+    model.insertH5pyObject(nexus_wrapper.nexus_file)
+    view = TreeView()
+    qtbot.addWidget(view)
+    view.setModel(model)
+    nexus_wrapper.file_changed.connect(
+        lambda nexus_file, changes: update_nexus_tree(view, nexus_file, changes)
+    )
+    return view
+
+
+def _index(view: TreeView, path: str):
+    model = view.model()
+    index = model.index(0, 0)
+    for name in path.strip("/").split("/"):
+        node = model.nodeFromIndex(index)
+        rows = [
+            row for row in range(node.childCount()) if node.child(row).basename == name
+        ]
+        if not rows:
+            return None
+        index = model.index(rows[0], 0, index)
+    return index
+
+
+def _child_names(view: TreeView, path: str):
+    model = view.model()
+    index = _index(view, path)
+    return [model.index(row, 0, index).data() for row in range(model.rowCount(index))]
+
+
+def _expand(view: TreeView, path: str):
+    view.setExpanded(_index(view, path), True)
+
+
+def test_GIVEN_expanded_group_WHEN_adding_group_THEN_group_is_added_to_tree(
+    qtbot, nexus_wrapper
+):
+    view = _create_view(qtbot, nexus_wrapper)
+    _expand(view, "entry/instrument")
+
+    nexus_wrapper.create_nx_group("sample", "NXsample", nexus_wrapper.instrument)
+
+    assert _child_names(view, "entry/instrument") == ["sample"]
+
+
+def test_GIVEN_expanded_group_WHEN_removing_group_THEN_group_is_removed_from_tree(
+    qtbot, nexus_wrapper
+):
+    sample = nexus_wrapper.create_nx_group(
+        "sample", "NXsample", nexus_wrapper.instrument
+    )
+    view = _create_view(qtbot, nexus_wrapper)
+    _expand(view, "entry/instrument")
+
+    nexus_wrapper.delete_node(sample)
+
+    assert _child_names(view, "entry/instrument") == []
+
+
+def test_GIVEN_expanded_group_WHEN_renaming_group_THEN_group_is_renamed_in_tree(
+    qtbot, nexus_wrapper
+):
+    sample = nexus_wrapper.create_nx_group(
+        "sample", "NXsample", nexus_wrapper.instrument
+    )
+    view = _create_view(qtbot, nexus_wrapper)
+    _expand(view, "entry/instrument")
+
+    nexus_wrapper.rename_node(sample, "renamed_sample")
+
+    assert _child_names(view, "entry/instrument") == ["renamed_sample"]
+
+
+def test_GIVEN_group_in_tree_WHEN_changing_its_attributes_THEN_item_is_replaced(
+    qtbot, nexus_wrapper
+):
+    sample = nexus_wrapper.create_nx_group(
+        "sample", "NXsample", nexus_wrapper.instrument
+    )
+    view = _create_view(qtbot, nexus_wrapper)
+    _expand(view, "entry/instrument")
+    node_before = view.model().nodeFromIndex(_index(view, "entry/instrument/sample"))
+
+    nexus_wrapper.set_nx_class(sample, "NXdetector")
+
+    node_after = view.model().nodeFromIndex(_index(view, "entry/instrument/sample"))
+    assert node_after is not node_before
+    assert node_after.obj.attrs["NX_class"] == "NXdetector"
+
+
+def test_GIVEN_expanded_groups_WHEN_changing_them_THEN_they_stay_expanded(
+    qtbot, nexus_wrapper
+):
+    sample = nexus_wrapper.create_nx_group(
+        "sample", "NXsample", nexus_wrapper.instrument
+    )
+    nexus_wrapper.create_nx_group("geometry", "NXoff_geometry", sample)
+    view = _create_view(qtbot, nexus_wrapper)
+    _expand(view, "entry")
+    _expand(view, "entry/instrument")
+    _expand(view, "entry/instrument/sample")
+
+    nexus_wrapper.create_nx_group("monitor", "NXmonitor", nexus_wrapper.instrument)
+    nexus_wrapper.set_nx_class(sample, "NXdetector")
+
+    assert _child_names(view, "entry/instrument") == ["monitor", "sample"]
+    assert view.isExpanded(_index(view, "entry/instrument"))
+    assert view.isExpanded(_index(view, "entry/instrument/sample"))
+
+
+def test_GIVEN_silx_without_private_children_attribute_WHEN_checking_for_incremental_updates_THEN_returns_false():
+    can_update_incrementally.cache_clear()
+    try:
+        with patch.object(nexus_tree_updater, "_CHILDREN_ATTRIBUTE", "_renamed"):
+            assert not can_update_incrementally()
+    finally:
+        can_update_incrementally.cache_clear()
+
+    assert can_update_incrementally()
+
+
+def test_GIVEN_incremental_updates_unavailable_WHEN_updating_tree_THEN_tree_is_rebuilt(
+    qtbot, nexus_wrapper
+):
+    view = _create_view(qtbot, nexus_wrapper)
+    changes = [FileChange(ChangeType.ADDED, "/entry/instrument/sample")]
+
+    with patch.object(
+        nexus_tree_updater, "can_update_incrementally", return_value=False
+    ), patch.object(nexus_tree_updater, "_rebuild_tree") as rebuild_tree:
+        update_nexus_tree(view, nexus_wrapper.nexus_file, changes)
+
+    rebuild_tree.assert_called_once_with(view.model(), nexus_wrapper.nexus_file)
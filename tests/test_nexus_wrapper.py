@@ -1,10 +1,20 @@
+import os
+
 import h5py
+import numpy as np
+import pytest
 from mock import Mock
+from nexus_constructor.nexus.file_changes import (
+    ChangeType,
+    FileChange,
+    coalesce_changes,
+)
 from nexus_constructor.nexus.nexus_wrapper import (
     NexusWrapper,
     append_nxs_extension,
     get_nx_class,
 )
+from nexus_constructor.nexus.lazy_file import SourceFileChangedError
 from tests.helpers import InMemoryFile
 
 
@@ -159,3 +169,255 @@ def test_GIVEN_variable_length_string_type_dataset_WHEN_getting_value_THEN_retur
         wrapper.nexus_file, dataset_name
     ) == string_data.decode("utf8")
     assert isinstance(wrapper.get_field_value(wrapper.nexus_file, dataset_name), str)
+
+
+def test_GIVEN_several_changes_in_batch_WHEN_batch_exits_THEN_file_changed_is_emitted_once():
+    wrapper = NexusWrapper(filename="test_batch_emits_once")
+    emitted_files = []
+    wrapper.file_changed.connect(
+        lambda nexus_file, changes: emitted_files.append(nexus_file)
+    )
+
+    with wrapper.batch_changes():
+        group = wrapper.create_nx_group("test_group", "NXcollection", wrapper.entry)
+        wrapper.set_field_value(group, "test_field", 42)
+        wrapper.set_attribute_value(group, "test_attr", "test_value")
+        assert not emitted_files
+
+    assert emitted_files == [wrapper.nexus_file]
+
+
+def test_GIVEN_nested_batches_WHEN_inner_batch_exits_THEN_file_changed_is_not_emitted_until_outer_batch_exits():
+    wrapper = NexusWrapper(filename="test_nested_batches")
+    emitted_files = []
+    wrapper.file_changed.connect(
+        lambda nexus_file, changes: emitted_files.append(nexus_file)
+    )
+
+    with wrapper.batch_changes():
+        with wrapper.batch_changes():
+            wrapper.create_nx_group("test_group", "NXcollection", wrapper.entry)
+        assert not emitted_files
+
+    assert len(emitted_files) == 1
+
+
+def test_GIVEN_no_changes_in_batch_WHEN_batch_exits_THEN_file_changed_is_not_emitted():
+    wrapper = NexusWrapper(filename="test_empty_batch")
+    emitted_files = []
+    wrapper.file_changed.connect(
+        lambda nexus_file, changes: emitted_files.append(nexus_file)
+    )
+
+    with wrapper.batch_changes():
+        pass
+
+    assert not emitted_files
+
+
+def test_GIVEN_exception_in_batch_WHEN_batch_exits_THEN_pending_change_is_still_emitted():
+    wrapper = NexusWrapper(filename="test_batch_exception")
+    emitted_files = []
+    wrapper.file_changed.connect(
+        lambda nexus_file, changes: emitted_files.append(nexus_file)
+    )
+
+    try:
+        with wrapper.batch_changes():
+            wrapper.create_nx_group("test_group", "NXcollection", wrapper.entry)
+            raise ValueError
+    except ValueError:
+        pass
+
+    assert len(emitted_files) == 1
+
+
+def _record_changes(wrapper: NexusWrapper) -> list:
+    emitted_changes = []
+    wrapper.file_changed.connect(
+        lambda nexus_file, changes: emitted_changes.append(changes)
+    )
+    return emitted_changes
+
+
+def test_GIVEN_new_group_WHEN_creating_group_THEN_added_change_is_emitted():
+    wrapper = NexusWrapper(filename="test_group_added_change")
+    emitted_changes = _record_changes(wrapper)
+
+    group = wrapper.create_nx_group("test_group", "NXcollection", wrapper.entry)
+
+    assert emitted_changes == [[FileChange(ChangeType.ADDED, group.name)]]
+
+
+def test_GIVEN_existing_field_WHEN_setting_field_value_THEN_value_changed_change_is_emitted():
+    wrapper = NexusWrapper(filename="test_value_changed_change")
+    wrapper.set_field_value(wrapper.entry, "test_field", 1)
+    emitted_changes = _record_changes(wrapper)
+
+    wrapper.set_field_value(wrapper.entry, "test_field", 2)
+
+    assert emitted_changes == [
+        [FileChange(ChangeType.VALUE_CHANGED, "/entry/test_field")]
+    ]
+
+
+def test_GIVEN_group_WHEN_renaming_group_THEN_renamed_change_has_old_and_new_path():
+    wrapper = NexusWrapper(filename="test_renamed_change")
+    group = wrapper.create_nx_group("old_name", "NXcollection", wrapper.entry)
+    emitted_changes = _record_changes(wrapper)
+
+    wrapper.rename_node(group, "new_name")
+
+    assert emitted_changes == [
+        [FileChange(ChangeType.RENAMED, "/entry/old_name", "/entry/new_name")]
+    ]
+
+
+def test_GIVEN_changes_to_group_added_in_same_batch_WHEN_batch_exits_THEN_only_added_change_is_emitted():
+    wrapper = NexusWrapper(filename="test_batch_coalesces_changes")
+    emitted_changes = _record_changes(wrapper)
+
+    with wrapper.batch_changes():
+        group = wrapper.create_nx_group("test_group", "NXcollection", wrapper.entry)
+        wrapper.set_field_value(group, "test_field", 42)
+        wrapper.set_attribute_value(group, "test_attr", "test_value")
+        wrapper.set_attribute_value(group, "test_attr", "test_value")
+
+    assert emitted_changes == [[FileChange(ChangeType.ADDED, group.name)]]
+
+
+def test_GIVEN_group_added_then_removed_in_batch_WHEN_coalescing_THEN_both_changes_are_kept_in_order():
+    changes = [
+        FileChange(ChangeType.ADDED, "/entry/group"),
+        FileChange(ChangeType.REMOVED, "/entry/group"),
+        FileChange(ChangeType.ADDED, "/entry/group/field"),
+    ]
+
+    assert coalesce_changes(changes) == changes
+
+
+def test_GIVEN_reloaded_change_in_batch_WHEN_coalescing_THEN_only_reloaded_change_is_kept():
+    changes = [
+        FileChange(ChangeType.ADDED, "/entry/group"),
+        FileChange(ChangeType.RELOADED, "/"),
+        FileChange(ChangeType.ATTRS_CHANGED, "/entry"),
+    ]
+
+    assert coalesce_changes(changes) == [FileChange(ChangeType.RELOADED, "/")]
+
+
+def _create_file_with_large_dataset(filename: str):
+    with h5py.File(filename, mode="w") as file:
+        entry = file.create_group("entry")
+        entry.attrs["NX_class"] = "NXentry"
+        instrument = entry.create_group("instrument")
+        instrument.attrs["NX_class"] = "NXinstrument"
+        large = instrument.create_dataset("large", data=np.arange(300000.0))
+        large.attrs["units"] = "m"
+        instrument.create_dataset("small", data=np.arange(3))
+        instrument["link"] = h5py.SoftLink("/entry/instrument/small")
+
+
+def test_GIVEN_file_WHEN_opening_lazily_THEN_large_datasets_are_read_from_disk_and_small_datasets_are_in_memory(
+    tmpdir,
+):
+    filename = str(tmpdir.join("lazy.nxs"))
+    _create_file_with_large_dataset(filename)
+    wrapper = NexusWrapper("test_lazy_open")
+
+    assert wrapper.open_file(filename, lazy=True)
+
+    large = wrapper.instrument["large"]
+    assert large.is_virtual
+    assert large[299999] == 299999.0
+    assert large.attrs["units"] == "m"
+    assert not wrapper.instrument["small"].is_virtual
+    assert wrapper.instrument["link"][...].tolist() == [0, 1, 2]
+    assert wrapper.lazy_source.path == filename
+
+
+def test_GIVEN_lazily_opened_file_WHEN_setting_value_of_large_dataset_THEN_value_is_changed_in_memory_only(
+    tmpdir,
+):
+    filename = str(tmpdir.join("lazy.nxs"))
+    _create_file_with_large_dataset(filename)
+    wrapper = NexusWrapper("test_lazy_set_value")
+    wrapper.open_file(filename, lazy=True)
+
+    wrapper.set_field_value(wrapper.instrument, "large", np.zeros(300000))
+
+    assert not wrapper.instrument["large"].is_virtual
+    assert wrapper.instrument["large"][-1] == 0
+    with h5py.File(filename, mode="r") as file:
+        assert file["entry/instrument/large"][-1] == 299999.0
+
+
+def test_GIVEN_lazily_opened_file_WHEN_saving_THEN_saved_file_contains_large_dataset_values(
+    tmpdir,
+):
+    filename = str(tmpdir.join("lazy.nxs"))
+    _create_file_with_large_dataset(filename)
+    wrapper = NexusWrapper("test_lazy_save")
+    wrapper.open_file(filename, lazy=True)
+    saved_filename = str(tmpdir.join("saved.nxs"))
+
+    wrapper.save_file(saved_filename)
+
+    with h5py.File(saved_filename, mode="r") as file:
+        assert not file["entry/instrument/large"].is_virtual
+        assert file["entry/instrument/large"][-1] == 299999.0
+        assert file["entry/instrument/large"].attrs["units"] == "m"
+
+
+def test_GIVEN_lazily_opened_file_has_been_moved_WHEN_saving_THEN_save_fails_and_no_file_is_written(
+    tmpdir,
+):
+    filename = str(tmpdir.join("lazy.nxs"))
+    _create_file_with_large_dataset(filename)
+    wrapper = NexusWrapper("test_lazy_save_moved")
+    wrapper.open_file(filename, lazy=True)
+    os.rename(filename, str(tmpdir.join("moved.nxs")))
+    saved_filename = str(tmpdir.join("saved.nxs"))
+
+    with pytest.raises(SourceFileChangedError):
+        wrapper.save_file(saved_filename)
+
+    assert not os.path.exists(saved_filename)
+
+
+def test_GIVEN_lazily_opened_file_has_been_deleted_WHEN_saving_THEN_save_fails(tmpdir,):
+    filename = str(tmpdir.join("lazy.nxs"))
+    _create_file_with_large_dataset(filename)
+    wrapper = NexusWrapper("test_lazy_save_deleted")
+    wrapper.open_file(filename, lazy=True)
+    os.remove(filename)
+
+    with pytest.raises(SourceFileChangedError):
+        wrapper.save_file(str(tmpdir.join("saved.nxs")))
+
+
+def test_GIVEN_lazily_opened_file_has_been_replaced_WHEN_reading_large_dataset_THEN_read_fails(
+    tmpdir,
+):
+    filename = str(tmpdir.join("lazy.nxs"))
+    _create_file_with_large_dataset(filename)
+    wrapper = NexusWrapper("test_lazy_read_replaced")
+    wrapper.open_file(filename, lazy=True)
+    os.remove(filename)
+    with h5py.File(filename, mode="w") as file:
+        file.create_dataset("entry/instrument/large", data=np.zeros(10))
+
+    with pytest.raises(SourceFileChangedError):
+        wrapper.get_field_value(wrapper.instrument, "large")
+
+
+def test_GIVEN_lazily_opened_file_has_been_deleted_WHEN_reading_small_dataset_THEN_value_is_read_from_memory(
+    tmpdir,
+):
+    filename = str(tmpdir.join("lazy.nxs"))
+    _create_file_with_large_dataset(filename)
+    wrapper = NexusWrapper("test_lazy_read_small")
+    wrapper.open_file(filename, lazy=True)
+    os.remove(filename)
+
+    assert wrapper.get_field_value(wrapper.instrument, "small").tolist() == [0, 1, 2]
@@ -1,13 +1,13 @@
 import pytest
 from mock import patch
 from numpy import array_equal, array
+import numpy as np
 
 from nexus_constructor.geometry import (
     OFFGeometryNoNexus,
     OFFGeometryNexus,
     record_faces_in_file,
 )
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.pixel_data import PixelMapping
 from .helpers import add_component_to_file
@@ -27,17 +27,17 @@ def test_GIVEN_nothing_WHEN_constructing_OFFGeometry_THEN_geometry_str_is_OFF():
 
 
 UNIT = "m"
-AXIS_DIRECTION = QVector3D(1, 2, 3)
+AXIS_DIRECTION = np.array([1, 2, 3])
 HEIGHT = 2.0
 RADIUS = 1.0
 
 
 def test_GIVEN_faces_WHEN_calling_winding_order_on_OFF_THEN_order_is_correct():
     vertices = [
-        QVector3D(0, 0, 1),
-        QVector3D(0, 1, 0),
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 1),
+        np.array([0, 0, 1]),
+        np.array([0, 1, 0]),
+        np.array([0, 0, 0]),
+        np.array([0, 1, 1]),
     ]
 
     faces = [[0, 1, 2, 3]]
@@ -50,10 +50,10 @@ def test_GIVEN_faces_WHEN_calling_winding_order_on_OFF_THEN_order_is_correct():
 
 def test_GIVEN_faces_WHEN_calling_winding_order_indices_on_OFF_THEN_order_is_correct():
     vertices = [
-        QVector3D(0, 0, 1),
-        QVector3D(0, 1, 0),
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 1),
+        np.array([0, 0, 1]),
+        np.array([0, 1, 0]),
+        np.array([0, 0, 0]),
+        np.array([0, 1, 1]),
     ]
 
     faces = [[0, 1, 2, 3]]
@@ -67,17 +67,17 @@ def test_GIVEN_faces_WHEN_calling_winding_order_indices_on_OFF_THEN_order_is_cor
 
 def test_GIVEN_off_geometry_WHEN_calling_off_geometry_on_offGeometry_THEN_original_geometry_is_returned():
     vertices = [
-        QVector3D(0, 0, 1),
-        QVector3D(0, 1, 0),
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 1),
+        np.array([0, 0, 1]),
+        np.array([0, 1, 0]),
+        np.array([0, 0, 0]),
+        np.array([0, 1, 1]),
     ]
 
     faces = [[0, 1, 2, 3]]
     geom = OFFGeometryNoNexus(vertices, faces)
 
     assert geom.faces == faces
-    assert geom.vertices == vertices
+    assert np.array_equal(geom.vertices, vertices)
     assert geom.off_geometry == geom
 
 
@@ -89,10 +89,10 @@ def test_can_get_off_geometry_properties(nexus_wrapper):
     vertex_3_z = 1.0
 
     vertices = [
-        QVector3D(0, 0, 1),
-        QVector3D(0, 1, 0),
-        QVector3D(0, 0, 0),
-        QVector3D(vertex_3_x, vertex_3_y, vertex_3_z),
+        np.array([0, 0, 1]),
+        np.array([0, 1, 0]),
+        np.array([0, 0, 0]),
+        np.array([vertex_3_x, vertex_3_y, vertex_3_z]),
     ]
 
     faces = [[0, 1, 2, 3]]
@@ -104,19 +104,17 @@ def test_can_get_off_geometry_properties(nexus_wrapper):
     nexus_shape, _ = component.shape
     assert isinstance(nexus_shape, OFFGeometryNexus)
     assert nexus_shape.faces == faces
-    assert nexus_shape.vertices[3].x() == approx(vertex_3_x)
-    assert nexus_shape.vertices[3].y() == approx(vertex_3_y)
-    assert nexus_shape.vertices[3].z() == approx(vertex_3_z)
+    assert nexus_shape.vertices[3] == approx([vertex_3_x, vertex_3_y, vertex_3_z])
 
 
 def test_can_set_off_geometry_properties(nexus_wrapper):
     component = add_component_to_file(nexus_wrapper)
 
     vertices = [
-        QVector3D(0.0, 0.0, 1.0),
-        QVector3D(0.0, 1.0, 0.0),
-        QVector3D(0.0, 0.0, 0.0),
-        QVector3D(0.0, 1.0, 1.0),
+        np.array([0.0, 0.0, 1.0]),
+        np.array([0.0, 1.0, 0.0]),
+        np.array([0.0, 0.0, 0.0]),
+        np.array([0.0, 1.0, 1.0]),
     ]
 
     faces = [[0, 1, 2, 3]]
@@ -131,9 +129,9 @@ def test_can_set_off_geometry_properties(nexus_wrapper):
     vertex_2_y = -0.5
     vertex_2_z = 0
     new_vertices = [
-        QVector3D(-0.5, -0.5, 0),
-        QVector3D(0, 0.5, 0),
-        QVector3D(vertex_2_x, vertex_2_y, vertex_2_z),
+        np.array([-0.5, -0.5, 0]),
+        np.array([0, 0.5, 0]),
+        np.array([vertex_2_x, vertex_2_y, vertex_2_z]),
     ]
     triangle = [0, 1, 2]
     new_faces = [triangle]
@@ -141,9 +139,7 @@ def test_can_set_off_geometry_properties(nexus_wrapper):
     nexus_shape.faces = new_faces
 
     assert nexus_shape.faces == new_faces
-    assert nexus_shape.vertices[2].x() == approx(vertex_2_x)
-    assert nexus_shape.vertices[2].y() == approx(vertex_2_y)
-    assert nexus_shape.vertices[2].z() == approx(vertex_2_z)
+    assert nexus_shape.vertices[2] == approx([vertex_2_x, vertex_2_y, vertex_2_z])
 
 
 def test_can_record_list_of_vertices_for_each_face(nexus_wrapper):
@@ -151,7 +147,11 @@ def test_can_record_list_of_vertices_for_each_face(nexus_wrapper):
     component = add_component_to_file(nexus_wrapper)
 
     shape = OFFGeometryNoNexus(
-        [QVector3D(0.0, 0.0, 1.0), QVector3D(0.0, 1.0, 0.0), QVector3D(0.0, 0.0, 0.0)],
+        [
+            np.array([0.0, 0.0, 1.0]),
+            np.array([0.0, 1.0, 0.0]),
+            np.array([0.0, 0.0, 0.0]),
+        ],
         [[0, 1, 2]],
     )
 
@@ -184,7 +184,11 @@ def test_can_retrieve_list_of_vertices_for_each_face(nexus_wrapper):
     component = add_component_to_file(nexus_wrapper)
 
     shape = OFFGeometryNoNexus(
-        [QVector3D(0.0, 0.0, 1.0), QVector3D(0.0, 1.0, 0.0), QVector3D(0.0, 0.0, 0.0)],
+        [
+            np.array([0.0, 0.0, 1.0]),
+            np.array([0.0, 1.0, 0.0]),
+            np.array([0.0, 0.0, 0.0]),
+        ],
         [[0, 1, 2]],
     )
 
@@ -232,3 +236,40 @@ def test_GIVEN_pixel_mapping_WHEN_initialising_off_geometry_THEN_mapping_in_nexu
     actual_dataset = off_geometry.detector_faces
 
     assert array_equal(array(expected_dataset), actual_dataset)
+
+
+def test_GIVEN_arrays_WHEN_creating_OFFGeometry_from_arrays_THEN_list_properties_match_arrays():
+    geom = OFFGeometryNoNexus.from_arrays(
+        np.array([[0, 0, 1], [0, 1, 0], [0, 0, 0], [0, 1, 1]]),
+        np.array([0, 1, 2, 1, 2, 3]),
+        np.array([0, 3]),
+    )
+
+    assert geom.faces == [[0, 1, 2], [1, 2, 3]]
+    assert np.array_equal(geom.vertices[3], np.array([0, 1, 1]))
+    assert geom.winding_order_indices == [0, 3]
+
+
+def test_GIVEN_faces_WHEN_setting_faces_on_OFFGeometry_THEN_arrays_are_in_nexus_layout():
+    geom = OFFGeometryNoNexus([np.array([0, 0, 0])] * 5, [[0, 1, 2], [1, 2, 3, 4]])
+
+    assert geom.winding_order_array.tolist() == [0, 1, 2, 1, 2, 3, 4]
+    assert geom.winding_order_indices_array.tolist() == [0, 3]
+    assert geom.vertices_array.shape == (5, 3)
+
+
+def test_GIVEN_off_shape_in_file_WHEN_getting_off_geometry_THEN_arrays_match_file(
+    nexus_wrapper,
+):
+    component = add_component_to_file(nexus_wrapper)
+    vertices = [np.array([0, 0, 1]), np.array([0, 1, 0]), np.array([0, 0, 0])]
+    component.set_off_shape(OFFGeometryNoNexus(vertices, [[0, 1, 2]]))
+    nexus_shape, _ = component.shape
+
+    off_geometry = nexus_shape.off_geometry
+
+    assert np.array_equal(
+        off_geometry.vertices_array, nexus_shape.group["vertices"][...]
+    )
+    assert off_geometry.faces == [[0, 1, 2]]
+    assert np.array_equal(off_geometry.vertices, vertices)
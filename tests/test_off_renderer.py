@@ -1,13 +1,19 @@
 from nexus_constructor.off_renderer import (
     QtOFFGeometry,
-    create_vertex_buffer,
-    create_normal_buffer,
     OffMesh,
+    create_mesh_buffers,
+    triangulate_faces,
+    create_vertex_and_normal_arrays,
 )
 from nexus_constructor.geometry import OFFGeometryNoNexus
+from nexus_constructor.geometry.off_geometry import faces_to_winding_order
 from nexus_constructor.geometry.no_shape_geometry import OFFCube
-import itertools
-from PySide2.QtGui import QVector3D
+from nexus_constructor.qentity_utils import (
+    INSTANCE_MATRIX_ATTRIBUTE_NAMES,
+    INSTANCE_OFFSET_ATTRIBUTE_NAME,
+)
+import numpy as np
+import pytest
 
 TRIANGLES_IN_SQUARE = 2
 VERTICES_IN_TRIANGLE = 3
@@ -15,83 +21,153 @@ POINTS_IN_VERTEX = 3
 VERTICES_IN_CUBE = 6
 
 
-def test_GIVEN_a_single_triangle_face_WHEN_creating_vertex_buffer_THEN_output_is_correct():
-    vertices = [QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(1, 1, 0)]
-    faces = [[0, 1, 2]]
+def _triangulate(faces):
+    return triangulate_faces(*faces_to_winding_order(faces))
+
 
-    vertex_buffer = create_vertex_buffer(vertices, faces)
+def _attribute_values(buffers, name):
+    attribute_data = next(
+        attribute_data
+        for attribute_data in buffers.attributes
+        if attribute_data.name == name
+    )
+    return np.frombuffer(attribute_data.data, dtype=np.float32).reshape(-1, 3)
 
-    expected_output = itertools.chain.from_iterable([v.toTuple() for v in vertices])
 
-    assert list(vertex_buffer) == list(expected_output)
+def _vertex_positions(buffers):
+    return _attribute_values(
+        buffers, QtOFFGeometry.q_attribute.defaultPositionAttributeName()
+    )
 
 
-def test_GIVEN_a_set_of_triangle_faces_WHEN_creating_vertex_buffer_THEN_length_is_total_points_in_all_faces():
-    vertices = [
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 0),
-        QVector3D(1, 1, 0),
-        QVector3D(1, 0, 1),
+def get_dummy_OFF():
+    # A square with a triangle on the side
+    original_vertices = [
+        np.array([0, 0, 0]),
+        np.array([0, 1, 0]),
+        np.array([1, 1, 0]),
+        np.array([1, 0, 0]),
+        np.array([1.5, 0.5, 0]),
     ]
+    original_faces = [[0, 1, 2, 3], [2, 3, 4]]
+
+    return OFFGeometryNoNexus(vertices=original_vertices, faces=original_faces)
+
+
+def test_GIVEN_a_single_triangle_face_WHEN_creating_vertex_array_THEN_output_is_correct():
+    vertices = np.array([[0, 0, 0], [0, 1, 0], [1, 1, 0]])
+    faces = [[0, 1, 2]]
+
+    positions, _ = create_vertex_and_normal_arrays(vertices, _triangulate(faces))
+
+    assert positions.tolist() == vertices.tolist()
+
+
+def test_GIVEN_a_set_of_triangle_faces_WHEN_creating_vertex_array_THEN_length_is_total_points_in_all_faces():
+    vertices = np.array([[0, 0, 0], [0, 1, 0], [1, 1, 0], [1, 0, 1]])
     faces = [[0, 1, 2], [3, 2, 0], [2, 3, 1]]
 
-    vertex_buffer = create_vertex_buffer(vertices, faces)
+    positions, _ = create_vertex_and_normal_arrays(vertices, _triangulate(faces))
 
     NUM_OF_TRIANGLES = len(faces)
 
+    assert positions.size == NUM_OF_TRIANGLES * VERTICES_IN_TRIANGLE * POINTS_IN_VERTEX
+
+
+def test_GIVEN_a_square_WHEN_creating_vertex_array_THEN_length_is_correct():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]])
+    faces = [[0, 1, 2, 3]]
+
+    positions, _ = create_vertex_and_normal_arrays(vertices, _triangulate(faces))
+
     assert (
-        len(list(vertex_buffer))
-        == NUM_OF_TRIANGLES * VERTICES_IN_TRIANGLE * POINTS_IN_VERTEX
+        positions.size == TRIANGLES_IN_SQUARE * VERTICES_IN_TRIANGLE * POINTS_IN_VERTEX
     )
 
 
-def test_GIVEN_a_square_WHEN_creating_vertex_buffer_THEN_length_is_correct():
-    vertices = [
-        QVector3D(0, 0, 0),
-        QVector3D(1, 0, 0),
-        QVector3D(0, 1, 0),
-        QVector3D(1, 1, 0),
-    ]
+def test_GIVEN_a_single_triangle_face_WHEN_creating_normal_array_THEN_output_is_correct():
+    vertices = np.array([[0, 0, 0], [0, 1, 0], [1, 1, 0]])
+    faces = [[0, 1, 2]]
+
+    _, normals = create_vertex_and_normal_arrays(vertices, _triangulate(faces))
+
+    assert normals.tolist() == [[0.0, 0.0, -1.0]] * VERTICES_IN_TRIANGLE
+
+
+def test_GIVEN_a_square_face_WHEN_creating_normal_array_THEN_output_is_correct():
+    vertices = np.array([[0, 0, 0], [0, 1, 0], [1, 1, 0], [1, 0, 0]])
     faces = [[0, 1, 2, 3]]
 
-    vertex_buffer = create_vertex_buffer(vertices, faces)
+    _, normals = create_vertex_and_normal_arrays(vertices, _triangulate(faces))
 
     assert (
-        len(list(vertex_buffer))
-        == TRIANGLES_IN_SQUARE * VERTICES_IN_TRIANGLE * POINTS_IN_VERTEX
+        normals.tolist()
+        == [[0.0, 0.0, -1.0]] * TRIANGLES_IN_SQUARE * VERTICES_IN_TRIANGLE
     )
 
 
-def test_GIVEN_a_single_triangle_face_WHEN_creating_normal_buffer_THEN_output_is_correct():
-    vertices = [QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(1, 1, 0)]
-    faces = [[0, 1, 2]]
+def test_WHEN_creating_mesh_buffers_with_no_repeat_THEN_mesh_is_unchanged():
+    off_geometry = get_dummy_OFF()
+
+    buffers = create_mesh_buffers(off_geometry, [np.array([0, 0, 0])])
 
-    normal = create_normal_buffer(vertices, faces)
+    expected_positions, _ = create_vertex_and_normal_arrays(
+        off_geometry.vertices_array, _triangulate(off_geometry.faces)
+    )
+    assert _vertex_positions(buffers).tolist() == expected_positions.tolist()
 
-    expected_output = [0.0, 0.0, -1.0] * 3
 
-    assert list(normal) == expected_output
+def test_WHEN_creating_mesh_buffers_with_three_copies_THEN_original_shape_remains():
+    off_geometry = get_dummy_OFF()
+    positions = [np.array([0, 0, 0]), np.array([0, 0, 1]), np.array([1, 0, 0])]
 
+    buffers = create_mesh_buffers(off_geometry, positions)
 
-def test_GIVEN_a_square_face_WHEN_creating_normal_buffer_THEN_output_is_correct():
-    vertices = [
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 0),
-        QVector3D(1, 1, 0),
-        QVector3D(1, 0, 0),
-    ]
-    faces = [[0, 1, 2, 3]]
+    expected_positions, _ = create_vertex_and_normal_arrays(
+        off_geometry.vertices_array, _triangulate(off_geometry.faces)
+    )
+    vertex_positions = _vertex_positions(buffers)
+    assert len(vertex_positions) == len(positions) * len(expected_positions)
+    assert (
+        vertex_positions[: len(expected_positions)].tolist()
+        == expected_positions.tolist()
+    )
 
-    normal = create_normal_buffer(vertices, faces)
 
-    expected_output = [0.0, 0.0, -1.0] * TRIANGLES_IN_SQUARE * VERTICES_IN_TRIANGLE
+@pytest.mark.parametrize(
+    "translation", [[1, 0, 0], [0, 1, 0], [0, 0, -1], [0, 1, -1]],
+)
+def test_WHEN_creating_mesh_buffers_with_single_translation_THEN_second_shape_is_translation_of_first(
+    translation,
+):
+    off_geometry = get_dummy_OFF()
+
+    buffers = create_mesh_buffers(
+        off_geometry, [np.array([0, 0, 0]), np.array(translation)]
+    )
 
-    assert list(normal) == expected_output
+    vertex_positions = _vertex_positions(buffers)
+    original_positions, second_shape_positions = np.split(vertex_positions, 2)
+    assert np.array_equal(second_shape_positions - translation, original_positions)
+
+
+def test_GIVEN_copies_WHEN_creating_mesh_buffers_THEN_every_copy_has_the_same_normals():
+    off_geometry = get_dummy_OFF()
+
+    buffers = create_mesh_buffers(
+        off_geometry, [np.array([0, 0, 0]), np.array([0, 0, 1])]
+    )
+
+    normals = _attribute_values(
+        buffers, QtOFFGeometry.q_attribute.defaultNormalAttributeName()
+    )
+    first_normals, second_normals = np.split(normals, 2)
+    assert np.array_equal(first_normals, second_normals)
 
 
 def test_GIVEN_a_triangle_WHEN_creating_off_geometry_with_no_pixel_data_THEN_vertex_count_equals_3():
     off_geometry = OFFGeometryNoNexus(
-        vertices=[QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(1, 1, 0)],
+        vertices=[np.array([0, 0, 0]), np.array([0, 1, 0]), np.array([1, 1, 0])],
         faces=[[0, 1, 2]],
     )
 
@@ -110,10 +186,130 @@ def test_WHEN_creating_off_mesh_with_cube_THEN_geometry_contains_cube():
 
 def test_GIVEN_geometry_WHEN_creating_off_mesh_THEN_geometry_contains_original_geometry():
     off_output = OFFGeometryNoNexus(
-        vertices=[QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(1, 1, 0)],
+        vertices=[np.array([0, 0, 0]), np.array([0, 1, 0]), np.array([1, 1, 0])],
         faces=[[0, 1, 2]],
     )
 
     off_mesh = OffMesh(off_output, None)
 
     assert off_mesh.geometry().vertex_count == VERTICES_IN_TRIANGLE
+
+
+def test_GIVEN_faces_of_different_sizes_WHEN_triangulating_faces_THEN_each_face_becomes_a_fan_of_triangles():
+    winding_order, face_starts = faces_to_winding_order([[0, 1, 2], [3, 4, 5, 6, 7]])
+
+    triangles = triangulate_faces(winding_order, face_starts)
+
+    assert triangles.tolist() == [[0, 1, 2], [3, 4, 5], [3, 5, 6], [3, 6, 7]]
+
+
+def test_GIVEN_degenerate_triangle_WHEN_creating_vertex_and_normal_arrays_THEN_normal_is_zero():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0]], dtype=np.float32)
+
+    positions, normals = create_vertex_and_normal_arrays(
+        vertices, np.array([[0, 1, 2]])
+    )
+
+    assert positions.tolist() == vertices.tolist()
+    assert normals.tolist() == [[0.0, 0.0, 0.0]] * VERTICES_IN_TRIANGLE
+
+
+def test_GIVEN_geometry_and_positions_WHEN_creating_off_geometry_THEN_vertex_count_includes_every_copy():
+    off_geometry = OFFGeometryNoNexus(
+        vertices=[np.array([0, 0, 0]), np.array([0, 1, 0]), np.array([1, 1, 0])],
+        faces=[[0, 1, 2]],
+    )
+
+    qt_geometry = QtOFFGeometry(
+        off_geometry, [np.array([0, 0, 0]), np.array([0, 0, 1]), np.array([0, 0, 2])]
+    )
+
+    assert qt_geometry.vertex_count == 3 * VERTICES_IN_TRIANGLE
+
+
+def test_GIVEN_geometry_and_positions_WHEN_creating_instanced_off_mesh_THEN_mesh_is_stored_once_drawn_per_position():
+    off_geometry = OFFGeometryNoNexus(
+        vertices=[np.array([0, 0, 0]), np.array([0, 1, 0]), np.array([1, 1, 0])],
+        faces=[[0, 1, 2]],
+    )
+    positions = [np.array([0, 0, 0]), np.array([0, 0, 1]), np.array([0, 0, 2])]
+
+    off_mesh = OffMesh(off_geometry, None, positions, instanced=True)
+
+    assert off_mesh.vertexCount() == VERTICES_IN_TRIANGLE
+    assert off_mesh.instanceCount() == len(positions)
+    offset_attribute = next(
+        attribute
+        for attribute in off_mesh.geometry().attributes()
+        if attribute.name() == INSTANCE_OFFSET_ATTRIBUTE_NAME
+    )
+    assert offset_attribute.divisor() == 1
+    assert offset_attribute.count() == len(positions)
+    assert np.frombuffer(
+        offset_attribute.buffer().data().data(), dtype=np.float32
+    ).tolist() == [0, 0, 0, 0, 0, 1, 0, 0, 2]
+
+
+def test_GIVEN_instance_matrices_WHEN_creating_instanced_off_mesh_THEN_matrix_columns_are_per_instance_attributes():
+    off_geometry = OFFGeometryNoNexus(
+        vertices=[np.array([0, 0, 0]), np.array([0, 1, 0]), np.array([1, 1, 0])],
+        faces=[[0, 1, 2]],
+    )
+    positions = np.array([[0, 0, 0], [0, 0, 1]])
+    matrices = np.array([np.identity(3), np.diag([2.0, 3.0, 4.0])])
+
+    off_mesh = OffMesh(
+        off_geometry, None, positions, instanced=True, instance_matrices=matrices
+    )
+
+    attributes = {
+        attribute.name(): attribute for attribute in off_mesh.geometry().attributes()
+    }
+    assert off_mesh.instanceCount() == 2
+    for column, name in enumerate(INSTANCE_MATRIX_ATTRIBUTE_NAMES):
+        attribute = attributes[name]
+        assert attribute.divisor() == 1
+        values = np.frombuffer(attribute.buffer().data().data(), dtype=np.float32)
+        assert values.reshape(-1, 3).tolist() == matrices[:, :, column].tolist()
+
+
+def test_GIVEN_no_instance_matrices_WHEN_creating_instanced_off_mesh_THEN_instances_are_not_rotated_or_scaled():
+    off_geometry = OFFGeometryNoNexus(
+        vertices=[np.array([0, 0, 0]), np.array([0, 1, 0]), np.array([1, 1, 0])],
+        faces=[[0, 1, 2]],
+    )
+
+    off_mesh = OffMesh(off_geometry, None, [np.array([0, 0, 1])], instanced=True)
+
+    attributes = {
+        attribute.name(): attribute for attribute in off_mesh.geometry().attributes()
+    }
+    columns = [
+        np.frombuffer(attributes[name].buffer().data().data(), dtype=np.float32)
+        for name in INSTANCE_MATRIX_ATTRIBUTE_NAMES
+    ]
+    assert np.column_stack(columns).tolist() == np.identity(3).tolist()
+
+
+def test_GIVEN_buffers_made_in_advance_WHEN_creating_off_mesh_THEN_mesh_uses_the_buffers():
+    off_geometry = OFFGeometryNoNexus(
+        vertices=[np.array([0, 0, 0]), np.array([0, 1, 0]), np.array([1, 1, 0])],
+        faces=[[0, 1, 2]],
+    )
+    positions = [np.array([0, 0, 0]), np.array([0, 0, 1])]
+    buffers = create_mesh_buffers(off_geometry, positions, instanced=True)
+
+    off_mesh = OffMesh(None, None, buffers=buffers)
+
+    assert off_mesh.vertexCount() == VERTICES_IN_TRIANGLE
+    assert off_mesh.instanceCount() == len(positions)
+    position_attribute = next(
+        attribute
+        for attribute in off_mesh.geometry().attributes()
+        if attribute.name() == QtOFFGeometry.q_attribute.defaultPositionAttributeName()
+    )
+    assert position_attribute.buffer().data().data() == next(
+        attribute_data.data
+        for attribute_data in buffers.attributes
+        if attribute_data.name == position_attribute.name()
+    )
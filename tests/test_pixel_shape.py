@@ -1,6 +1,5 @@
 from nexus_constructor.component.pixel_shape import PixelShape
 from nexus_constructor.nexus import nexus_wrapper as nx
-from nexus_constructor.ui_utils import qvector3d_to_numpy_array
 import numpy as np
 
 
@@ -40,15 +39,11 @@ def test_GIVEN_a_PixelShape_WHEN_calling_get_shape_THEN_shape_and_transformation
     shape, transformations = pixel_shape.get_shape()
 
     for vertex_index, vertex in enumerate(shape.vertices):
-        assert np.allclose(qvector3d_to_numpy_array(vertex), vertices[vertex_index])
+        assert np.allclose(vertex, vertices[vertex_index])
     assert np.allclose(shape.faces, [winding_order])
 
     assert (
         len(transformations) == x_offsets.size
     ), "Expected one transformation per pixel offset"
-    assert np.allclose(
-        qvector3d_to_numpy_array(transformations[0]), np.array([-0.05, -0.05, 0.0])
-    )
-    assert np.allclose(
-        qvector3d_to_numpy_array(transformations[3]), np.array([0.05, 0.05, 0.0])
-    )
+    assert np.allclose(transformations[0], np.array([-0.05, -0.05, 0.0]))
+    assert np.allclose(transformations[3], np.array([0.05, 0.05, 0.0]))
@@ -1,10 +1,10 @@
 from tests.helpers import add_component_to_file
-from PySide2.QtGui import QVector3D
+import numpy as np
 
 
 def test_remove_from_beginning_1(nexus_wrapper):
     component1 = add_component_to_file(nexus_wrapper, "field", 42, "component1")
-    rot = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component1.depends_on = rot
     assert len(rot.get_dependents()) == 1
     rot.remove_from_dependee_chain()
@@ -13,8 +13,8 @@ def test_remove_from_beginning_1(nexus_wrapper):
 
 def test_remove_from_beginning_2(nexus_wrapper):
     component1 = add_component_to_file(nexus_wrapper, "field", 42, "component1")
-    rot1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
-    rot2 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
+    rot2 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component1.depends_on = rot1
     rot1.depends_on = rot2
     assert len(rot2.get_dependents()) == 1
@@ -27,8 +27,8 @@ def test_remove_from_beginning_2(nexus_wrapper):
 def test_remove_from_beginning_3(nexus_wrapper):
     component1 = add_component_to_file(nexus_wrapper, "field", 42, "component1")
     component2 = add_component_to_file(nexus_wrapper, "field", 42, "component2")
-    rot1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
-    rot2 = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
+    rot2 = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component1.depends_on = rot1
     component2.depends_on = rot2
     rot1.depends_on = rot2
@@ -45,9 +45,9 @@ def test_remove_from_middle(nexus_wrapper):
     component1 = add_component_to_file(nexus_wrapper, "field", 42, "component1")
     component2 = add_component_to_file(nexus_wrapper, "field", 42, "component2")
     component3 = add_component_to_file(nexus_wrapper, "field", 42, "component3")
-    rot1 = component1.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
-    rot2 = component2.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
-    rot3 = component3.add_rotation(QVector3D(1.0, 0.0, 0.0), 90.0)
+    rot1 = component1.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
+    rot2 = component2.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
+    rot3 = component3.add_rotation(np.array([1.0, 0.0, 0.0]), 90.0)
     component1.depends_on = rot1
     component2.depends_on = rot2
     component3.depends_on = rot3
@@ -0,0 +1,92 @@
+import subprocess
+import sys
+
+import pytest
+from mock import Mock
+
+from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
+from nexus_constructor.nexus.signals import Signal
+from nexus_constructor.qt_signal_bridge import QtNexusSignals
+
+
+class Emitter:
+    changed = Signal()
+
+
+def test_GIVEN_connected_functions_WHEN_emitting_signal_THEN_each_function_is_called_with_arguments():
+    emitter = Emitter()
+    first, second = Mock(), Mock()
+    emitter.changed.connect(first)
+    emitter.changed.connect(second)
+
+    emitter.changed.emit(1, "two")
+
+    first.assert_called_once_with(1, "two")
+    second.assert_called_once_with(1, "two")
+
+
+def test_GIVEN_two_instances_WHEN_emitting_signal_of_one_THEN_functions_connected_to_other_are_not_called():
+    emitter, other_emitter = Emitter(), Emitter()
+    slot = Mock()
+    other_emitter.changed.connect(slot)
+
+    emitter.changed.emit()
+
+    slot.assert_not_called()
+
+
+def test_GIVEN_disconnected_function_WHEN_emitting_signal_THEN_function_is_not_called():
+    emitter = Emitter()
+    slot = Mock()
+    emitter.changed.connect(slot)
+    emitter.changed.disconnect(slot)
+
+    emitter.changed.emit()
+
+    slot.assert_not_called()
+
+
+def test_GIVEN_function_which_is_not_connected_WHEN_disconnecting_THEN_runtime_error_is_raised():
+    with pytest.raises(RuntimeError):
+        Emitter().changed.disconnect(Mock())
+
+
+def test_GIVEN_qt_signal_bridge_WHEN_nexus_wrapper_emits_signal_THEN_qt_signal_is_emitted():
+    wrapper = NexusWrapper("test_qt_signal_bridge")
+    bridge = QtNexusSignals(wrapper)
+    slot = Mock()
+    bridge.component_removed.connect(slot)
+
+    wrapper.component_removed.emit("component")
+
+    slot.assert_called_once_with("component")
+
+
+def test_GIVEN_nexus_wrapper_module_WHEN_importing_THEN_qt_is_not_imported():
+    script = (
+        "import sys, nexus_constructor.nexus.nexus_wrapper;"
+        "print([m for m in sys.modules if m.startswith('PySide2')])"
+    )
+
+    output = subprocess.run(
+        [sys.executable, "-c", script], stdout=subprocess.PIPE, check=True
+    ).stdout
+
+    assert output.decode().strip() == "[]"
+
+
+def test_GIVEN_method_of_deleted_object_WHEN_emitting_signal_THEN_signal_is_emitted_to_remaining_functions():
+    class Receiver:
+        def on_changed(self):
+            pass
+
+    emitter = Emitter()
+    receiver = Receiver()
+    slot = Mock()
+    emitter.changed.connect(receiver.on_changed)
+    emitter.changed.connect(slot)
+    del receiver
+
+    emitter.changed.emit()
+
+    slot.assert_called_once_with()
@@ -0,0 +1,99 @@
+import sys
+
+import pytest
+
+from nexus_constructor.startup_profiler import StartupProfiler
+
+
+@pytest.fixture
+def module_dir(tmpdir):
+    tmpdir.join("profiled_outer.py").write("import profiled_inner\n")
+    tmpdir.join("profiled_inner.py").write("VALUE = 1\n")
+    sys.path.insert(0, str(tmpdir))
+    yield tmpdir
+    sys.path.remove(str(tmpdir))
+    for name in ["profiled_outer", "profiled_inner"]:
+        sys.modules.pop(name, None)
+
+
+def test_GIVEN_profiler_is_started_WHEN_importing_modules_THEN_each_module_is_timed(
+    module_dir,
+):
+    profiler = StartupProfiler()
+    profiler.start()
+    try:
+        import profiled_outer  # noqa: F401
+    finally:
+        profiler.stop()
+
+    modules = {module.name: module for module in profiler.modules}
+    assert modules["profiled_inner"].cumulative_time <= (
+        modules["profiled_outer"].cumulative_time
+    )
+    assert modules["profiled_outer"].self_time <= (
+        modules["profiled_outer"].cumulative_time
+        - modules["profiled_inner"].cumulative_time
+        + 1e-6
+    )
+
+
+def test_GIVEN_profiler_is_started_WHEN_importing_module_THEN_module_keeps_its_own_loader(
+    module_dir,
+):
+    profiler = StartupProfiler()
+    profiler.start()
+    try:
+        import profiled_inner
+    finally:
+        profiler.stop()
+
+    assert type(profiled_inner.__loader__).__name__ == "SourceFileLoader"
+    assert profiled_inner.__spec__.loader is profiled_inner.__loader__
+
+
+def test_GIVEN_profiler_is_stopped_WHEN_importing_module_THEN_module_is_not_timed(
+    module_dir,
+):
+    profiler = StartupProfiler()
+    profiler.start()
+    profiler.stop()
+
+    import profiled_inner  # noqa: F401
+
+    assert not profiler.modules
+
+
+def test_GIVEN_disabled_profiler_WHEN_timing_stage_THEN_stage_is_not_recorded():
+    profiler = StartupProfiler(enabled=False)
+
+    with profiler.stage("Create the application"):
+        pass
+
+    assert not profiler.stages
+
+
+def test_GIVEN_timed_stages_and_imports_WHEN_reporting_THEN_report_lists_stages_and_modules(
+    module_dir,
+):
+    profiler = StartupProfiler()
+    profiler.start()
+    with profiler.stage("Import modules"):
+        import profiled_outer  # noqa: F401
+
+    report = profiler.report(profiler.stop())
+
+    assert "Import modules" in report
+    assert "profiled_inner" in report
+    assert "profiled_outer" in report
+
+
+def test_GIVEN_output_file_WHEN_finishing_THEN_report_is_written_to_file(tmpdir):
+    profiler = StartupProfiler()
+    profiler.start()
+    with profiler.stage("Show the main window"):
+        pass
+    output_file = tmpdir.join("startup.txt")
+
+    profiler.finish(str(output_file))
+
+    assert "Show the main window" in output_file.read()
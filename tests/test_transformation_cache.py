@@ -0,0 +1,124 @@
+from mock import patch
+import numpy as np
+from pytest import approx, raises
+
+from nexus_constructor.component.component import Component
+from nexus_constructor.transformation_cache import TransformationCache
+from .helpers import add_component_to_file
+
+
+def _set_magnitude(nexus_wrapper, transformation, magnitude):
+    nexus_wrapper.set_field_value(
+        transformation.dataset.parent, transformation.name, magnitude
+    )
+
+
+def test_GIVEN_component_with_transformation_chain_WHEN_getting_component_matrix_THEN_matches_component_matrix(
+    nexus_wrapper,
+):
+    cache = TransformationCache(nexus_wrapper)
+    component = add_component_to_file(nexus_wrapper, component_name="component")
+    translation = component.add_translation(np.array([0.0, 0.0, 2.0]))
+    rotation = component.add_rotation(
+        np.array([0.0, 1.0, 0.0]), 90.0, depends_on=translation
+    )
+    component.depends_on = rotation
+
+    assert cache.component_matrix(component).flatten() == approx(
+        component.matrix.flatten(), abs=1e-6
+    )
+
+
+def test_GIVEN_cached_component_matrix_WHEN_transformation_value_changes_THEN_component_matrix_is_recomputed(
+    nexus_wrapper,
+):
+    cache = TransformationCache(nexus_wrapper)
+    component = add_component_to_file(nexus_wrapper, component_name="component")
+    translation = component.add_translation(np.array([0.0, 0.0, 1.0]))
+    component.depends_on = translation
+    cache.component_matrix(component)
+
+    _set_magnitude(nexus_wrapper, translation, 5.0)
+
+    assert cache.component_matrix(component)[2, 3] == approx(5.0)
+
+
+def test_GIVEN_transformation_depended_on_by_another_component_WHEN_it_changes_THEN_dependent_matrix_is_recomputed(
+    nexus_wrapper,
+):
+    cache = TransformationCache(nexus_wrapper)
+    first_component = add_component_to_file(nexus_wrapper, component_name="first")
+    second_component = add_component_to_file(nexus_wrapper, component_name="second")
+    first_translation = first_component.add_translation(np.array([1.0, 0.0, 0.0]))
+    second_translation = second_component.add_translation(
+        np.array([0.0, 1.0, 0.0]), depends_on=first_translation
+    )
+    second_component.depends_on = second_translation
+    cache.component_matrix(second_component)
+
+    _set_magnitude(nexus_wrapper, first_translation, 3.0)
+
+    assert cache.component_matrix(second_component)[0, 3] == approx(3.0)
+
+
+def test_GIVEN_two_independent_components_WHEN_one_transformation_changes_THEN_other_matrix_is_not_recomputed(
+    nexus_wrapper,
+):
+    cache = TransformationCache(nexus_wrapper)
+    first_component = add_component_to_file(nexus_wrapper, component_name="first")
+    second_component = add_component_to_file(nexus_wrapper, component_name="second")
+    first_translation = first_component.add_translation(np.array([1.0, 0.0, 0.0]))
+    second_translation = second_component.add_translation(np.array([0.0, 1.0, 0.0]))
+    first_component.depends_on = first_translation
+    second_component.depends_on = second_translation
+    cache.component_matrix(first_component)
+    cache.component_matrix(second_component)
+
+    _set_magnitude(nexus_wrapper, first_translation, 3.0)
+
+    with patch(
+        "nexus_constructor.transformation_cache.local_matrices"
+    ) as mock_local_matrices:
+        cache.component_matrix(second_component)
+        mock_local_matrices.assert_not_called()
+
+
+def _create_cyclic_chain(nexus_wrapper):
+    # In the entry, which resolve_all searches
+    component = Component(
+        nexus_wrapper,
+        nexus_wrapper.create_nx_group("component", "NXdetector", nexus_wrapper.entry),
+    )
+    first = component.add_translation(np.array([0.0, 0.0, 1.0]))
+    second = component.add_translation(np.array([1.0, 0.0, 0.0]), depends_on=first)
+    first.dataset.attrs["depends_on"] = second.dataset.name
+    component.depends_on = second
+    return component, first, second
+
+
+def test_GIVEN_cyclic_depends_on_chain_WHEN_getting_matrices_THEN_value_error_is_raised_and_nothing_is_cached(
+    nexus_wrapper,
+):
+    cache = TransformationCache(nexus_wrapper)
+    component, first, _ = _create_cyclic_chain(nexus_wrapper)
+
+    with raises(ValueError):
+        cache.resolve_all()
+    with raises(ValueError):
+        cache.transformation_matrix(first.dataset.name)
+    with raises(ValueError):
+        cache.component_matrix(component)
+    assert cache._matrices == {}
+
+
+def test_GIVEN_link_without_transformation_type_WHEN_getting_matrix_THEN_link_is_treated_as_translation(
+    nexus_wrapper,
+):
+    cache = TransformationCache(nexus_wrapper)
+    component = add_component_to_file(nexus_wrapper, component_name="component")
+    translation = component.add_translation(np.array([0.0, 0.0, 2.0]))
+    del translation.dataset.attrs["transformation_type"]
+
+    matrix = cache.transformation_matrix(translation.dataset.name)
+
+    assert matrix[:, 3] == approx([0.0, 0.0, 2.0, 1.0])
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.QtGui import QVector3D
+from pytest import approx
+
+from nexus_constructor.transformation_engine import (
+    NO_PARENT,
+    resolve_chains,
+    rotation_matrices,
+    translation_matrices,
+    resolve_transformations,
+    resolve_component_matrices,
+)
+from .helpers import add_component_to_file
+
+
+def _qt_rotation(axis, angle):
+    transform = Qt3DCore.QTransform()
+    transform.setRotation(transform.fromAxisAndAngle(QVector3D(*axis), angle))
+    return np.array(transform.matrix().data()).reshape(4, 4).T
+
+
+def test_GIVEN_axes_and_angles_WHEN_computing_rotation_matrices_THEN_matches_qt_rotation():
+    axes = np.array([[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [1.0, 1.0, 1.0]])
+    angles = np.array([90.0, -45.0, 30.0])
+
+    matrices = rotation_matrices(axes, angles)
+
+    for matrix, axis, angle in zip(matrices, axes, angles):
+        assert matrix.flatten() == approx(_qt_rotation(axis, angle).flatten(), abs=1e-6)
+
+
+def test_GIVEN_zero_length_axis_WHEN_computing_rotation_matrices_THEN_matrix_is_identity():
+    assert rotation_matrices(np.zeros((1, 3)), np.array([90.0]))[0] == approx(
+        np.identity(4)
+    )
+
+
+def test_GIVEN_vector_and_magnitude_WHEN_computing_translation_matrices_THEN_translation_is_along_normalised_vector():
+    matrices = translation_matrices(np.array([[0.0, 0.0, 2.0]]), np.array([3.0]))
+
+    assert matrices[0, :3, 3] == approx([0.0, 0.0, 3.0])
+
+
+def test_GIVEN_chain_WHEN_resolving_chains_THEN_each_matrix_is_local_matrix_times_resolved_parent():
+    local = translation_matrices(
+        np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]),
+        np.array([1.0, 2.0, 3.0]),
+    )
+    local[1] = rotation_matrices(np.array([[0.0, 0.0, 1.0]]), np.array([90.0]))[0]
+    parents = np.array([1, 2, NO_PARENT])
+
+    resolved = resolve_chains(local, parents)
+
+    assert resolved[2] == approx(local[2])
+    assert resolved[1] == approx(local[1] @ local[2])
+    assert resolved[0] == approx(local[0] @ local[1] @ local[2])
+
+
+def test_GIVEN_cyclic_depends_on_WHEN_resolving_chains_THEN_raises_value_error():
+    local = np.tile(np.identity(4), (2, 1, 1))
+
+    with pytest.raises(ValueError):
+        resolve_chains(local, np.array([1, 0]))
+
+
+def test_GIVEN_components_with_transformations_WHEN_resolving_component_matrices_THEN_matches_component_matrix(
+    nexus_wrapper,
+):
+    first_component = add_component_to_file(nexus_wrapper, component_name="first")
+    second_component = add_component_to_file(nexus_wrapper, component_name="second")
+    translation = first_component.add_translation(np.array([0.0, 0.0, 2.0]))
+    rotation = second_component.add_rotation(
+        np.array([0.0, 1.0, 0.0]), 90.0, depends_on=translation
+    )
+    first_component.depends_on = translation
+    second_component.depends_on = rotation
+
+    matrices = resolve_component_matrices(
+        nexus_wrapper.nexus_file,
+        [first_component.absolute_path, second_component.absolute_path],
+    )
+
+    for component in [first_component, second_component]:
+        assert matrices[component.absolute_path].flatten() == approx(
+            component.matrix.flatten(), abs=1e-6
+        )
+
+
+def test_GIVEN_file_with_transformations_WHEN_resolving_transformations_THEN_all_transformations_are_found(
+    nexus_wrapper,
+):
+    component = add_component_to_file(nexus_wrapper, component_name="component")
+    translation = component.add_translation(np.array([1.0, 0.0, 0.0]))
+    rotation = component.add_rotation(
+        np.array([0.0, 1.0, 0.0]), 90.0, depends_on=translation
+    )
+
+    resolved = resolve_transformations(nexus_wrapper.nexus_file)
+
+    assert sorted(resolved.paths) == sorted(
+        [translation.absolute_path, rotation.absolute_path]
+    )
+    assert resolved.matrices.shape == (2, 4, 4)
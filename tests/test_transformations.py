@@ -5,10 +5,9 @@ import pytest
 from nexus_constructor.common_attrs import CommonAttrs
 from nexus_constructor.component.component import Component
 from nexus_constructor.transformation_types import TransformationType
-from nexus_constructor.transformations import Transformation, QVector3D
+from nexus_constructor.transformations import Transformation
 from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
 from typing import Any
-from nexus_constructor.ui_utils import qvector3d_to_numpy_array
 from uuid import uuid1
 from tests.helpers import add_component_to_file, file  # noqa:F401
 
@@ -21,11 +20,11 @@ def _add_transform_to_file(
     nexus_wrapper: NexusWrapper,
     name: str,
     value: Any,
-    vector: QVector3D,
+    vector: np.ndarray,
     transform_type: str,
 ):
     transform_dataset = nexus_wrapper.nexus_file.create_dataset(name, data=value)
-    transform_dataset.attrs[CommonAttrs.VECTOR] = qvector3d_to_numpy_array(vector)
+    transform_dataset.attrs[CommonAttrs.VECTOR] = vector
     transform_dataset.attrs[CommonAttrs.TRANSFORMATION_TYPE] = transform_type
     return transform_dataset
 
@@ -35,7 +34,7 @@ def test_can_get_transform_properties():
 
     test_name = "slartibartfast"
     test_value = 42
-    test_vector = QVector3D(1.0, 0.0, 0.0)
+    test_vector = np.array([1.0, 0.0, 0.0])
     test_type = "Translation"
 
     transform_dataset = _add_transform_to_file(
@@ -50,8 +49,8 @@ def test_can_get_transform_properties():
     assert (
         transform.ui_value == test_value
     ), "Expected the transform value to match what was in the NeXus file"
-    assert (
-        transform.vector == test_vector
+    assert np.array_equal(
+        transform.vector, test_vector
     ), "Expected the transform vector to match what was in the NeXus file"
     assert (
         transform.type == test_type
@@ -63,7 +62,7 @@ def test_transform_dependents_depends_on_are_updated_when_transformation_name_is
 
     test_name = "slartibartfast"
     test_value = 42
-    test_vector = QVector3D(1.0, 0.0, 0.0)
+    test_vector = np.array([1.0, 0.0, 0.0])
     test_type = "Translation"
 
     transform_dataset = _add_transform_to_file(
@@ -92,7 +91,7 @@ def test_transform_type_is_capitalised(test_input):
     nexus_wrapper = NexusWrapper(str(uuid1()))
     test_name = "slartibartfast"
     test_value = 42
-    test_vector = QVector3D(1.0, 0.0, 0.0)
+    test_vector = np.array([1.0, 0.0, 0.0])
     transform_dataset = _add_transform_to_file(
         nexus_wrapper, test_name, test_value, test_vector, test_input
     )
@@ -102,7 +101,7 @@ def test_transform_type_is_capitalised(test_input):
 
 def create_transform(nexus_file, name):
     initial_value = 42
-    initial_vector = QVector3D(1.0, 0.0, 0.0)
+    initial_vector = np.array([1.0, 0.0, 0.0])
     initial_type = "Translation"
     dataset = _add_transform_to_file(
         nexus_file, name, initial_value, initial_vector, initial_type
@@ -120,7 +119,7 @@ def test_ui_value_for_transform_with_array_magnitude_returns_first_value():
         nexus_wrapper,
         transform_name,
         transform_value,
-        QVector3D(1, 0, 0),
+        np.array([1, 0, 0]),
         TransformationType.TRANSLATION,
     )
 
@@ -138,7 +137,7 @@ def test_ui_value_for_transform_with_array_magnitude_of_strings_returns_zero():
         nexus_wrapper,
         transform_name,
         transform_value,
-        QVector3D(1, 0, 0),
+        np.array([1, 0, 0]),
         TransformationType.TRANSLATION,
     )
 
@@ -155,7 +154,7 @@ def test_can_set_transform_properties():
 
     test_name = "beeblebrox"
     test_value = 34.0
-    test_vector = QVector3D(0.0, 0.0, 1.0)
+    test_vector = np.array([0.0, 0.0, 1.0])
     test_type = "Rotation"
 
     transform.name = test_name
@@ -169,8 +168,8 @@ def test_can_set_transform_properties():
     assert (
         transform.value == test_value
     ), "Expected the transform value to match what was in the NeXus file"
-    assert (
-        transform.vector == test_vector
+    assert np.array_equal(
+        transform.vector, test_vector
     ), "Expected the transform vector to match what was in the NeXus file"
     assert (
         transform.type == test_type
@@ -406,32 +405,32 @@ def test_can_get_translation_as_4_by_4_matrix():
 
     test_value = 42.0
     # Note, it should not matter if this is not set to a unit vector
-    test_vector = QVector3D(2.0, 0.0, 0.0)
+    test_vector = np.array([2.0, 0.0, 0.0])
     test_type = "Translation"
     dataset = _add_transform_to_file(
         nexus_wrapper, "test_transform", test_value, test_vector, test_type
     )
     transformation = Transformation(nexus_wrapper, dataset)
 
-    test_matrix = transformation.qmatrix
+    test_matrix = transformation.matrix
     expected_matrix = np.array(
         (1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, test_value, 0, 0, 1)
     )
-    assert np.allclose(expected_matrix, np.array(test_matrix.data()))
+    assert np.allclose(expected_matrix, test_matrix.flatten(order="F"))
 
 
 def test_can_get_rotation_as_4_by_4_matrix():
     nexus_wrapper = NexusWrapper(str(uuid1()))
 
     test_value = 45.0  # degrees
-    test_vector = QVector3D(0.0, 1.0, 0.0)  # around y-axis
+    test_vector = np.array([0.0, 1.0, 0.0])  # around y-axis
     test_type = "Rotation"
     dataset = _add_transform_to_file(
         nexus_wrapper, "test_transform", test_value, test_vector, test_type
     )
     transformation = Transformation(nexus_wrapper, dataset)
 
-    test_matrix = transformation.qmatrix
+    test_matrix = transformation.matrix
     # for a rotation around the y-axis:
     test_value_radians = np.deg2rad(test_value)
     expected_matrix = np.array(
@@ -454,10 +453,10 @@ def test_can_get_rotation_as_4_by_4_matrix():
             1,
         )
     )
-    assert np.allclose(expected_matrix, np.array(test_matrix.data()), atol=1.0e-7)
+    assert np.allclose(expected_matrix, test_matrix.flatten(order="F"), atol=1.0e-7)
 
 
-def test_GIVEN_nexus_file_with_linked_transformation_but_without_dependee_of_attr_WHEN_opening_nexus_file_THEN_components_linked_contain_dependee_of_attribute():
+def test_GIVEN_nexus_file_with_linked_transformation_WHEN_opening_nexus_file_THEN_components_linked_are_dependents():
     nexus_wrapper = NexusWrapper(str(uuid1()))
     transform_name = "transform_1"
     transform = create_transform(nexus_wrapper, transform_name)
@@ -470,37 +469,33 @@ def test_GIVEN_nexus_file_with_linked_transformation_but_without_dependee_of_att
     component1.depends_on = transform
     component2.depends_on = transform
 
-    del transform._dataset.attrs[CommonAttrs.DEPENDEE_OF]
-
+    nexus_wrapper.dependency_graph.clear()
     nexus_wrapper.load_nexus_file(nexus_wrapper.nexus_file)
-    new_transform_group = nexus_wrapper.nexus_file[transform_name]
-
-    assert CommonAttrs.DEPENDEE_OF in new_transform_group.attrs
-    assert len(new_transform_group.attrs[CommonAttrs.DEPENDEE_OF]) == 2
-    assert (
-        new_transform_group.attrs[CommonAttrs.DEPENDEE_OF][0] == "/" + component1_name
-    )
-    assert (
-        new_transform_group.attrs[CommonAttrs.DEPENDEE_OF][1] == "/" + component2_name
+    new_transform = Transformation(
+        nexus_wrapper, nexus_wrapper.nexus_file[transform_name]
     )
 
+    assert CommonAttrs.DEPENDEE_OF not in new_transform.dataset.attrs
+    assert new_transform.get_dependents() == [component1, component2]
 
-def test_GIVEN_nexus_file_with_linked_transformation_but_without_dependee_of_attr_WHEN_opening_nexus_file_THEN_component_linked_contains_dependee_of_attribute():
-    nexus_wrapper = NexusWrapper(str(uuid1()))
-    transform_name = "transform_1"
-    transform = create_transform(nexus_wrapper, transform_name)
-
-    component1_name = "test_component1"
 
-    component1 = add_component_to_file(nexus_wrapper, component_name=component1_name)
-    component1.depends_on = transform
-    del transform._dataset.attrs[CommonAttrs.DEPENDEE_OF]
+def test_GIVEN_transformation_with_dependents_WHEN_saving_file_THEN_saved_transformation_has_dependee_of_attribute(
+    tmpdir,
+):
+    nexus_wrapper = NexusWrapper(str(uuid1()))
+    transform = Transformation(
+        nexus_wrapper, nexus_wrapper.entry.create_dataset("transform_1", data=1.0),
+    )
+    component = add_component_to_file(nexus_wrapper, component_name="test_component1")
+    component.depends_on = transform
+    filename = str(tmpdir.join("saved.nxs"))
 
-    nexus_wrapper.load_nexus_file(nexus_wrapper.nexus_file)
-    new_transform_group = nexus_wrapper.nexus_file[transform_name]
+    nexus_wrapper.save_file(filename)
 
-    assert CommonAttrs.DEPENDEE_OF in new_transform_group.attrs
-    assert new_transform_group.attrs[CommonAttrs.DEPENDEE_OF] == "/" + component1_name
+    with h5py.File(filename, mode="r") as saved_file:
+        assert list(saved_file["entry/transform_1"].attrs[CommonAttrs.DEPENDEE_OF]) == [
+            component.absolute_path
+        ]
 
 
 def test_GIVEN_transformation_with_scalar_value_that_is_not_castable_to_int_WHEN_getting_ui_value_THEN_ui_placeholder_value_is_returned_instead(
@@ -515,3 +510,29 @@ def test_GIVEN_transformation_with_scalar_value_that_is_not_castable_to_int_WHEN
 
     assert transform.ui_value != str_value
     assert transform.ui_value == 0
+
+
+def test_GIVEN_transformation_in_chain_WHEN_setting_its_dataset_THEN_links_to_and_from_it_are_kept(
+    file,  # noqa: F811
+):
+    nexus_wrapper = NexusWrapper(str(uuid1()))
+    component = add_component_to_file(nexus_wrapper, component_name="component")
+    first = component.add_translation(np.array([1.0, 0.0, 0.0]), name="first")
+    second = component.add_translation(
+        np.array([0.0, 1.0, 0.0]), name="second", depends_on=first
+    )
+    third = component.add_translation(
+        np.array([0.0, 0.0, 1.0]), name="third", depends_on=second
+    )
+    component.depends_on = third
+
+    second.dataset = file.create_dataset("new_value", data=2.0)
+
+    assert second.get_dependents() == [third]
+    assert first.get_dependents() == [second]
+    assert third.get_dependents() == [component]
+
+    second.name = "renamed"
+
+    assert third.depends_on == second
+    assert first.get_dependents() == [second]
@@ -1,6 +1,19 @@
-from nexus_constructor.unit_utils import calculate_unit_conversion_factor, METRES
+import subprocess
+import sys
+
+from mock import patch
 from pytest import approx
 
+from nexus_constructor import unit_utils
+from nexus_constructor.unit_utils import (
+    calculate_unit_conversion_factor,
+    get_unit_registry,
+    units_are_expected_type,
+    units_are_recognised_by_pint,
+    units_have_magnitude_of_one,
+    METRES,
+)
+
 
 def test_unit_conversion_factor():
 
@@ -10,3 +23,53 @@ def test_unit_conversion_factor():
     # Check that the unit conversion factor can correctly find the unit in terms of meters
     for unit in units:
         assert approx(calculate_unit_conversion_factor(unit[0], METRES)) == unit[1]
+
+
+def test_GIVEN_unit_utils_WHEN_importing_THEN_pint_is_only_imported_when_units_are_first_checked():
+    script = (
+        "import sys, nexus_constructor.unit_utils as unit_utils;"
+        "print('pint' in sys.modules);"
+        "unit_utils.units_are_recognised_by_pint('m');"
+        "print('pint' in sys.modules)"
+    )
+
+    output = subprocess.run(
+        [sys.executable, "-c", script], stdout=subprocess.PIPE, check=True
+    ).stdout
+
+    assert output.decode().split() == ["False", "True"]
+
+
+def test_GIVEN_units_checked_before_WHEN_checking_units_again_THEN_units_are_not_parsed_again():
+    units_are_recognised_by_pint("furlong")
+
+    with patch.object(unit_utils, "get_unit_registry") as get_unit_registry:
+        assert units_are_recognised_by_pint("furlong")
+        assert units_have_magnitude_of_one("furlong")
+
+    get_unit_registry.assert_not_called()
+
+
+def test_GIVEN_conversion_factor_calculated_before_WHEN_calculating_it_again_THEN_registry_is_not_used():
+    expected_factor = calculate_unit_conversion_factor("mm", METRES)
+
+    with patch.object(unit_utils, "get_unit_registry") as get_unit_registry:
+        factor = calculate_unit_conversion_factor("mm", METRES)
+
+    get_unit_registry.assert_not_called()
+    assert factor == approx(expected_factor)
+
+
+def test_GIVEN_unrecognised_units_WHEN_checking_units_THEN_checks_fail_every_time():
+    for _ in range(2):
+        assert not units_are_recognised_by_pint("notaunit", False)
+        assert not units_have_magnitude_of_one("notaunit", False)
+
+
+def test_GIVEN_units_of_wrong_type_WHEN_checking_type_THEN_check_fails():
+    assert units_are_expected_type("seconds", METRES, False) is False
+    assert units_are_expected_type("cm", METRES, False) is True
+
+
+def test_GIVEN_registry_WHEN_getting_registry_again_THEN_same_registry_is_returned():
+    assert get_unit_registry() is get_unit_registry()
@@ -5,7 +5,8 @@ from mock import Mock
 from nexus_constructor.component.component_type import (
     make_dictionary_of_class_definitions,
 )
-from nexus_constructor.ui_utils import validate_line_edit, generate_unique_name
+from nexus_constructor.name_utils import generate_unique_name
+from nexus_constructor.ui_utils import validate_line_edit
 
 
 class DummyLineEdit:
@@ -116,6 +117,7 @@ def test_GIVEN_name_with_1_as_suffix_and_name_with_11_already_in_list_WHEN_gener
     ) == "something12"
 
 
+# Cached in the temporary directory which conftest.py points the cache at for the whole session
 NX_CLASS_DEFINITIONS = make_dictionary_of_class_definitions(
     os.path.join(os.getcwd(), "definitions")
 )[1]
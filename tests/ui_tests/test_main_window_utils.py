@@ -2,7 +2,7 @@ import uuid
 from unittest.mock import Mock
 import pytest
 from PySide2.QtCore import QPoint, QModelIndex
-from PySide2.QtGui import QVector3D
+import numpy as np
 from PySide2.QtWidgets import QToolBar, QWidget, QTreeView, QFrame, QVBoxLayout
 from nexus_constructor.component_tree_model import ComponentTreeModel
 from nexus_constructor.component_tree_view import ComponentEditorDelegate
@@ -610,7 +610,7 @@ def create_transformation(trans_type: TransformationType):
     ds = file.nexus_file.create_dataset("transform", data=8)
     t = Transformation(file, ds)
     t.type = trans_type
-    t.vector = QVector3D(1, 0, 0)
+    t.vector = np.array([1, 0, 0])
     return t
 
 
@@ -5,7 +5,6 @@ import h5py
 import pytest
 import pytestqt
 from PySide2.QtCore import Qt
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QDialog, QRadioButton, QMainWindow
 from mock import Mock, call, patch, mock_open
 from pytestqt.qtbot import QtBot
@@ -1731,7 +1730,7 @@ def test_UI_GIVEN_component_with_cylinder_shape_WHEN_editing_component_THEN_cyli
 
     component_name = "test"
     component = instrument.create_component(component_name, "NXpinhole", "")
-    component.set_cylinder_shape(QVector3D(1, 1, 1), height=3, radius=4)
+    component.set_cylinder_shape(np.array([1, 1, 1]), height=3, radius=4)
 
     with patch("nexus_constructor.validators.PixelValidator") as mock_pixel_validator:
         mock_pixel_validator.unacceptable_pixel_states = Mock(return_value=[])
@@ -1949,9 +1948,9 @@ def test_UI_GIVEN_component_with_off_shape_WHEN_editing_component_THEN_mesh_shap
     component.set_off_shape(
         OFFGeometryNoNexus(
             [
-                QVector3D(0.0, 0.0, 1.0),
-                QVector3D(0.0, 1.0, 0.0),
-                QVector3D(0.0, 0.0, 0.0),
+                np.array([0.0, 0.0, 1.0]),
+                np.array([0.0, 1.0, 0.0]),
+                np.array([0.0, 0.0, 0.0]),
             ],
             [[0, 1, 2]],
         ),
@@ -1992,9 +1991,9 @@ def test_UI_GIVEN_component_with_off_shape_WHEN_editing_component_THEN_mesh_data
     component.set_off_shape(
         OFFGeometryNoNexus(
             [
-                QVector3D(0.0, 0.0, 1.0),
-                QVector3D(0.0, 1.0, 0.0),
-                QVector3D(0.0, 0.0, 0.0),
+                np.array([0.0, 0.0, 1.0]),
+                np.array([0.0, 1.0, 0.0]),
+                np.array([0.0, 0.0, 0.0]),
             ],
             [[0, 1, 2]],
         ),
@@ -1,5 +1,4 @@
 import h5py
-from PySide2.QtGui import QVector3D
 from mock import Mock
 
 from nexus_constructor.instrument import Instrument
@@ -7,6 +6,7 @@ from nexus_constructor.nexus.nexus_wrapper import NexusWrapper
 from nexus_constructor.transformation_view import EditRotation, EditTranslation
 from nexus_constructor.validators import FieldType
 import numpy as np
+from pytest import approx
 from pytestqt.qtbot import QtBot  # noqa: F401
 from tests.helpers import file  # noqa: F401
 
@@ -22,7 +22,7 @@ def test_UI_GIVEN_scalar_vector_WHEN_creating_translation_view_THEN_ui_is_filled
     x = 1
     y = 0
     z = 0
-    transform = component.add_translation(QVector3D(x, y, z), name="test")
+    transform = component.add_translation(np.array([x, y, z]), name="test")
 
     view = EditTranslation(parent=None, transformation=transform, instrument=instrument)
     qtbot.addWidget(view)
@@ -51,7 +51,7 @@ def test_UI_GIVEN_scalar_angle_WHEN_creating_rotation_view_THEN_ui_is_filled_cor
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=np.array([x, y, z]))
 
     view = EditRotation(parent=None, transformation=transform, instrument=instrument)
     qtbot.addWidget(view)
@@ -80,7 +80,7 @@ def test_UI_GIVEN_array_dataset_as_magnitude_WHEN_creating_translation_THEN_ui_i
     x = 1
     y = 0
     z = 0
-    transform = component.add_translation(QVector3D(x, y, z), name="test")
+    transform = component.add_translation(np.array([x, y, z]), name="test")
 
     transform.dataset = file.create_dataset("test", data=array)
 
@@ -108,7 +108,7 @@ def test_UI_GIVEN_stream_group_as_angle_WHEN_creating_rotation_THEN_ui_is_filled
     y = 0
     z = 0
 
-    transform = component.add_rotation(QVector3D(x, y, z), 0, name="test")
+    transform = component.add_rotation(np.array([x, y, z]), 0, name="test")
 
     stream_group = file.create_group("stream_group")
     stream_group.attrs["NX_class"] = "NCstream"
@@ -152,7 +152,7 @@ def test_UI_GIVEN_link_as_rotation_magnitude_WHEN_creating_rotation_view_THEN_ui
     z = 0
     path = "/entry"
 
-    transform = component.add_rotation(QVector3D(x, y, z), 0, name="test")
+    transform = component.add_rotation(np.array([x, y, z]), 0, name="test")
     link = wrapper.instrument["asdfgh"] = h5py.SoftLink(path)
 
     transform.dataset = link
@@ -179,7 +179,7 @@ def test_UI_GIVEN_vector_updated_WHEN_saving_view_changes_THEN_model_is_updated(
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=np.array([x, y, z]))
 
     view = EditRotation(parent=None, transformation=transform, instrument=instrument)
     qtbot.addWidget(view)
@@ -194,7 +194,7 @@ def test_UI_GIVEN_vector_updated_WHEN_saving_view_changes_THEN_model_is_updated(
 
     view.saveChanges()
 
-    assert transform.vector == QVector3D(new_x, new_y, new_z)
+    assert transform.vector == approx([new_x, new_y, new_z])
 
 
 def test_UI_GIVEN_view_gains_focus_WHEN_transformation_view_exists_THEN_spinboxes_are_enabled(
@@ -210,7 +210,7 @@ def test_UI_GIVEN_view_gains_focus_WHEN_transformation_view_exists_THEN_spinboxe
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=np.array([x, y, z]))
 
     view = EditRotation(parent=None, transformation=transform, instrument=instrument)
     qtbot.addWidget(view)
@@ -236,7 +236,7 @@ def test_UI_GIVEN_view_loses_focus_WHEN_transformation_view_exists_THEN_spinboxe
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=np.array([x, y, z]))
 
     view = EditRotation(parent=None, transformation=transform, instrument=instrument)
     qtbot.addWidget(view)
@@ -262,7 +262,7 @@ def test_UI_GIVEN_new_values_are_provided_WHEN_save_changes_is_called_THEN_trans
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=np.array([x, y, z]))
 
     view = EditRotation(parent=None, transformation=transform, instrument=instrument)
     instrument.nexus.transformation_changed = Mock()
@@ -273,4 +273,4 @@ def test_UI_GIVEN_new_values_are_provided_WHEN_save_changes_is_called_THEN_trans
     view.transformation_frame.x_spinbox.setValue(new_x)
     view.saveChanges()
     instrument.nexus.transformation_changed.emit.assert_called_once()
-    assert transform.vector == QVector3D(new_x, y, z)
+    assert transform.vector == approx([new_x, y, z])
@@ -57,11 +57,13 @@ class Ui_MainWindow(object):
         self.status_bar = QtWidgets.QStatusBar(MainWindow)
         MainWindow.setStatusBar(self.status_bar)
         self.open_nexus_file_action = QtWidgets.QAction(MainWindow)
+        self.open_nexus_file_lazily_action = QtWidgets.QAction(MainWindow)
         self.open_json_file_action = QtWidgets.QAction(MainWindow)
         self.export_to_nexus_file_action = QtWidgets.QAction(MainWindow)
         self.export_to_filewriter_JSON_action = QtWidgets.QAction(MainWindow)
         self.export_to_forwarder_JSON_action = QtWidgets.QAction(MainWindow)
         self.file_menu.addAction(self.open_nexus_file_action)
+        self.file_menu.addAction(self.open_nexus_file_lazily_action)
         self.file_menu.addAction(self.open_json_file_action)
         self.file_menu.addAction(self.export_to_nexus_file_action)
         self.file_menu.addAction(self.export_to_filewriter_JSON_action)
@@ -90,6 +92,11 @@ class Ui_MainWindow(object):
         self.open_nexus_file_action.setText(
             QtWidgets.QApplication.translate("MainWindow", "Open NeXus file", None, -1)
         )
+        self.open_nexus_file_lazily_action.setText(
+            QtWidgets.QApplication.translate(
+                "MainWindow", "Open NeXus file (large datasets on disk)", None, -1
+            )
+        )
         self.open_json_file_action.setText(
             QtWidgets.QApplication.translate(
                 "MainWindow", "Open Filewriter JSON file", None, -1